@@ -0,0 +1,170 @@
+"""
+Namespaced caching for data derived from other services, such as the Discovery service.
+
+Entries are cached per site within a namespace. Each namespace has a generation number per site which is part of
+the cache keys of its entries, so incrementing the generation invalidates every entry of the namespace at once.
+
+Expired entries are served for up to CACHE_STALE_WHILE_REVALIDATE seconds while a single worker, holding a
+short-lived lease, refreshes them.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from edx_django_utils.cache import RequestCache, TieredCache
+from edx_django_utils.cache.utils import CachedResponse
+
+from ecommerce.core.instrumentation import metrics
+from ecommerce.core.utils import get_cache_key, get_or_set_cache
+
+logger = logging.getLogger(__name__)
+
+
+class CacheNamespace:
+    """
+    A group of cache entries that can be invalidated together for a site.
+    """
+
+    def __init__(self, name, timeout_setting):
+        """
+        Arguments:
+            name (str): Name of the namespace.
+            timeout_setting (str): Name of the setting holding the number of seconds entries stay fresh.
+        """
+        self.name = name
+        self.timeout_setting = timeout_setting
+
+    @property
+    def timeout(self):
+        return getattr(settings, self.timeout_setting)
+
+    def _generation_key(self, site_domain):
+        return 'cache_namespace.{name}.{site_domain}.generation'.format(name=self.name, site_domain=site_domain)
+
+    def get_generation(self, site_domain):
+        """
+        Return the current generation of the namespace for the site.
+
+        The generation is read from the cache at most once per request.
+        """
+        generation_key = self._generation_key(site_domain)
+        request_cache = RequestCache()
+        cached_response = request_cache.get_cached_response(generation_key)
+        if cached_response.is_found:
+            return cached_response.value
+
+        generation = cache.get(generation_key)
+        if generation is None:
+            # Start from the current time rather than 1, so that entries cached under an evicted generation
+            # are not served again.
+            cache.add(generation_key, int(time.time() * 1000), None)
+            generation = cache.get(generation_key)
+
+        request_cache.set(generation_key, generation)
+        return generation
+
+    def invalidate(self, site_domain):
+        """
+        Invalidate every entry of the namespace for the site.
+        """
+        generation_key = self._generation_key(site_domain)
+        try:
+            cache.incr(generation_key)
+        except ValueError:
+            cache.add(generation_key, int(time.time() * 1000), None)
+        RequestCache().delete(generation_key)
+        logger.info('Invalidated the [%s] cache namespace for site [%s].', self.name, site_domain)
+
+    def get_cache_key(self, site_domain, **kwargs):
+        """
+        Return the cache key of the entry identified by `kwargs` in the current generation of the namespace.
+        """
+        return get_cache_key(
+            namespace=self.name,
+            generation=self.get_generation(site_domain),
+            site_domain=site_domain,
+            **kwargs
+        )
+
+    def get_cached_response(self, site_domain, **kwargs):
+        """
+        Return a CachedResponse for the entry identified by `kwargs`, whether or not it is stale.
+        """
+        cache_key = self.get_cache_key(site_domain, **kwargs)
+        cached_response = TieredCache.get_cached_response(cache_key)
+        value = cached_response.value[0] if cached_response.is_found else None
+        return CachedResponse(cached_response.is_found, cache_key, value)
+
+    def set(self, site_domain, value, timeout=None, **kwargs):
+        """
+        Cache `value` for the entry identified by `kwargs`.
+        """
+        self._set(self.get_cache_key(site_domain, **kwargs), value, timeout)
+
+    def _set(self, cache_key, value, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        fresh_until = time.time() + timeout
+        TieredCache.set_all_tiers(cache_key, (value, fresh_until), timeout + settings.CACHE_STALE_WHILE_REVALIDATE)
+
+    def get_or_set(self, site_domain, fetch, timeout=None, **kwargs):
+        """
+        Return the cached value of the entry identified by `kwargs`, calling `fetch` to compute it when needed.
+
+        Concurrent misses are coalesced by `get_or_set_cache`. A stale value is returned as is unless this worker
+        acquires the lease to refresh it. If the refresh fails, the stale value is returned.
+
+        Arguments:
+            site_domain (str): Domain of the site the entry belongs to.
+            fetch (callable): Returns the value to cache.
+            timeout (int): Number of seconds the value stays fresh. Defaults to the namespace timeout.
+            **kwargs: Identify the entry within the namespace.
+        """
+        cache_key = self.get_cache_key(site_domain, **kwargs)
+        timeout = self.timeout if timeout is None else timeout
+
+        fetched = []
+
+        def fetch_entry():
+            fetched.append(True)
+            return fetch(), time.time() + timeout
+
+        value, fresh_until = get_or_set_cache(
+            cache_key, fetch_entry, timeout + settings.CACHE_STALE_WHILE_REVALIDATE
+        )
+        if fetched:
+            metrics.record_cache_lookup(self.name, 'miss')
+            return value
+        if time.time() < fresh_until:
+            metrics.record_cache_lookup(self.name, 'hit')
+            return value
+
+        metrics.record_cache_lookup(self.name, 'stale')
+        lease_key = cache_key + '.refresh'
+        if not cache.add(lease_key, 1, settings.CACHE_REFRESH_LEASE_TIMEOUT):
+            return value
+
+        try:
+            value = fetch()
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Failed to refresh [%s] cache entry. Serving the stale value.', self.name)
+            return value
+        finally:
+            cache.delete(lease_key)
+
+        self._set(cache_key, value, timeout)
+        return value
+
+
+COURSES_CACHE = CacheNamespace('courses', 'COURSES_API_CACHE_TIMEOUT')
+CATALOGS_CACHE = CacheNamespace('catalogs', 'COURSES_API_CACHE_TIMEOUT')
+PROGRAMS_CACHE = CacheNamespace('programs', 'PROGRAM_CACHE_TIMEOUT')
+CREDIT_PROVIDERS_CACHE = CacheNamespace('credit_providers', 'CREDIT_PROVIDER_CACHE_TIMEOUT')
+BASKET_CALCULATE_CACHE = CacheNamespace('basket_calculate', 'BASKET_CALCULATE_CACHE_TIMEOUT')
+
+CACHE_NAMESPACES = {
+    namespace.name: namespace
+    for namespace in (
+        COURSES_CACHE, CATALOGS_CACHE, PROGRAMS_CACHE, CREDIT_PROVIDERS_CACHE, BASKET_CALCULATE_CACHE
+    )
+}
@@ -0,0 +1,124 @@
+"""
+Database routing for the optional read replica.
+
+Read queries are only sent to the replica inside a `read_replica()` block, which views opt into with
+`ecommerce.core.views.ReadReplicaMixin`. Writes always go to the primary database.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+READ_REPLICA_ALIAS = 'read_replica'
+
+_local = threading.local()
+_lag_check = {'checked_at': None, 'usable': False}
+
+
+@contextmanager
+def read_replica():
+    """
+    Route read queries made inside the block to the read replica, if it is available.
+    """
+    previous = getattr(_local, 'use_read_replica', False)
+    _local.use_read_replica = True
+    try:
+        yield
+    finally:
+        _local.use_read_replica = previous
+
+
+def is_read_replica_requested():
+    """
+    Return True if the current thread is inside a `read_replica()` block.
+    """
+    return getattr(_local, 'use_read_replica', False)
+
+
+def get_read_replica_lag():
+    """
+    Return the replication lag of the read replica in seconds, as reported by READ_REPLICA_LAG_QUERY.
+
+    Returns None if the lag could not be determined.
+    """
+    with connections[READ_REPLICA_ALIAS].cursor() as cursor:
+        cursor.execute(settings.READ_REPLICA_LAG_QUERY)
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def _check_read_replica_lag():
+    max_lag = settings.READ_REPLICA_MAX_LAG
+    try:
+        lag = get_read_replica_lag()
+    except DatabaseError:
+        logger.exception('Failed to determine the read replica lag. Falling back to the primary database.')
+        return False
+
+    if lag is None or lag > max_lag:
+        logger.warning(
+            'Read replica lag [%s] exceeds the allowed [%s] seconds. Falling back to the primary database.',
+            lag,
+            max_lag
+        )
+        return False
+    return True
+
+
+def is_read_replica_usable():
+    """
+    Return True if a read replica is configured and, when a lag guard is configured, is not lagging behind.
+
+    The lag check result is cached in-process for READ_REPLICA_LAG_CHECK_INTERVAL seconds.
+    """
+    if READ_REPLICA_ALIAS not in settings.DATABASES:
+        return False
+
+    if settings.READ_REPLICA_MAX_LAG is None or not settings.READ_REPLICA_LAG_QUERY:
+        return True
+
+    now = time.monotonic()
+    checked_at = _lag_check['checked_at']
+    if checked_at is None or now - checked_at >= settings.READ_REPLICA_LAG_CHECK_INTERVAL:
+        _lag_check['usable'] = _check_read_replica_lag()
+        _lag_check['checked_at'] = now
+    return _lag_check['usable']
+
+
+def reset_read_replica_lag_check():
+    """
+    Forget the cached result of the last lag check.
+    """
+    _lag_check['checked_at'] = None
+    _lag_check['usable'] = False
+
+
+class ReadReplicaRouter:
+    """
+    Send reads made inside a `read_replica()` block to the read replica and every write to the primary.
+    """
+
+    def db_for_read(self, model, **hints):  # pylint: disable=unused-argument
+        if is_read_replica_requested() and is_read_replica_usable():
+            return READ_REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):  # pylint: disable=unused-argument
+        # Instances read from the replica must still be saved to the primary.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):  # pylint: disable=unused-argument
+        databases = {DEFAULT_DB_ALIAS, READ_REPLICA_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:  # pylint: disable=protected-access
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):  # pylint: disable=unused-argument
+        if db == READ_REPLICA_ALIAS:
+            return False
+        return None
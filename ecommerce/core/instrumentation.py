@@ -0,0 +1,299 @@
+"""
+In-process metrics for caches and calls to upstream services.
+
+Cache lookups are counted per namespace, and calls to upstream services (Discovery, LMS, enterprise, CyberSource)
+are recorded per service and endpoint as latency and payload size histograms. Metrics are kept in memory by each
+worker process and exposed by the staff-only stats endpoint, as JSON or in the Prometheus text format.
+"""
+import re
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)  # Values are in seconds.
+PAYLOAD_SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)  # Values are in bytes.
+
+# Endpoints beyond this number are recorded as OTHER_ENDPOINT, to bound the number of series per service.
+MAX_ENDPOINTS_PER_SERVICE = 100
+OTHER_ENDPOINT = 'other'
+
+# Path segments holding identifiers (numbers, UUIDs, course keys, usernames with digits) are replaced by
+# ID_PLACEHOLDER in endpoint names.
+ID_PLACEHOLDER = '{id}'
+_IDENTIFIER_SEGMENT = re.compile(r'[\d:+@]')
+_VERSION_SEGMENT = re.compile(r'^v\d+$')
+
+
+class Histogram:
+    """
+    A histogram with fixed buckets, in the style of Prometheus.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def cumulative_counts(self):
+        """
+        Return a list of (upper bound, number of observations less than or equal to it) tuples.
+        """
+        total = 0
+        cumulative = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return cumulative
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': {str(bound): count for bound, count in self.cumulative_counts()},
+        }
+
+
+class UpstreamEndpointMetrics:
+    def __init__(self):
+        self.errors = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.payload_size = Histogram(PAYLOAD_SIZE_BUCKETS)
+
+    def as_dict(self):
+        return {
+            'count': self.latency.count,
+            'errors': self.errors,
+            'latency_seconds': self.latency.as_dict(),
+            'payload_size_bytes': self.payload_size.as_dict(),
+        }
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of the metrics of this process.
+    """
+
+    CACHE_RESULTS = ('hit', 'miss', 'stale')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._upstream = {}
+
+    def record_cache_lookup(self, namespace, result):
+        """
+        Count a cache lookup.
+
+        Arguments:
+            namespace (str): Name of the group of cache entries the lookup belongs to.
+            result (str): One of CACHE_RESULTS. Stale results are served while the entry is being refreshed.
+        """
+        with self._lock:
+            counts = self._cache.setdefault(namespace, dict.fromkeys(self.CACHE_RESULTS, 0))
+            counts[result] += 1
+
+    def record_upstream_call(self, service, endpoint, duration, payload_size=None, error=False):
+        """
+        Record a call to an upstream service.
+
+        Arguments:
+            service (str): Name of the upstream service.
+            endpoint (str): Name of the endpoint, which must not contain identifiers.
+            duration (float): Number of seconds the call took.
+            payload_size (int): Size of the response body in bytes, if known.
+            error (bool): Whether the call failed.
+        """
+        with self._lock:
+            endpoints = self._upstream.setdefault(service, {})
+            if endpoint not in endpoints and len(endpoints) >= MAX_ENDPOINTS_PER_SERVICE:
+                endpoint = OTHER_ENDPOINT
+            endpoint_metrics = endpoints.get(endpoint)
+            if endpoint_metrics is None:
+                endpoint_metrics = endpoints[endpoint] = UpstreamEndpointMetrics()
+
+            endpoint_metrics.latency.observe(duration)
+            if payload_size is not None:
+                endpoint_metrics.payload_size.observe(payload_size)
+            if error:
+                endpoint_metrics.errors += 1
+
+    def reset(self):
+        with self._lock:
+            self._cache = {}
+            self._upstream = {}
+
+    def as_dict(self):
+        """
+        Return the metrics as a JSON-serializable dict.
+        """
+        with self._lock:
+            cache = {}
+            for namespace, counts in sorted(self._cache.items()):
+                lookups = sum(counts.values())
+                cache[namespace] = dict(
+                    counts,
+                    hit_ratio=(counts['hit'] + counts['stale']) / lookups if lookups else None
+                )
+
+            upstream = {
+                service: {endpoint: values.as_dict() for endpoint, values in sorted(endpoints.items())}
+                for service, endpoints in sorted(self._upstream.items())
+            }
+
+        return {'cache': cache, 'upstream': upstream}
+
+    def as_prometheus_text(self):
+        """
+        Return the metrics in the Prometheus text exposition format.
+        """
+        lines = [
+            '# HELP ecommerce_cache_lookups_total Cache lookups by namespace and result.',
+            '# TYPE ecommerce_cache_lookups_total counter',
+        ]
+        with self._lock:
+            for namespace, counts in sorted(self._cache.items()):
+                for result in self.CACHE_RESULTS:
+                    lines.append(_sample(
+                        'ecommerce_cache_lookups_total', {'namespace': namespace, 'result': result}, counts[result]
+                    ))
+
+            upstream = [
+                (service, endpoint, endpoint_metrics)
+                for service, endpoints in sorted(self._upstream.items())
+                for endpoint, endpoint_metrics in sorted(endpoints.items())
+            ]
+
+            lines += [
+                '# HELP ecommerce_upstream_errors_total Failed calls to upstream services.',
+                '# TYPE ecommerce_upstream_errors_total counter',
+            ]
+            for service, endpoint, endpoint_metrics in upstream:
+                labels = {'service': service, 'endpoint': endpoint}
+                lines.append(_sample('ecommerce_upstream_errors_total', labels, endpoint_metrics.errors))
+
+            for name, description, attribute in (
+                    ('ecommerce_upstream_request_duration_seconds', 'Latency of calls to upstream services.',
+                     'latency'),
+                    ('ecommerce_upstream_response_size_bytes', 'Size of responses from upstream services.',
+                     'payload_size'),
+            ):
+                lines += [
+                    '# HELP {name} {description}'.format(name=name, description=description),
+                    '# TYPE {name} histogram'.format(name=name),
+                ]
+                for service, endpoint, endpoint_metrics in upstream:
+                    lines += _histogram_samples(
+                        name, {'service': service, 'endpoint': endpoint}, getattr(endpoint_metrics, attribute)
+                    )
+
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _sample(name, labels, value):
+    formatted_labels = ','.join(
+        '{key}="{value}"'.format(key=key, value=_escape_label_value(value)) for key, value in labels.items()
+    )
+    return '{name}{{{labels}}} {value}'.format(name=name, labels=formatted_labels, value=value)
+
+
+def _histogram_samples(name, labels, histogram):
+    samples = [
+        _sample(name + '_bucket', dict(labels, le=bound), count)
+        for bound, count in histogram.cumulative_counts()
+    ]
+    samples += [
+        _sample(name + '_bucket', dict(labels, le='+Inf'), histogram.count),
+        _sample(name + '_sum', labels, histogram.sum),
+        _sample(name + '_count', labels, histogram.count),
+    ]
+    return samples
+
+
+metrics = MetricsRegistry()
+
+
+def get_endpoint_name(method, base_url, url):
+    """
+    Return the name of the endpoint called with `url`, relative to `base_url` and without identifiers.
+
+    Example:
+        >>> get_endpoint_name('get', 'https://lms/api/v1/', 'https://lms/api/v1/courses/course-v1:a+b+c/?x=1')
+        'GET /courses/{id}/'
+    """
+    path = urlparse(url).path
+    base_path = urlparse(base_url).path.rstrip('/')
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path):]
+
+    segments = [
+        ID_PLACEHOLDER if _IDENTIFIER_SEGMENT.search(segment) and not _VERSION_SEGMENT.match(segment) else segment
+        for segment in path.split('/')
+    ]
+    return '{method} {path}'.format(method=method.upper(), path='/'.join(segments) or '/')
+
+
+@contextmanager
+def record_upstream_call(service, endpoint):
+    """
+    Record the duration of the calls made inside the block, and whether they raised.
+    """
+    start = time.monotonic()
+    try:
+        yield
+    except Exception:
+        metrics.record_upstream_call(service, endpoint, time.monotonic() - start, error=True)
+        raise
+    metrics.record_upstream_call(service, endpoint, time.monotonic() - start)
+
+
+def instrument_api_client(client, service, base_url=None):
+    """
+    Record the latency and payload size of every call made with a Slumber-based API client.
+
+    Arguments:
+        client (EdxRestApiClient): The client to instrument.
+        service (str): Name of the upstream service the client calls.
+        base_url (str): URL endpoint names are relative to. Defaults to the URL of the client.
+
+    Returns:
+        The instrumented client.
+    """
+    # pylint: disable=protected-access
+    session = client._store['session']
+    base_url = base_url or client._store['base_url']
+    send_request = session.request
+
+    def request(method, url, *args, **kwargs):
+        endpoint = get_endpoint_name(method, base_url, url)
+        start = time.monotonic()
+        try:
+            response = send_request(method, url, *args, **kwargs)
+        except Exception:
+            metrics.record_upstream_call(service, endpoint, time.monotonic() - start, error=True)
+            raise
+
+        metrics.record_upstream_call(
+            service,
+            endpoint,
+            time.monotonic() - start,
+            payload_size=len(response.content),
+            error=response.status_code >= 500,
+        )
+        return response
+
+    session.request = request
+    return client
@@ -0,0 +1,120 @@
+"""
+Long-running API operations executed outside of the request.
+
+An endpoint starts a job with `start_job`, and returns `job_accepted_response` right away. The job is executed once the
+transaction of the request commits: by the `ecommerce.core.tasks.run_async_job` Celery task, or by a thread of this
+process when Celery tasks are executed eagerly (CELERY_ALWAYS_EAGER). Clients poll the job URL for its progress and
+result.
+
+Job functions receive the AsyncJob, to report their progress, and the JSON-serializable arguments the job was started
+with. Their return value, which must be JSON-serializable, is the result of the job.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.response import Response
+
+from ecommerce.celery_app import app
+from ecommerce.core.models import AsyncJob
+
+logger = logging.getLogger(__name__)
+
+ASYNC_QUERY_PARAM = 'async'
+RUN_JOB_TASK_NAME = 'ecommerce.core.tasks.run_async_job'
+
+_job_executor = None
+_job_executor_lock = threading.Lock()
+
+
+def is_async_request(request):
+    """
+    Return True if the client asked for the operation to be executed as a job, with `?async=true`.
+    """
+    return request.query_params.get(ASYNC_QUERY_PARAM, '').lower() in ('1', 'true')
+
+
+def start_job(func, site, user, **arguments):
+    """
+    Create a job executing `func(job, **arguments)`, and dispatch it once the current transaction commits.
+
+    Returns:
+        AsyncJob
+    """
+    job = AsyncJob.objects.create(
+        name='{}.{}'.format(func.__module__, func.__name__),
+        site=site,
+        user=user,
+        arguments=arguments,
+    )
+    transaction.on_commit(lambda: dispatch_job(job.id))
+    return job
+
+
+def dispatch_job(job_id):
+    if settings.CELERY_ALWAYS_EAGER:
+        _get_job_executor().submit(_run_job_in_thread, job_id)
+    else:
+        # Sent by name, as the tasks module imports this one.
+        app.send_task(RUN_JOB_TASK_NAME, args=(job_id,))
+
+
+def run_job(job_id):
+    """
+    Execute the pending job, and record its result or error.
+    """
+    # The job is claimed with a single conditional update, so that a task delivered twice executes it once.
+    claimed = AsyncJob.objects.filter(id=job_id, status=AsyncJob.PENDING).update(
+        status=AsyncJob.RUNNING, modified=timezone.now()
+    )
+    job = AsyncJob.objects.get(id=job_id)
+    if not claimed:
+        logger.warning('Job [%s] is %s, it will not be executed again.', job.uuid, job.status)
+        return job
+
+    try:
+        func = import_string(job.name)
+        job.result = func(job, **job.arguments)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.exception('Job [%s] executing [%s] failed.', job.uuid, job.name)
+        job.status = AsyncJob.FAILED
+        job.error = str(exc)
+        job.save(update_fields=['status', 'error', 'modified'])
+    else:
+        job.status = AsyncJob.SUCCEEDED
+        job.save(update_fields=['status', 'result', 'modified'])
+    return job
+
+
+def job_accepted_response(request, job):
+    """
+    Return the 202 response of an endpoint that started a job, pointing the client to the job URL.
+    """
+    job_url = request.build_absolute_uri(reverse('api:v2:jobs-detail', kwargs={'uuid': job.uuid}))
+    return Response(
+        {'job': str(job.uuid), 'status': job.status, 'url': job_url},
+        status=status.HTTP_202_ACCEPTED,
+        headers={'Location': job_url},
+    )
+
+
+def _get_job_executor():
+    global _job_executor  # pylint: disable=global-statement
+    with _job_executor_lock:
+        if _job_executor is None:
+            _job_executor = ThreadPoolExecutor(max_workers=settings.ASYNC_JOB_THREADS, thread_name_prefix='async-job')
+        return _job_executor
+
+
+def _run_job_in_thread(job_id):
+    try:
+        run_job(job_id)
+    finally:
+        # Each thread has its own database connections.
+        connections.close_all()
@@ -0,0 +1,50 @@
+"""
+Management command that deletes the API jobs which finished more than ASYNC_JOB_RETENTION_DAYS days ago.
+
+The arguments and results of jobs may hold learner email addresses, and they are of no use once their client read
+them.
+"""
+import datetime
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from ecommerce.core.models import AsyncJob
+
+
+class Command(BaseCommand):
+    help = 'Delete the API jobs which finished more than ASYNC_JOB_RETENTION_DAYS days ago.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days',
+                            action='store',
+                            dest='days',
+                            default=None,
+                            type=int,
+                            help='Delete the jobs which finished more than this many days ago. '
+                                 'Defaults to ASYNC_JOB_RETENTION_DAYS.')
+        # Batched deletion prevents the entire table from locking up as the command executes.
+        parser.add_argument('-b', '--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            default=1000,
+                            type=int,
+                            help='Size of each batch of jobs to be deleted.')
+
+    def handle(self, *args, **options):
+        days = settings.ASYNC_JOB_RETENTION_DAYS if options['days'] is None else options['days']
+        queryset = AsyncJob.objects.filter(
+            status__in=(AsyncJob.SUCCEEDED, AsyncJob.FAILED),
+            modified__lt=timezone.now() - datetime.timedelta(days=days),
+        )
+
+        deleted = 0
+        while True:
+            ids = list(queryset.values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            AsyncJob.objects.filter(id__in=ids).delete()
+            deleted += len(ids)
+
+        self.stderr.write('Deleted [{}] finished jobs.'.format(deleted))
@@ -0,0 +1,35 @@
+"""
+Management command that invalidates every entry of a cache namespace, for one site or for all of them.
+
+Invalidation bumps the namespace generation, so it takes effect on every worker without deleting keys.
+"""
+from django.contrib.sites.models import Site
+from django.core.management import BaseCommand, CommandError
+
+from ecommerce.core.cache import CACHE_NAMESPACES
+
+
+class Command(BaseCommand):
+    help = 'Invalidate the entries of a cache namespace.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name',
+                            choices=sorted(CACHE_NAMESPACES),
+                            help='Name of the cache namespace to invalidate.')
+        parser.add_argument('--site',
+                            action='store',
+                            dest='site',
+                            default=None,
+                            help='Domain of the site whose entries should be invalidated. Defaults to all sites.')
+
+    def handle(self, *args, **options):
+        namespace = CACHE_NAMESPACES[options['name']]
+        domains = list(Site.objects.values_list('domain', flat=True))
+        if options['site']:
+            if options['site'] not in domains:
+                raise CommandError('Site [{}] does not exist.'.format(options['site']))
+            domains = [options['site']]
+
+        for domain in domains:
+            namespace.invalidate(domain)
+            self.stderr.write('Invalidated the [{}] cache namespace for site [{}].'.format(namespace.name, domain))
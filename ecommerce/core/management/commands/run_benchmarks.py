@@ -0,0 +1,86 @@
+"""
+Django management command to benchmark the basket, checkout, coupon and enterprise report flows.
+"""
+import datetime
+import itertools
+import json
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+try:
+    from ecommerce.tests import benchmarks
+except ImportError:  # pragma: no cover
+    # The benchmarks stub upstream services with httpretty and build their data with the test factories, which are
+    # only installed with the test requirements.
+    benchmarks = None
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the main flows with generated data and stubbed upstream services. Sizes accept several values, '
+        'and every combination is benchmarked. The data is rolled back after each combination.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--offers', type=int, nargs='+', default=[10],
+                            help='Numbers of site offers applying to the baskets.')
+        parser.add_argument('--vouchers', type=int, nargs='+', default=[10],
+                            help='Numbers of vouchers of the coupons.')
+        parser.add_argument('--lines', type=int, nargs='+', default=[1],
+                            help='Numbers of lines of the baskets.')
+        scenarios = list(benchmarks.SCENARIOS) if benchmarks else None
+        parser.add_argument('--scenario', dest='scenarios', action='append', choices=scenarios,
+                            help='Scenario to run. May be repeated. Defaults to all scenarios.')
+        parser.add_argument('--iterations', type=int, default=10,
+                            help='Number of measured iterations of each scenario.')
+        parser.add_argument('--warmup', type=int, default=1,
+                            help='Number of iterations run before measuring, to fill caches.')
+        parser.add_argument('--cold-cache', action='store_true',
+                            help='Clear the cache before every iteration.')
+        parser.add_argument('--upstream-latency', type=float, default=0,
+                            help='Number of seconds the stubbed upstream services take to respond.')
+        parser.add_argument('--output',
+                            help='JSON lines file the results are appended to, and compared with.')
+
+    def handle(self, *args, **options):
+        if benchmarks is None:
+            raise CommandError('The benchmarks require the test requirements, see requirements/test.txt.')
+        if options['iterations'] < 1:
+            raise CommandError('At least one iteration is required.')
+
+        previous_runs = benchmarks.load_results(options['output']) if options['output'] else []
+        revision = benchmarks.get_revision()
+
+        for offers, vouchers, lines in itertools.product(options['offers'], options['vouchers'], options['lines']):
+            logger.info('Benchmarking with %d offers, %d vouchers and %d lines.', offers, vouchers, lines)
+            run = benchmarks.run_benchmarks(
+                offers,
+                vouchers,
+                lines,
+                scenario_names=options['scenarios'],
+                iterations=options['iterations'],
+                warmup=options['warmup'],
+                cold_cache=options['cold_cache'],
+                upstream_latency=options['upstream_latency'],
+            )
+            run.update({
+                'timestamp': datetime.datetime.utcnow().isoformat(),
+                'revision': revision,
+                'database': connection.vendor,
+                'iterations': options['iterations'],
+                'cold_cache': options['cold_cache'],
+                'upstream_latency': options['upstream_latency'],
+            })
+
+            previous = benchmarks.find_previous_run(previous_runs, run)
+            if previous:
+                run['compared_to'] = previous['timestamp']
+                run['changes'] = benchmarks.compare_runs(previous, run)
+
+            self.stdout.write(json.dumps(run, indent=2))
+            if options['output']:
+                benchmarks.save_results(options['output'], run)
@@ -0,0 +1,37 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from ecommerce.core.models import AsyncJob
+from ecommerce.tests.testcases import TestCase
+
+
+class DeleteFinishedAsyncJobsTests(TestCase):
+    command = 'delete_finished_async_jobs'
+
+    def create_job(self, status, days_ago):
+        job = AsyncJob.objects.create(name='ecommerce.core.tests.test_jobs.count_items', site=self.site, status=status)
+        AsyncJob.objects.filter(id=job.id).update(modified=timezone.now() - datetime.timedelta(days=days_ago))
+        return job
+
+    def test_delete_finished_jobs(self):
+        """ Verify only the jobs which finished before the retention period are deleted. """
+        expired = [self.create_job(AsyncJob.SUCCEEDED, 31), self.create_job(AsyncJob.FAILED, 40)]
+        kept = [
+            self.create_job(AsyncJob.SUCCEEDED, 1),
+            self.create_job(AsyncJob.PENDING, 40),
+            self.create_job(AsyncJob.RUNNING, 40),
+        ]
+
+        call_command(self.command, '--batch-size', '1', stderr=StringIO())
+
+        remaining = set(AsyncJob.objects.values_list('id', flat=True))
+        self.assertEqual(remaining, {job.id for job in kept})
+        self.assertFalse(remaining & {job.id for job in expired})
+
+    def test_days(self):
+        job = self.create_job(AsyncJob.SUCCEEDED, 2)
+        call_command(self.command, '--days', '1', stderr=StringIO())
+        self.assertFalse(AsyncJob.objects.filter(id=job.id).exists())
@@ -0,0 +1,37 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+
+from ecommerce.core.cache import COURSES_CACHE
+from ecommerce.tests.factories import SiteFactory
+from ecommerce.tests.testcases import TestCase
+
+
+class InvalidateCacheNamespaceTests(TestCase):
+    command = 'invalidate_cache_namespace'
+
+    def setUp(self):
+        super(InvalidateCacheNamespaceTests, self).setUp()
+        self.other_site = SiteFactory()
+
+    def test_invalidate_all_sites(self):
+        domains = (self.site.domain, self.other_site.domain)
+        generations = {domain: COURSES_CACHE.get_generation(domain) for domain in domains}
+        call_command(self.command, 'courses', stderr=StringIO())
+        for domain, generation in generations.items():
+            self.assertNotEqual(COURSES_CACHE.get_generation(domain), generation)
+
+    def test_invalidate_site(self):
+        generation = COURSES_CACHE.get_generation(self.site.domain)
+        other_generation = COURSES_CACHE.get_generation(self.other_site.domain)
+        call_command(self.command, 'courses', '--site', self.site.domain, stderr=StringIO())
+        self.assertNotEqual(COURSES_CACHE.get_generation(self.site.domain), generation)
+        self.assertEqual(COURSES_CACHE.get_generation(self.other_site.domain), other_generation)
+
+    def test_unknown_site(self):
+        with self.assertRaises(CommandError):
+            call_command(self.command, 'courses', '--site', 'unknown.example.com', stderr=StringIO())
+
+    def test_unknown_namespace(self):
+        with self.assertRaises(CommandError):
+            call_command(self.command, 'unknown', stderr=StringIO())
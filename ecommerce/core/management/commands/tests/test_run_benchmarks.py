@@ -0,0 +1,109 @@
+"""
+Tests for Django management command to benchmark the main flows.
+"""
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from oscar.core.loading import get_model
+
+from ecommerce.tests.benchmarks import compare_runs
+from ecommerce.tests.testcases import TestCase
+
+Order = get_model('order', 'Order')
+
+
+class RunBenchmarksTests(TestCase):
+    command = 'run_benchmarks'
+
+    def setUp(self):
+        super(RunBenchmarksTests, self).setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.output = os.path.join(directory, 'benchmarks.jsonl')
+
+    def run_command(self, *args):
+        call_command(
+            self.command,
+            '--offers', '2',
+            '--vouchers', '2',
+            '--lines', '1', '2',
+            '--scenario', 'basket_calculate',
+            '--scenario', 'order_placement',
+            '--iterations', '2',
+            '--output', self.output,
+            *args,
+            stdout=StringIO()
+        )
+        with open(self.output, encoding='utf-8') as results_file:
+            return [json.loads(line) for line in results_file]
+
+    def test_run_benchmarks(self):
+        """ Verify every combination of sizes is benchmarked, and the data is rolled back. """
+        orders = Order.objects.count()
+        runs = self.run_command()
+
+        self.assertEqual([run['sizes']['lines'] for run in runs], [1, 2])
+        for run in runs:
+            self.assertEqual(list(run['scenarios']), ['basket_calculate', 'order_placement'])
+            for stats in run['scenarios'].values():
+                self.assertEqual(stats['iterations'], 2)
+                self.assertEqual(stats['errors'], 0)
+                self.assertGreater(stats['queries'], 0)
+            self.assertNotIn('changes', run)
+        self.assertEqual(Order.objects.count(), orders)
+
+    def test_view_exception_counted_as_error(self):
+        """ Verify an exception raised by a view is counted as an error instead of aborting the run. """
+        with mock.patch('ecommerce.tests.benchmarks.BasketCalculateScenario.run', side_effect=Exception('Failed')):
+            runs = self.run_command()
+
+        for run in runs:
+            # Failed iterations are left out of the statistics.
+            self.assertEqual(run['scenarios']['basket_calculate']['errors'], 2)
+            self.assertEqual(run['scenarios']['basket_calculate']['iterations'], 0)
+            self.assertIsNone(run['scenarios']['basket_calculate']['median_ms'])
+            self.assertEqual(run['scenarios']['order_placement']['errors'], 0)
+
+    @mock.patch('ecommerce.core.management.commands.run_benchmarks.benchmarks', None)
+    def test_missing_test_requirements(self):
+        with self.assertRaisesRegex(CommandError, 'test requirements'):
+            call_command(self.command)
+
+    def test_compare_with_previous_run(self):
+        runs = self.run_command()
+        runs = self.run_command()
+
+        self.assertEqual(len(runs), 4)
+        self.assertEqual(runs[2]['compared_to'], runs[0]['timestamp'])
+        self.assertEqual(set(runs[2]['changes']), {'basket_calculate', 'order_placement'})
+
+        # Runs with other options are not compared.
+        runs = self.run_command('--cold-cache')
+        self.assertNotIn('changes', runs[-1])
+
+    def test_compare_runs(self):
+        previous = {'scenarios': {
+            'a': {'iterations': 1, 'median_ms': 10, 'queries': 20},
+            'b': {'iterations': 1, 'median_ms': 0, 'queries': 1},
+            'd': {'iterations': 1, 'median_ms': 1, 'queries': 1},
+        }}
+        run = {'scenarios': {
+            'a': {'iterations': 1, 'median_ms': 15, 'queries': 18},
+            'b': {'iterations': 1, 'median_ms': 1, 'queries': 1},
+            'c': {'iterations': 1, 'median_ms': 1, 'queries': 1},
+            'd': {'iterations': 0, 'median_ms': None, 'queries': None},
+        }}
+        self.assertEqual(compare_runs(previous, run), {
+            'a': {'median_ms_change': 0.5, 'queries_change': -2},
+            'b': {'median_ms_change': None, 'queries_change': 0},
+        })
+
+    def test_invalid_iterations(self):
+        with self.assertRaises(CommandError):
+            call_command(self.command, '--iterations', '0')
@@ -6,6 +6,7 @@ Tests for Django management command to verify ecommerce transactions.
 import datetime
 
 import ddt
+import mock
 import pytz
 from django.core.management import call_command
 from django.core.management.base import CommandError
@@ -14,7 +15,11 @@ from oscar.test.factories import OrderFactory, OrderLineFactory, ProductFactory
 
 from ecommerce.core.constants import SEAT_PRODUCT_CLASS_NAME
 from ecommerce.core.management.commands.tests.factories import PaymentEventFactory
-from ecommerce.core.management.commands.verify_transactions import DEFAULT_END_DELTA_TIME, DEFAULT_START_DELTA_TIME
+from ecommerce.core.management.commands.verify_transactions import (
+    DEFAULT_END_DELTA_TIME,
+    DEFAULT_START_DELTA_TIME,
+    Command
+)
 from ecommerce.tests.testcases import TestCase
 
 PaymentEventType = get_model('order', 'PaymentEventType')
@@ -252,3 +257,58 @@ class VerifyTransactionsTest(TestCase):
         self.assertIn(str(refund.id), exception)
         self.assertIn('"amount": 90.0', exception)
         self.assertIn('"amount": 100.0', exception)
+
+    def test_batches(self):
+        """ Verify orders are verified across several keyset batches """
+        for i in range(3):
+            order = OrderFactory(total_incl_tax=0, date_placed=self.timestamp + datetime.timedelta(seconds=i))
+            order.save()
+
+        with self.assertRaises(CommandError) as cm:
+            call_command('verify_transactions', '--batch-size=2', '--threshold=0.2')
+        exception = str(cm.exception)
+        self.assertIn("The following orders are without payments", exception)
+        self.assertIn(str(self.order.id), exception)
+
+        # 1 error out of 4 orders is within the threshold
+        call_command('verify_transactions', '--batch-size=2', '--threshold=0.25')
+
+    def test_split_window(self):
+        """ Verify the time range is split into consecutive windows """
+        start = datetime.datetime(2020, 1, 1, tzinfo=pytz.utc)
+        end = start + datetime.timedelta(minutes=150)
+        self.assertEqual(
+            Command.split_window(start, end, window_size=60),
+            [
+                (start, start + datetime.timedelta(minutes=60)),
+                (start + datetime.timedelta(minutes=60), start + datetime.timedelta(minutes=120)),
+                (start + datetime.timedelta(minutes=120), end),
+            ]
+        )
+        self.assertEqual(
+            Command.split_window(start, end, processes=2),
+            [(start, start + datetime.timedelta(minutes=75)), (start + datetime.timedelta(minutes=75), end)]
+        )
+        self.assertEqual(Command.split_window(end, start), [(end, start)])
+
+    def test_parallel_windows(self):
+        """ Verify errors found by worker processes are merged """
+        class SerialPool:
+            def __init__(self, processes):
+                self.processes = processes
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+            def imap_unordered(self, func, iterable):
+                return map(func, iterable)
+
+        with mock.patch('ecommerce.core.management.commands.verify_transactions.Pool', SerialPool):
+            with self.assertRaises(CommandError) as cm:
+                call_command('verify_transactions', '--processes=3')
+        exception = str(cm.exception)
+        self.assertIn("The following orders are without payments", exception)
+        self.assertIn(str(self.order.id), exception)
@@ -12,6 +12,11 @@ PaymentEvent amount is different from the order amount, then the order
 id and relevant payment information is logged in a list associated with
 each of these scenarios.
 
+Orders are streamed in primary key ordered batches, with the paid and refunded
+totals of each order computed by the database. Long time windows can be split
+into smaller windows (--window-size) and verified by several worker processes
+(--processes).
+
 After considering each order in the time window the errors are input into the
 exit_errors dictionary. If any errors exist at the end of the script a
 CommandError is raised and the dictionary is printed as a string log.
@@ -29,10 +34,13 @@ Example output:
 import datetime
 import json
 import logging
+from collections import defaultdict
+from multiprocessing import Pool
 
 import pytz
 from django.core.management.base import BaseCommand, CommandError
-from django.db.models import Sum
+from django.db import connections
+from django.db.models import Count, Exists, OuterRef, Q, Sum
 from oscar.core.loading import get_class, get_model
 
 from ecommerce.core.constants import COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME, SEAT_PRODUCT_CLASS_NAME
@@ -40,15 +48,37 @@ from ecommerce.core.utils import use_read_replica_if_available
 
 logger = logging.getLogger(__name__)
 Order = get_model('order', 'Order')
+OrderLine = get_model('order', 'Line')
 PaymentEvent = get_model('order', 'PaymentEvent')
 PaymentEventType = get_model('order', 'PaymentEventType')
 PaymentEventTypeName = get_class('order.constants', 'PaymentEventTypeName')
 
 DEFAULT_START_DELTA_TIME = 240
 DEFAULT_END_DELTA_TIME = 60
+DEFAULT_BATCH_SIZE = 1000
 VALID_PRODUCT_CLASS_NAMES = [SEAT_PRODUCT_CLASS_NAME, COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME]
 
 
+def verify_window(window):
+    """
+    Verify the orders placed within a single time window.
+
+    This is the unit of work handed to worker processes.
+
+    Arguments:
+        window (tuple): (start, end, batch_size, support)
+
+    Returns:
+        tuple: (number of orders verified, errors dict)
+    """
+    start, end, batch_size, support = window
+    command = Command()
+    command.ERRORS_DICT = {}
+    command.load_event_types()
+    order_count = command.verify_orders(start, end, batch_size, support)
+    return order_count, command.ERRORS_DICT
+
+
 class Command(BaseCommand):
     ERRORS_DICT = None
     PAID_EVENT_TYPE = None
@@ -84,52 +114,184 @@ class Command(BaseCommand):
             action='store_true',
             help='Mismatched orders to go to Support'
         )
+        parser.add_argument(
+            '--batch-size',
+            action='store',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Number of orders to load from the database at a time.'
+        )
+        parser.add_argument(
+            '--window-size',
+            action='store',
+            type=int,
+            default=None,
+            help='Split the time range into windows of this many minutes. Defaults to one window per process.'
+        )
+        parser.add_argument(
+            '--processes',
+            action='store',
+            type=int,
+            default=1,
+            help='Number of worker processes verifying windows in parallel.'
+        )
 
     def handle(self, *args, **options):
         logger.info("Verify transactions with options: %r", options)
 
         self.ERRORS_DICT = {}
-        self.PAID_EVENT_TYPE = PaymentEventType.objects.get(name=PaymentEventTypeName.PAID)
-        self.REFUNDED_EVENT_TYPE = PaymentEventType.objects.get(name=PaymentEventTypeName.REFUNDED)
+        self.load_event_types()
 
         support = options['support']
         start_delta = options['start_delta']
         end_delta = options['end_delta']
         threshold = max(options['threshold'], 0)
+        processes = max(options['processes'], 1)
 
         start = datetime.datetime.now(pytz.utc) - datetime.timedelta(minutes=start_delta)
         end = datetime.datetime.now(pytz.utc) - datetime.timedelta(minutes=end_delta)
         logger.info("Start time: %s  --  End time: %s", start, end)
 
-        orders = use_read_replica_if_available(Order.objects.all()
-                                               .filter(date_placed__gte=start, date_placed__lt=end)
-                                               .prefetch_related('payment_events__event_type'))
-        logger.info("Number of orders to verify: %s", orders.count())
-        if orders.count() == 0:
+        windows = [
+            (window_start, window_end, options['batch_size'], support)
+            for window_start, window_end in self.split_window(start, end, options['window_size'], processes)
+        ]
+        if processes > 1 and len(windows) > 1:
+            order_count = self.verify_windows_in_parallel(windows, processes)
+        else:
+            order_count = sum(self.verify_orders(*window) for window in windows)
+
+        logger.info("Number of orders verified: %s", order_count)
+        if order_count == 0:
             logger.info("No orders, DONE")
             return
 
         if support:
-            self.handle_support(orders)
+            self.handle_support(order_count)
         else:
-            self.handle_alert(orders, threshold)
+            self.handle_alert(order_count, threshold)
 
-    def process_errors(self, orders):
+    def load_event_types(self):
+        self.PAID_EVENT_TYPE = PaymentEventType.objects.get(name=PaymentEventTypeName.PAID)
+        self.REFUNDED_EVENT_TYPE = PaymentEventType.objects.get(name=PaymentEventTypeName.REFUNDED)
+
+    @staticmethod
+    def split_window(start, end, window_size=None, processes=1):
+        """
+        Split [start, end) into consecutive (start, end) windows.
+
+        Windows are `window_size` minutes long, or the range is split evenly between processes if no
+        window size is given.
+        """
+        if window_size:
+            step = datetime.timedelta(minutes=window_size)
+        else:
+            step = (end - start) / processes
+        if step <= datetime.timedelta(0):
+            return [(start, end)]
+
+        windows = []
+        window_start = start
+        while window_start < end:
+            window_end = min(window_start + step, end)
+            windows.append((window_start, window_end))
+            window_start = window_end
+        return windows
+
+    def verify_windows_in_parallel(self, windows, processes):
+        # Connections must not be shared with the forked worker processes.
+        connections.close_all()
+        order_count = 0
+        with Pool(processes) as pool:
+            for window_order_count, errors in pool.imap_unordered(verify_window, windows):
+                order_count += window_order_count
+                self.merge_errors(errors)
+        return order_count
+
+    def merge_errors(self, errors):
+        for tag, error in errors.items():
+            if tag not in self.ERRORS_DICT:
+                self.ERRORS_DICT[tag] = {"message": error["message"], "errors": []}
+            self.ERRORS_DICT[tag]["errors"].extend(error["errors"])
+
+    def get_orders(self, start, end):
+        """
+        Return the orders placed in [start, end), annotated with their payment and refund totals.
+        """
+        paid = Q(payment_events__event_type=self.PAID_EVENT_TYPE)
+        refunded = Q(payment_events__event_type=self.REFUNDED_EVENT_TYPE)
+        # We only expect immediate payments for Seats and Entitlements.
+        payable_lines = OrderLine.objects.filter(order=OuterRef('pk')).filter(
+            Q(product__product_class__name__in=VALID_PRODUCT_CLASS_NAMES) |
+            Q(product__parent__product_class__name__in=VALID_PRODUCT_CLASS_NAMES)
+        )
+        return use_read_replica_if_available(
+            Order.objects.filter(date_placed__gte=start, date_placed__lt=end)
+            .annotate(
+                payment_count=Count('payment_events', filter=paid),
+                payment_total=Sum('payment_events__amount', filter=paid),
+                refund_total=Sum('payment_events__amount', filter=refunded),
+                requires_payment=Exists(payable_lines),
+            )
+            .order_by('pk')
+        )
+
+    def iter_order_batches(self, start, end, batch_size):
+        """
+        Yield lists of annotated orders placed in [start, end), using keyset pagination on the primary key.
+        """
+        orders = self.get_orders(start, end)
+        last_pk = 0
+        while True:
+            batch = list(orders.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                return
+            yield batch
+            last_pk = batch[-1].pk
+
+    def get_payment_events(self, orders):
+        """
+        Return a dict mapping each order id to a dict of its payment events keyed by event type id.
+        """
+        events = defaultdict(lambda: defaultdict(list))
+        if orders:
+            payment_events = use_read_replica_if_available(
+                PaymentEvent.objects.filter(order__in=orders).select_related('event_type').order_by('pk')
+            )
+            for event in payment_events:
+                events[event.order_id][event.event_type_id].append(event)
+        return events
+
+    def verify_orders(self, start, end, batch_size=DEFAULT_BATCH_SIZE, support=False):
+        """
+        Verify the orders placed in [start, end), recording errors in ERRORS_DICT.
+
+        Returns:
+            int: Number of orders verified.
+        """
+        order_count = 0
+        validate = self.validate_support_order if support else self.validate_order
+        for batch in self.iter_order_batches(start, end, batch_size):
+            order_count += len(batch)
+            flagged = [order for order in batch if validate(order)]
+            events = self.get_payment_events(flagged)
+            for order in flagged:
+                validate(order, events[order.id])
+        return order_count
+
+    def process_errors(self, order_count):
         # FIXME: it is possible for an order to have more than one error, so this really should
         # count "unique orders with errors", not number of errors
         error_count = sum([len(v["errors"]) for v in self.ERRORS_DICT.values()])
         exit_errors = json.dumps(self.ERRORS_DICT)
-        error_rate = float(error_count) / orders.count()
+        error_rate = float(error_count) / order_count
 
         logger.info("Summary: %d errors, %.1f %%", error_count, error_rate * 100.0)
 
         return error_count, exit_errors, error_rate
 
-    def handle_alert(self, orders, threshold):
-        for order in orders:
-            self.validate_order(order)
-
-        error_count, exit_errors, error_rate = self.process_errors(orders)
+    def handle_alert(self, order_count, threshold):
+        error_count, exit_errors, error_rate = self.process_errors(order_count)
 
         if threshold == 0 or threshold >= 1:
             threshold = int(threshold)
@@ -142,80 +304,106 @@ class Command(BaseCommand):
         if self.ERRORS_DICT:
             logger.warning("Errors in transactions within threshold (%r): %s", threshold, exit_errors)
 
-    def handle_support(self, orders):
-        for order in orders:
-            all_payment_events = order.payment_events
-            payments = all_payment_events.filter(event_type=self.PAID_EVENT_TYPE)
-
-            # If the payment total and the order total do not match, flag for review.
-            if payments.count() == 1 and payments[0].amount != order.total_incl_tax:
-                mismatch_total = float(payments[0].amount - order.total_incl_tax)
-                # FIXME: validate_order should be changed to log _all_ errors related to an order
-                # If payment amount > order amount, a refund is required from Support
-                if mismatch_total > 0:
-                    error_dict = {
-                        "order_number": order.number,
-                        "order_id": order.id,
-                        "order_amount": float(order.total_incl_tax),
-                        # Assuming just one payment since we do not support multi-payment
-                        "payment_id": payments[0].id,
-                        "payment_amount": float(payments[0].amount),
-                        "user_email": order.guest_email,
-                        "refund_amount": mismatch_total
-                    }
-                    self.add_error(
-                        "orders_mismatched_totals_support",
-                        "There was a mismatch in the totals in the following order that require a refund",
-                        error_dict=error_dict,
-                    )
-
-        error_count, exit_errors, error_rate = self.process_errors(orders)
+    def handle_support(self, order_count):
+        error_count, exit_errors, error_rate = self.process_errors(order_count)
         if error_count and error_rate > 0:
             raise CommandError("Errors in transactions: {errors}".format(errors=exit_errors))
 
-    def validate_order(self, order):
-        all_payment_events = order.payment_events
-        refunds = all_payment_events.filter(event_type=self.REFUNDED_EVENT_TYPE)
-        payments = all_payment_events.filter(event_type=self.PAID_EVENT_TYPE)
+    def validate_support_order(self, order, events=None):
+        """
+        Flag orders that were paid more than their total, which require a refund from Support.
+
+        Called without `events` to check whether the order needs flagging, and with the order's
+        payment events to record the error.
+        """
+        # If the payment total and the order total do not match, flag for review.
+        mismatch = order.payment_count == 1 and order.payment_total != order.total_incl_tax
+        # FIXME: validate_order should be changed to log _all_ errors related to an order
+        # If payment amount > order amount, a refund is required from Support
+        if not mismatch or order.payment_total < order.total_incl_tax:
+            return False
+        if events is None:
+            return True
+
+        # Assuming just one payment since we do not support multi-payment
+        payment = events[self.PAID_EVENT_TYPE.id][0]
+        error_dict = {
+            "order_number": order.number,
+            "order_id": order.id,
+            "order_amount": float(order.total_incl_tax),
+            "payment_id": payment.id,
+            "payment_amount": float(payment.amount),
+            "user_email": order.guest_email,
+            "refund_amount": float(payment.amount - order.total_incl_tax)
+        }
+        self.add_error(
+            "orders_mismatched_totals_support",
+            "There was a mismatch in the totals in the following order that require a refund",
+            error_dict=error_dict,
+        )
+        return True
+
+    def validate_order(self, order, events=None):
+        """
+        Check the payment and refund totals of an annotated order.
+
+        Called without `events` to check whether the order has any error, and with the order's
+        payment events to record its errors.
+        """
+        if events is None:
+            events = {}
+            record = False
+        else:
+            record = True
+        payments = events.get(self.PAID_EVENT_TYPE.id, [])
+        refunds = events.get(self.REFUNDED_EVENT_TYPE.id, [])
+        has_errors = False
 
         # If a coupon is used to purchase a product for the full price, there will be no PaymentEvent
         # so we must also verify that order had a price > 0.
-        if payments.count() == 0:
-            if self.order_requires_payment(order) and order.total_incl_tax > 0:
-                self.add_error(
-                    "orders_no_payment",
-                    "The following orders are without payments",
-                    order
-                )
+        if order.payment_count == 0:
+            if order.requires_payment and order.total_incl_tax > 0:
+                has_errors = True
+                if record:
+                    self.add_error(
+                        "orders_no_payment",
+                        "The following orders are without payments",
+                        order
+                    )
 
         # We do not support multi-payment today, so flag this for review.
-        elif payments.count() > 1:
-            self.add_error(
-                "orders_multi_payment",
-                "The following orders had multiple payments",
-                order,
-                payments
-            )
+        elif order.payment_count > 1:
+            has_errors = True
+            if record:
+                self.add_error(
+                    "orders_multi_payment",
+                    "The following orders had multiple payments",
+                    order,
+                    payments
+                )
 
         # If the payment total and the order total do not match, flag for review.
-        elif payments.aggregate(total=Sum('amount')).get('total') != order.total_incl_tax:
+        elif order.payment_total != order.total_incl_tax:
             # FIXME: validate_order should be changed to log _all_ errors related to an order
-            self.add_error(
-                "orders_mismatched_totals",
-                "The following order totals mismatch payments received",
-                order,
-                payments
-            )
+            has_errors = True
+            if record:
+                self.add_error(
+                    "orders_mismatched_totals",
+                    "The following order totals mismatch payments received",
+                    order,
+                    payments
+                )
 
-        refund_total = refunds.aggregate(total=Sum('amount')).get('total')
-        payment_total = payments.aggregate(total=Sum('amount')).get('total')
-        if refund_total is not None and refund_total > payment_total:
-            self.add_error(
-                "orders_refund_exceeded",
-                "The following orders had excessive refunds",
-                order,
-                refunds
-            )
+        if order.refund_total is not None and order.refund_total > (order.payment_total or 0):
+            has_errors = True
+            if record:
+                self.add_error(
+                    "orders_refund_exceeded",
+                    "The following orders had excessive refunds",
+                    order,
+                    refunds
+                )
+        return has_errors
 
     def add_error(self, tag, msg, order=None, payments=None, error_dict=None):
         if tag not in self.ERRORS_DICT:
@@ -243,13 +431,3 @@ class Command(BaseCommand):
                 for p in payments
             ]
         return d
-
-    def order_requires_payment(self, order):
-        # We only expect immediate payments for Seats and Entitlements.
-        # Filter out orders that were flagged as being without payment for other product types
-        # FIXME: there are better ways to do this
-        for line in order.lines.all():
-            name = line.product.get_product_class().name
-            if name in VALID_PRODUCT_CLASS_NAMES:
-                return True
-        return False
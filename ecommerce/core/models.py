@@ -1,6 +1,7 @@
 import datetime
 import logging
 from urllib.parse import urljoin, urlsplit
+from uuid import uuid4
 
 import waffle
 from analytics import Client as SegmentClient
@@ -11,6 +12,7 @@ from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
+from django_extensions.db.models import TimeStampedModel
 from edx_django_utils import monitoring as monitoring_utils
 from edx_django_utils.cache import TieredCache
 from edx_rbac.models import UserRole, UserRoleAssignment
@@ -23,9 +25,10 @@ from slumber.exceptions import SlumberBaseException
 
 from ecommerce.core.constants import ALL_ACCESS_CONTEXT, ALLOW_MISSING_LMS_USER_ID
 from ecommerce.core.exceptions import MissingLmsUserIdException
+from ecommerce.core.instrumentation import instrument_api_client
 from ecommerce.core.utils import log_message_and_raise_validation_error
 from ecommerce.extensions.payment.exceptions import ProcessorNotFoundError
-from ecommerce.extensions.payment.helpers import get_processor_class, get_processor_class_by_name
+from ecommerce.extensions.payment.helpers import get_processor_class_by_name, registry
 
 log = logging.getLogger(__name__)
 
@@ -252,8 +255,7 @@ class SiteConfiguration(models.Model):
 
     def _all_payment_processors(self):
         """ Returns all processor classes declared in settings. """
-        all_processors = [get_processor_class(path) for path in settings.PAYMENT_PROCESSORS]
-        return all_processors
+        return registry.classes
 
     def get_payment_processors(self):
         """
@@ -286,9 +288,10 @@ class SiteConfiguration(models.Model):
              BasePaymentProcessor
         """
         if self.client_side_payment_processor:
-            for processor in self._all_payment_processors():
-                if processor.NAME == self.client_side_payment_processor:
-                    return processor
+            try:
+                return get_processor_class_by_name(self.client_side_payment_processor)
+            except ProcessorNotFoundError:
+                pass
 
         return None
 
@@ -310,6 +313,7 @@ class SiteConfiguration(models.Model):
         # Clear Site cache upon SiteConfiguration changed
         Site.objects.clear_cache()
         super(SiteConfiguration, self).save(*args, **kwargs)
+        registry.clear_instances(self.site_id)
 
     def build_ecommerce_url(self, path=''):
         """
@@ -408,6 +412,10 @@ class SiteConfiguration(models.Model):
         TieredCache.set_all_tiers(key, access_token, expires)
         return access_token
 
+    def _instrument_lms_api_client(self, client):
+        # Name LMS endpoints by their path from the LMS root, so that the endpoints of all LMS clients are distinct.
+        return instrument_api_client(client, 'lms', base_url=self.lms_url_root)
+
     @cached_property
     def discovery_api_client(self):
         """
@@ -417,12 +425,16 @@ class SiteConfiguration(models.Model):
             EdxRestApiClient: The client to access the Discovery service.
         """
 
-        return EdxRestApiClient(self.discovery_api_url, jwt=self.access_token)
+        return instrument_api_client(EdxRestApiClient(self.discovery_api_url, jwt=self.access_token), 'discovery')
 
     @cached_property
     def embargo_api_client(self):
         """ Returns the URL for the embargo API """
-        return EdxRestApiClient(self.build_lms_url('/api/embargo/v1'), jwt=self.access_token)
+        return self._instrument_lms_api_client(EdxRestApiClient(
+            self.build_lms_url('/api/embargo/v1'),
+            jwt=self.access_token,
+            timeout=settings.EMBARGO_CHECK_REQUEST_TIMEOUT
+        ))
 
     @cached_property
     def enterprise_api_client(self):
@@ -436,7 +448,7 @@ class SiteConfiguration(models.Model):
             EdxRestApiClient: The client to access the Enterprise service.
 
         """
-        return EdxRestApiClient(self.enterprise_api_url, jwt=self.access_token)
+        return instrument_api_client(EdxRestApiClient(self.enterprise_api_url, jwt=self.access_token), 'enterprise')
 
     @cached_property
     def enterprise_catalog_api_client(self):
@@ -450,11 +462,15 @@ class SiteConfiguration(models.Model):
             EdxRestApiClient: The client to access the Enterprise Catalog service.
 
         """
-        return EdxRestApiClient(self.enterprise_catalog_api_url, jwt=self.access_token)
+        return instrument_api_client(
+            EdxRestApiClient(self.enterprise_catalog_api_url, jwt=self.access_token), 'enterprise_catalog'
+        )
 
     @cached_property
     def consent_api_client(self):
-        return EdxRestApiClient(self.build_lms_url('/consent/api/v1/'), jwt=self.access_token, append_slash=False)
+        return self._instrument_lms_api_client(
+            EdxRestApiClient(self.build_lms_url('/consent/api/v1/'), jwt=self.access_token, append_slash=False)
+        )
 
     @cached_property
     def user_api_client(self):
@@ -464,23 +480,33 @@ class SiteConfiguration(models.Model):
         Returns:
             EdxRestApiClient: The client to access the LMS user API service.
         """
-        return EdxRestApiClient(self.build_lms_url('/api/user/v1/'), jwt=self.access_token)
+        return self._instrument_lms_api_client(
+            EdxRestApiClient(self.build_lms_url('/api/user/v1/'), jwt=self.access_token)
+        )
 
     @cached_property
     def commerce_api_client(self):
-        return EdxRestApiClient(self.build_lms_url('/api/commerce/v1/'), jwt=self.access_token)
+        return self._instrument_lms_api_client(
+            EdxRestApiClient(self.build_lms_url('/api/commerce/v1/'), jwt=self.access_token)
+        )
 
     @cached_property
     def credit_api_client(self):
-        return EdxRestApiClient(self.build_lms_url('/api/credit/v1/'), jwt=self.access_token)
+        return self._instrument_lms_api_client(
+            EdxRestApiClient(self.build_lms_url('/api/credit/v1/'), jwt=self.access_token)
+        )
 
     @cached_property
     def enrollment_api_client(self):
-        return EdxRestApiClient(self.build_lms_url('/api/enrollment/v1/'), jwt=self.access_token, append_slash=False)
+        return self._instrument_lms_api_client(
+            EdxRestApiClient(self.build_lms_url('/api/enrollment/v1/'), jwt=self.access_token, append_slash=False)
+        )
 
     @cached_property
     def entitlement_api_client(self):
-        return EdxRestApiClient(self.build_lms_url('/api/entitlements/v1/'), jwt=self.access_token)
+        return self._instrument_lms_api_client(
+            EdxRestApiClient(self.build_lms_url('/api/entitlements/v1/'), jwt=self.access_token)
+        )
 
 
 class User(AbstractUser):
@@ -824,3 +850,54 @@ class EcommerceFeatureRoleAssignment(UserRoleAssignment):
         Return uniquely identifying string representation.
         """
         return self.__str__()
+
+
+class AsyncJob(TimeStampedModel):
+    """
+    Long-running operation requested through the API, and executed outside of the request.
+
+    See `ecommerce.core.jobs`.
+
+    .. pii: The arguments and result of a job may hold learner email addresses, e.g. the assignments of code
+       reminders and revocations, and the job is linked to the user who requested it.
+    .. pii_types: email_address, other
+    .. pii_retirement: local_api
+       Finished jobs are deleted ASYNC_JOB_RETENTION_DAYS days after they finish, by the
+       delete_finished_async_jobs management command.
+    """
+    PENDING, RUNNING, SUCCEEDED, FAILED = 'pending', 'running', 'succeeded', 'failed'
+    STATUS_CHOICES = (
+        (PENDING, _('Pending')),
+        (RUNNING, _('Running')),
+        (SUCCEEDED, _('Succeeded')),
+        (FAILED, _('Failed')),
+    )
+
+    uuid = models.UUIDField(default=uuid4, editable=False, unique=True)
+    site = models.ForeignKey(Site, null=True, blank=True, on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    name = models.CharField(max_length=255, help_text=_('Dotted path of the function executing the job.'))
+    arguments = JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=32, choices=STATUS_CHOICES, default=PENDING, db_index=True)
+    progress = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(null=True, blank=True)
+    result = JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    def set_progress(self, progress, total=None):
+        """
+        Record the number of items processed so far, out of `total` if given.
+        """
+        self.progress = progress
+        update_fields = ['progress', 'modified']
+        if total is not None:
+            self.total = total
+            update_fields.append('total')
+        self.save(update_fields=update_fields)
+
+    @property
+    def is_finished(self):
+        return self.status in (self.SUCCEEDED, self.FAILED)
+
+    def __str__(self):
+        return '<AsyncJob {uuid}: {name} [{status}]>'.format(uuid=self.uuid, name=self.name, status=self.status)
@@ -0,0 +1,257 @@
+"""
+SQL query budgets for views.
+
+Views declare the maximum number of SQL queries a request may make with a `query_budget` class attribute, and the
+maximum number of duplicate queries with `query_duplicate_budget`. Budgets are set to the most queries the tests of
+the view make, plus a margin of 2.
+`QueryBudgetMiddleware` counts the queries, duplicate queries and database time of every request, and logs the
+requests exceeding a budget of their view, with the queries grouped by statement and the code that made them.
+It can also profile a sample of the requests with cProfile and keep the profiles of slow requests.
+"""
+import cProfile
+import logging
+import os
+import random
+import re
+import time
+import traceback
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Number of stack frames kept for each query.
+STACK_DEPTH = 8
+
+_NUMBER_LITERAL = re.compile(r'\b\d+\b')
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_IN_LIST = re.compile(r'\bIN \((?:%s|\?)(?:, (?:%s|\?))*\)')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """ Raised when a block of code makes more SQL queries than its budget allows. """
+
+
+def normalize_sql(sql):
+    """
+    Return `sql` without its literal values, so that statements differing only by parameters compare equal.
+    """
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+def _get_caller_stack():
+    """
+    Return the innermost frames of the current stack which belong to this project, outermost first.
+    """
+    frames = [
+        frame for frame in traceback.extract_stack()[:-3]
+        if '/ecommerce/' in frame.filename and '/ecommerce/core/query_budget.py' not in frame.filename
+    ]
+    return traceback.format_list(frames[-STACK_DEPTH:])
+
+
+class CapturedQuery:
+    def __init__(self, sql, params, duration, stack):
+        self.sql = sql
+        self.params = params
+        self.duration = duration
+        self.stack = stack
+
+
+class QueryCounter:
+    """
+    Context manager recording the SQL queries executed on every database connection of the current thread.
+
+    Capturing the stack of a query is much slower than counting it. With `capture_stacks_after`, stacks are only
+    captured for the queries exceeding that number, i.e. once a budget is exceeded.
+
+    Example:
+        >>> with QueryCounter() as counter:
+        ...     Basket.objects.count()
+        >>> counter.count
+        1
+    """
+
+    def __init__(self, capture_stacks=True, capture_stacks_after=0):
+        self.capture_stacks = capture_stacks
+        self.capture_stacks_after = capture_stacks_after
+        self.queries = []
+        self._wrappers = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(CapturedQuery(
+                sql,
+                params,
+                time.monotonic() - start,
+                _get_caller_stack() if self._should_capture_stack() else [],
+            ))
+
+    def _should_capture_stack(self):
+        return self.capture_stacks and len(self.queries) >= self.capture_stacks_after
+
+    def __enter__(self):
+        for connection in connections.all():
+            wrapper = connection.execute_wrapper(self)
+            wrapper.__enter__()
+            self._wrappers.append(wrapper)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        while self._wrappers:
+            self._wrappers.pop().__exit__(exc_type, exc_value, exc_traceback)
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        return sum(query.duration for query in self.queries)
+
+    @property
+    def duplicate_count(self):
+        """
+        Number of queries repeating an earlier query with the same statement and parameters.
+        """
+        seen = set()
+        duplicates = 0
+        for query in self.queries:
+            key = (query.sql, repr(query.params))
+            if key in seen:
+                duplicates += 1
+            seen.add(key)
+        return duplicates
+
+    def grouped(self):
+        """
+        Return the queries grouped by normalized statement, most frequent first.
+
+        Returns:
+            list of (str, list of CapturedQuery) tuples.
+        """
+        groups = OrderedDict()
+        for query in self.queries:
+            groups.setdefault(normalize_sql(query.sql), []).append(query)
+        return sorted(groups.items(), key=lambda item: len(item[1]), reverse=True)
+
+    def report(self, max_groups=10):
+        """
+        Return a description of the queries, grouped by statement with the first captured stack of each group.
+        """
+        lines = ['{count} queries ({duplicates} duplicates) in {duration:.1f} ms'.format(
+            count=self.count, duplicates=self.duplicate_count, duration=self.duration * 1000
+        )]
+        for sql, queries in self.grouped()[:max_groups]:
+            lines.append('{count} x {sql}'.format(count=len(queries), sql=sql))
+            stack = next((query.stack for query in queries if query.stack), [])
+            lines.extend('    ' + line.rstrip() for frame in stack for line in frame.splitlines())
+        return '\n'.join(lines)
+
+
+def get_view_query_budget(view_func, attribute='query_budget'):
+    """
+    Return the `query_budget`, or other budget `attribute`, declared on the class of a view, or None if it has none.
+    """
+    # Django sets view_class on class-based views, and DRF sets cls on the views of viewsets.
+    view_class = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None)
+    return getattr(view_class, attribute, None)
+
+
+def _get_view_name(view_func):
+    view_class = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None) or view_func
+    return '{module}.{name}'.format(module=view_class.__module__, name=view_class.__name__)
+
+
+class QueryBudgetMiddleware:
+    """
+    Enforce the query budgets of views and profile slow requests.
+
+    Enabled with QUERY_BUDGET_ENABLED. Requests exceeding a budget of their view are logged, and raise
+    QueryBudgetExceeded if QUERY_BUDGET_RAISE is set, which is how the test suite catches regressions.
+
+    If QUERY_BUDGET_PROFILE_DIR is set, QUERY_BUDGET_PROFILE_SAMPLE_RATE of the requests are profiled, and the
+    profiles of those taking longer than QUERY_BUDGET_PROFILE_SLOW_REQUEST_SECONDS are saved to the directory.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_BUDGET_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.query_budget_view = None
+        profiler = None
+        if settings.QUERY_BUDGET_PROFILE_DIR and random.random() < settings.QUERY_BUDGET_PROFILE_SAMPLE_RATE:
+            profiler = cProfile.Profile()
+
+        start = time.monotonic()
+        # Stacks are only captured once the budget of the view is known, see process_view.
+        with QueryCounter(capture_stacks=False) as counter:
+            request.query_budget_counter = counter
+            if profiler:
+                profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler:
+                    profiler.disable()
+        duration = time.monotonic() - start
+
+        view_func = request.query_budget_view
+        if view_func is not None:
+            self._check_budget(request, view_func, counter)
+            if profiler and duration >= settings.QUERY_BUDGET_PROFILE_SLOW_REQUEST_SECONDS:
+                self._save_profile(profiler, view_func, duration)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):  # pylint: disable=unused-argument
+        request.query_budget_view = view_func
+        budget = get_view_query_budget(view_func)
+        if settings.QUERY_BUDGET_CAPTURE_STACKS and budget is not None:
+            counter = request.query_budget_counter
+            counter.capture_stacks = True
+            counter.capture_stacks_after = budget
+
+    def _check_budget(self, request, view_func, counter):
+        budget = get_view_query_budget(view_func)
+        duplicate_budget = get_view_query_budget(view_func, 'query_duplicate_budget')
+        if budget is not None and counter.count > budget:
+            exceeded = 'its budget of {budget} queries'.format(budget=budget)
+        elif duplicate_budget is not None and counter.duplicate_count > duplicate_budget:
+            exceeded = 'its budget of {budget} duplicate queries'.format(budget=duplicate_budget)
+        else:
+            return
+
+        message = 'Request [{method} {path}] to [{view}] exceeded {exceeded}: {report}'.format(
+            method=request.method,
+            path=request.path,
+            view=_get_view_name(view_func),
+            exceeded=exceeded,
+            report=counter.report(),
+        )
+        logger.warning(message)
+        if settings.QUERY_BUDGET_RAISE:
+            raise QueryBudgetExceeded(message)
+
+    def _save_profile(self, profiler, view_func, duration):
+        path = os.path.join(
+            settings.QUERY_BUDGET_PROFILE_DIR,
+            '{view}-{timestamp}.prof'.format(view=_get_view_name(view_func), timestamp=int(time.time() * 1000)),
+        )
+        try:
+            profiler.dump_stats(path)
+        except OSError:
+            logger.exception('Failed to save the profile of a slow request to [%s].', path)
+            return
+        logger.info('Saved the profile of a request to [%s] which took %.3f seconds to [%s].',
+                    _get_view_name(view_func), duration, path)
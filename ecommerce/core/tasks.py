@@ -0,0 +1,11 @@
+"""
+Celery tasks of this project. They are routed to the ecommerce.jobs queue, which is consumed by workers running this
+project (celery -A ecommerce.celery_app worker -Q ecommerce.jobs), not by the ecommerce worker.
+"""
+from ecommerce.celery_app import app
+from ecommerce.core.jobs import RUN_JOB_TASK_NAME, run_job
+
+
+@app.task(name=RUN_JOB_TASK_NAME, ignore_result=True)
+def run_async_job(job_id):
+    run_job(job_id)
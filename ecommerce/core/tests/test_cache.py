@@ -0,0 +1,68 @@
+import mock
+from django.core.cache import cache
+from edx_django_utils.cache import RequestCache
+
+from ecommerce.core.cache import CacheNamespace
+from ecommerce.tests.testcases import TestCase
+
+SITE_DOMAIN = 'example.com'
+
+
+class CacheNamespaceTests(TestCase):
+    def setUp(self):
+        super(CacheNamespaceTests, self).setUp()
+        self.namespace = CacheNamespace('test', 'COURSES_API_CACHE_TIMEOUT')
+        self.fetch = mock.Mock(return_value='value')
+
+    def test_get_or_set(self):
+        self.assertEqual(self.namespace.get_or_set(SITE_DOMAIN, self.fetch, resource='a'), 'value')
+        self.assertEqual(self.namespace.get_or_set(SITE_DOMAIN, self.fetch, resource='a'), 'value')
+        self.assertEqual(self.fetch.call_count, 1)
+
+        cached_response = self.namespace.get_cached_response(SITE_DOMAIN, resource='a')
+        self.assertTrue(cached_response.is_found)
+        self.assertEqual(cached_response.value, 'value')
+        self.assertFalse(self.namespace.get_cached_response(SITE_DOMAIN, resource='b').is_found)
+
+    def test_invalidate(self):
+        self.namespace.get_or_set(SITE_DOMAIN, self.fetch, resource='a')
+        self.namespace.get_or_set('other.example.com', self.fetch, resource='a')
+        generation = self.namespace.get_generation(SITE_DOMAIN)
+
+        self.namespace.invalidate(SITE_DOMAIN)
+
+        self.assertEqual(self.namespace.get_generation(SITE_DOMAIN), generation + 1)
+        self.assertFalse(self.namespace.get_cached_response(SITE_DOMAIN, resource='a').is_found)
+        self.assertTrue(self.namespace.get_cached_response('other.example.com', resource='a').is_found)
+
+    def test_invalidate_evicted_generation(self):
+        self.namespace.invalidate(SITE_DOMAIN)
+        self.assertIsNotNone(self.namespace.get_generation(SITE_DOMAIN))
+
+    def test_stale_value_is_refreshed(self):
+        self.namespace.get_or_set(SITE_DOMAIN, self.fetch, timeout=0, resource='a')
+        RequestCache.clear_all_namespaces()
+
+        self.fetch.return_value = 'new value'
+        self.assertEqual(self.namespace.get_or_set(SITE_DOMAIN, self.fetch, resource='a'), 'new value')
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_stale_value_served_while_refreshing(self):
+        self.namespace.get_or_set(SITE_DOMAIN, self.fetch, timeout=0, resource='a')
+        RequestCache.clear_all_namespaces()
+        cache_key = self.namespace.get_cache_key(SITE_DOMAIN, resource='a')
+        cache.add(cache_key + '.refresh', 1)
+
+        self.fetch.return_value = 'new value'
+        self.assertEqual(self.namespace.get_or_set(SITE_DOMAIN, self.fetch, resource='a'), 'value')
+        self.assertEqual(self.fetch.call_count, 1)
+
+    def test_stale_value_served_on_error(self):
+        self.namespace.get_or_set(SITE_DOMAIN, self.fetch, timeout=0, resource='a')
+        RequestCache.clear_all_namespaces()
+
+        self.fetch.side_effect = Exception
+        self.assertEqual(self.namespace.get_or_set(SITE_DOMAIN, self.fetch, resource='a'), 'value')
+        # The lease is released so that another worker can retry the refresh.
+        cache_key = self.namespace.get_cache_key(SITE_DOMAIN, resource='a')
+        self.assertIsNone(cache.get(cache_key + '.refresh'))
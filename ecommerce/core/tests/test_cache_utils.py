@@ -0,0 +1,67 @@
+import threading
+
+import mock
+from django.core.cache import cache
+from django.test import override_settings
+
+from ecommerce.core.utils import get_or_set_cache, single_flight
+from ecommerce.tests.testcases import TestCase
+
+CACHE_KEY = 'test-cache-key'
+
+
+class GetOrSetCacheTests(TestCase):
+    def test_get_or_set_cache(self):
+        fetch = mock.Mock(return_value='value')
+        self.assertEqual(get_or_set_cache(CACHE_KEY, fetch, 60), 'value')
+        self.assertEqual(get_or_set_cache(CACHE_KEY, fetch, 60), 'value')
+        self.assertEqual(fetch.call_count, 1)
+
+    def test_fetch_error_not_cached(self):
+        fetch = mock.Mock(side_effect=[Exception, 'value'])
+        with self.assertRaises(Exception):
+            get_or_set_cache(CACHE_KEY, fetch, 60)
+
+        # The lease is released, so the next miss fetches the value without waiting.
+        self.assertIsNone(cache.get(CACHE_KEY + '.lease'))
+        self.assertEqual(get_or_set_cache(CACHE_KEY, fetch, 60), 'value')
+
+    def test_concurrent_misses_are_coalesced(self):
+        """ Verify threads missing the same key share a single fetch. """
+        started = threading.Event()
+        release = threading.Event()
+        fetch = mock.Mock(return_value='value')
+
+        def slow_fetch():
+            started.set()
+            release.wait(5)
+            return fetch()
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(get_or_set_cache(CACHE_KEY, slow_fetch, 60)))
+        first.start()
+        started.wait(5)
+        second = threading.Thread(target=lambda: results.append(get_or_set_cache(CACHE_KEY, slow_fetch, 60)))
+        second.start()
+        release.set()
+        first.join(5)
+        second.join(5)
+
+        self.assertEqual(results, ['value', 'value'])
+        self.assertEqual(fetch.call_count, 1)
+
+    @override_settings(CACHE_FILL_WAIT_TIMEOUT=0.1)
+    def test_lease_held_by_other_process(self):
+        """ Verify a worker waits for another process' lease for a limited time only. """
+        cache.add(CACHE_KEY + '.lease', 1)
+        fetch = mock.Mock(return_value='value')
+        with mock.patch('ecommerce.core.utils.time.sleep') as mock_sleep:
+            self.assertEqual(get_or_set_cache(CACHE_KEY, fetch, 60), 'value')
+        self.assertTrue(mock_sleep.called)
+        # The lease belongs to the other process.
+        self.assertIsNotNone(cache.get(CACHE_KEY + '.lease'))
+
+    def test_single_flight_lease(self):
+        with single_flight(CACHE_KEY):
+            self.assertIsNotNone(cache.get(CACHE_KEY + '.lease'))
+        self.assertIsNone(cache.get(CACHE_KEY + '.lease'))
@@ -0,0 +1,100 @@
+import mock
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.views.generic import View
+
+from ecommerce.core.db_routers import (
+    READ_REPLICA_ALIAS,
+    ReadReplicaRouter,
+    is_read_replica_requested,
+    is_read_replica_usable,
+    read_replica,
+    reset_read_replica_lag_check
+)
+from ecommerce.core.models import User
+from ecommerce.core.views import ReadReplicaMixin
+from ecommerce.tests.testcases import TestCase
+
+DATABASES_WITH_REPLICA = dict(settings.DATABASES, **{READ_REPLICA_ALIAS: settings.DATABASES['default']})
+
+
+class ReadReplicaRouterTests(TestCase):
+    def setUp(self):
+        super(ReadReplicaRouterTests, self).setUp()
+        self.router = ReadReplicaRouter()
+        reset_read_replica_lag_check()
+        self.addCleanup(reset_read_replica_lag_check)
+
+    def test_reads_use_default_outside_block(self):
+        with override_settings(DATABASES=DATABASES_WITH_REPLICA):
+            self.assertIsNone(self.router.db_for_read(User))
+
+    def test_reads_use_replica_inside_block(self):
+        with override_settings(DATABASES=DATABASES_WITH_REPLICA):
+            with read_replica():
+                self.assertEqual(self.router.db_for_read(User), READ_REPLICA_ALIAS)
+            self.assertIsNone(self.router.db_for_read(User))
+
+    def test_reads_use_default_without_replica(self):
+        with read_replica():
+            self.assertIsNone(self.router.db_for_read(User))
+
+    def test_writes_always_use_default(self):
+        with override_settings(DATABASES=DATABASES_WITH_REPLICA):
+            with read_replica():
+                self.assertEqual(self.router.db_for_write(User), DEFAULT_DB_ALIAS)
+
+    def test_no_migrations_on_replica(self):
+        self.assertFalse(self.router.allow_migrate(READ_REPLICA_ALIAS, 'core'))
+        self.assertIsNone(self.router.allow_migrate(DEFAULT_DB_ALIAS, 'core'))
+
+    @override_settings(
+        DATABASES=DATABASES_WITH_REPLICA,
+        READ_REPLICA_MAX_LAG=5,
+        READ_REPLICA_LAG_QUERY='SELECT lag FROM heartbeat',
+    )
+    def test_lag_guard(self):
+        with mock.patch('ecommerce.core.db_routers.get_read_replica_lag', return_value=2) as mock_lag:
+            self.assertTrue(is_read_replica_usable())
+            # The result of the check is cached.
+            self.assertTrue(is_read_replica_usable())
+            self.assertEqual(mock_lag.call_count, 1)
+
+        reset_read_replica_lag_check()
+        with mock.patch('ecommerce.core.db_routers.get_read_replica_lag', return_value=10):
+            self.assertFalse(is_read_replica_usable())
+
+        reset_read_replica_lag_check()
+        with mock.patch('ecommerce.core.db_routers.get_read_replica_lag', side_effect=DatabaseError):
+            with read_replica():
+                self.assertIsNone(self.router.db_for_read(User))
+
+
+class ReadReplicaMixinTests(TestCase):
+    class ReplicaView(ReadReplicaMixin, View):
+        def get(self, request):  # pylint: disable=unused-argument
+            return HttpResponse(str(is_read_replica_requested()))
+
+        post = get
+
+    def test_safe_requests_use_replica(self):
+        response = self.ReplicaView.as_view()(RequestFactory().get('/'))
+        self.assertEqual(response.content, b'True')
+        self.assertFalse(is_read_replica_requested())
+
+    def test_unsafe_requests_use_default(self):
+        response = self.ReplicaView.as_view()(RequestFactory().post('/'))
+        self.assertEqual(response.content, b'False')
+
+    def test_read_replica_actions(self):
+        view = self.ReplicaView()
+        view.read_replica_actions = ('offers',)
+        request = RequestFactory().get('/')
+
+        view.action_map = {'get': 'offers'}
+        self.assertTrue(view.use_read_replica(request))
+        view.action_map = {'get': 'list'}
+        self.assertFalse(view.use_read_replica(request))
@@ -0,0 +1,74 @@
+import httpretty
+from edx_rest_api_client.client import EdxRestApiClient
+
+from ecommerce.core.instrumentation import (
+    MAX_ENDPOINTS_PER_SERVICE,
+    OTHER_ENDPOINT,
+    get_endpoint_name,
+    instrument_api_client,
+    metrics,
+    record_upstream_call
+)
+from ecommerce.core.utils import get_or_set_cache
+from ecommerce.tests.testcases import TestCase
+
+
+class InstrumentationTests(TestCase):
+    def setUp(self):
+        super(InstrumentationTests, self).setUp()
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def test_get_endpoint_name(self):
+        base_url = 'https://lms.example.com/api/v1/'
+        self.assertEqual(
+            get_endpoint_name('get', base_url, base_url + 'courses/course-v1:edX+DemoX+Demo/?page=2'),
+            'GET /courses/{id}/'
+        )
+        self.assertEqual(
+            get_endpoint_name('post', 'https://lms.example.com', 'https://lms.example.com/api/v2/orders/123'),
+            'POST /api/v2/orders/{id}'
+        )
+
+    @httpretty.activate
+    def test_instrument_api_client(self):
+        url = 'https://discovery.example.com/api/v1/courses/a4b2c3d4-0000-0000-0000-000000000000/'
+        httpretty.register_uri(httpretty.GET, url, body='{"key": "value"}', content_type='application/json')
+        httpretty.register_uri(httpretty.GET, url + 'runs/', status=503)
+        client = instrument_api_client(EdxRestApiClient('https://discovery.example.com/api/v1/', jwt='t'), 'discovery')
+
+        client.courses('a4b2c3d4-0000-0000-0000-000000000000').get()
+        with self.assertRaises(Exception):
+            client.courses('a4b2c3d4-0000-0000-0000-000000000000').runs.get()
+
+        upstream = metrics.as_dict()['upstream']['discovery']
+        self.assertEqual(upstream['GET /courses/{id}/']['count'], 1)
+        self.assertEqual(upstream['GET /courses/{id}/']['errors'], 0)
+        self.assertEqual(upstream['GET /courses/{id}/']['payload_size_bytes']['sum'], len('{"key": "value"}'))
+        self.assertEqual(upstream['GET /courses/{id}/runs/']['errors'], 1)
+
+    def test_record_upstream_call(self):
+        with self.assertRaises(ValueError):
+            with record_upstream_call('cybersource', 'create_payment'):
+                raise ValueError
+        with record_upstream_call('cybersource', 'create_payment'):
+            pass
+
+        endpoint = metrics.as_dict()['upstream']['cybersource']['create_payment']
+        self.assertEqual(endpoint['count'], 2)
+        self.assertEqual(endpoint['errors'], 1)
+
+    def test_endpoints_are_bounded(self):
+        for index in range(MAX_ENDPOINTS_PER_SERVICE + 5):
+            metrics.record_upstream_call('lms', 'GET /endpoint-{}'.format(index), 0.1)
+
+        endpoints = metrics.as_dict()['upstream']['lms']
+        self.assertEqual(len(endpoints), MAX_ENDPOINTS_PER_SERVICE + 1)
+        self.assertEqual(endpoints[OTHER_ENDPOINT]['count'], 5)
+
+    def test_cache_lookups(self):
+        get_or_set_cache('key', lambda: 'value', 60, namespace='test')
+        get_or_set_cache('key', lambda: 'value', 60, namespace='test')
+        get_or_set_cache('other', lambda: 'value', 60)
+
+        self.assertEqual(metrics.as_dict()['cache'], {'test': {'hit': 1, 'miss': 1, 'stale': 0, 'hit_ratio': 0.5}})
@@ -0,0 +1,84 @@
+import mock
+from django.test import override_settings
+
+from ecommerce.core.jobs import dispatch_job, run_job, start_job
+from ecommerce.core.models import AsyncJob
+from ecommerce.tests.testcases import TestCase
+
+
+def count_items(job, items):
+    job.set_progress(0, total=len(items))
+    for index, __ in enumerate(items, start=1):
+        job.set_progress(index)
+    return {'count': len(items)}
+
+
+def fail(job):
+    raise ValueError('Failed job {}'.format(job.uuid))
+
+
+class AsyncJobTests(TestCase):
+    def setUp(self):
+        super(AsyncJobTests, self).setUp()
+        self.user = self.create_user()
+
+    def test_start_job(self):
+        """ Verify the job is created pending, and dispatched once the transaction commits. """
+        with mock.patch('ecommerce.core.jobs.transaction.on_commit') as on_commit:
+            job = start_job(count_items, self.site, self.user, items=['a', 'b'])
+
+        self.assertEqual(job.status, AsyncJob.PENDING)
+        self.assertEqual(job.name, 'ecommerce.core.tests.test_jobs.count_items')
+        self.assertEqual(job.arguments, {'items': ['a', 'b']})
+        self.assertEqual((job.site, job.user), (self.site, self.user))
+
+        with mock.patch('ecommerce.core.jobs.dispatch_job') as mock_dispatch_job:
+            on_commit.call_args[0][0]()
+        mock_dispatch_job.assert_called_once_with(job.id)
+
+    def test_run_job(self):
+        """ Verify the result and progress of the job are recorded. """
+        job = start_job(count_items, self.site, self.user, items=['a', 'b', 'c'])
+        run_job(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, AsyncJob.SUCCEEDED)
+        self.assertTrue(job.is_finished)
+        self.assertEqual(job.result, {'count': 3})
+        self.assertEqual((job.progress, job.total), (3, 3))
+
+    def test_run_job_failure(self):
+        """ Verify the error of a failed job is recorded, and the job is not executed again. """
+        job = start_job(fail, self.site, self.user)
+        run_job(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, AsyncJob.FAILED)
+        self.assertEqual(job.error, 'Failed job {}'.format(job.uuid))
+
+        with mock.patch('ecommerce.core.tests.test_jobs.fail') as mock_fail:
+            run_job(job.id)
+        self.assertFalse(mock_fail.called)
+
+    def test_run_job_claimed(self):
+        """ Verify a job claimed by another worker in the meantime is not executed. """
+        job = start_job(count_items, self.site, self.user, items=['a'])
+        AsyncJob.objects.filter(id=job.id).update(status=AsyncJob.RUNNING)
+
+        with mock.patch('ecommerce.core.tests.test_jobs.count_items') as mock_count_items:
+            self.assertEqual(run_job(job.id).status, AsyncJob.RUNNING)
+        self.assertFalse(mock_count_items.called)
+
+    @override_settings(CELERY_ALWAYS_EAGER=True)
+    def test_dispatch_job_eager(self):
+        """ Verify jobs are executed by the thread pool when Celery tasks are executed eagerly. """
+        with mock.patch('ecommerce.core.jobs._get_job_executor') as get_job_executor:
+            dispatch_job(1)
+        get_job_executor.return_value.submit.assert_called_once_with(mock.ANY, 1)
+
+    @override_settings(CELERY_ALWAYS_EAGER=False)
+    def test_dispatch_job_celery(self):
+        """ Verify jobs are executed by the Celery task. """
+        with mock.patch('ecommerce.core.jobs.app.send_task') as send_task:
+            dispatch_job(1)
+        send_task.assert_called_once_with('ecommerce.core.tasks.run_async_job', args=(1,))
@@ -0,0 +1,60 @@
+import ddt
+import mock
+
+from ecommerce.core.utils import traverse_pagination
+from ecommerce.tests.testcases import TestCase
+
+CACHE_KEY = 'test-pagination-cache-key'
+URL = 'http://example.com/api/v1/resources/'
+
+
+def get_page(page, num_pages=3):
+    return {
+        'results': [page * 10 + index for index in range(2)],
+        'next': '{}?page={}&page_size=2'.format(URL, page + 1) if page < num_pages else None,
+    }
+
+
+@ddt.ddt
+class TraversePaginationTests(TestCase):
+    def setUp(self):
+        super(TraversePaginationTests, self).setUp()
+        self.endpoint = mock.Mock()
+        self.endpoint.get.side_effect = lambda page, page_size: get_page(int(page[0]))
+
+    @ddt.data(True, False)
+    def test_traverse_pagination(self, prefetch):
+        """ Verify the results of every page are yielded in order. """
+        results = traverse_pagination(get_page(1), self.endpoint, prefetch=prefetch)
+        self.assertEqual(list(results), [10, 11, 20, 21, 30, 31])
+        self.endpoint.get.assert_has_calls([
+            mock.call(page=['2'], page_size=['2']),
+            mock.call(page=['3'], page_size=['2']),
+        ])
+
+    def test_single_page(self):
+        self.assertEqual(list(traverse_pagination(get_page(1, num_pages=1), self.endpoint)), [10, 11])
+        self.assertFalse(self.endpoint.get.called)
+
+    def test_early_termination(self):
+        """ Verify the pages following the one the caller stopped in are not retrieved without prefetching. """
+        results = traverse_pagination(get_page(1), self.endpoint, prefetch=False)
+        self.assertEqual(next(result for result in results if result == 20), 20)
+        results.close()
+
+        self.endpoint.get.assert_called_once_with(page=['2'], page_size=['2'])
+
+    def test_cached_pages(self):
+        """ Verify the following pages are cached, and retrieved once. """
+        for __ in range(2):
+            results = traverse_pagination(get_page(1), self.endpoint, cache_key=CACHE_KEY, cache_timeout=60)
+            self.assertEqual(list(results), [10, 11, 20, 21, 30, 31])
+        self.assertEqual(self.endpoint.get.call_count, 2)
+
+    def test_error(self):
+        """ Verify errors retrieving a page in the background are raised to the caller. """
+        self.endpoint.get.side_effect = ValueError
+        results = traverse_pagination(get_page(1), self.endpoint)
+        self.assertEqual([next(results), next(results)], [10, 11])
+        with self.assertRaises(ValueError):
+            next(results)
@@ -0,0 +1,121 @@
+import os
+import shutil
+import tempfile
+
+import mock
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.views.generic import View
+
+from ecommerce.core.models import User
+from ecommerce.core.query_budget import QueryBudgetExceeded, QueryBudgetMiddleware, QueryCounter, normalize_sql
+from ecommerce.tests.testcases import TestCase
+
+
+class BudgetedView(View):
+    query_budget = 2
+
+    def get(self, request):  # pylint: disable=unused-argument
+        for _ in range(int(request.GET.get('queries', 0))):
+            list(User.objects.filter(username='test'))
+        return HttpResponse()
+
+
+class DuplicateBudgetedView(BudgetedView):
+    query_budget = 10
+    query_duplicate_budget = 1
+
+
+class QueryCounterTests(TestCase):
+    def test_count(self):
+        with QueryCounter() as counter:
+            list(User.objects.filter(username='a'))
+            list(User.objects.filter(username='a'))
+            list(User.objects.filter(username='b'))
+
+        self.assertEqual(counter.count, 3)
+        self.assertEqual(counter.duplicate_count, 1)
+        self.assertEqual(len(counter.grouped()), 1)
+        self.assertIn('3 x SELECT', counter.report())
+        self.assertIn('test_query_budget.py', counter.report())
+
+    def test_capture_stacks_after(self):
+        """ Verify stacks are only captured for the queries exceeding `capture_stacks_after`. """
+        with QueryCounter(capture_stacks_after=2) as counter:
+            for _ in range(3):
+                list(User.objects.filter(username='a'))
+
+        self.assertEqual([bool(query.stack) for query in counter.queries], [False, False, True])
+        self.assertIn('test_query_budget.py', counter.report())
+
+    def test_normalize_sql(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE a = 'x' AND b = 3 AND c IN (%s, %s, %s)"),
+            'SELECT * FROM t WHERE a = ? AND b = ? AND c IN (...)'
+        )
+
+    def test_assert_query_budget(self):
+        with self.assertQueryBudget(1):
+            list(User.objects.all())
+
+        with self.assertRaises(AssertionError):
+            with self.assertQueryBudget(1):
+                list(User.objects.all())
+                list(User.objects.all())
+
+        with self.assertRaises(AssertionError):
+            with self.assertQueryBudget(2, max_duplicates=0):
+                list(User.objects.all())
+                list(User.objects.all())
+
+
+class QueryBudgetMiddlewareTests(TestCase):
+    def get(self, queries, view_class=BudgetedView):
+        view = view_class.as_view()
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            return view(request)
+
+        middleware = QueryBudgetMiddleware(get_response)
+        return middleware(RequestFactory().get('/', {'queries': queries}))
+
+    def test_within_budget(self):
+        self.assertEqual(self.get(2).status_code, 200)
+
+    def test_over_budget(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.get(3)
+
+        with override_settings(QUERY_BUDGET_RAISE=False):
+            with mock.patch('ecommerce.core.query_budget.logger.warning') as mock_warning:
+                self.assertEqual(self.get(3).status_code, 200)
+        self.assertIn('BudgetedView] exceeded its budget of 2 queries', mock_warning.call_args[0][0])
+        self.assertIn('test_query_budget.py', mock_warning.call_args[0][0])
+
+    def test_over_duplicate_budget(self):
+        self.assertEqual(self.get(2, DuplicateBudgetedView).status_code, 200)
+
+        with self.assertRaisesRegex(QueryBudgetExceeded, 'exceeded its budget of 1 duplicate queries'):
+            self.get(3, DuplicateBudgetedView)
+
+    def test_stacks_captured_over_budget(self):
+        """ Verify the stacks of the queries are only captured once the budget of the view is exceeded. """
+        with mock.patch('ecommerce.core.query_budget._get_caller_stack', return_value=[]) as mock_get_caller_stack:
+            self.get(2)
+            self.assertFalse(mock_get_caller_stack.called)
+
+            with self.assertRaises(QueryBudgetExceeded):
+                self.get(3)
+            self.assertEqual(mock_get_caller_stack.call_count, 1)
+
+    def test_slow_request_profile(self):
+        profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, profile_dir)
+        with override_settings(
+                QUERY_BUDGET_PROFILE_DIR=profile_dir,
+                QUERY_BUDGET_PROFILE_SAMPLE_RATE=1,
+                QUERY_BUDGET_PROFILE_SLOW_REQUEST_SECONDS=0,
+        ):
+            self.get(1)
+        self.assertEqual(len(os.listdir(profile_dir)), 1)
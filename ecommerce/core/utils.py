@@ -1,15 +1,31 @@
 
 
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from urllib.parse import parse_qs, urlparse
 
-import waffle
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from edx_django_utils.cache import TieredCache
 from edx_django_utils.cache import get_cache_key as get_django_cache_key
 
+from ecommerce.core.db_routers import READ_REPLICA_ALIAS
+from ecommerce.core.instrumentation import metrics
+
 logger = logging.getLogger(__name__)
 
+CACHE_FILL_POLL_INTERVAL = 0.05  # Value is in seconds.
+
+_cache_key_locks = {}
+_cache_key_locks_lock = threading.Lock()
+
+_page_executor = None
+_page_executor_lock = threading.Lock()
+
 
 def log_message_and_raise_validation_error(message):
     """
@@ -32,45 +48,168 @@ def get_cache_key(**kwargs):
     return get_django_cache_key(**kwargs)
 
 
-def deprecated_traverse_pagination(response, endpoint):
+@contextmanager
+def _cache_key_lock(cache_key):
+    """
+    Serialize the threads of this process holding the lock for the same cache key.
     """
-    Traverse a paginated API response.
+    with _cache_key_locks_lock:
+        lock, waiters = _cache_key_locks.get(cache_key, (threading.Lock(), 0))
+        _cache_key_locks[cache_key] = (lock, waiters + 1)
+    try:
+        with lock:
+            yield
+    finally:
+        with _cache_key_locks_lock:
+            lock, waiters = _cache_key_locks[cache_key]
+            if waiters == 1:
+                del _cache_key_locks[cache_key]
+            else:
+                _cache_key_locks[cache_key] = (lock, waiters - 1)
+
+
+@contextmanager
+def single_flight(cache_key):
+    """
+    Serialize the computation of the value cached under `cache_key`, so that concurrent cache misses share a
+    single call to the upstream service.
 
-    Note: This method should be deprecated since it defeats the purpose
-    of pagination.
+    Threads of this process wait for each other on a lock. Across processes, the first worker takes a lease in the
+    shared cache, and the others wait for up to CACHE_FILL_WAIT_TIMEOUT seconds for it to be released before
+    proceeding. Callers should check the cache again once inside the block.
+    """
+    with _cache_key_lock(cache_key):
+        lease_key = cache_key + '.lease'
+        leased = cache.add(lease_key, 1, settings.CACHE_FILL_LEASE_TIMEOUT)
+        if not leased:
+            deadline = time.monotonic() + settings.CACHE_FILL_WAIT_TIMEOUT
+            while cache.get(lease_key) is not None and time.monotonic() < deadline:
+                time.sleep(CACHE_FILL_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            if leased:
+                cache.delete(lease_key)
+
+
+def _record_cache_lookup(namespace, result):
+    if namespace:
+        metrics.record_cache_lookup(namespace, result)
+
+
+def get_or_set_cache(cache_key, fetch, timeout, namespace=None):
+    """
+    Return the value cached in all tiers under `cache_key`, calling `fetch` and caching its result on a miss.
 
-    Extracts and concatenates "results" (list of dict) returned by DRF-powered
-    APIs.
+    Concurrent misses for the same key are coalesced by `single_flight`. Nothing is cached if `fetch` raises.
 
     Arguments:
-        response (Dict): Current response dict from service API
-        endpoint (slumber Resource object): slumber Resource object from edx-rest-api-client
+        cache_key (str): Key of the cached value.
+        fetch (callable): Returns the value to cache.
+        timeout (int): Number of seconds to cache the value for.
+        namespace (str): Name under which hits and misses are counted. Lookups are not counted if omitted.
+    """
+    cached_response = TieredCache.get_cached_response(cache_key)
+    if cached_response.is_found:
+        _record_cache_lookup(namespace, 'hit')
+        return cached_response.value
+
+    with single_flight(cache_key):
+        # The value may have been cached while we were waiting.
+        cached_response = TieredCache.get_cached_response(cache_key)
+        if cached_response.is_found:
+            _record_cache_lookup(namespace, 'hit')
+            return cached_response.value
+
+        _record_cache_lookup(namespace, 'miss')
+        value = fetch()
+        TieredCache.set_all_tiers(cache_key, value, timeout)
+        return value
+
+
+def _get_page_executor():
+    global _page_executor  # pylint: disable=global-statement
+    with _page_executor_lock:
+        if _page_executor is None:
+            _page_executor = ThreadPoolExecutor(
+                max_workers=settings.PAGINATION_PREFETCH_THREADS, thread_name_prefix='pagination-prefetch'
+            )
+        return _page_executor
+
+
+def _request_page(endpoint, next_page, prefetch, cache_key, cache_timeout):
+    """
+    Start retrieving the page at the `next_page` URL.
 
     Returns:
-        list of dict.
-
+        tuple: A callable returning the page, and the Future retrieving it in the background, if any.
+    """
+    querystring = parse_qs(urlparse(next_page).query, keep_blank_values=True)
+    page_cache_key = None
+    if cache_key:
+        page_cache_key = get_cache_key(namespace=cache_key, page=sorted(querystring.items()))
+        cached_response = TieredCache.get_cached_response(page_cache_key)
+        if cached_response.is_found:
+            return (lambda: cached_response.value), None
+
+    future = None
+    if prefetch:
+        # The page is only requested from the worker thread, and cached from this one: the request cache tier
+        # is local to each thread.
+        future = _get_page_executor().submit(endpoint.get, **querystring)
+
+    def get_page():
+        page = future.result() if future else endpoint.get(**querystring)
+        if page_cache_key:
+            TieredCache.set_all_tiers(page_cache_key, page, cache_timeout)
+        return page
+
+    return get_page, future
+
+
+def traverse_pagination(response, endpoint, prefetch=True, cache_key=None, cache_timeout=None):
     """
-    results = response.get('results', [])
+    Yield the results of a paginated API response, retrieving the following pages as the results are consumed.
 
-    next_page = response.get('next')
-    while next_page:
-        if waffle.switch_is_active("debug_logging_for_deprecated_traverse_pagination"):  # pragma: no cover
-            base_url = ""
-            try:
-                base_url = endpoint._store['base_url']  # pylint: disable=protected-access
-            except:  # pylint: disable=bare-except
-                pass
-            logger.info("deprecated_traverse_pagination method is called for endpoint %s", base_url)
-        querystring = parse_qs(urlparse(next_page).query, keep_blank_values=True)
-        response = endpoint.get(**querystring)
-        results += response.get('results', [])
-        next_page = response.get('next')
+    Callers looking for specific results can stop iterating once they are found. With `prefetch`, the next page is
+    requested in a background thread as soon as a page is handed to the caller, so one page beyond the page the
+    caller stopped in may still be retrieved; it is cancelled if its request has not started yet. Without
+    `prefetch`, no page beyond the page the caller stopped in is retrieved.
 
-    return results
+    Arguments:
+        response (dict): First page of the response of a DRF-powered API.
+        endpoint (slumber Resource object): slumber Resource object from edx-rest-api-client
+        prefetch (bool): Whether to retrieve the next page in the background.
+        cache_key (str): Cache the following pages under keys derived from this key. Pages are not cached if
+            omitted. The first page is the caller's to cache.
+        cache_timeout (int): Number of seconds to cache the pages for.
+
+    Yields:
+        dict: Results of the pages, in order.
+    """
+    page = response
+    while True:
+        next_page = page.get('next')
+        get_next_page, future = None, None
+        if next_page:
+            get_next_page, future = _request_page(endpoint, next_page, prefetch, cache_key, cache_timeout)
+
+        try:
+            for result in page.get('results', []):
+                yield result
+        except GeneratorExit:
+            # The caller stopped iterating, so the next page is not needed.
+            if future:
+                future.cancel()
+            raise
+
+        if not get_next_page:
+            return
+        page = get_next_page()
 
 
 def use_read_replica_if_available(queryset):
     """
     If there is a database called 'read_replica', use that database for the queryset.
     """
-    return queryset.using("read_replica") if "read_replica" in settings.DATABASES else queryset
+    return queryset.using(READ_REPLICA_ALIAS) if READ_REPLICA_ALIAS in settings.DATABASES else queryset
@@ -15,6 +15,7 @@ from django.utils.decorators import method_decorator
 from django.views.generic import View
 
 from ecommerce.core.constants import Status
+from ecommerce.core.db_routers import read_replica
 
 try:
     import newrelic.agent
@@ -108,6 +109,43 @@ class StaffOnlyMixin:
         return super(StaffOnlyMixin, self).dispatch(request, *args, **kwargs)
 
 
+class ReadReplicaMixin:
+    """
+    Routes the reads of safe (read-only) requests to the read replica, when one is configured.
+
+    Viewsets can limit routing to specific actions by listing them in `read_replica_actions`. If it is None,
+    every safe request handled by the view is routed.
+    """
+    read_replica_actions = None
+
+    def use_read_replica(self, request):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            return False
+        if self.read_replica_actions is None:
+            return True
+        action_map = getattr(self, 'action_map', None) or {}
+        return action_map.get(request.method.lower()) in self.read_replica_actions
+
+    def dispatch(self, request, *args, **kwargs):
+        return self.read_replica_dispatch(super(ReadReplicaMixin, self).dispatch, request, *args, **kwargs)
+
+    def read_replica_dispatch(self, handler, request, *args, **kwargs):
+        """
+        Call `handler`, routing its reads to the read replica if the request allows it.
+
+        Views that bypass their parents' `dispatch` can call this with the dispatch method they delegate to.
+        """
+        if not self.use_read_replica(request):
+            return handler(request, *args, **kwargs)
+
+        with read_replica():
+            response = handler(request, *args, **kwargs)
+            # Template responses are rendered lazily; render them here so their queries use the replica too.
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+        return response
+
+
 class LogoutView(EdxOAuth2LogoutView):
     """ Logout view that redirects the user to the LMS logout page. """
 
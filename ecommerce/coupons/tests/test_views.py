@@ -786,7 +786,8 @@ class CouponRedeemViewTests(CouponMixin, DiscoveryTestMixin, LmsApiMockMixin, En
         self.mock_account_api(self.request, self.user.username, data={'is_active': True})
         self.mock_access_token_response()
         self.create_coupon_and_get_code(catalog=self.catalog)
-        with mock.patch.object(UserAlreadyPlacedOrder, 'user_already_placed_order', return_value=True):
+        with mock.patch.object(UserAlreadyPlacedOrder, 'already_purchased',
+                               side_effect=lambda user, products, site: products):
             response = self.client.get(self.redeem_url_with_params())
             msg = 'You have already purchased {course} seat.'.format(course=self.course.name)
             self.assertEqual(response.context['error'], msg)
@@ -1,16 +1,13 @@
 """ Coupon related utility functions. """
 
 
-import hashlib
 import logging
 
-from django.conf import settings
 from django.utils import timezone
-from edx_django_utils.cache import TieredCache
 from oscar.core.loading import get_model
 from slumber.exceptions import HttpNotFoundError
 
-from ecommerce.core.utils import get_cache_key
+from ecommerce.core.cache import CATALOGS_CACHE
 
 Product = get_model('catalogue', 'Product')
 
@@ -59,31 +56,27 @@ def get_catalog_course_runs(site, query, limit=None, offset=None):
     """
     api_resource_name = 'course_runs'
     partner_code = site.siteconfiguration.partner.short_code
-    cache_key = u'{site_domain}_{partner_code}_{resource}_{query}_{limit}_{offset}'.format(
-        site_domain=site.domain,
-        partner_code=partner_code,
-        resource=api_resource_name,
-        query=query,
-        limit=limit,
-        offset=offset
-    )
-    cache_key = hashlib.md5(cache_key.encode('utf-8')).hexdigest()
 
-    cached_response = TieredCache.get_cached_response(cache_key)
-    if cached_response.is_found:
-        return cached_response.value
+    def fetch():
+        api = site.siteconfiguration.discovery_api_client
+        endpoint = getattr(api, api_resource_name)
 
-    api = site.siteconfiguration.discovery_api_client
-    endpoint = getattr(api, api_resource_name)
+        return endpoint().get(
+            partner=partner_code,
+            q=query,
+            limit=limit,
+            offset=offset
+        )
 
-    response = endpoint().get(
-        partner=partner_code,
-        q=query,
+    return CATALOGS_CACHE.get_or_set(
+        site.domain,
+        fetch,
+        partner_code=partner_code,
+        resource=api_resource_name,
+        query=query,
         limit=limit,
-        offset=offset
+        offset=offset,
     )
-    TieredCache.set_all_tiers(cache_key, response, settings.COURSES_API_CACHE_TIMEOUT)
-    return response
 
 
 def prepare_course_seat_types(course_seat_types):
@@ -134,27 +127,17 @@ def fetch_course_catalog(site, catalog_id):
     """
     api_resource = 'catalogs'
 
-    cache_key = get_cache_key(
-        site_domain=site.domain,
-        resource=api_resource,
-        catalog_id=catalog_id,
-    )
-
-    cached_response = TieredCache.get_cached_response(cache_key)
-    if cached_response.is_found:
-        return cached_response.value
-
-    api = site.siteconfiguration.discovery_api_client
-    endpoint = getattr(api, api_resource)
+    def fetch():
+        api = site.siteconfiguration.discovery_api_client
+        endpoint = getattr(api, api_resource)
 
-    try:
-        response = endpoint(catalog_id).get()
-    except HttpNotFoundError:
-        logger.exception("Catalog '%s' not found.", catalog_id)
-        raise
+        try:
+            return endpoint(catalog_id).get()
+        except HttpNotFoundError:
+            logger.exception("Catalog '%s' not found.", catalog_id)
+            raise
 
-    TieredCache.set_all_tiers(cache_key, response, settings.COURSES_API_CACHE_TIMEOUT)
-    return response
+    return CATALOGS_CACHE.get_or_set(site.domain, fetch, resource=api_resource, catalog_id=catalog_id)
 
 
 def is_voucher_applied(basket, voucher):
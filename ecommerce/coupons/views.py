@@ -146,6 +146,9 @@ class CouponOfferView(TemplateView):
 
 class CouponRedeemView(EdxOrderPlacementMixin, APIView):
     permission_classes = (LoginRedirectIfUnauthenticated,)
+    # Redeeming a code for a free product places the order and fulfills it in the same request.
+    query_budget = 194
+    query_duplicate_budget = 88
 
     @method_decorator(set_enterprise_cookie)
     def get(self, request):  # pylint: disable=too-many-statements
@@ -7,7 +7,7 @@ from mock import patch
 from opaque_keys.edx.keys import CourseKey
 from requests.exceptions import ConnectionError as ReqConnectionError
 
-from ecommerce.core.utils import get_cache_key
+from ecommerce.core.cache import CATALOGS_CACHE, COURSES_CACHE
 from ecommerce.coupons.tests.mixins import DiscoveryMockMixin
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.courses.utils import (
@@ -68,11 +68,9 @@ class UtilsTests(DiscoveryTestMixin, DiscoveryMockMixin, TestCase):
                 course=product
             )
 
-        cache_key = get_cache_key(
-            site_domain=self.site.domain,
-            resource="{}-{}".format(resource, key)
+        course_cached_response = COURSES_CACHE.get_cached_response(
+            self.site.domain, resource="{}-{}".format(resource, key)
         )
-        course_cached_response = TieredCache.get_cached_response(cache_key)
         self.assertFalse(course_cached_response.is_found)
 
         response = get_course_info_from_catalog(self.request.site, product)
@@ -82,7 +80,9 @@ class UtilsTests(DiscoveryTestMixin, DiscoveryMockMixin, TestCase):
         else:
             self.assertEqual(response['title'], product.title)
 
-        course_cached_response = TieredCache.get_cached_response(cache_key)
+        course_cached_response = COURSES_CACHE.get_cached_response(
+            self.site.domain, resource="{}-{}".format(resource, key)
+        )
         self.assertEqual(course_cached_response.value, response)
 
     def test_get_course_info_from_catalog_cached(self):
@@ -144,11 +144,7 @@ class GetCourseCatalogUtilTests(DiscoveryMockMixin, TestCase):
         "get_course_catalogs".
         """
         resource = "catalogs"
-        cache_key = get_cache_key(
-            site_domain=self.site.domain,
-            resource=resource
-        )
-        course_catalogs_cached_response = TieredCache.get_cached_response(cache_key)
+        course_catalogs_cached_response = CATALOGS_CACHE.get_cached_response(self.site.domain, resource=resource)
         self.assertFalse(course_catalogs_cached_response.is_found)
 
         response = get_course_catalogs(self.request.site)
@@ -157,7 +153,7 @@ class GetCourseCatalogUtilTests(DiscoveryMockMixin, TestCase):
         for catalog_index, catalog in enumerate(response):
             self.assertEqual(catalog['name'], catalog_name_list[catalog_index])
 
-        course_cached_response = TieredCache.get_cached_response(cache_key)
+        course_cached_response = CATALOGS_CACHE.get_cached_response(self.site.domain, resource=resource)
         self.assertEqual(course_cached_response.value, response)
 
     def test_get_course_catalogs_for_single_catalog_with_id(self):
@@ -170,17 +166,17 @@ class GetCourseCatalogUtilTests(DiscoveryMockMixin, TestCase):
 
         catalog_id = 1
         resource = "catalogs"
-        cache_key = get_cache_key(
-            site_domain=self.site.domain,
-            resource="{}-{}".format(resource, catalog_id)
+        course_catalogs_cached_response = CATALOGS_CACHE.get_cached_response(
+            self.site.domain, resource="{}-{}".format(resource, catalog_id)
         )
-        course_catalogs_cached_response = TieredCache.get_cached_response(cache_key)
         self.assertFalse(course_catalogs_cached_response.is_found)
 
         response = get_course_catalogs(self.request.site, catalog_id)
         self.assertEqual(response['name'], 'All Courses')
 
-        course_cached_response = TieredCache.get_cached_response(cache_key)
+        course_cached_response = CATALOGS_CACHE.get_cached_response(
+            self.site.domain, resource="{}-{}".format(resource, catalog_id)
+        )
         self.assertEqual(course_cached_response.value, response)
 
         # Verify the API was actually hit (not the cache)
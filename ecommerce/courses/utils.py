@@ -1,11 +1,10 @@
 
 
-from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
-from edx_django_utils.cache import TieredCache
 from opaque_keys.edx.keys import CourseKey
 
-from ecommerce.core.utils import deprecated_traverse_pagination, get_cache_key
+from ecommerce.core.cache import CATALOGS_CACHE, COURSES_CACHE
+from ecommerce.core.utils import traverse_pagination
 
 
 def mode_for_product(product):
@@ -15,43 +14,54 @@ def mode_for_product(product):
     bulk purchase "enrollment code" product variant of the single-seat product, so we attempt
     to locate the 'seat_type' attribute in its place.
     """
-    mode = getattr(product.attr, 'certificate_type', getattr(product.attr, 'seat_type', None))
-    if not mode:
+    return mode_for_certificate_type(
+        getattr(product.attr, 'certificate_type', getattr(product.attr, 'seat_type', None)),
+        getattr(product.attr, 'id_verification_required', False)
+    )
+
+
+def mode_for_certificate_type(certificate_type, id_verification_required):
+    """
+    Returns the enrollment mode for a product with the given certificate type and ID verification requirement.
+    """
+    if not certificate_type:
         return 'audit'
-    if mode == 'professional' and not getattr(product.attr, 'id_verification_required', False):
+    if certificate_type == 'professional' and not id_verification_required:
         return 'no-id-professional'
-    return mode
+    return certificate_type
 
 
-def _get_discovery_response(site, cache_key, resource, resource_id):
+def _get_discovery_response(site, cache_namespace, resource, resource_id):
     """
     Return the discovery endpoint result of given resource or cached response if its already been cached.
 
     Arguments:
         site (Site): Site object containing Site Configuration data
-        cache_key (str): Cache key for given resource
+        cache_namespace (CacheNamespace): Cache namespace the response is cached in
+        resource (str): Name of the Discovery API resource
         resource_id (int or str): Identifies a specific resource to be retrieved
 
     Returns:
         dict: resource's information for given resource_id received from Discovery API
     """
-    course_cached_response = TieredCache.get_cached_response(cache_key)
-    if course_cached_response.is_found:
-        return course_cached_response.value
-
-    params = {}
-    api = site.siteconfiguration.discovery_api_client
-    endpoint = getattr(api, resource)
-
-    if resource == 'course_runs':
-        params['partner'] = site.siteconfiguration.partner.short_code
-    response = endpoint(resource_id).get(**params)
-
-    if resource_id is None:
-        response = deprecated_traverse_pagination(response, endpoint)
-
-    TieredCache.set_all_tiers(cache_key, response, settings.COURSES_API_CACHE_TIMEOUT)
-    return response
+    def fetch():
+        params = {}
+        api = site.siteconfiguration.discovery_api_client
+        endpoint = getattr(api, resource)
+
+        if resource == 'course_runs':
+            params['partner'] = site.siteconfiguration.partner.short_code
+        response = endpoint(resource_id).get(**params)
+
+        if resource_id is None:
+            response = list(traverse_pagination(response, endpoint))
+        return response
+
+    return cache_namespace.get_or_set(
+        site.domain,
+        fetch,
+        resource=resource if resource_id is None else '{}-{}'.format(resource, resource_id),
+    )
 
 
 def get_course_detail(site, course_resource_id):
@@ -65,12 +75,7 @@ def get_course_detail(site, course_resource_id):
     Returns:
         dict: Course information received from Discovery API
     """
-    resource = "courses"
-    cache_key = get_cache_key(
-        site_domain=site.domain,
-        resource="{}-{}".format(resource, course_resource_id)
-    )
-    return _get_discovery_response(site, cache_key, resource, course_resource_id)
+    return _get_discovery_response(site, COURSES_CACHE, 'courses', course_resource_id)
 
 
 def get_course_run_detail(site, course_run_key):
@@ -84,12 +89,7 @@ def get_course_run_detail(site, course_run_key):
     Returns:
         dict: CourseRun information received from Discovery API
     """
-    resource = "course_runs"
-    cache_key = get_cache_key(
-        site_domain=site.domain,
-        resource="{}-{}".format(resource, course_run_key)
-    )
-    return _get_discovery_response(site, cache_key, resource, course_run_key)
+    return _get_discovery_response(site, COURSES_CACHE, 'course_runs', course_run_key)
 
 
 def get_course_info_from_catalog(site, product):
@@ -118,12 +118,7 @@ def get_course_catalogs(site, resource_id=None):
         Timeout: requests exception "Timeout"
 
     """
-    resource = "catalogs"
-    cache_key = get_cache_key(
-        site_domain=site.domain,
-        resource=resource if resource_id is None else "{}-{}".format(resource, resource_id)
-    )
-    return _get_discovery_response(site, cache_key, 'catalogs', resource_id)
+    return _get_discovery_response(site, CATALOGS_CACHE, 'catalogs', resource_id)
 
 
 def get_certificate_type_display_value(certificate_type):
@@ -211,6 +211,29 @@ class CheckoutPageTest(DiscoveryTestMixin, TestCase, JwtMixin):
 
         self._assert_success_checkout_page(sku=credit_seat.stockrecords.first().partner_sku)
 
+    @httpretty.activate
+    def test_providers_cached(self):
+        """ Verify the credit providers are retrieved from the LMS once for a set of provider ids. """
+        self.course.create_or_update_seat('credit', True, self.price, self.provider, credit_hours=self.credit_hours)
+        self.course.create_or_update_seat('credit', True, self.price * 2, 'MIT', credit_hours=self.credit_hours)
+        self.mock_access_token_response()
+        self._mock_eligibility_api(body=self.eligibilities)
+        self._mock_providers_api(body=self.provider_data + [dict(self.provider_data[0], id='MIT')])
+
+        for __ in range(2):
+            response = self.client.get(self.path)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                {provider['id']: provider['price'] for provider in response.context['providers']},
+                {'ASU': self.price, 'MIT': self.price * 2}
+            )
+
+        provider_requests = [request for request in httpretty.httpretty.latest_requests if request.path.startswith(
+            '/api/credit/v1/providers/'
+        )]
+        self.assertEqual(len(provider_requests), 1)
+        self.assertEqual(provider_requests[0].querystring['provider_ids'], ['ASU,MIT'])
+
     @httpretty.activate
     def test_get_checkout_page_with_audit_seats(self):
         """ Verify the page loads with the proper context, if all Credit API
@@ -11,10 +11,13 @@ from django.views.generic import TemplateView
 from oscar.core.loading import get_model
 from slumber.exceptions import SlumberHttpBaseException
 
+from ecommerce.core.cache import CREDIT_PROVIDERS_CACHE
 from ecommerce.courses.models import Course
 from ecommerce.extensions.analytics.utils import prepare_analytics_data
+from ecommerce.extensions.catalogue.snapshots import get_product_snapshots
 from ecommerce.extensions.offer.utils import format_benefit_value
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
+from ecommerce.extensions.voucher.utils import get_voucher_discount_infos
 
 logger = logging.getLogger(__name__)
 Voucher = get_model('voucher', 'Voucher')
@@ -43,17 +46,25 @@ class Checkout(TemplateView):
 
         partner = get_partner_for_site(self.request)
         strategy = self.request.strategy
-        # Audit seats do not have a `certificate_type` attribute, so
-        # we use getattr to avoid an exception.
-        credit_seats = []
 
+        # The stock records of the seats are prefetched, and the attributes of the seats are read from their
+        # snapshots, so that the number of queries does not grow with the number of seats.
+        stockrecords = {}
         for seat in course.seat_products:
-            if getattr(seat.attr, 'certificate_type', None) != self.CREDIT_MODE:
+            for stockrecord in seat.stockrecords.all():
+                if stockrecord.partner_id == partner.id:
+                    stockrecords[stockrecord.partner_sku] = (seat, stockrecord)
+        snapshots = get_product_snapshots(partner.id, stockrecords)
+
+        credit_seats = []
+        for sku, (seat, stockrecord) in stockrecords.items():
+            snapshot = snapshots.get(sku)
+            if snapshot is None or snapshot.certificate_type != self.CREDIT_MODE:
                 continue
 
-            purchase_info = strategy.fetch_for_product(seat)
-            if purchase_info.availability.is_available_to_buy and seat.stockrecords.filter(partner=partner).exists():
-                credit_seats.append(seat)
+            purchase_info = strategy.fetch_for_product(seat, stockrecord)
+            if purchase_info.availability.is_available_to_buy:
+                credit_seats.append(snapshot)
 
         if not credit_seats:
             msg = _(
@@ -123,41 +134,33 @@ class Checkout(TemplateView):
         """ Get details for the credit providers for the given credit seats.
 
         Arguments:
-            credit_seats (Products[]): List of credit_seats objects.
+            credit_seats (ProductSnapshot[]): Snapshots of the credit seats.
 
         Returns:
             A list of dictionaries with provider(s) detail.
         """
         code = self.request.GET.get('code')
-        if code:
-            voucher = Voucher.objects.get(code=code)
-            discount_type = voucher.benefit.type
-            discount_value = voucher.benefit.value
+        benefit = Voucher.objects.get(code=code).benefit if code else None
 
         providers = self._get_providers_from_lms(credit_seats)
         if not providers:
             return None
 
+        # The providers are cached, so they are copied before being updated with the details of the seats.
         providers_dict = {}
         for provider in providers:
-            providers_dict[provider['id']] = provider
+            providers_dict[provider['id']] = dict(provider)
 
-        partner = get_partner_for_site(self.request)
-        for seat in credit_seats:
-            stockrecord = seat.stockrecords.filter(partner=partner).first()
+        discount = format_benefit_value(benefit) if benefit else None
+        discount_infos = get_voucher_discount_infos(benefit, [seat.price_excl_tax for seat in credit_seats])
+        for seat, discount_info in zip(credit_seats, discount_infos):
             new_price = None
-            discount = None
-            if code:
-                discount = format_benefit_value(voucher.benefit)
-                if discount_type == 'Percentage':
-                    new_price = stockrecord.price_excl_tax - (stockrecord.price_excl_tax * (discount_value / 100))
-                else:
-                    new_price = stockrecord.price_excl_tax - discount_value
-                new_price = '{0:.2f}'.format(new_price)
-            providers_dict[seat.attr.credit_provider].update({
-                'price': stockrecord.price_excl_tax,
-                'sku': stockrecord.partner_sku,
-                'credit_hours': seat.attr.credit_hours,
+            if benefit:
+                new_price = '{0:.2f}'.format(float(seat.price_excl_tax) - discount_info['discount_value'])
+            providers_dict[seat.credit_provider].update({
+                'price': seat.price_excl_tax,
+                'sku': seat.partner_sku,
+                'credit_hours': seat.credit_hours,
                 'discount': discount,
                 'new_price': new_price
             })
@@ -167,18 +170,24 @@ class Checkout(TemplateView):
     def _get_providers_from_lms(self, credit_seats):
         """ Helper method for getting provider info from LMS.
 
+        The providers are cached per set of provider ids for CREDIT_PROVIDER_CACHE_TIMEOUT seconds, and refreshed by
+        a single worker at a time.
+
         Arguments:
-            credit_seats (Products): List of credit_seats objects.
+            credit_seats (ProductSnapshot[]): Snapshots of the credit seats.
 
         Returns:
             Response from LMS as json, containing list of providers.
         """
-
-        provider_ids = ",".join([seat.attr.credit_provider for seat in credit_seats if seat.attr.credit_provider])
+        provider_ids = ','.join(sorted({seat.credit_provider for seat in credit_seats if seat.credit_provider}))
+        site_configuration = self.request.site.siteconfiguration
 
         try:
-            credit_api_client = self.request.site.siteconfiguration.credit_api_client
-            return credit_api_client.providers.get(provider_ids=provider_ids)
+            return CREDIT_PROVIDERS_CACHE.get_or_set(
+                self.request.site.domain,
+                lambda: site_configuration.credit_api_client.providers.get(provider_ids=provider_ids),
+                provider_ids=provider_ids,
+            )
         except SlumberHttpBaseException:
             logger.exception('An error occurred while retrieving credit provider details.')
             return None
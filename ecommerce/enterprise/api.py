@@ -7,12 +7,11 @@ import logging
 from urllib.parse import urlencode
 
 from django.conf import settings
-from edx_django_utils.cache import TieredCache
 from requests.exceptions import ConnectionError as ReqConnectionError
 from requests.exceptions import Timeout
 from slumber.exceptions import SlumberHttpBaseException
 
-from ecommerce.core.utils import get_cache_key
+from ecommerce.core.utils import get_cache_key, get_or_set_cache
 from ecommerce.enterprise.utils import get_enterprise_id_for_current_request_user_from_jwt
 
 logger = logging.getLogger(__name__)
@@ -100,17 +99,13 @@ def fetch_enterprise_learner_data(site, user):
         username=user.username
     )
 
-    cached_response = TieredCache.get_cached_response(cache_key)
-    if cached_response.is_found:
-        return cached_response.value
+    def fetch():
+        api = site.siteconfiguration.enterprise_api_client
+        endpoint = getattr(api, api_resource_name)
+        querystring = {'username': user.username}
+        return endpoint().get(**querystring)
 
-    api = site.siteconfiguration.enterprise_api_client
-    endpoint = getattr(api, api_resource_name)
-    querystring = {'username': user.username}
-    response = endpoint().get(**querystring)
-
-    TieredCache.set_all_tiers(cache_key, response, settings.ENTERPRISE_API_CACHE_TIMEOUT)
-    return response
+    return get_or_set_cache(cache_key, fetch, settings.ENTERPRISE_API_CACHE_TIMEOUT, namespace=api_resource_name)
 
 
 def catalog_contains_course_runs(site, course_run_ids, enterprise_customer_uuid, enterprise_customer_catalog_uuid=None):
@@ -136,15 +131,13 @@ def catalog_contains_course_runs(site, course_run_ids, enterprise_customer_uuid,
         query_params=urlencode(query_params, True)
     )
 
-    contains_content_cached_response = TieredCache.get_cached_response(cache_key)
-    if contains_content_cached_response.is_found:
-        return contains_content_cached_response.value
-
-    endpoint = getattr(api, api_resource_name)(api_resource_id)
-    contains_content = endpoint.contains_content_items.get(**query_params)['contains_content_items']
-    TieredCache.set_all_tiers(cache_key, contains_content, settings.ENTERPRISE_API_CACHE_TIMEOUT)
+    def fetch():
+        endpoint = getattr(api, api_resource_name)(api_resource_id)
+        return endpoint.contains_content_items.get(**query_params)['contains_content_items']
 
-    return contains_content
+    return get_or_set_cache(
+        cache_key, fetch, settings.ENTERPRISE_API_CACHE_TIMEOUT, namespace='enterprise_contains_content_items'
+    )
 
 
 def get_enterprise_id_for_user(site, user):
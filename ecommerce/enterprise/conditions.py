@@ -19,6 +19,7 @@ from ecommerce.enterprise.utils import get_or_create_enterprise_customer_user
 from ecommerce.extensions.basket.utils import ENTERPRISE_CATALOG_ATTRIBUTE_TYPE
 from ecommerce.extensions.fulfillment.status import ORDER
 from ecommerce.extensions.offer.constants import OFFER_ASSIGNMENT_REVOKED, OFFER_REDEEMED
+from ecommerce.extensions.offer.evaluation import get_offer_evaluation
 from ecommerce.extensions.offer.mixins import ConditionWithoutRangeMixin, SingleItemConsumptionConditionMixin
 from ecommerce.extensions.offer.models import OFFER_PRIORITY_ENTERPRISE
 from ecommerce.extensions.offer.utils import get_benefit_type, get_discount_value
@@ -105,6 +106,25 @@ class EnterpriseCustomerCondition(ConditionWithoutRangeMixin, SingleItemConsumpt
     def name(self):
         return "Basket contains a seat from {}'s catalog".format(self.enterprise_customer_name)
 
+    def passes_prechecks(self, offer, evaluation):
+        """
+        Discards the offer without looking up the catalog of the enterprise when the basket has no owner, contains
+        products which are not related to a course, or when its owner is linked to another enterprise.
+        """
+        if not evaluation.basket.owner:
+            return False
+
+        # Evaluating the conditions of voucher offers logs redemption failures, and may link the learner to the
+        # enterprise of the voucher. Only site offers are discarded by the following prechecks.
+        if offer.offer_type != ConditionalOffer.SITE:
+            return True
+
+        if not all(snapshot.course_id or snapshot.is_course_entitlement_product
+                   for snapshot in evaluation.line_snapshots):
+            return False
+
+        return not evaluation.enterprise_id or str(self.enterprise_customer_uuid) == evaluation.enterprise_id
+
     def is_satisfied(self, offer, basket):  # pylint: disable=unused-argument
         """
         Determines if a user is eligible for an enterprise customer offer
@@ -178,7 +198,11 @@ class EnterpriseCustomerCondition(ConditionWithoutRangeMixin, SingleItemConsumpt
             course_ids.append(course.id)
 
         courses_in_basket = ','.join(course_ids)
-        user_enterprise = get_enterprise_id_for_user(basket.site, basket.owner)
+        evaluation = get_offer_evaluation(basket)
+        if evaluation:
+            user_enterprise = evaluation.enterprise_id
+        else:
+            user_enterprise = get_enterprise_id_for_user(basket.site, basket.owner)
         if user_enterprise and enterprise_in_condition != user_enterprise:
             # Learner is not linked to the EnterpriseCustomer associated with this condition.
             if offer.offer_type == ConditionalOffer.VOUCHER:
@@ -2,10 +2,14 @@
 Send the enterprise code assignment nudge emails.
 """
 import logging
+import operator
 from datetime import datetime
+from functools import reduce
 
+from celery import group
 from django.contrib.sites.models import Site
 from django.core.management import BaseCommand
+from django.db.models import Q
 from django.utils import timezone
 from ecommerce_worker.email.v1.api import send_code_assignment_nudge_email
 
@@ -13,10 +17,9 @@ from ecommerce.core.models import User
 from ecommerce.enterprise.utils import (
     get_enterprise_customer_reply_to_email,
     get_enterprise_customer_sender_alias,
-    get_enterprise_customer_uuid
+    get_enterprise_customer_uuid_from_voucher
 )
 from ecommerce.extensions.offer.constants import AUTOMATIC_EMAIL
-from ecommerce.extensions.voucher.utils import get_cached_voucher
 from ecommerce.programs.custom import get_model
 
 CodeAssignmentNudgeEmails = get_model('offer', 'CodeAssignmentNudgeEmails')
@@ -32,14 +35,25 @@ logger.setLevel(logging.INFO)
 class Command(BaseCommand):
     """
     Send the code assignment nudge emails.
+
+    Nudge emails are processed in batches: the vouchers, enterprise metadata and LMS user ids for a whole
+    batch are loaded up front, emails are rendered in memory, state changes are written with bulk queries
+    and the email tasks for the batch are enqueued as a single celery group.
     """
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Maximum number of nudge emails to process in one batch.'
+        )
+
     @staticmethod
     def _get_nudge_emails():
         """
         Return the CodeAssignmentNudgeEmails objects which are scheduled to be sent today.
         """
-        # TODO: Removing this filter for testing purpose "email_date__date=datetime.now().date()"
         return CodeAssignmentNudgeEmails.objects.filter(
             email_date__date=datetime.now().date(),
             already_sent=False,
@@ -47,80 +61,107 @@ class Command(BaseCommand):
         )
 
     @staticmethod
-    def _create_email_sent_record(site, nudge_email):
+    def _iter_batches(nudge_emails, batch_size):
         """
-        Creates an instance of OfferAssignmentEmailSentRecord with the given data.
-        Arguments:
-            nudge_email (CodeAssignmentNudgeEmails): A nudge email sent to the learner.
-        """
-        OfferAssignmentEmailSentRecord.create_email_record(
-            enterprise_customer_uuid=get_enterprise_customer_uuid(nudge_email.code),
-            email_type=nudge_email.email_template.email_type,
-            template=nudge_email.email_template,
-            sender_category=AUTOMATIC_EMAIL,
-            code=nudge_email.code,
-            user_email=nudge_email.user_email,
-            receiver_id=User.get_lms_user_attribute_using_email(site, nudge_email.user_email)
+        Yield lists of nudge emails ordered by primary key, using keyset pagination.
+        """
+        nudge_emails = nudge_emails.select_related('email_template').order_by('pk')
+        last_pk = 0
+        while True:
+            batch = list(nudge_emails.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                return
+            yield batch
+            last_pk = batch[-1].pk
+
+    @staticmethod
+    def _get_vouchers(codes):
+        """
+        Return a dict mapping each of the given codes to its voucher, with offers prefetched.
+        """
+        vouchers = Voucher.objects.filter(code__in=codes).prefetch_related(
+            'offers__benefit__range',
+            'offers__condition',
         )
+        return {voucher.code: voucher for voucher in vouchers}
 
     @staticmethod
-    def _get_sender_alias(site, nudge_email):
+    def _get_enterprise_metadata(site, enterprise_customer_uuids):
         """
-        Returns the sender alias of an Enterprise Customer.
+        Return a dict mapping each enterprise customer uuid to its (sender_alias, reply_to) pair.
+        """
+        return {
+            enterprise_customer_uuid: (
+                get_enterprise_customer_sender_alias(site, enterprise_customer_uuid),
+                get_enterprise_customer_reply_to_email(site, enterprise_customer_uuid),
+            )
+            for enterprise_customer_uuid in enterprise_customer_uuids
+        }
 
-        Arguments:
-            nudge_email (CodeAssignmentNudgeEmails): A nudge email sent to the learner.
+    @staticmethod
+    def _get_lms_user_ids(site, user_emails):
+        """
+        Return a dict mapping user email to the LMS user id for the given emails.
         """
-        enterprise_customer_uuid = get_enterprise_customer_uuid(nudge_email.code)
-        return get_enterprise_customer_sender_alias(site, enterprise_customer_uuid)
+        lms_users = User.get_bulk_lms_users_using_emails(site, list(user_emails))
+        return {lms_user['email']: lms_user['id'] for lms_user in lms_users if 'email' in lms_user}
 
     @staticmethod
-    def _get_reply_to_email(site, nudge_email):
+    def _code_email_filter(nudge_emails):
         """
-        Returns the reply_to email address of an Enterprise Customer.
+        Return a Q object matching exactly the (code, user_email) pairs of the given nudge emails.
+        """
+        return reduce(
+            operator.or_,
+            (Q(code=nudge_email.code, user_email=nudge_email.user_email) for nudge_email in nudge_emails)
+        )
 
-        Arguments:
-            nudge_email (CodeAssignmentNudgeEmails): A nudge email sent to the learner.
+    def _process_batch(self, site, batch):
         """
-        enterprise_customer_uuid = get_enterprise_customer_uuid(nudge_email.code)
-        return get_enterprise_customer_reply_to_email(site, enterprise_customer_uuid)
+        Render and enqueue the nudge emails in `batch` and record them as sent.
 
-    def handle(self, *args, **options):
-        send_nudge_email_count = 0
-        site = Site.objects.get_current()
-        nudge_emails = self._get_nudge_emails()
-        total_nudge_emails_count = nudge_emails.count()
-        logger.info(
-            '[Code Assignment Nudge Email] Total count of Enterprise Nudge Emails that are scheduled for today is %s.',
-            total_nudge_emails_count
-        )
-        for nudge_email in nudge_emails:
-            try:
-                voucher = get_cached_voucher(nudge_email.code)
-            except Voucher.DoesNotExist:
+        Returns:
+            int: Number of emails added to the email sending queue.
+        """
+        vouchers = self._get_vouchers({nudge_email.code for nudge_email in batch})
+
+        expired, to_send = [], []
+        for nudge_email in batch:
+            voucher = vouchers.get(nudge_email.code)
+            if voucher is None:
                 continue
             if voucher.is_expired():
-                # unsubscribe the user to avoid sending any nudge in future regarding this same code assignment
-                CodeAssignmentNudgeEmails.unsubscribe_from_nudging(
-                    codes=[nudge_email.code],
-                    user_emails=[nudge_email.user_email]
-                )
-                continue
+                expired.append(nudge_email)
+            else:
+                to_send.append((nudge_email, voucher))
+
+        if expired:
+            # unsubscribe the users to avoid sending any nudge in future regarding these same code assignments
+            CodeAssignmentNudgeEmails.objects.filter(
+                self._code_email_filter(expired),
+                already_sent=False,
+            ).update(is_subscribed=False)
 
+        enterprise_customer_uuids = {
+            voucher.code: get_enterprise_customer_uuid_from_voucher(voucher) for __, voucher in to_send
+        }
+        enterprise_metadata = self._get_enterprise_metadata(site, set(enterprise_customer_uuids.values()))
+
+        sent, signatures = [], []
+        for nudge_email, voucher in to_send:
             base_enterprise_url = nudge_email.options.get('base_enterprise_url', '')
             # Get the formatted email body and subject on the bases of given code.
-            email_body, email_subject = nudge_email.email_template.get_email_content(
+            email_body, email_subject = nudge_email.email_template.get_email_content_for_voucher(
+                voucher,
                 nudge_email.user_email,
                 nudge_email.code,
                 base_enterprise_url=base_enterprise_url,
             )
-            if email_body:
-                nudge_email.already_sent = True
-                nudge_email.save()
-                send_nudge_email_count += 1
-                sender_alias = self._get_sender_alias(site, nudge_email)
-                reply_to = self._get_reply_to_email(site, nudge_email)
-                send_code_assignment_nudge_email.delay(
+            if not email_body:
+                continue
+            sender_alias, reply_to = enterprise_metadata[enterprise_customer_uuids[nudge_email.code]]
+            signatures.append(
+                send_code_assignment_nudge_email.si(
                     nudge_email.user_email,
                     email_subject,
                     email_body,
@@ -128,18 +169,64 @@ class Command(BaseCommand):
                     reply_to,
                     base_enterprise_url=base_enterprise_url,
                 )
-                self.set_last_reminder_date(nudge_email.user_email, nudge_email.code)
-                self._create_email_sent_record(site, nudge_email)
+            )
+            sent.append(nudge_email)
+
+        if not sent:
+            return 0
+
+        for nudge_email in sent:
+            nudge_email.already_sent = True
+        CodeAssignmentNudgeEmails.objects.bulk_update(sent, ['already_sent'])
+        self.set_last_reminder_dates(sent)
+        self._create_email_sent_records(site, sent, enterprise_customer_uuids)
+        group(signatures).apply_async()
+        return len(sent)
+
+    def _create_email_sent_records(self, site, nudge_emails, enterprise_customer_uuids):
+        """
+        Bulk create OfferAssignmentEmailSentRecord instances for the given nudge emails.
+
+        Arguments:
+            nudge_emails (list): Nudge emails sent to the learners.
+            enterprise_customer_uuids (dict): Enterprise customer uuid of each nudge email's code.
+        """
+        lms_user_ids = self._get_lms_user_ids(site, {nudge_email.user_email for nudge_email in nudge_emails})
+        OfferAssignmentEmailSentRecord.objects.bulk_create([
+            OfferAssignmentEmailSentRecord(
+                enterprise_customer=enterprise_customer_uuids[nudge_email.code],
+                email_type=nudge_email.email_template.email_type,
+                template_content_object=nudge_email.email_template,
+                sender_category=AUTOMATIC_EMAIL,
+                code=nudge_email.code,
+                user_email=nudge_email.user_email,
+                receiver_id=lms_user_ids.get(nudge_email.user_email),
+            )
+            for nudge_email in nudge_emails
+        ])
+
+    def handle(self, *args, **options):
+        send_nudge_email_count = 0
+        site = Site.objects.get_current()
+        nudge_emails = self._get_nudge_emails()
+        total_nudge_emails_count = nudge_emails.count()
+        logger.info(
+            '[Code Assignment Nudge Email] Total count of Enterprise Nudge Emails that are scheduled for today is %s.',
+            total_nudge_emails_count
+        )
+        for batch in self._iter_batches(nudge_emails, options['batch_size']):
+            send_nudge_email_count += self._process_batch(site, batch)
         logger.info(
             '[Code Assignment Nudge Email] %s out of %s added to the email sending queue.',
             send_nudge_email_count,
             total_nudge_emails_count
         )
 
-    @staticmethod
-    def set_last_reminder_date(email, code):
+    def set_last_reminder_dates(self, nudge_emails):
         """
-        Set reminder date for offer assignments with `email` and `code`.
+        Set reminder date for offer assignments matching the code and email of any of the given nudge emails.
         """
         current_date_time = timezone.now()
-        OfferAssignment.objects.filter(code=code, user_email=email).update(last_reminder_date=current_date_time)
+        OfferAssignment.objects.filter(
+            self._code_email_filter(nudge_emails)
+        ).update(last_reminder_date=current_date_time)
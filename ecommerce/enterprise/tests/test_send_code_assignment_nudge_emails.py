@@ -27,6 +27,7 @@ OfferAssignmentEmailSentRecord = get_model('offer', 'OfferAssignmentEmailSentRec
 
 LOGGER_NAME = 'ecommerce.enterprise.management.commands.send_code_assignment_nudge_emails'
 MODEL_LOGGER_NAME = 'ecommerce.extensions.offer.models'
+CMD_PATH = 'ecommerce.enterprise.management.commands.send_code_assignment_nudge_emails'
 
 
 class SendCodeAssignmentNudgeEmailsTests(TestCase):
@@ -62,23 +63,22 @@ class SendCodeAssignmentNudgeEmailsTests(TestCase):
         for offer_assignment in OfferAssignment.objects.all():
             assert offer_assignment.last_reminder_date.date() == current_date_time.date()
 
-    def _assert_sent_count(self):
+    def _assert_sent_count(self, *args):
         nudge_email = CodeAssignmentNudgeEmails.objects.all()
         assert nudge_email.filter(already_sent=True).count() == 0
-        cmd_path = 'ecommerce.enterprise.management.commands.send_code_assignment_nudge_emails'
-        with mock.patch(cmd_path + '.send_code_assignment_nudge_email.delay') as mock_send_email:
-            with LogCapture(level=logging.INFO) as log:
-                mock_send_email.return_value = mock.Mock()
-                call_command('send_code_assignment_nudge_emails')
-                assert mock_send_email.call_count == self.total_nudge_emails_for_today
-                assert nudge_email.filter(already_sent=True).count() == self.total_nudge_emails_for_today
-        return log
+        with mock.patch(CMD_PATH + '.send_code_assignment_nudge_email.si') as mock_send_email:
+            with mock.patch(CMD_PATH + '.group') as mock_group:
+                with LogCapture(level=logging.INFO) as log:
+                    call_command('send_code_assignment_nudge_emails', *args)
+                    assert mock_send_email.call_count == self.total_nudge_emails_for_today
+                    assert nudge_email.filter(already_sent=True).count() == self.total_nudge_emails_for_today
+        return log, mock_group
 
     def test_command(self):
         """
         Test the send_enterprise_offer_limit_emails command
         """
-        log = self._assert_sent_count()
+        log, __ = self._assert_sent_count()
         self.assert_last_reminder_date()
         log.check_present(
             (
@@ -106,7 +106,7 @@ class SendCodeAssignmentNudgeEmailsTests(TestCase):
         """
         code = "dummy-code"
         CodeAssignmentNudgeEmailsFactory(code=code)
-        log = self._assert_sent_count()
+        log, __ = self._assert_sent_count()
         log.check_present(
             (
                 LOGGER_NAME,
@@ -144,12 +144,23 @@ class SendCodeAssignmentNudgeEmailsTests(TestCase):
         self.voucher.end_datetime = datetime.datetime.now(pytz.UTC) - datetime.timedelta(days=1)
         self.voucher.save(update_fields=['end_datetime'])
         nudge_email = CodeAssignmentNudgeEmails.objects.all()
-        cmd_path = 'ecommerce.enterprise.management.commands.send_code_assignment_nudge_emails'
-        with mock.patch(cmd_path + '.send_code_assignment_nudge_email.delay') as mock_send_email:
-            mock_send_email.return_value = mock.Mock()
-            call_command('send_code_assignment_nudge_emails')
-            # assert that no emails were sent
-            assert mock_send_email.call_count == 0
+        with mock.patch(CMD_PATH + '.send_code_assignment_nudge_email.si') as mock_send_email:
+            with mock.patch(CMD_PATH + '.group') as mock_group:
+                call_command('send_code_assignment_nudge_emails')
+                # assert that no emails were sent
+                assert mock_send_email.call_count == 0
+                assert mock_group.call_count == 0
             assert nudge_email.filter(already_sent=True).count() == 0
             # assert that nudge emails are unsubscribed if voucher is expired
             assert nudge_email.filter(is_subscribed=False).count() == self.total_nudge_emails_for_today
+
+    def test_nudge_emails_enqueued_as_group_per_batch(self):
+        """
+        Test that the email tasks of each batch are enqueued together as a single celery group.
+        """
+        __, mock_group = self._assert_sent_count('--batch-size', '2')
+        assert mock_group.call_count == 3
+        assert [len(call[0][0]) for call in mock_group.call_args_list] == [2, 2, 1]
+        assert mock_group.return_value.apply_async.call_count == 3
+        self.assert_last_reminder_date()
+        assert OfferAssignmentEmailSentRecord.objects.count() == self.total_nudge_emails_for_today
@@ -24,6 +24,7 @@ from slumber.exceptions import SlumberHttpBaseException
 
 from ecommerce.core.constants import SYSTEM_ENTERPRISE_LEARNER_ROLE
 from ecommerce.core.url_utils import absolute_url, get_lms_dashboard_url
+from ecommerce.core.utils import get_or_set_cache
 from ecommerce.enterprise.constants import SENDER_ALIAS
 from ecommerce.enterprise.exceptions import EnterpriseDoesNotExist
 from ecommerce.extensions.offer.models import OFFER_PRIORITY_ENTERPRISE
@@ -67,38 +68,29 @@ def get_enterprise_customer(site, uuid):
         enterprise_uuid=uuid,
     )
     cache_key = hashlib.md5(cache_key.encode('utf-8')).hexdigest()
-    cached_response = TieredCache.get_cached_response(cache_key)
-    if cached_response.is_found:
-        return cached_response.value
 
-    client = get_enterprise_api_client(site)
-    path = [resource, str(uuid)]
-    client = reduce(getattr, path, client)
+    def fetch():
+        client = get_enterprise_api_client(site)
+        path = [resource, str(uuid)]
+        response = reduce(getattr, path, client).get()
+        return {
+            'name': response['name'],
+            'id': response['uuid'],
+            'enable_data_sharing_consent': response['enable_data_sharing_consent'],
+            'enforce_data_sharing_consent': response['enforce_data_sharing_consent'],
+            'contact_email': response.get('contact_email', ''),
+            'slug': response.get('slug'),
+            'sender_alias': response.get('sender_alias', ''),
+            'reply_to': response.get('reply_to', ''),
+        }
 
     try:
-        response = client.get()
+        return get_or_set_cache(
+            cache_key, fetch, settings.ENTERPRISE_CUSTOMER_RESULTS_CACHE_TIMEOUT, namespace=resource
+        )
     except (ReqConnectionError, SlumberHttpBaseException, Timeout):
         return None
 
-    enterprise_customer_response = {
-        'name': response['name'],
-        'id': response['uuid'],
-        'enable_data_sharing_consent': response['enable_data_sharing_consent'],
-        'enforce_data_sharing_consent': response['enforce_data_sharing_consent'],
-        'contact_email': response.get('contact_email', ''),
-        'slug': response.get('slug'),
-        'sender_alias': response.get('sender_alias', ''),
-        'reply_to': response.get('reply_to', ''),
-    }
-
-    TieredCache.set_all_tiers(
-        cache_key,
-        enterprise_customer_response,
-        settings.ENTERPRISE_CUSTOMER_RESULTS_CACHE_TIMEOUT
-    )
-
-    return enterprise_customer_response
-
 
 def get_enterprise_customers(request):
     client = get_enterprise_api_client(request.site)
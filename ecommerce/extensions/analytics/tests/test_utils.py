@@ -162,6 +162,9 @@ class UtilsTest(DiscoveryTestMixin, BasketMixin, TransactionTestCase):
         seat.save()
         course.delete()
         expected['name'] = seat.title
+        # The seat, its stock record and its attributes are deleted with the course, so the line is reported from
+        # its product in memory, without a certificate type.
+        expected['sku'] = 'audit'
         self.assertEqual(translate_basket_line_for_segment(line), expected)
 
     def test_get_google_analytics_client_id(self):
@@ -10,7 +10,7 @@ import requests
 from django.conf import settings
 from django.db import transaction
 
-from ecommerce.courses.utils import mode_for_product
+from ecommerce.extensions.catalogue.snapshots import get_line_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -195,18 +195,18 @@ def translate_basket_line_for_segment(line):
     Returns:
         dict
     """
-    course = line.product.course
+    snapshot = get_line_snapshot(line)
     return {
         # For backwards-compatibility with older events the `sku` field is (ab)used to
         # store the product's `certificate_type`, while the `id` field holds the product's
         # SKU. Marketing is aware that this approach will not scale once we start selling
         # products other than courses, and will need to change in the future.
-        'product_id': line.stockrecord.partner_sku,
-        'sku': mode_for_product(line.product),
-        'name': course.id if course else line.product.title,
+        'product_id': snapshot.partner_sku,
+        'sku': snapshot.mode,
+        'name': snapshot.course_id or snapshot.title,
         'price': float(line.line_price_excl_tax),
         'quantity': int(line.quantity),
-        'category': line.product.get_product_class().name,
+        'category': snapshot.product_class,
     }
 
 
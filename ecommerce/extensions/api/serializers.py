@@ -2,7 +2,7 @@
 
 import logging
 import re
-from collections import OrderedDict
+from collections import Counter, OrderedDict, defaultdict
 from decimal import Decimal
 from urllib.parse import urljoin
 
@@ -20,6 +20,7 @@ from oscar.core.loading import get_class, get_model
 from rest_framework import serializers
 from rest_framework.reverse import reverse
 from rest_framework.settings import api_settings
+from simple_history.utils import bulk_update_with_history
 
 from ecommerce.core.constants import (
     COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME,
@@ -27,6 +28,7 @@ from ecommerce.core.constants import (
     ISO_8601_FORMAT,
     SEAT_PRODUCT_CLASS_NAME
 )
+from ecommerce.core.models import AsyncJob
 from ecommerce.core.url_utils import get_ecommerce_url
 from ecommerce.core.utils import log_message_and_raise_validation_error
 from ecommerce.coupons.utils import is_coupon_available
@@ -64,7 +66,9 @@ from ecommerce.extensions.offer.utils import (
     get_benefit_type,
     send_assigned_offer_email,
     send_assigned_offer_reminder_email,
-    send_revoked_offer_email
+    send_assigned_offer_reminder_emails,
+    send_revoked_offer_email,
+    send_revoked_offer_emails
 )
 from ecommerce.extensions.voucher.utils import create_enterprise_vouchers
 from ecommerce.invoice.models import Invoice
@@ -296,6 +300,17 @@ class ProductAttributeValueSerializer(serializers.ModelSerializer):
         fields = ('name', 'code', 'value',)
 
 
+class AsyncJobSerializer(serializers.ModelSerializer):
+    """ Serializer for the status and result of API jobs. """
+    job = serializers.UUIDField(source='uuid', read_only=True)
+    result = serializers.JSONField(read_only=True)
+
+    class Meta:
+        model = AsyncJob
+        fields = ('job', 'name', 'status', 'progress', 'total', 'result', 'error', 'created', 'modified',)
+        read_only_fields = fields
+
+
 class StockRecordSerializer(serializers.ModelSerializer):
     """ Serializer for stock record objects. """
 
@@ -1849,6 +1864,7 @@ class CouponCodeRevokeRemindBulkSerializer(serializers.ListSerializer):  # pylin
                 api_settings.NON_FIELD_ERRORS_KEY: [message]
             })
 
+        self.child.load_assignments(data)
         ret = []
 
         for item in data:
@@ -1872,16 +1888,15 @@ class CouponCodeRevokeRemindBulkSerializer(serializers.ListSerializer):  # pylin
 
     def create(self, validated_data):
         """
-        This selectively calls the child create method based on whether or not validation failed for each payload.
+        This calls the child bulk_create method with the payloads which passed validation.
         """
-        ret = []
-        for attrs in validated_data:
-            if 'non_field_errors' not in attrs and not any(isinstance(attrs[field], list) for field in attrs):
-                ret.append(self.child.create(attrs))
-            else:
-                ret.append(attrs)
-
-        return ret
+        self.child.bulk_create([
+            attrs for attrs in validated_data
+            if 'non_field_errors' not in attrs and not any(
+                isinstance(attrs.get(field), list) for field in self.child.fields
+            )
+        ])
+        return validated_data
 
     def to_representation(self, data):
         """
@@ -1900,6 +1915,55 @@ class CouponCodeRevokeRemindBulkSerializer(serializers.ListSerializer):  # pylin
 
 
 class CouponCodeMixin:
+    UNREDEEMED_STATUSES = [OFFER_ASSIGNED, OFFER_ASSIGNMENT_EMAIL_PENDING, OFFER_ASSIGNMENT_EMAIL_BOUNCED]
+
+    # Codes and offer assignments loaded by `load_assignments`, for the validation of many payloads.
+    _loaded_assignments = None
+
+    def load_assignments(self, items):
+        """
+        Load the codes of the coupon, the offer assignments and the email template needed to validate the payloads
+        in `items` with a query each, instead of a few queries per payload.
+
+        Codes and emails are matched case-insensitively, as by the database.
+        """
+        codes, emails = set(), set()
+        for item in items:
+            # Malformed payloads are reported by their validation.
+            if isinstance(item, dict) and isinstance(item.get('user'), dict):
+                codes.add(str(item.get('code')))
+                emails.add(str(item['user'].get('email')))
+
+        coupon = self.context.get('coupon')
+        unredeemed_offer_assignments = defaultdict(list)
+        redeemed_offer_counts = Counter()
+        offer_assignments = OfferAssignment.objects.filter(
+            code__in=codes,
+            user_email__in=emails,
+            status__in=self.UNREDEEMED_STATUSES + [OFFER_REDEEMED]
+        ).order_by('id')
+        for offer_assignment in offer_assignments:
+            key = (offer_assignment.code.lower(), offer_assignment.user_email.lower())
+            if offer_assignment.status == OFFER_REDEEMED:
+                redeemed_offer_counts[key] += 1
+            else:
+                unredeemed_offer_assignments[key].append(offer_assignment)
+
+        self._loaded_assignments = {
+            'coupon_codes': {
+                code.lower() for code in coupon.attr.coupon_vouchers.vouchers.filter(
+                    code__in=codes
+                ).values_list('code', flat=True)
+            },
+            'unredeemed_offer_assignments': unredeemed_offer_assignments,
+            'redeemed_offer_counts': redeemed_offer_counts,
+            'template': OfferAssignmentEmailTemplates.get_template(self.context.get('template_id', None)),
+        }
+
+    def get_template(self):
+        if self._loaded_assignments is not None:
+            return self._loaded_assignments['template']
+        return OfferAssignmentEmailTemplates.get_template(self.context.get('template_id', None))
 
     def validate_coupon_has_code(self, coupon, code):
         """
@@ -1908,7 +1972,11 @@ class CouponCodeMixin:
         :param code: (str): Code associated with the voucher
         :raises rest_framework.exceptions.ValidationError in case code is not associated with the coupon
         """
-        if not coupon.attr.coupon_vouchers.vouchers.filter(code=code).exists():
+        if self._loaded_assignments is not None:
+            has_code = code.lower() in self._loaded_assignments['coupon_codes']
+        else:
+            has_code = coupon.attr.coupon_vouchers.vouchers.filter(code=code).exists()
+        if not has_code:
             raise serializers.ValidationError('Code {} is not associated with this Coupon'.format(code))
 
     def get_unredeemed_offer_assignments(self, code, email):
@@ -1916,13 +1984,43 @@ class CouponCodeMixin:
         Returns offer assignments associated with the code and email
         :param code: (str): Code associated with the voucher
         :param email: (str): Learner email
-        :return: QuerySet containing offer assignments associated with the code and email
+        :return: list of the offer assignments associated with the code and email
         """
-        return OfferAssignment.objects.filter(
+        if self._loaded_assignments is not None:
+            return self._loaded_assignments['unredeemed_offer_assignments'][(code.lower(), email.lower())]
+        return list(OfferAssignment.objects.filter(
             code=code,
             user_email=email,
-            status__in=[OFFER_ASSIGNED, OFFER_ASSIGNMENT_EMAIL_PENDING, OFFER_ASSIGNMENT_EMAIL_BOUNCED]
-        )
+            status__in=self.UNREDEEMED_STATUSES
+        ))
+
+    def get_redeemed_offer_count(self, code, email):
+        """
+        Returns the number of redeemed offer assignments associated with the code and email
+        """
+        if self._loaded_assignments is not None:
+            return self._loaded_assignments['redeemed_offer_counts'][(code.lower(), email.lower())]
+        return OfferAssignment.objects.filter(code=code, user_email=email, status=OFFER_REDEEMED).count()
+
+    def create_email_sent_records(self, items, email_type, template, enterprise_customer_uuid, sender_id):
+        """
+        Bulk create the OfferAssignmentEmailSentRecord of the emails sent for `items`,
+        see `create_offer_assignment_email_sent_record`.
+        """
+        sender_category = MANUAL_EMAIL if sender_id else AUTOMATIC_EMAIL
+        OfferAssignmentEmailSentRecord.objects.bulk_create([
+            OfferAssignmentEmailSentRecord(
+                user_email=attrs['user']['email'],
+                code=attrs['code'],
+                receiver_id=attrs['user'].get('lms_user_id'),
+                sender_id=sender_id,
+                sender_category=sender_category,
+                template_content_object=template,
+                enterprise_customer=enterprise_customer_uuid,
+                email_type=email_type
+            )
+            for attrs in items
+        ])
 
 
 class CouponCodeRevokeSerializer(CouponCodeMixin, serializers.Serializer):  # pylint: disable=abstract-method
@@ -2000,6 +2098,66 @@ class CouponCodeRevokeSerializer(CouponCodeMixin, serializers.Serializer):  # py
         validated_data['detail'] = detail
         return validated_data
 
+    def bulk_create(self, items):
+        """
+        Update the OfferAssignments of the validated payloads in `items` to have Revoked status, and send the
+        revocation emails with a single task group. Each payload is updated in place with its `detail`.
+        """
+        if not items:
+            return
+
+        sender_id = self.context.get('sender_id', None)
+        template = items[0]['template']
+        enterprise_customer_uuid = items[0]['enterprise_customer_uuid']
+        offer_assignments = []
+        for attrs in items:
+            offer_assignments.extend(attrs.pop('offer_assignments'))
+            for field in ('sender_id', 'template', 'enterprise_customer_uuid'):
+                attrs.pop(field)
+        subject = self.context.get('subject')
+        greeting = self.context.get('greeting')
+        closing = self.context.get('closing')
+        base_enterprise_url = self.context.get('base_enterprise_url', '')
+        files = self.context.get('files', [])
+        site = self.context.get('site')
+        detail = 'success'
+        current_date_time = timezone.now()
+        emailed_items = [attrs for attrs in items if not attrs.get('do_not_email')]
+
+        try:
+            for offer_assignment in offer_assignments:
+                offer_assignment.status = OFFER_ASSIGNMENT_REVOKED
+                offer_assignment.revocation_date = current_date_time
+                offer_assignment.modified = current_date_time
+            bulk_update_with_history(
+                offer_assignments, OfferAssignment, ['status', 'revocation_date', 'modified'], batch_size=500
+            )
+
+            if emailed_items:
+                send_revoked_offer_emails(
+                    subject=subject,
+                    greeting=greeting,
+                    closing=closing,
+                    learners=[(attrs['user']['email'], attrs['code']) for attrs in emailed_items],
+                    sender_alias=get_enterprise_customer_sender_alias(site, enterprise_customer_uuid),
+                    reply_to=get_enterprise_customer_reply_to_email(site, enterprise_customer_uuid),
+                    base_enterprise_url=base_enterprise_url,
+                    attachments=files,
+                )
+                self.create_email_sent_records(
+                    emailed_items, REVOKE, template, enterprise_customer_uuid, sender_id
+                )
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception(
+                '[Offer Revocation] Encountered error when revoking %d codes with '
+                'subject %r, greeting %r closing %r base_enterprise_url %r and files %r',
+                len(items), subject, greeting, closing, base_enterprise_url, files
+            )
+            detail = str(exc)
+
+        for attrs in items:
+            attrs['detail'] = detail
+
     def validate(self, attrs):
         """
         Validate that the code is part of the Coupon and the provided code and email have an active OfferAssignment.
@@ -2007,13 +2165,12 @@ class CouponCodeRevokeSerializer(CouponCodeMixin, serializers.Serializer):  # py
         code = attrs.get('code')
         user = attrs.get('user')
         coupon = self.context.get('coupon')
-        template_id = self.context.get('template_id', None)
         sender_id = self.context.get('sender_id', None)
-        template = OfferAssignmentEmailTemplates.get_template(template_id)
+        template = self.get_template()
         enterprise_customer_uuid = coupon.attr.enterprise_customer_uuid
         self.validate_coupon_has_code(coupon, code)
         offer_assignments = self.get_unredeemed_offer_assignments(code, user['email'])
-        if not offer_assignments.exists():
+        if not offer_assignments:
             raise serializers.ValidationError(f'No assignments exist for user {user["email"]} and code {code}')
         attrs['offer_assignments'] = offer_assignments
         attrs['sender_id'] = sender_id
@@ -2060,7 +2217,7 @@ class CouponCodeRemindSerializer(CouponCodeMixin, serializers.Serializer):  # py
                 subject,
                 greeting,
                 closing,
-                offer_assignments.first(),
+                offer_assignments[0],
                 redeemed_offer_count,
                 total_offer_count,
                 sender_alias,
@@ -2088,6 +2245,68 @@ class CouponCodeRemindSerializer(CouponCodeMixin, serializers.Serializer):  # py
         validated_data['detail'] = detail
         return validated_data
 
+    def bulk_create(self, items):
+        """
+        Send the remind emails for the pending OfferAssignments of the validated payloads in `items` with a single
+        task group. Each payload is updated in place with its `detail`.
+        """
+        if not items:
+            return
+
+        sender_id = self.context.get('sender_id', None)
+        template = items[0]['template']
+        enterprise_customer_uuid = items[0]['enterprise_customer_uuid']
+        offer_assignments = []
+        for attrs in items:
+            offer_assignments.extend(attrs.pop('offer_assignments'))
+            for field in ('sender_id', 'template', 'enterprise_customer_uuid'):
+                attrs.pop(field)
+        subject = self.context.get('subject')
+        greeting = self.context.get('greeting')
+        closing = self.context.get('closing')
+        files = self.context.get('files', [])
+        base_enterprise_url = self.context.get('base_enterprise_url', '')
+        detail = 'success'
+        current_date_time = timezone.now()
+        site = self.context.get('site')
+
+        sender_alias = get_enterprise_customer_sender_alias(site, enterprise_customer_uuid)
+        reply_to = get_enterprise_customer_reply_to_email(site, enterprise_customer_uuid)
+        code_expiration_date = retrieve_end_date(self.context.get('coupon'))
+        try:
+            send_assigned_offer_reminder_emails(
+                subject=subject,
+                greeting=greeting,
+                closing=closing,
+                reminders=[
+                    {
+                        'learner_email': attrs['user']['email'],
+                        'code': attrs['code'],
+                        'redeemed_offer_count': attrs['redeemed_offer_count'],
+                        'total_offer_count': attrs['total_offer_count'],
+                    }
+                    for attrs in items
+                ],
+                code_expiration_date=code_expiration_date.strftime('%d %B, %Y %H:%M %Z'),
+                sender_alias=sender_alias,
+                reply_to=reply_to,
+                attachments=files,
+                base_enterprise_url=base_enterprise_url,
+            )
+            self.create_email_sent_records(items, REMIND, template, enterprise_customer_uuid, sender_id)
+            for offer_assignment in offer_assignments:
+                offer_assignment.last_reminder_date = current_date_time
+                offer_assignment.modified = current_date_time
+            bulk_update_with_history(
+                offer_assignments, OfferAssignment, ['last_reminder_date', 'modified'], batch_size=500
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception('Encountered error during reminder emails for %d codes', len(items))
+            detail = str(exc)
+
+        for attrs in items:
+            attrs['detail'] = detail
+
     def validate(self, attrs):
         """
         Validate that the code is part of the Coupon the code and email provided have an active OfferAssignment.
@@ -2095,22 +2314,16 @@ class CouponCodeRemindSerializer(CouponCodeMixin, serializers.Serializer):  # py
         code = attrs.get('code')
         user = attrs.get('user')
         coupon = self.context.get('coupon')
-        template_id = self.context.get('template_id', None)
         sender_id = self.context.get('sender_id', None)
-        template = OfferAssignmentEmailTemplates.get_template(template_id)
+        template = self.get_template()
         enterprise_customer_uuid = coupon.attr.enterprise_customer_uuid
         self.validate_coupon_has_code(coupon, code)
         offer_assignments = self.get_unredeemed_offer_assignments(code, user['email'])
-        offer_assignments_redeemed = OfferAssignment.objects.filter(
-            code=code,
-            user_email=user['email'],
-            status=OFFER_REDEEMED
-        )
-        if not offer_assignments.exists():
+        if not offer_assignments:
             raise serializers.ValidationError(f'No assignments exist for user {user["email"]} and code {code}')
         attrs['offer_assignments'] = offer_assignments
-        attrs['redeemed_offer_count'] = offer_assignments_redeemed.count()
-        attrs['total_offer_count'] = offer_assignments.count()
+        attrs['redeemed_offer_count'] = self.get_redeemed_offer_count(code, user['email'])
+        attrs['total_offer_count'] = len(offer_assignments)
         attrs['sender_id'] = sender_id
         attrs['template'] = template
         attrs['enterprise_customer_uuid'] = enterprise_customer_uuid
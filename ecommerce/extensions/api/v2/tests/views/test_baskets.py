@@ -652,8 +652,11 @@ class BasketCalculateViewTests(ProgramTestMixin, ThrottlingMixin, TestCase):
 
         mock_get_lms_resource_for_user.side_effect = Exception('Forced exception to test logging.')
 
-        with self.assertRaises(Exception):
-            self.client.get(url)
+        # Fail in the calculation, rather than while computing the cache key.
+        fingerprint_path = 'ecommerce.programs.conditions.ProgramCourseRunSeatsCondition.get_ownership_fingerprint'
+        with mock.patch(fingerprint_path, return_value=None):
+            with self.assertRaises(Exception):
+                self.client.get(url)
 
         self.assertTrue(mock_get_lms_resource_for_user.called, msg='LMS calls should be made for non-anonymous case.')
         self.assertTrue(mock_logger.called, msg='A message should have been logged for the exception.')
@@ -791,10 +794,10 @@ class BasketCalculateViewTests(ProgramTestMixin, ThrottlingMixin, TestCase):
         self.assertEqual(response.data, expected)
         mock_calculate_basket_atomic.reset_mock()
 
-        # Call BasketCalculate again to test that we do not hit the cache
+        # Call BasketCalculate again to test that we hit the cache of the request user
         response = self.client.get(url_with_one_sku_no_anon)
         self.assertEqual(response.status_code, 200)
-        self.assertTrue(mock_calculate_basket_atomic.called, msg='The cache should be missed.')
+        self.assertFalse(mock_calculate_basket_atomic.called, msg='The cache should be hit.')
         self.assertEqual(response.data, expected)
 
     @httpretty.activate
@@ -830,23 +833,77 @@ class BasketCalculateViewTests(ProgramTestMixin, ThrottlingMixin, TestCase):
 
     @httpretty.activate
     @mock.patch('ecommerce.extensions.api.v2.views.baskets.BasketCalculateView._calculate_temporary_basket_atomic')
-    def test_basket_calculate_with_anonymous_caching_disabled(self, mock_calculate_basket_atomic):
-        """Verify a request made by a staff user is not cached"""
+    def test_basket_calculate_authenticated_caching(self, mock_calculate_basket_atomic):
+        """Verify a request made by an authenticated user is cached, per eligibility fingerprint"""
         expected = {'Test Succeeded': True}
-        mock_calculate_basket_atomic.return_value = {'Test Succeeded': True}
+        mock_calculate_basket_atomic.return_value = expected
 
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
-        self.assertTrue(mock_calculate_basket_atomic.called)
+        self.assertTrue(mock_calculate_basket_atomic.called, msg='The cache should be missed.')
         self.assertEqual(response.data, expected)
-
         mock_calculate_basket_atomic.reset_mock()
 
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
-        self.assertTrue(mock_calculate_basket_atomic.called, msg='The cache should be missed.')
+        self.assertFalse(mock_calculate_basket_atomic.called, msg='The cache should be hit.')
         self.assertEqual(response.data, expected)
 
+        # Orders count toward the usage limits of offers, so they change the fingerprint of the user.
+        factories.create_order(user=self.user)
+        self.client.get(self.url)
+        self.assertTrue(mock_calculate_basket_atomic.called, msg='The cache should be missed.')
+        mock_calculate_basket_atomic.reset_mock()
+
+        # A voucher code is part of the cache key.
+        self.client.get(self.url + '&code=ABC')
+        self.assertTrue(mock_calculate_basket_atomic.called, msg='The cache should be missed.')
+
+    @httpretty.activate
+    @mock.patch('ecommerce.extensions.api.v2.views.baskets.BasketCalculateView._calculate_temporary_basket_atomic')
+    def test_basket_calculate_cache_shared_by_fingerprint(self, mock_calculate_basket_atomic):
+        """Verify users with the same eligibility fingerprint share cached calculations"""
+        mock_calculate_basket_atomic.return_value = {'Test Succeeded': True}
+        self.client.get(self.url)
+        mock_calculate_basket_atomic.reset_mock()
+
+        other_user = self._login_as_user(is_staff=True)
+        self.client.get(self._generate_sku_url(self.products, username=other_user.username))
+        self.assertFalse(mock_calculate_basket_atomic.called, msg='The cache should be hit.')
+
+        # Offers may be restricted to email domains.
+        other_user.email = 'learner@other.example.com'
+        other_user.save()
+        self.client.get(self._generate_sku_url(self.products, username=other_user.username))
+        self.assertTrue(mock_calculate_basket_atomic.called, msg='The cache should be missed.')
+
+    @httpretty.activate
+    def test_basket_calculate_cache_invalidated_by_offers(self):
+        """Verify cached calculations are invalidated when offers or prices change"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['total_incl_tax'], self.product_total)
+
+        benefit = factories.BenefitFactory(type=Benefit.PERCENTAGE, range=self.range, value=10)
+        condition = factories.ConditionFactory(value=3, range=self.range, type=Condition.COVERAGE)
+        offer = factories.ConditionalOfferFactory(
+            benefit=benefit, condition=condition, offer_type=ConditionalOffer.SITE,
+            start_datetime=datetime.datetime.now() - datetime.timedelta(days=1),
+            end_datetime=datetime.datetime.now() + datetime.timedelta(days=2),
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['total_incl_tax'], Decimal('27.00'))
+
+        offer.benefit.value = 20
+        offer.benefit.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['total_incl_tax'], Decimal('24.00'))
+
+        stockrecord = self.products[0].stockrecords.first()
+        stockrecord.price_excl_tax += 10
+        stockrecord.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['total_incl_tax_excl_discounts'], self.product_total + 10)
+
     @httpretty.activate
     @mock.patch('ecommerce.programs.conditions.ProgramCourseRunSeatsCondition._get_lms_resource_for_user')
     @mock.patch('ecommerce.extensions.api.v2.views.baskets.logger.exception')
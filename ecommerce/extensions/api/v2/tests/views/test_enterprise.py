@@ -30,7 +30,8 @@ from ecommerce.core.constants import (
     SYSTEM_ENTERPRISE_ADMIN_ROLE,
     SYSTEM_ENTERPRISE_OPERATOR_ROLE
 )
-from ecommerce.core.models import EcommerceFeatureRole, EcommerceFeatureRoleAssignment
+from ecommerce.core.jobs import run_job
+from ecommerce.core.models import AsyncJob, EcommerceFeatureRole, EcommerceFeatureRoleAssignment
 from ecommerce.core.url_utils import get_ecommerce_url
 from ecommerce.coupons.tests.mixins import CouponMixin, DiscoveryMockMixin
 from ecommerce.coupons.utils import is_coupon_available
@@ -2862,6 +2863,43 @@ class EnterpriseCouponViewSetRbacTests(
             assert offer_assignment.status == OFFER_ASSIGNMENT_REVOKED
             self.assertIsNotNone(offer_assignment.revocation_date)
 
+    def test_coupon_codes_revoke_bulk_grouped_emails(self):
+        """Test that revoking many assignments sends their emails with a single group of tasks."""
+        users = [{'email': 'test1@example.com'}, {'email': 'test2@example.com'}]
+        coupon_post_data = dict(self.data, voucher_type=Voucher.SINGLE_USE, quantity=2)
+        coupon = self.get_response('POST', ENTERPRISE_COUPONS_LINK, coupon_post_data)
+        coupon_id = coupon.json()['coupon_id']
+        self.assign_user_to_code(coupon_id, users, [])
+
+        assignments = [
+            {'user': {'email': offer_assignment.user_email}, 'code': offer_assignment.code}
+            for offer_assignment in OfferAssignment.objects.order_by('user_email')
+        ]
+        with mock.patch('ecommerce.extensions.offer.utils.group') as mock_group:
+            response = self.get_response(
+                'POST',
+                '/api/v2/enterprise/coupons/{}/revoke/'.format(coupon_id),
+                {
+                    'template': 'Test template',
+                    'template_subject': TEMPLATE_SUBJECT,
+                    'template_greeting': TEMPLATE_GREETING,
+                    'template_closing': TEMPLATE_CLOSING,
+                    'assignments': assignments,
+                    'do_not_email': False
+                }
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['detail'] for item in response.json()] == ['success', 'success']
+        mock_group.return_value.apply_async.assert_called_once_with()
+        assert len(mock_group.call_args[0][0]) == 2
+        assert OfferAssignmentEmailSentRecord.objects.filter(email_type=REVOKE).count() == 2
+        for offer_assignment in OfferAssignment.objects.all():
+            assert offer_assignment.status == OFFER_ASSIGNMENT_REVOKED
+            self.assertIsNotNone(offer_assignment.revocation_date)
+            # The bulk update keeps the history of the assignments.
+            assert offer_assignment.history.first().status == OFFER_ASSIGNMENT_REVOKED
+
     def test_email_record_not_created_when_notify_learners_disabled(self):
         """
         Test that the code assignment serializer won't notify learners nor create email sent records if the
@@ -2996,6 +3034,69 @@ class EnterpriseCouponViewSetRbacTests(
         offer_assignment = OfferAssignment.objects.filter(user_email=user['email']).first()
         self.assertIsNotNone(offer_assignment.last_reminder_date)
 
+    def _assign_coupon_code(self, user):
+        """Create a coupon and assign one of its codes to the user, returning the coupon id and the assignment."""
+        coupon = self.get_response('POST', ENTERPRISE_COUPONS_LINK, self.data).json()
+        with mock.patch('ecommerce.extensions.offer.utils.send_offer_assignment_email.delay'):
+            self.get_response(
+                'POST',
+                '/api/v2/enterprise/coupons/{}/assign/'.format(coupon['coupon_id']),
+                {
+                    'template': 'Test template',
+                    'template_subject': TEMPLATE_SUBJECT,
+                    'template_greeting': TEMPLATE_GREETING,
+                    'template_closing': TEMPLATE_CLOSING,
+                    'users': [user]
+                }
+            )
+        return coupon['coupon_id'], OfferAssignment.objects.get(user_email=user['email'])
+
+    def test_coupon_codes_remind_async(self):
+        """Test that reminder emails are sent by a job in async mode."""
+        user = {'email': 'test1@example.com'}
+        coupon_id, offer_assignment = self._assign_coupon_code(user)
+        payload = {'assignments': [{'user': user, 'code': offer_assignment.code}], 'template': 'Test template'}
+        with mock.patch('ecommerce.extensions.offer.utils.send_offer_update_email.delay') as mock_send_email:
+            response = self.get_response(
+                'POST',
+                '/api/v2/enterprise/coupons/{}/remind/?async=true'.format(coupon_id),
+                payload
+            )
+            assert response.status_code == status.HTTP_202_ACCEPTED
+            assert mock_send_email.call_count == 0
+
+            job = run_job(AsyncJob.objects.get(uuid=response.json()['job']).id)
+
+        assert job.status == AsyncJob.SUCCEEDED
+        assert job.result == [{'code': offer_assignment.code, 'user': user, 'detail': 'success'}]
+        assert mock_send_email.call_count == 1
+        offer_assignment.refresh_from_db()
+        self.assertIsNotNone(offer_assignment.last_reminder_date)
+
+    def test_coupon_codes_revoke_async(self):
+        """Test that codes are revoked by a job in async mode."""
+        user = {'email': 'test1@example.com'}
+        coupon_id, offer_assignment = self._assign_coupon_code(user)
+        nudge_email = CodeAssignmentNudgeEmailsFactory(user_email=user['email'], code=offer_assignment.code)
+        payload = {'assignments': [{'user': user, 'code': offer_assignment.code}], 'do_not_email': True}
+        response = self.get_response(
+            'POST',
+            '/api/v2/enterprise/coupons/{}/revoke/?async=true'.format(coupon_id),
+            payload
+        )
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        offer_assignment.refresh_from_db()
+        assert offer_assignment.status != OFFER_ASSIGNMENT_REVOKED
+
+        job = run_job(AsyncJob.objects.get(uuid=response.json()['job']).id)
+
+        assert job.status == AsyncJob.SUCCEEDED
+        assert job.result == [{'code': offer_assignment.code, 'user': user, 'detail': 'success', 'do_not_email': True}]
+        offer_assignment.refresh_from_db()
+        assert offer_assignment.status == OFFER_ASSIGNMENT_REVOKED
+        nudge_email.refresh_from_db()
+        assert not nudge_email.is_subscribed
+
     def test_coupon_codes_remind_code_not_in_coupon(self):
         """Test that remind fails when the specified code is not associated with the Coupon."""
         user = {'email': 'test1@example.com'}
@@ -3210,7 +3311,7 @@ class EnterpriseCouponViewSetRbacTests(
             self.assign_user_to_code(coupon_id, [user], [codes[code_index]])
 
         offer_assignments = OfferAssignment.objects.all().order_by('user_email')
-        with mock.patch('ecommerce.extensions.offer.utils.send_offer_update_email.delay') as mock_send_email:
+        with mock.patch('ecommerce.extensions.offer.utils.group') as mock_group:
             with mock.patch(
                     UPLOAD_FILES_TO_S3_PATH) as mock_file_uploader:
                 mock_file_uploader.return_value = [
@@ -3235,7 +3336,9 @@ class EnterpriseCouponViewSetRbacTests(
             {'code': offer_assignment.code, 'user': {'email': offer_assignment.user_email}, 'detail': 'success'}
             for offer_assignment in offer_assignments
         ]
-        assert mock_send_email.call_count == 2
+        # The emails are sent by a single group of tasks.
+        mock_group.return_value.apply_async.assert_called_once_with()
+        assert len(mock_group.call_args[0][0]) == 2
         for offer_assignment in offer_assignments:
             self.assertIsNotNone(offer_assignment.last_reminder_date)
 
@@ -3630,7 +3733,7 @@ class EnterpriseCouponViewSetRbacTests(
         # verify that no record has been created with 'remind' email type
         assert OfferAssignmentEmailSentRecord.objects.filter(email_type=REMIND).count() == 0
 
-        with mock.patch('ecommerce.extensions.offer.utils.send_offer_update_email.delay'):
+        with mock.patch('ecommerce.extensions.offer.utils.group'):
             with mock.patch(
                     UPLOAD_FILES_TO_S3_PATH) as mock_file_uploader:
                 mock_file_uploader.return_value = [
@@ -3661,7 +3764,7 @@ class EnterpriseCouponViewSetRbacTests(
         # verify that no record has been created with 'revoke' email type
         assert OfferAssignmentEmailSentRecord.objects.filter(email_type=REVOKE).count() == 0
 
-        with mock.patch('ecommerce.extensions.offer.utils.send_offer_update_email.delay'):
+        with mock.patch('ecommerce.extensions.offer.utils.group'):
             with mock.patch(
                     UPLOAD_FILES_TO_S3_PATH) as mock_file_uploader:
                 mock_file_uploader.return_value = [
@@ -0,0 +1,46 @@
+from django.urls import reverse
+
+from ecommerce.core.models import AsyncJob
+from ecommerce.tests.testcases import TestCase
+
+
+class AsyncJobViewSetTests(TestCase):
+    def setUp(self):
+        super(AsyncJobViewSetTests, self).setUp()
+        self.user = self.create_user()
+        self.job = AsyncJob.objects.create(
+            name='ecommerce.core.tests.test_jobs.count_items',
+            site=self.site,
+            user=self.user,
+            status=AsyncJob.SUCCEEDED,
+            progress=2,
+            total=2,
+            result={'count': 2},
+        )
+        self.path = reverse('api:v2:jobs-detail', kwargs={'uuid': self.job.uuid})
+
+    def test_authentication_required(self):
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 401)
+
+    def test_retrieve(self):
+        """ Verify the status, progress and result of the job are returned to the user who started it. """
+        self.client.login(username=self.user.username, password=self.password)
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertEqual(data['job'], str(self.job.uuid))
+        self.assertEqual(data['status'], AsyncJob.SUCCEEDED)
+        self.assertEqual((data['progress'], data['total']), (2, 2))
+        self.assertEqual(data['result'], {'count': 2})
+
+    def test_other_users_jobs(self):
+        """ Verify users only see their own jobs, and staff users see every job. """
+        user = self.create_user()
+        self.client.login(username=user.username, password=self.password)
+        self.assertEqual(self.client.get(self.path).status_code, 404)
+
+        staff_user = self.create_user(is_staff=True)
+        self.client.login(username=staff_user.username, password=self.password)
+        self.assertEqual(self.client.get(self.path).status_code, 200)
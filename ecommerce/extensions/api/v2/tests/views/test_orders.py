@@ -16,6 +16,8 @@ from oscar.core.loading import get_class, get_model
 from oscar.test import factories
 from rest_framework import status
 
+from ecommerce.core.jobs import run_job
+from ecommerce.core.models import AsyncJob
 from ecommerce.coupons.tests.mixins import DiscoveryMockMixin
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.entitlements.utils import create_or_update_course_entitlement
@@ -505,6 +507,30 @@ class ManualCourseEnrollmentOrderViewSetTests(TestCase, DiscoveryMockMixin):
                 "Course mode should be paid"
             )
 
+    def test_create_manual_order_async(self):
+        """
+        Test that the orders are created by a job in async mode.
+        """
+        post_data = self.generate_post_data(2)
+        response = self.client.post(
+            self.url + '?async=true',
+            json.dumps(post_data),
+            content_type='application/json',
+            **self.build_jwt_header(self.user)
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = AsyncJob.objects.get(uuid=response.json()['job'])
+        self.assertEqual(response['Location'], response.json()['url'])
+        self.assertEqual(job.status, AsyncJob.PENDING)
+        self.assertEqual(job.user, self.user)
+        self.assertFalse(Order.objects.exists())
+
+        job = run_job(job.id)
+        self.assertEqual(job.status, AsyncJob.SUCCEEDED)
+        self.assertEqual((job.progress, job.total), (2, 2))
+        self.assertEqual([order['status'] for order in job.result['orders']], ['success', 'success'])
+        self.assertEqual(Order.objects.count(), 2)
+
     def test_create_manual_order(self):
         """"
         Test that manual enrollment order can be created with expected data.
@@ -0,0 +1,54 @@
+from django.urls import reverse
+
+from ecommerce.core.instrumentation import metrics
+from ecommerce.tests.testcases import TestCase
+
+
+class StatsViewTests(TestCase):
+    path = reverse('api:v2:stats')
+
+    def setUp(self):
+        super(StatsViewTests, self).setUp()
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+        metrics.record_cache_lookup('courses', 'hit')
+        metrics.record_upstream_call('discovery', 'GET /courses/{id}/', 0.2, payload_size=2048)
+
+    def test_staff_only(self):
+        """ Verify only staff users can access the endpoint. """
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 401)
+
+        user = self.create_user()
+        self.client.login(username=user.username, password=self.password)
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 403)
+
+    def test_json(self):
+        user = self.create_user(is_staff=True)
+        self.client.login(username=user.username, password=self.password)
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertEqual(data['cache']['courses'], {'hit': 1, 'miss': 0, 'stale': 0, 'hit_ratio': 1.0})
+        endpoint = data['upstream']['discovery']['GET /courses/{id}/']
+        self.assertEqual(endpoint['count'], 1)
+        self.assertEqual(endpoint['latency_seconds']['buckets']['0.25'], 1)
+        self.assertEqual(endpoint['latency_seconds']['buckets']['0.1'], 0)
+        self.assertEqual(endpoint['payload_size_bytes']['buckets']['4096'], 1)
+
+    def test_prometheus(self):
+        user = self.create_user(is_staff=True)
+        self.client.login(username=user.username, password=self.password)
+        response = self.client.get(self.path, {'format': 'prometheus'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+
+        content = response.content.decode('utf-8')
+        self.assertIn('ecommerce_cache_lookups_total{namespace="courses",result="hit"} 1', content)
+        self.assertIn(
+            'ecommerce_upstream_request_duration_seconds_bucket'
+            '{service="discovery",endpoint="GET /courses/{id}/",le="+Inf"} 1',
+            content
+        )
@@ -10,6 +10,7 @@ import pytz
 from django.http import Http404
 from django.urls import reverse
 from django.utils.timezone import now
+from edx_django_utils.cache import TieredCache
 from opaque_keys.edx.keys import CourseKey
 from oscar.core.loading import get_model
 from oscar.test.factories import BenefitFactory, OrderFactory, OrderLineFactory, ProductFactory, RangeFactory
@@ -163,6 +164,11 @@ class VoucherViewSetTests(DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockMixi
         product.expires = pytz.utc.localize(datetime.datetime.min)
         product.save()
 
+        # The offers of the catalog page are cached.
+        offers = VoucherViewSet().get_offers(request=request, voucher=voucher)['results']
+        self.assertEqual(len(offers), 2)
+
+        TieredCache.dangerous_clear_all_tiers()
         offers = VoucherViewSet().get_offers(request=request, voucher=voucher)['results']
         self.assertEqual(len(offers), 1)
 
@@ -262,6 +268,24 @@ class VoucherViewSetTests(DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockMixi
         self.assertNotIn(expired_seat, products)
         self.assertNotIn(future_enrollment_seat, products)
 
+    def test_retrieve_course_objects_batched(self):
+        """ Verify the products and stock records of all seat types are retrieved with one query each. """
+        course = CourseFactory(partner=self.partner)
+        verified_seat = course.create_or_update_seat('verified', True, 100)
+        audit_seat = course.create_or_update_seat('', False, 0)
+        other_course = CourseFactory(partner=self.partner)
+        professional_seat = other_course.create_or_update_seat('professional', False, 100)
+        course_discovery_results = [{'key': course.id}, {'key': other_course.id}]
+
+        with self.assertNumQueries(2):
+            products, stock_records, __ = VoucherViewSet().retrieve_course_objects(
+                course_discovery_results, 'professional,verified'
+            )
+        self.assertEqual(products, [professional_seat, verified_seat])
+        self.assertNotIn(audit_seat, products)
+        self.assertEqual(stock_records[verified_seat.id], verified_seat.stockrecords.first())
+        self.assertEqual(products[0].seat_type, 'professional')
+
 
 @ddt.ddt
 @httpretty.activate
@@ -12,6 +12,7 @@ from ecommerce.extensions.api.v2.views import checkout as checkout_views
 from ecommerce.extensions.api.v2.views import coupons as coupon_views
 from ecommerce.extensions.api.v2.views import courses as course_views
 from ecommerce.extensions.api.v2.views import enterprise as enterprise_views
+from ecommerce.extensions.api.v2.views import jobs as job_views
 from ecommerce.extensions.api.v2.views import orders as order_views
 from ecommerce.extensions.api.v2.views import partners as partner_views
 from ecommerce.extensions.api.v2.views import payments as payment_views
@@ -20,6 +21,7 @@ from ecommerce.extensions.api.v2.views import providers as provider_views
 from ecommerce.extensions.api.v2.views import publication as publication_views
 from ecommerce.extensions.api.v2.views import refunds as refund_views
 from ecommerce.extensions.api.v2.views import retirement as retirement_views
+from ecommerce.extensions.api.v2.views import stats as stats_views
 from ecommerce.extensions.api.v2.views import stockrecords as stockrecords_views
 from ecommerce.extensions.api.v2.views import user_management as user_management_views
 from ecommerce.extensions.api.v2.views import vouchers as voucher_views
@@ -114,6 +116,7 @@ urlpatterns = [
     url(r'^publication/', include((ATOMIC_PUBLICATION_URLS, 'publication'))),
     url(r'^refunds/', include((REFUND_URLS, 'refunds'))),
     url(r'^retirement/', include((RETIREMENT_URLS, 'retirement'))),
+    url(r'^stats/$', stats_views.StatsView.as_view(), name='stats'),
     url(r'^user_management/', include((USER_MANAGEMENT_URLS, 'user_management'))),
     url(r'^assignment-email/', include((ASSIGNMENT_EMAIL_URLS, 'assignment-email'))),
 ]
@@ -139,6 +142,7 @@ router.register(
 router.register(r'courses', course_views.CourseViewSet, basename='course') \
     .register(r'products', product_views.ProductViewSet,
               basename='course-product', parents_query_lookups=['course_id'])
+router.register(r'jobs', job_views.AsyncJobViewSet, basename='jobs')
 router.register(r'orders', order_views.OrderViewSet, basename='order')
 router.register(
     r'manual_course_enrollment_order',
@@ -1,16 +1,18 @@
 """HTTP endpoints for interacting with baskets."""
 
 
+import hashlib
 import logging
 import warnings
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import Count, Max
 from django.http import HttpResponseBadRequest, HttpResponseForbidden
 from django.utils.decorators import method_decorator
 from django.utils.translation import ugettext as _
-from edx_django_utils.cache import DEFAULT_REQUEST_CACHE, TieredCache
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
 from edx_rest_framework_extensions.permissions import IsSuperuser
 from oscar.core.loading import get_class, get_model
 from rest_framework import generics, status, viewsets
@@ -18,8 +20,9 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import DjangoModelPermissions, IsAuthenticated
 from rest_framework.response import Response
 
+from ecommerce.core.cache import BASKET_CALCULATE_CACHE
 from ecommerce.core.exceptions import MissingLmsUserIdException
-from ecommerce.core.utils import get_cache_key
+from ecommerce.enterprise.api import get_enterprise_id_for_user
 from ecommerce.extensions.analytics.utils import audit_log
 from ecommerce.extensions.api import data as data_api
 from ecommerce.extensions.api import exceptions as api_exceptions
@@ -31,14 +34,21 @@ from ecommerce.extensions.basket.utils import attribute_cookie_data
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
 from ecommerce.extensions.payment import exceptions as payment_exceptions
-from ecommerce.extensions.payment.helpers import get_default_processor_class, get_processor_class_by_name
+from ecommerce.extensions.payment.helpers import (
+    get_default_processor_class,
+    get_processor,
+    get_processor_class_by_name
+)
+from ecommerce.programs.conditions import ProgramCourseRunSeatsCondition
 
 Applicator = get_class('offer.applicator', 'Applicator')
 Basket = get_model('basket', 'Basket')
 logger = logging.getLogger(__name__)
+OfferAssignment = get_model('offer', 'OfferAssignment')
 Order = get_model('order', 'Order')
 OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
 Product = get_model('catalogue', 'Product')
+Refund = get_model('refund', 'Refund')
 Selector = get_class('partner.strategy', 'Selector')
 User = get_user_model()
 Voucher = get_model('voucher', 'Voucher')
@@ -217,7 +227,7 @@ class BasketCreateView(EdxOrderPlacementMixin, generics.CreateAPIView):
                 payment_processor = get_default_processor_class()
 
             try:
-                response_data = self._checkout(basket, payment_processor(request.site), request)
+                response_data = self._checkout(basket, get_processor(request.site, payment_processor), request)
             except Exception as ex:  # pylint: disable=broad-except
                 basket.delete()
                 logger.exception('Failed to initiate checkout for Basket [%d]. The basket has been deleted.', basket_id)
@@ -359,6 +369,8 @@ class BasketDestroyView(generics.DestroyAPIView):
 class BasketCalculateView(generics.GenericAPIView):
     permission_classes = (IsAuthenticated,)
     throttle_classes = (ServiceUserThrottle,)
+    query_budget = 79
+    query_duplicate_budget = 22
     MARKETING_USER = 'marketing_site_worker'
 
     def _report_bad_request(self, developer_message, user_message):
@@ -413,6 +425,35 @@ class BasketCalculateView(generics.GenericAPIView):
             raise
         return response
 
+    def _get_eligibility_fingerprint(self, request, user, code, bundle_id):
+        """
+        Return a hash of the data of the user which the offers applied to their basket depend on.
+
+        Changes to offers, vouchers, ranges and prices invalidate every cached calculation, see
+        `ecommerce.extensions.offer.signals`. The fingerprint covers the data of the user instead, so that users
+        with the same fingerprint share cached calculations: the email domain offers are restricted to, the orders
+        and refunds counting toward usage limits, the enrollments and entitlements counting toward program offers,
+        the assignments of the voucher and the other query parameters, such as the enterprise catalog.
+        """
+        fingerprint = {
+            'email_domain': user.email.rpartition('@')[2].lower(),
+            'is_staff': request.user.is_staff,
+            'orders': Order.objects.filter(user=user).aggregate(count=Count('id'), last_id=Max('id')),
+            'refunds': Refund.objects.filter(user=user).aggregate(count=Count('id'), modified=Max('modified')),
+            'query': sorted(
+                (key, sorted(values)) for key, values in request.GET.lists() if key not in ('username', 'is_anonymous')
+            ),
+        }
+        if code:
+            fingerprint['assignments'] = sorted(
+                OfferAssignment.objects.filter(code=code, user_email=user.email).values_list('id', 'status')
+            )
+        if bundle_id:
+            condition = ProgramCourseRunSeatsCondition(program_uuid=bundle_id)
+            fingerprint['ownership'] = condition.get_ownership_fingerprint(Basket(owner=user, site=request.site))
+
+        return hashlib.sha256(repr(sorted(fingerprint.items())).encode('utf-8')).hexdigest()
+
     def get(self, request):  # pylint: disable=too-many-statements
         """ Calculate basket totals given a list of sku's
 
@@ -421,6 +462,9 @@ class BasketCalculateView(generics.GenericAPIView):
         provided apply a voucher in the Enterprise entitlements available
         to the user.
 
+        Calculations are cached until offers, vouchers, ranges or prices change,
+        and shared by the users with the same eligibility fingerprint.
+
         Query Params:
             sku (string): A list of sku(s) to calculate
             code (string): Optional voucher code to apply to the basket.
@@ -507,24 +551,32 @@ class BasketCalculateView(generics.GenericAPIView):
                 api_exceptions.LMS_USER_ID_NOT_FOUND_USER_MESSAGE
             )
 
-        cache_key = None
         bundle_id = request.GET.get('bundle')
+
+        def calculate():
+            return self._calculate_temporary_basket_atomic(basket_owner, request, products, voucher, skus, code)
+
         if use_default_basket:
             # For an anonymous user we can directly get the cached price, because
             # there can't be any enrollments or entitlements.
             # We want bundle_id to be in the cache_key, since calls without bundle_id will produce different results
-            cache_key = get_cache_key(
-                site_domain=request.site,
-                resource_name='calculate',
+            response = BASKET_CALCULATE_CACHE.get_or_set(
+                request.site.domain,
+                calculate,
+                timeout=settings.ANONYMOUS_BASKET_CALCULATE_CACHE_TIMEOUT,
                 skus=skus,
-                bundle_id=bundle_id
+                code=code,
+                bundle_id=bundle_id,
+            )
+        else:
+            response = BASKET_CALCULATE_CACHE.get_or_set(
+                request.site.domain,
+                calculate,
+                skus=skus,
+                code=code,
+                bundle_id=bundle_id,
+                enterprise_id=get_enterprise_id_for_user(request.site, basket_owner),
+                fingerprint=self._get_eligibility_fingerprint(request, basket_owner, code, bundle_id),
             )
-            cached_response = TieredCache.get_cached_response(cache_key)
-            if cached_response.is_found:
-                return Response(cached_response.value)
-
-        response = self._calculate_temporary_basket_atomic(basket_owner, request, products, voucher, skus, code)
-        if response and use_default_basket:
-            TieredCache.set_all_tiers(cache_key, response, settings.ANONYMOUS_BASKET_CALCULATE_CACHE_TIMEOUT)
 
         return Response(response)
@@ -22,6 +22,8 @@ from rest_framework.viewsets import ModelViewSet, ViewSet
 from slumber.exceptions import SlumberHttpBaseException
 
 from ecommerce.core.constants import COUPON_PRODUCT_CLASS_NAME, DEFAULT_CATALOG_PAGE_SIZE
+from ecommerce.core.jobs import is_async_request, job_accepted_response, start_job
+from ecommerce.core.views import ReadReplicaMixin
 from ecommerce.coupons.utils import is_coupon_available
 from ecommerce.enterprise.utils import (
     get_enterprise_catalog,
@@ -212,9 +214,10 @@ class OfferAssignmentSummaryViewSet(ModelViewSet):
         return list(offer_assignments_with_counts.values())
 
 
-class EnterpriseCouponViewSet(CouponViewSet):
+class EnterpriseCouponViewSet(ReadReplicaMixin, CouponViewSet):
     """ Coupon resource. """
     pagination_class = DatatablesDefaultPagination
+    read_replica_actions = ('codes', 'overview', 'search',)
 
     def get_queryset(self):
         filter_kwargs = {
@@ -723,6 +726,13 @@ class EnterpriseCouponViewSet(CouponViewSet):
         if errors:
             raise DRFValidationError({'error': errors})
 
+    @staticmethod
+    def _get_job_email_context(context):
+        """
+        Return the JSON-serializable part of the serializer context of remind and revoke, for their jobs.
+        """
+        return {key: value for key, value in context.items() if key not in ('coupon', 'site')}
+
     def add_extra_user_info(self, lms_users, user):
         """
         Update user dict to add lms_user_id and username from lms_users.
@@ -859,6 +869,8 @@ class EnterpriseCouponViewSet(CouponViewSet):
     def revoke(self, request, pk):  # pylint: disable=unused-argument
         """
         Revoke users by email from codes within the Coupon.
+
+        With `?async=true`, the assignments are revoked in a job, and the response is 202 with the URL of the job.
         """
         coupon = self.get_object()
         self._validate_coupon_availablity(coupon, 'Coupon is not available for code revoke')
@@ -902,6 +914,17 @@ class EnterpriseCouponViewSet(CouponViewSet):
         serializer = CouponCodeRevokeSerializer(data=assignments, many=True, context=context)
         if serializer.is_valid():
             self.add_extra_user_info_in_assignments(assignments)
+            if is_async_request(request):
+                job = start_job(
+                    revoke_coupon_assignments,
+                    request.site,
+                    request.user,
+                    coupon_id=coupon.id,
+                    assignments=assignments,
+                    email_context=self._get_job_email_context(context),
+                    uploaded_files=uploaded_files,
+                )
+                return job_accepted_response(request, job)
             serializer = CouponCodeRevokeSerializer(data=assignments, many=True, context=context)
             if serializer.is_valid():
                 serializer.save()
@@ -923,6 +946,8 @@ class EnterpriseCouponViewSet(CouponViewSet):
         """
         Remind users of pending offer assignments by email.
         coupons/<id>/remind
+
+        With `?async=true`, the reminders are sent in a job, and the response is 202 with the URL of the job.
         """
 
         coupon = self.get_object()
@@ -986,6 +1011,17 @@ class EnterpriseCouponViewSet(CouponViewSet):
         serializer = CouponCodeRemindSerializer(data=assignments, many=True, context=context)
         if serializer.is_valid():
             self.add_extra_user_info_in_assignments(assignments)
+            if is_async_request(request):
+                job = start_job(
+                    remind_coupon_assignments,
+                    request.site,
+                    request.user,
+                    coupon_id=coupon.id,
+                    assignments=assignments,
+                    email_context=self._get_job_email_context(context),
+                    uploaded_files=uploaded_files,
+                )
+                return job_accepted_response(request, job)
             serializer = CouponCodeRemindSerializer(data=assignments, many=True, context=context)
             if serializer.is_valid():
                 serializer.save()
@@ -1060,3 +1096,46 @@ class OfferAssignmentEmailTemplatesViewSet(PermissionRequiredMixin, ModelViewSet
         files_to_send = TemplateFileAttachmentSerializer(files_to_send, many=True)
         updated_template_response.data.update({'email_files': files_to_send.data})
         return updated_template_response
+
+
+def _save_coupon_assignments(job, serializer_class, coupon_id, assignments, email_context, uploaded_files):
+    """
+    Validate and save the assignments with the remind or revoke serializer, for their jobs.
+
+    The uploaded email attachments are deleted if any email could not be sent, as in the endpoints.
+    """
+    context = dict(email_context, coupon=Product.objects.get(id=coupon_id), site=job.site)
+    job.set_progress(0, total=len(assignments))
+    serializer = serializer_class(data=assignments, many=True, context=context)
+    serializer.is_valid(raise_exception=True)
+
+    serializer.save()
+    if any(item['detail'] == 'failure' for item in serializer.data):
+        for file in uploaded_files:
+            delete_file_from_s3_with_key(file['name'])
+    job.set_progress(len(assignments))
+    return serializer.data
+
+
+def remind_coupon_assignments(job, coupon_id, assignments, email_context, uploaded_files):
+    """
+    Job of `EnterpriseCouponViewSet.remind` in async mode, see `ecommerce.core.jobs`.
+    """
+    return _save_coupon_assignments(
+        job, CouponCodeRemindSerializer, coupon_id, assignments, email_context, uploaded_files
+    )
+
+
+def revoke_coupon_assignments(job, coupon_id, assignments, email_context, uploaded_files):
+    """
+    Job of `EnterpriseCouponViewSet.revoke` in async mode, see `ecommerce.core.jobs`.
+    """
+    data = _save_coupon_assignments(
+        job, CouponCodeRevokeSerializer, coupon_id, assignments, email_context, uploaded_files
+    )
+    # unsubscribe user from receiving nudge emails
+    CodeAssignmentNudgeEmails.unsubscribe_from_nudging(
+        [assignment['code'] for assignment in assignments],
+        [assignment['user']['email'] for assignment in assignments]
+    )
+    return data
@@ -0,0 +1,25 @@
+"""HTTP endpoints for the status and result of API jobs."""
+
+
+from rest_framework import viewsets
+from rest_framework.permissions import IsAuthenticated
+
+from ecommerce.core.models import AsyncJob
+from ecommerce.extensions.api import serializers
+
+
+class AsyncJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Status, progress and result of the jobs started by API endpoints in async mode, see `ecommerce.core.jobs`.
+
+    GET /api/v2/jobs/<uuid>/
+    """
+    lookup_field = 'uuid'
+    permission_classes = (IsAuthenticated,)
+    serializer_class = serializers.AsyncJobSerializer
+
+    def get_queryset(self):
+        queryset = AsyncJob.objects.filter(site=self.request.site).order_by('-created')
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(user=self.request.user)
+        return queryset
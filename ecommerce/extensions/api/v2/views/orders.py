@@ -22,6 +22,8 @@ from rest_framework.response import Response
 from rest_framework.viewsets import ViewSet
 from slumber.exceptions import HttpServerError, SlumberBaseException
 
+from ecommerce.core.jobs import is_async_request, job_accepted_response, start_job
+from ecommerce.core.views import ReadReplicaMixin
 from ecommerce.courses.models import Course
 from ecommerce.courses.utils import get_course_run_detail
 from ecommerce.enterprise.mixins import EnterpriseDiscountMixin
@@ -34,7 +36,7 @@ from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.fulfillment.status import LINE, ORDER
 from ecommerce.extensions.offer.models import OFFER_PRIORITY_MANUAL_ORDER
 from ecommerce.extensions.order.benefits import ManualEnrollmentOrderDiscountBenefit
-from ecommerce.extensions.order.conditions import ManualEnrollmentOrderDiscountCondition
+from ecommerce.extensions.order.conditions import ManualEnrollmentOrderDiscountCondition, manual_enrollment_order_job
 from ecommerce.programs.custom import class_path
 
 logger = logging.getLogger(__name__)
@@ -51,8 +53,9 @@ Benefit = get_model('offer', 'Benefit')
 
 
 @method_decorator(transaction.non_atomic_requests, name='dispatch')
-class OrderViewSet(viewsets.ReadOnlyModelViewSet):
+class OrderViewSet(ReadReplicaMixin, viewsets.ReadOnlyModelViewSet):
     lookup_field = 'number'
+    read_replica_actions = ('list', 'retrieve',)
     permission_classes = (IsAuthenticated, IsStaffOrOwner, DjangoModelPermissions,)
     queryset = Order.objects.all()
     serializer_class = serializers.OrderSerializer
@@ -173,6 +176,9 @@ class ManualCourseEnrollmentOrderViewSet(EdxOrderPlacementMixin, EnterpriseDisco
             >>>         },
             >>>     ]
             >>> }
+
+            POST /api/v2/manual_course_enrollment_order/?async=true creates the orders in a job, and
+            responds with 202 and the URL of the job right away. The result of the job is the response above.
     """
 
     authentication_classes = (JwtAuthentication,)
@@ -215,6 +221,10 @@ class ManualCourseEnrollmentOrderViewSet(EdxOrderPlacementMixin, EnterpriseDisco
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        if is_async_request(request):
+            job = start_job(create_manual_course_enrollment_orders, request.site, request.user, enrollments=enrollments)
+            return job_accepted_response(request, job)
+
         orders = []
         for enrollment in enrollments:
             orders.append(self._create_single_order(enrollment, request.user, request.site))
@@ -503,3 +513,17 @@ class ManualCourseEnrollmentOrderViewSet(EdxOrderPlacementMixin, EnterpriseDisco
         )
 
         return order
+
+
+def create_manual_course_enrollment_orders(job, enrollments):
+    """
+    Job creating the orders of `ManualCourseEnrollmentOrderViewSet.create` in async mode, see `ecommerce.core.jobs`.
+    """
+    viewset = ManualCourseEnrollmentOrderViewSet()
+    orders = []
+    job.set_progress(0, total=len(enrollments))
+    with manual_enrollment_order_job():
+        for enrollment in enrollments:
+            orders.append(viewset._create_single_order(enrollment, job.user, job.site))  # pylint: disable=protected-access
+            job.set_progress(len(orders))
+    return {'orders': orders}
@@ -0,0 +1,33 @@
+"""HTTP endpoint for the cache and upstream service metrics of the current process."""
+
+
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ecommerce.core.instrumentation import metrics
+
+
+class PrometheusTextRenderer(BaseRenderer):
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
+
+
+class StatsView(APIView):
+    """
+    Returns the cache hit ratios and upstream latency and payload size histograms of the worker serving the request.
+
+    Metrics are returned as JSON, or in the Prometheus text format with `?format=prometheus`.
+    """
+    permission_classes = (IsAuthenticated, IsAdminUser,)
+    renderer_classes = (JSONRenderer, PrometheusTextRenderer,)
+
+    def get(self, request):
+        if request.accepted_renderer.format == PrometheusTextRenderer.format:
+            return Response(metrics.as_prometheus_text())
+        return Response(metrics.as_dict())
@@ -2,14 +2,18 @@
 
 
 import logging
+from functools import lru_cache
 from urllib.parse import urlparse
 
 import django_filters
 import pytz
 from dateutil.parser import parse
 from dateutil.utils import default_tzinfo
+from django.conf import settings
+from django.db.models import OuterRef, Subquery
 from django.shortcuts import get_object_or_404
 from django.utils.timezone import now
+from django.utils.translation import get_language
 from opaque_keys.edx.keys import CourseKey
 from oscar.core.loading import get_model
 from requests.exceptions import ConnectionError as ReqConnectionError
@@ -20,6 +24,8 @@ from rest_framework.response import Response
 from slumber.exceptions import SlumberBaseException
 
 from ecommerce.core.constants import DEFAULT_CATALOG_PAGE_SIZE
+from ecommerce.core.utils import get_cache_key, get_or_set_cache
+from ecommerce.core.views import ReadReplicaMixin
 from ecommerce.coupons.utils import fetch_course_catalog, get_catalog_course_runs
 from ecommerce.courses.models import Course
 from ecommerce.courses.utils import get_course_info_from_catalog
@@ -31,10 +37,47 @@ from ecommerce.extensions.api.v2.views import NonDestroyableModelViewSet
 logger = logging.getLogger(__name__)
 Order = get_model('order', 'Order')
 Product = get_model('catalogue', 'Product')
+ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
 StockRecord = get_model('partner', 'StockRecord')
 Voucher = get_model('voucher', 'Voucher')
 
 
+@lru_cache(maxsize=4096)
+def get_enrollability_window(course_run_key, end, enrollment_start, enrollment_end):
+    """
+    Return the parsed (end, enrollment_start, enrollment_end) dates of a course run.
+
+    The raw date strings are part of the cache key, so a course run whose dates change in Discovery is parsed again.
+    """
+    # pylint: disable=unused-argument
+    return tuple(
+        value and default_tzinfo(parse(value), pytz.UTC)
+        for value in (end, enrollment_start, enrollment_end)
+    )
+
+
+def is_course_run_enrollable(course_run):
+    """
+    Checks if a course run is available for enrollment by checking the following conditions:
+        if end date is not set or is in the future
+        if enrollment start is not set or is in the past
+        if enrollment end is not set or is in the future
+    """
+    end, enrollment_start, enrollment_end = get_enrollability_window(
+        course_run.get('key'),
+        course_run.get('end'),
+        course_run.get('enrollment_start'),
+        course_run.get('enrollment_end'),
+    )
+    current_time = now()
+
+    return (
+        (not end or end > current_time) and
+        (not enrollment_start or enrollment_start <= current_time) and
+        (not enrollment_end or enrollment_end > current_time)
+    )
+
+
 class VoucherFilter(django_filters.rest_framework.FilterSet):
     """
     Filter for vouchers via query string parameters.
@@ -47,8 +90,9 @@ class VoucherFilter(django_filters.rest_framework.FilterSet):
         fields = ('code',)
 
 
-class VoucherViewSet(NonDestroyableModelViewSet):
+class VoucherViewSet(ReadReplicaMixin, NonDestroyableModelViewSet):
     """ View set for vouchers. """
+    read_replica_actions = ('offers',)
     serializer_class = serializers.VoucherSerializer
     permission_classes = (IsOffersOrIsAuthenticatedAndStaff,)
     filter_backends = (django_filters.rest_framework.DjangoFilterBackend,)
@@ -110,28 +154,11 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             course_seat_types(str): Comma-separated list of accepted seat types.
 
         Returns:
-            Querysets of products and stock records retrieved from results.
+            The list of products, a dict mapping product ids to their stock record and the course run metadata
+            retrieved from results. Each product is annotated with its `seat_type`.
         """
         course_run_metadata = {}
 
-        def is_course_run_enrollable(course_run):
-            # Checks if a course run is available for enrollment by checking the following conditions:
-            #   if end date is not set or is in the future
-            #   if enrollment start is not set or is in the past
-            #   if enrollment end is not set or is in the future
-            end = course_run.get('end') and default_tzinfo(parse(course_run['end']), pytz.UTC)
-            enrollment_start = (course_run.get('enrollment_start') and
-                                default_tzinfo(parse(course_run['enrollment_start']), pytz.UTC))
-            enrollment_end = (course_run.get('enrollment_end') and
-                              default_tzinfo(parse(course_run['enrollment_end']), pytz.UTC))
-            current_time = now()
-
-            return (
-                (not end or end > current_time) and
-                (not enrollment_start or enrollment_start <= current_time) and
-                (not enrollment_end or enrollment_end > current_time)
-            )
-
         for result in results:
             if 'content_type' in result and result['content_type'] == 'course':
                 for course_run in result['course_runs']:
@@ -144,17 +171,32 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             elif is_course_run_enrollable(result):
                 course_run_metadata[result['key']] = result
 
-        products = []
-        for seat_type in course_seat_types.split(','):
-            products.extend(Product.objects.filter(
-                course_id__in=list(course_run_metadata.keys()),
-                attributes__name='certificate_type',
-                attribute_values__value_text=seat_type
-            ))
-        stock_records = StockRecord.objects.filter(product__in=products)
+        seat_types = course_seat_types.split(',')
+        certificate_types = ProductAttributeValue.objects.filter(
+            product=OuterRef('pk'),
+            attribute__name='certificate_type',
+        ).values('value_text')[:1]
+        products = Product.objects.filter(
+            course_id__in=list(course_run_metadata.keys()),
+        ).annotate(
+            seat_type=Subquery(certificate_types)
+        ).filter(
+            seat_type__in=seat_types,
+        ).select_related('course', 'parent__product_class', 'product_class')
+        # Keep the products grouped by seat type, in the order the seat types are configured.
+        products = sorted(products, key=lambda product: seat_types.index(product.seat_type))
+
+        stock_records = {}
+        for stock_record in StockRecord.objects.filter(product__in=products):
+            stock_records.setdefault(stock_record.product_id, stock_record)
         return products, stock_records, course_run_metadata
 
     def convert_catalog_response_to_offers(self, request, voucher, response):
+        """
+        Return the offers for the products of a catalog response page.
+
+        Credit seats are included regardless of the user's eligibility, see `filter_credit_offers`.
+        """
         offers = []
         benefit = voucher.best_offer.benefit
         # default course_seat_types value to all paid seat types.
@@ -174,19 +216,19 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             logger.info('[Voucher Offers] Constructing offer data. Product: [%s]', product.id)
             # Omit unavailable seats from the offer results so that one seat does not cause an
             # error message for every seat in the query result.
-            if not request.strategy.fetch_for_product(product).availability.is_available_to_buy:
+            stock_record = stock_records.get(product.id)
+            purchase_info = request.strategy.fetch_for_product(product, stockrecord=stock_record)
+            if not purchase_info.availability.is_available_to_buy:
                 logger.info('%s is unavailable to buy. Omitting it from the results.', product)
                 continue
 
             course_id = product.course_id
             course_catalog_data = course_run_metadata[course_id]
-            if course_seat_types == 'credit' or product.attr.certificate_type == 'credit':
+            if stock_record is None:
+                logger.error('Stock Record for product %s not found.', product.id)
+
+            if product.seat_type == 'credit':
                 logger.info('[Voucher Offers] Constructing offer data for credit.')
-                # Omit credit seats for which the user is not eligible or which the user already bought.
-                if not request.user.is_eligible_for_credit(product.course_id, request.site.siteconfiguration):
-                    continue
-                if Order.objects.filter(user=request.user, lines__product=product).exists():
-                    continue
                 credit_seats = Product.objects.filter(parent=product.parent, attributes__name='credit_provider')
 
                 if credit_seats.count() > 1:
@@ -194,24 +236,12 @@ class VoucherViewSet(NonDestroyableModelViewSet):
                     credit_provider_price = None
                 else:
                     multiple_credit_providers = False
-                    credit_provider_price = StockRecord.objects.get(product=product).price_excl_tax
-
-            try:
-                stock_record = stock_records.get(product__id=product.id)
-            except StockRecord.DoesNotExist:
-                stock_record = None
-                logger.error('Stock Record for product %s not found.', product.id)
+                    credit_provider_price = stock_record.price_excl_tax if stock_record else None
 
-            try:
-                course = Course.objects.get(id=course_id)
-            except Course.DoesNotExist:  # pragma: no cover
-                course = None
-                logger.error('Course %s not found.', course_id)
-
-            if course_catalog_data and course and stock_record:
+            if course_catalog_data and stock_record:
                 offers.append(self.get_course_offer_data(
                     benefit=benefit,
-                    course=course,
+                    course=product.course,
                     course_info=course_catalog_data,
                     credit_provider_price=credit_provider_price,
                     multiple_credit_providers=multiple_credit_providers,
@@ -223,9 +253,39 @@ class VoucherViewSet(NonDestroyableModelViewSet):
 
         return offers
 
+    def filter_credit_offers(self, request, offers):
+        """
+        Omit credit seats for which the user is not eligible or which the user already bought.
+        """
+        credit_product_ids = [offer['stockrecords']['product'] for offer in offers if offer['seat_type'] == 'credit']
+        if not credit_product_ids:
+            return offers
+
+        purchased_product_ids = set(
+            Order.objects.filter(
+                user=request.user, lines__product__in=credit_product_ids
+            ).values_list('lines__product', flat=True)
+        )
+        eligibility = {}
+        filtered_offers = []
+        for offer in offers:
+            if offer['seat_type'] == 'credit':
+                course_id = offer['id']
+                if course_id not in eligibility:
+                    eligibility[course_id] = request.user.is_eligible_for_credit(
+                        course_id, request.site.siteconfiguration
+                    )
+                if not eligibility[course_id] or offer['stockrecords']['product'] in purchased_product_ids:
+                    continue
+            filtered_offers.append(offer)
+        return filtered_offers
+
     def get_offers_from_catalog(self, request, voucher):
         """ Helper method for collecting offers from catalog query or enterprise catalog.
 
+        The offers of a catalog page are cached per voucher, page and language for VOUCHER_OFFERS_CACHE_TIMEOUT
+        seconds. Credit seats are filtered for the requesting user after the offers are read from the cache.
+
         Args:
             request (WSGIRequest): Request data.
             voucher (Voucher): Oscar Voucher for which the offers are returned.
@@ -253,6 +313,28 @@ class VoucherViewSet(NonDestroyableModelViewSet):
         if not catalog_query and not enterprise_customer:
             return None, None
 
+        cache_key = get_cache_key(
+            site_domain=request.site.domain,
+            resource='voucher_offers',
+            voucher_id=voucher.id,
+            limit=request.GET.get('limit'),
+            page=request.GET.get('page'),
+            offset=request.GET.get('offset'),
+            language=get_language(),
+        )
+        offers, next_page = get_or_set_cache(
+            cache_key,
+            lambda: self._get_catalog_offers(request, voucher, catalog_query, enterprise_catalog),
+            settings.VOUCHER_OFFERS_CACHE_TIMEOUT,
+            namespace='voucher_offers',
+        )
+
+        return self.filter_credit_offers(request, offers), next_page
+
+    def _get_catalog_offers(self, request, voucher, catalog_query, enterprise_catalog):
+        """
+        Return the offers and the link to the next page for the requested page of the voucher's catalog.
+        """
         if enterprise_catalog:
             response = get_enterprise_catalog(
                 site=request.site,
@@ -349,7 +431,7 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             'multiple_credit_providers': multiple_credit_providers,
             'organization': CourseKey.from_string(course.id).org,
             'credit_provider_price': credit_provider_price,
-            'seat_type': product.attr.certificate_type,
+            'seat_type': getattr(product, 'seat_type', None) or product.attr.certificate_type,
             'stockrecords': serializers.StockRecordSerializer(stock_record).data,
             'title': course_info.get('title', course.name),
             'voucher_end_date': voucher.end_datetime
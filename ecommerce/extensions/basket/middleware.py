@@ -32,6 +32,55 @@ class BasketMiddleware(OscarBasketMiddleware):
         key = '{base}_{site_id}'.format(base=key, site_id=request.site.id)
         return key
 
+    def get_session_key(self, request):
+        """
+        Returns the session key under which the id of the open basket of the user is remembered.
+
+        Parameters:
+            request (Request) -- current request being processed
+
+        Returns:
+            str - session key
+        """
+        return 'open_basket_{site_id}'.format(site_id=request.site.id)
+
+    def get_session_basket(self, request):
+        """
+        Returns the open basket remembered in the session of a signed-in user.
+
+        The basket is only looked up if the user has no cookie basket to merge, and was remembered for the same
+        user. Returns None if the basket must be looked up in full, which merges baskets if needed.
+        """
+        session = getattr(request, 'session', None)
+        if session is None or self.get_cookie_key(request) in request.COOKIES:
+            return None
+
+        remembered = session.get(self.get_session_key(request))
+        if not remembered or remembered[0] != request.user.id:
+            return None
+
+        basket = Basket.open.filter(pk=remembered[1], owner=request.user, site=request.site).first()
+        if basket is None:
+            # The basket has been submitted, frozen or merged since.
+            return None
+        return basket
+
+    def remember_basket(self, request, basket):
+        """
+        Remembers the open basket of a signed-in user in their session, so that the next requests load it by id.
+
+        Requests without a session cookie, such as API requests authenticated with a JWT, do not get a session
+        just for this.
+        """
+        session = getattr(request, 'session', None)
+        if session is None or session.session_key is None or basket.id is None:
+            return
+
+        key = self.get_session_key(request)
+        remembered = [request.user.id, basket.id]
+        if session.get(key) != remembered:
+            session[key] = remembered
+
     def get_basket(self, request):
         """ Return the open basket for this request """
         # pylint: disable=protected-access
@@ -39,6 +88,14 @@ class BasketMiddleware(OscarBasketMiddleware):
             monitoring_utils.set_custom_metric('basket_id', request._basket_cache.id)
             return request._basket_cache
 
+        if hasattr(request, 'user') and request.user.is_authenticated:
+            basket = self.get_session_basket(request)
+            if basket is not None:
+                basket.owner = request.user
+                request._basket_cache = basket
+                monitoring_utils.set_custom_metric('basket_id', basket.id)
+                return basket
+
         manager = Basket.open
         cookie_key = self.get_cookie_key(request)
         cookie_basket = self.get_cookie_basket(cookie_key, request, manager)
@@ -65,6 +122,8 @@ class BasketMiddleware(OscarBasketMiddleware):
                 self.merge_baskets(basket, cookie_basket)
                 request.cookies_to_delete.append(cookie_key)
 
+            self.remember_basket(request, basket)
+
         elif cookie_basket:
             # Anonymous user with a basket tied to the cookie
             basket = cookie_basket
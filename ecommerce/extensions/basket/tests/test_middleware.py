@@ -3,6 +3,8 @@
 import mock
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.signing import Signer
 from django.http import HttpResponse
 from django.test.client import RequestFactory
 from oscar.core.loading import get_model
@@ -101,3 +103,75 @@ class BasketMiddlewareTests(TestCase):
         """ Verify the method returns a site-specific key. """
         expected = '{base}_{site_id}'.format(base=settings.OSCAR_BASKET_COOKIE_OPEN, site_id=self.site.id)
         self.assertEqual(self.middleware.get_cookie_key(self.request), expected)
+
+    def _get_request_with_session(self, user):
+        request = RequestFactory().get('/')
+        request.user = user
+        request.site = self.site
+        request.cookies_to_delete = []
+        request._basket_cache = None  # pylint: disable=protected-access
+        request.session = SessionStore()
+        request.session.create()
+        return request
+
+    def test_get_basket_remembers_basket_in_session(self):
+        """ Verify the open basket of a signed-in user is remembered in their session, and then loaded by id. """
+        user = self.create_user()
+        basket = BasketFactory(owner=user, site=self.site)
+        request = self._get_request_with_session(user)
+        self.assertEqual(self.middleware.get_basket(request), basket)
+        self.assertEqual(request.session[self.middleware.get_session_key(request)], [user.id, basket.id])
+
+        next_request = self._get_request_with_session(user)
+        next_request.session = request.session
+        with self.assertNumQueries(1):
+            self.assertEqual(self.middleware.get_basket(next_request), basket)
+
+    def test_get_basket_without_session_key(self):
+        """ Verify requests without a session cookie do not get a session to remember the basket. """
+        user = self.create_user()
+        request = self._get_request_with_session(user)
+        request.session = SessionStore()
+        self.middleware.get_basket(request)
+        self.assertIsNone(request.session.session_key)
+        self.assertNotIn(self.middleware.get_session_key(request), request.session)
+
+    def test_get_basket_with_stale_session_basket(self):
+        """ Verify a new open basket is looked up if the remembered basket is no longer open. """
+        user = self.create_user()
+        basket = BasketFactory(owner=user, site=self.site)
+        request = self._get_request_with_session(user)
+        self.middleware.get_basket(request)
+        basket.submit()
+
+        next_request = self._get_request_with_session(user)
+        next_request.session = request.session
+        new_basket = self.middleware.get_basket(next_request)
+        self.assertNotEqual(new_basket, basket)
+        self.assertEqual(request.session[self.middleware.get_session_key(request)], [user.id, new_basket.id])
+
+    def test_get_basket_with_session_basket_of_other_user(self):
+        """ Verify the basket remembered for another user is not returned. """
+        user = self.create_user()
+        other_basket = BasketFactory(owner=self.create_user(), site=self.site)
+        request = self._get_request_with_session(user)
+        request.session[self.middleware.get_session_key(request)] = [user.id, other_basket.id]
+        basket = self.middleware.get_basket(request)
+        self.assertNotEqual(basket, other_basket)
+        self.assertEqual(basket.owner, user)
+
+    def test_get_basket_with_session_basket_and_cookie_basket(self):
+        """ Verify a cookie basket is still merged into the basket remembered in the session. """
+        user = self.create_user()
+        basket = BasketFactory(owner=user, site=self.site)
+        request = self._get_request_with_session(user)
+        self.middleware.get_basket(request)
+
+        cookie_basket = BasketFactory(owner=None, site=self.site)
+        cookie_key = self.middleware.get_cookie_key(request)
+        next_request = self._get_request_with_session(user)
+        next_request.session = request.session
+        next_request.COOKIES[cookie_key] = Signer().sign(cookie_basket.id)
+        self.assertEqual(self.middleware.get_basket(next_request), basket)
+        self.assertEqual(Basket.objects.get(id=cookie_basket.id).status, Basket.MERGED)
+        self.assertIn(cookie_key, next_request.cookies_to_delete)
@@ -17,7 +17,7 @@ from django.contrib.messages import get_messages
 from django.http import HttpResponseRedirect
 from django.test import override_settings
 from django.urls import reverse
-from edx_django_utils.cache import RequestCache, TieredCache
+from edx_django_utils.cache import RequestCache
 from oscar.apps.basket.forms import BasketVoucherForm
 from oscar.core.loading import get_class, get_model
 from oscar.test import factories
@@ -27,10 +27,10 @@ from slumber.exceptions import SlumberBaseException
 from testfixtures import LogCapture
 from waffle.testutils import override_flag
 
+from ecommerce.core.cache import COURSES_CACHE
 from ecommerce.core.exceptions import SiteConfigurationError
 from ecommerce.core.tests import toggle_switch
 from ecommerce.core.url_utils import absolute_url, get_lms_url
-from ecommerce.core.utils import get_cache_key
 from ecommerce.coupons.tests.mixins import CouponMixin, DiscoveryMockMixin
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.enterprise.tests.mixins import EnterpriseServiceMockMixin
@@ -208,7 +208,8 @@ class BasketAddItemsViewTests(CouponMixin, DiscoveryTestMixin, DiscoveryMockMixi
         stock_record = StockRecordFactory(product=product2, partner=self.partner)
         catalog.stock_records.add(stock_record)
 
-        with mock.patch.object(UserAlreadyPlacedOrder, 'user_already_placed_order', return_value=True):
+        with mock.patch.object(UserAlreadyPlacedOrder, 'already_purchased',
+                               side_effect=lambda user, products, site: products):
             response = self._get_response(
                 [product.stockrecords.first().partner_sku for product in [product1, product2]],
             )
@@ -220,7 +221,7 @@ class BasketAddItemsViewTests(CouponMixin, DiscoveryTestMixin, DiscoveryMockMixi
         Test user can purchase products which have not been already purchased
         """
         products = ProductFactory.create_batch(3, stockrecords__partner=self.partner)
-        with mock.patch.object(UserAlreadyPlacedOrder, 'user_already_placed_order', return_value=False):
+        with mock.patch.object(UserAlreadyPlacedOrder, 'already_purchased', return_value=[]):
             response = self._get_response([product.stockrecords.first().partner_sku for product in products])
             self.assertEqual(response.status_code, 303)
 
@@ -994,16 +995,13 @@ class BasketSummaryViewTests(EnterpriseServiceMockMixin, DiscoveryTestMixin, Dis
             self.course, discovery_api_url=self.site_configuration.discovery_api_url
         )
 
-        cache_key = get_cache_key(
-            site_domain=self.site,
-            resource="{}-{}".format('course_runs', self.course.id)
-        )
-        course_before_cached_response = TieredCache.get_cached_response(cache_key)
+        resource = "{}-{}".format('course_runs', self.course.id)
+        course_before_cached_response = COURSES_CACHE.get_cached_response(self.site.domain, resource=resource)
         self.assertFalse(course_before_cached_response.is_found)
 
         response = self.client.get(self.path)
         self.assertEqual(response.status_code, 200)
-        course_after_cached_response = TieredCache.get_cached_response(cache_key)
+        course_after_cached_response = COURSES_CACHE.get_cached_response(self.site.domain, resource=resource)
         self.assertEqual(course_after_cached_response.value['title'], self.course.name)
 
     @ddt.data({
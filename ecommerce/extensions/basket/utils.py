@@ -151,6 +151,11 @@ def prepare_basket(request, products, voucher=None):
             return basket
 
     is_multi_product_basket = len(products) > 1
+    purchased_products = UserAlreadyPlacedOrder.already_purchased(
+        request.user,
+        [product for product in products if not product.is_enrollment_code_product],
+        request.site
+    )
     for product in products:
         # Multiple clicks can try adding twice, return if product is seat already in basket
         if is_duplicate_seat_attempt(basket, product):
@@ -162,9 +167,7 @@ def prepare_basket(request, products, voucher=None):
             )
             return basket
 
-        if product.is_enrollment_code_product or \
-                not UserAlreadyPlacedOrder.user_already_placed_order(user=request.user,
-                                                                     product=product, site=request.site):
+        if product not in purchased_products:
             basket.add_product(product, 1)
             # Call signal handler to notify listeners that something has been added to the basket
             basket_addition.send(sender=basket_addition, product=product, user=request.user, request=request,
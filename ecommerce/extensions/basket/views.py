@@ -61,6 +61,7 @@ from ecommerce.extensions.basket.utils import (
     prepare_basket,
     validate_voucher
 )
+from ecommerce.extensions.catalogue.snapshots import get_line_snapshots
 from ecommerce.extensions.offer.constants import DYNAMIC_DISCOUNT_FLAG
 from ecommerce.extensions.offer.dynamic_conditional_offer import get_percentage_from_request
 from ecommerce.extensions.offer.utils import (
@@ -73,6 +74,7 @@ from ecommerce.extensions.order.exceptions import AlreadyPlacedOrderException
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
 from ecommerce.extensions.payment.constants import CLIENT_SIDE_CHECKOUT_FLAG_NAME
 from ecommerce.extensions.payment.forms import PaymentForm
+from ecommerce.extensions.payment.helpers import get_processor
 from ecommerce.programs.utils import get_program
 
 Basket = get_model('basket', 'basket')
@@ -118,11 +120,11 @@ class BasketLogicMixin:
         }
 
         lines_data = []
-        for line in lines:
+        for line, snapshot in zip(lines, get_line_snapshots(lines)):
             product = line.product
-            if product.is_seat_product or product.is_course_entitlement_product:
+            if snapshot.is_seat_product or snapshot.is_course_entitlement_product:
                 line_data, _ = self._get_course_data(product)
-            elif product.is_enrollment_code_product:
+            elif snapshot.is_enrollment_code_product:
                 line_data, course = self._get_course_data(product)
                 self._set_single_enrollment_code_warning_if_needed(product, course)
                 context_updates['is_enrollment_code_purchase'] = True
@@ -136,15 +138,16 @@ class BasketLogicMixin:
                     'product_subject': None,
                 }
 
-            context_updates['order_details_msg'] = self._get_order_details_message(product)
+            context_updates['order_details_msg'] = self._get_order_details_message(snapshot)
             context_updates['switch_link_text'], context_updates['partner_sku'] = get_basket_switch_data(product)
 
             line_data.update({
-                'sku': product.stockrecords.first().partner_sku,
+                'sku': snapshot.partner_sku,
                 'benefit_value': self._get_benefit_value(line),
-                'enrollment_code': product.is_enrollment_code_product,
+                'enrollment_code': snapshot.is_enrollment_code_product,
                 'line': line,
-                'seat_type': self._get_certificate_type_display_value(product),
+                'product_snapshot': snapshot,
+                'seat_type': self._get_certificate_type_display_value(snapshot),
             })
             lines_data.append(line_data)
 
@@ -290,22 +293,20 @@ class BasketLogicMixin:
         return course_data, course
 
     @newrelic.agent.function_trace()
-    def _get_order_details_message(self, product):
-        if product.is_course_entitlement_product:
+    def _get_order_details_message(self, snapshot):
+        if snapshot.is_course_entitlement_product:
             return _(
                 'After you complete your order you will be able to select course dates from your dashboard.'
             )
-        elif product.is_seat_product:
-            try:
-                certificate_type = product.attr.certificate_type
-            except AttributeError:
-                logger.exception(
-                    "Failed to get certificate type from seat product: %r, %s, %s",
-                    product,
-                    product.id,
-                    product.is_seat_product
+        elif snapshot.is_seat_product:
+            certificate_type = snapshot.certificate_type
+            if certificate_type is None:
+                logger.error(
+                    "Failed to get certificate type from seat product: %s, %s",
+                    snapshot.partner_sku,
+                    snapshot.product_id,
                 )
-                raise
+                raise AttributeError('Seat product {} has no certificate type.'.format(snapshot.product_id))
             if certificate_type == 'verified':
                 return _(
                     'After you complete your order you will be automatically enrolled '
@@ -317,7 +318,7 @@ class BasketLogicMixin:
                 return _(
                     'After you complete your order you will be automatically enrolled in the course.'
                 )
-        elif product.is_enrollment_code_product:
+        elif snapshot.is_enrollment_code_product:
             return _(
                 '{paragraph_start}By purchasing, you and your organization agree to the following terms:'
                 '{paragraph_end} {ul_start} {li_start}Each code is valid for the one course covered and can be '
@@ -382,16 +383,14 @@ class BasketLogicMixin:
         return None
 
     @newrelic.agent.function_trace()
-    def _get_certificate_type(self, product):
-        if product.is_seat_product or product.is_course_entitlement_product:
-            return product.attr.certificate_type
-        elif product.is_enrollment_code_product:
-            return product.attr.seat_type
+    def _get_certificate_type(self, snapshot):
+        if snapshot.is_seat_product or snapshot.is_course_entitlement_product or snapshot.is_enrollment_code_product:
+            return snapshot.certificate_type
         return None
 
     @newrelic.agent.function_trace()
-    def _get_certificate_type_display_value(self, product):
-        certificate_type = self._get_certificate_type(product)
+    def _get_certificate_type_display_value(self, snapshot):
+        certificate_type = self._get_certificate_type(snapshot)
         if certificate_type:
             return get_certificate_type_display_value(certificate_type)
         return None
@@ -503,6 +502,9 @@ class BasketAddItemsView(BasketLogicMixin, APIView):
 
 
 class BasketSummaryView(BasketLogicMixin, BasketView):
+    query_budget = 77
+    query_duplicate_budget = 29
+
     @newrelic.agent.function_trace()
     def get_context_data(self, **kwargs):
         context = super(BasketSummaryView, self).get_context_data(**kwargs)
@@ -587,7 +589,7 @@ class BasketSummaryView(BasketLogicMixin, BasketView):
         payment_processor_class = site_configuration.get_client_side_payment_processor_class()
 
         if payment_processor_class:
-            payment_processor = payment_processor_class(self.request.site)
+            payment_processor = get_processor(self.request.site, payment_processor_class)
             current_year = datetime.today().year
 
             return {
@@ -619,7 +621,7 @@ class CaptureContextApiLogicMixin:  # pragma: no cover
         payment_processor_class = self.request.site.siteconfiguration.get_client_side_payment_processor_class()
         if not payment_processor_class:
             return
-        payment_processor = payment_processor_class(self.request.site)
+        payment_processor = get_processor(self.request.site, payment_processor_class)
         if not hasattr(payment_processor, 'get_capture_context'):
             return
 
@@ -690,9 +692,9 @@ class PaymentApiLogicMixin(BasketLogicMixin):
                 'course_key': getattr(line_data['line'].product.attr, 'course_key', None),
                 'sku': line_data['sku'],
                 'title': line_data['product_title'],
-                'product_type': line_data['line'].product.get_product_class().name,
+                'product_type': line_data['product_snapshot'].product_class,
                 'image_url': line_data['image_url'],
-                'certificate_type': self._get_certificate_type(line_data['line'].product),
+                'certificate_type': self._get_certificate_type(line_data['product_snapshot']),
                 'subject': line_data['product_subject'],
             }
             for line_data in lines_data
@@ -775,6 +777,8 @@ class PaymentApiView(PaymentApiLogicMixin, APIView):
         Retrieves basket contents and checkout/payment options.
     """
     permission_classes = (IsAuthenticated,)
+    query_budget = 58
+    query_duplicate_budget = 15
 
     def get(self, request):  # pylint: disable=unused-argument
         basket = request.basket
@@ -5,3 +5,9 @@ from oscar.apps.catalogue import apps
 
 class CatalogueConfig(apps.CatalogueConfig):
     name = 'ecommerce.extensions.catalogue'
+
+    def ready(self):
+        super().ready()
+
+        # noinspection PyUnresolvedReferences
+        import ecommerce.extensions.catalogue.snapshots  # pylint: disable=unused-import, import-outside-toplevel
@@ -10,6 +10,7 @@ from slumber.exceptions import HttpClientError
 
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.models import Course
+from ecommerce.extensions.catalogue.utils import bulk_update_seats
 
 logger = logging.getLogger(__name__)
 
@@ -61,9 +62,11 @@ class Command(BaseCommand):
                 course_seats = course.seat_products.filter(
                     attributes__name='certificate_type',
                     attribute_values__value_text__in=seats_to_update
-                )
+                ).distinct()
                 expires = dateutil.parser.parse(enrollment_end_date)
-                course_seats.update(expires=expires)
+                for seat in course_seats:
+                    seat.expires = expires
+                bulk_update_seats(course_seats, ['expires'])
                 logger.info(
                     'Updated expiration date for [%s] seats: [%s]',
                     course.id,
@@ -3,7 +3,7 @@
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from django.db import models
-from django.db.models.signals import post_init, post_save
+from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 from oscar.apps.catalogue.abstract_models import (
@@ -70,6 +70,19 @@ class Product(AbstractProduct):
 
     history = HistoricalRecords()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the stored expiration date of loaded products, so that saving a seat only updates its enrollment
+        code when the date changed.
+
+        Unlike a post_init receiver, this is not run for products instantiated in memory, and does not load
+        deferred fields.
+        """
+        instance = super(Product, cls).from_db(db, field_names, values)  # pylint: disable=bad-super-call
+        instance.original_expires = instance.__dict__.get('expires')
+        return instance
+
     @property
     def is_seat_product(self):
         return self.get_product_class().name == SEAT_PRODUCT_CLASS_NAME
@@ -108,17 +121,6 @@ class Product(AbstractProduct):
         super(Product, self).save(*args, **kwargs)  # pylint: disable=bad-super-call
 
 
-@receiver(post_init, sender=Product)
-def update_original_expires(sender, **kwargs):  # pylint: disable=unused-argument
-    """Updates original_expires value of an instance.
-
-    The original_expires value is used to save a database call when updating a
-    seat's enrollment code expires field.
-    """
-    instance = kwargs['instance']
-    instance.original_expires = instance.expires
-
-
 @receiver(post_save, sender=Product)
 def update_enrollment_code(sender, **kwargs):  # pylint: disable=unused-argument
     """Updates a seat's enrollment code when the seat is updated.
@@ -0,0 +1,290 @@
+"""
+Immutable snapshots of the products sold, cached by partner and SKU.
+
+Read-only hot paths, such as analytics events and the basket page, only need a few fields of each product: its class,
+certificate type, course and price. Reading them from the models takes a query for each attribute, product class and
+stock record. Snapshots hold these fields, and are cached in a per-process LRU cache backed by the shared cache.
+
+Saving or deleting a product, stock record or product attribute value invalidates every snapshot, by incrementing a
+generation number which is part of the cache keys. The generation is read from the shared cache once per request,
+and on every read outside of a request.
+Bulk updates which do not send signals must call `invalidate_product_snapshots`.
+"""
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import crum
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from edx_django_utils.cache import RequestCache
+from oscar.core.loading import get_model
+
+from ecommerce.core.constants import (
+    COUPON_PRODUCT_CLASS_NAME,
+    COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME,
+    ENROLLMENT_CODE_PRODUCT_CLASS_NAME,
+    SEAT_PRODUCT_CLASS_NAME
+)
+from ecommerce.core.utils import get_cache_key
+from ecommerce.courses.utils import mode_for_certificate_type
+
+Product = get_model('catalogue', 'Product')
+ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
+StockRecord = get_model('partner', 'StockRecord')
+
+GENERATION_CACHE_KEY = 'product_snapshot.generation'
+
+
+class ProductSnapshot(namedtuple('ProductSnapshot', [
+        'product_id',
+        'partner_id',
+        'partner_sku',
+        'title',
+        'product_class',
+        'certificate_type',
+        'id_verification_required',
+        'course_id',
+        'entitlement_uuid',
+        'credit_provider',
+        'credit_hours',
+        'price_excl_tax',
+        'price_currency',
+        'expires',
+])):
+    """
+    The fields of a product and its stock record used by read-only code paths.
+
+    For enrollment codes, `certificate_type` holds the seat type of the enrollment code.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_product(cls, product, partner_id, partner_sku, price_excl_tax=None, price_currency=None):
+        attr = product.attr
+        return cls(
+            product_id=product.id,
+            partner_id=partner_id,
+            partner_sku=partner_sku,
+            title=product.title,
+            product_class=product.get_product_class().name,
+            certificate_type=getattr(attr, 'certificate_type', getattr(attr, 'seat_type', None)),
+            id_verification_required=bool(getattr(attr, 'id_verification_required', False)),
+            course_id=product.course_id,
+            entitlement_uuid=getattr(attr, 'UUID', None),
+            credit_provider=getattr(attr, 'credit_provider', None),
+            credit_hours=getattr(attr, 'credit_hours', None),
+            price_excl_tax=price_excl_tax,
+            price_currency=price_currency,
+            expires=product.expires,
+        )
+
+    @classmethod
+    def from_stockrecord(cls, stockrecord):
+        return cls.from_product(
+            stockrecord.product,
+            stockrecord.partner_id,
+            stockrecord.partner_sku,
+            price_excl_tax=stockrecord.price_excl_tax,
+            price_currency=stockrecord.price_currency,
+        )
+
+    @property
+    def is_seat_product(self):
+        return self.product_class == SEAT_PRODUCT_CLASS_NAME
+
+    @property
+    def is_enrollment_code_product(self):
+        return self.product_class == ENROLLMENT_CODE_PRODUCT_CLASS_NAME
+
+    @property
+    def is_course_entitlement_product(self):
+        return self.product_class == COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME
+
+    @property
+    def is_coupon_product(self):
+        return self.product_class == COUPON_PRODUCT_CLASS_NAME
+
+    @property
+    def mode(self):
+        """ The enrollment mode of the product, see `ecommerce.courses.utils.mode_for_product`. """
+        return mode_for_certificate_type(self.certificate_type, self.id_verification_required)
+
+
+class LRUCache:
+    """
+    A thread-safe, size-bounded mapping discarding the least recently used entries.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return None
+            return self._entries[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_local_cache = LRUCache(settings.PRODUCT_SNAPSHOT_LOCAL_CACHE_SIZE)
+
+
+def _get_generation():
+    # The request cache is only cleared by the request middleware. Celery tasks, management commands and job
+    # threads would keep the first generation they read, so they read it from the shared cache every time.
+    request_cache = RequestCache() if crum.get_current_request() is not None else None
+    if request_cache:
+        cached_response = request_cache.get_cached_response(GENERATION_CACHE_KEY)
+        if cached_response.is_found:
+            return cached_response.value
+
+    generation = cache.get(GENERATION_CACHE_KEY)
+    if generation is None:
+        # Start from the current time, so that snapshots cached under an evicted generation are not served again.
+        cache.add(GENERATION_CACHE_KEY, int(time.time() * 1000), None)
+        generation = cache.get(GENERATION_CACHE_KEY)
+
+    if request_cache:
+        request_cache.set(GENERATION_CACHE_KEY, generation)
+    return generation
+
+
+def invalidate_product_snapshots():
+    """
+    Invalidate the snapshots of every product, in every process.
+    """
+    try:
+        cache.incr(GENERATION_CACHE_KEY)
+    except ValueError:
+        cache.add(GENERATION_CACHE_KEY, int(time.time() * 1000), None)
+    RequestCache().delete(GENERATION_CACHE_KEY)
+
+
+def clear_local_product_snapshots():
+    """
+    Discard the snapshots cached by this process. Only meant for tests, which clear the shared cache between tests.
+    """
+    _local_cache.clear()
+
+
+def get_product_snapshots(partner_id, skus):
+    """
+    Return the snapshots of the products with the given SKUs.
+
+    Snapshots missing from both caches are built from the database with a single query for the stock records.
+
+    Arguments:
+        partner_id (int): Id of the partner the SKUs belong to.
+        skus (iterable of str): SKUs of the stock records of the products.
+
+    Returns:
+        dict: ProductSnapshot by SKU. SKUs without a stock record are left out.
+    """
+    generation = _get_generation()
+    cache_keys = {
+        sku: get_cache_key(namespace='product_snapshot', generation=generation, partner_id=partner_id, sku=sku)
+        for sku in set(skus)
+    }
+
+    snapshots = {}
+    for sku, cache_key in cache_keys.items():
+        snapshot = _local_cache.get(cache_key)
+        if snapshot is not None:
+            snapshots[sku] = snapshot
+
+    missing_keys = [cache_key for sku, cache_key in cache_keys.items() if sku not in snapshots]
+    if missing_keys:
+        for snapshot in cache.get_many(missing_keys).values():
+            snapshots[snapshot.partner_sku] = snapshot
+            _local_cache.set(cache_keys[snapshot.partner_sku], snapshot)
+
+    missing_skus = [sku for sku in cache_keys if sku not in snapshots]
+    if missing_skus:
+        stockrecords = StockRecord.objects.filter(
+            partner_id=partner_id, partner_sku__in=missing_skus
+        ).select_related('product__product_class', 'product__parent__product_class')
+        built = {}
+        for stockrecord in stockrecords:
+            snapshot = ProductSnapshot.from_stockrecord(stockrecord)
+            snapshots[snapshot.partner_sku] = snapshot
+            built[cache_keys[snapshot.partner_sku]] = snapshot
+            _local_cache.set(cache_keys[snapshot.partner_sku], snapshot)
+        cache.set_many(built, settings.PRODUCT_SNAPSHOT_CACHE_TIMEOUT)
+
+    return snapshots
+
+
+def get_product_snapshot(partner_id, sku):
+    """
+    Return the snapshot of the product with the given SKU, or None if there is no such stock record.
+    """
+    return get_product_snapshots(partner_id, [sku]).get(sku)
+
+
+def _get_line_sku(line):
+    if hasattr(line, 'partner_sku'):
+        # Order lines keep the SKU they were bought with.
+        return line.partner_id, line.partner_sku
+    return line.stockrecord.partner_id, line.stockrecord.partner_sku
+
+
+def get_line_snapshots(lines):
+    """
+    Return the snapshots of the products of basket or order lines, in the order of the lines.
+
+    The snapshots of order lines whose stock record has since been deleted are built from their product, uncached.
+    """
+    lines = list(lines)
+    line_skus = [_get_line_sku(line) for line in lines]
+
+    skus_by_partner = {}
+    for partner_id, sku in line_skus:
+        skus_by_partner.setdefault(partner_id, []).append(sku)
+    snapshots = {
+        (partner_id, sku): snapshot
+        for partner_id, skus in skus_by_partner.items()
+        for sku, snapshot in get_product_snapshots(partner_id, skus).items()
+    }
+
+    return [
+        snapshots.get(line_sku) or ProductSnapshot.from_product(line.product, *line_sku)
+        for line, line_sku in zip(lines, line_skus)
+    ]
+
+
+def get_line_snapshot(line):
+    """
+    Return the snapshot of the product of a basket or order line.
+    """
+    return get_line_snapshots([line])[0]
+
+
+@receiver(post_save, sender=Product, dispatch_uid='product_snapshot.product_saved')
+@receiver(post_delete, sender=Product, dispatch_uid='product_snapshot.product_deleted')
+@receiver(post_save, sender=StockRecord, dispatch_uid='product_snapshot.stockrecord_saved')
+@receiver(post_delete, sender=StockRecord, dispatch_uid='product_snapshot.stockrecord_deleted')
+@receiver(post_save, sender=ProductAttributeValue, dispatch_uid='product_snapshot.attribute_value_saved')
+@receiver(post_delete, sender=ProductAttributeValue, dispatch_uid='product_snapshot.attribute_value_deleted')
+def invalidate_product_snapshots_on_change(sender, **kwargs):  # pylint: disable=unused-argument
+    # Invalidate again once the transaction commits, so that snapshots built by other processes from the data
+    # preceding the commit are not served.
+    invalidate_product_snapshots()
+    transaction.on_commit(invalidate_product_snapshots)
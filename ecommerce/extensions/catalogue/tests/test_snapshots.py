@@ -0,0 +1,114 @@
+from decimal import Decimal
+
+import mock
+from django.core.cache import cache
+from edx_django_utils.cache import RequestCache
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from ecommerce.core.constants import SEAT_PRODUCT_CLASS_NAME
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.catalogue.snapshots import (
+    GENERATION_CACHE_KEY,
+    clear_local_product_snapshots,
+    get_line_snapshots,
+    get_product_snapshot,
+    get_product_snapshots
+)
+from ecommerce.tests.testcases import TestCase
+
+Product = get_model('catalogue', 'Product')
+ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
+StockRecord = get_model('partner', 'StockRecord')
+
+
+class ProductSnapshotTests(TestCase):
+    def setUp(self):
+        super(ProductSnapshotTests, self).setUp()
+        self.course = CourseFactory(partner=self.partner)
+        self.seat = self.course.create_or_update_seat('professional', False, 100)
+        self.stockrecord = self.seat.stockrecords.get()
+        self.sku = self.stockrecord.partner_sku
+
+    def get_snapshot(self):
+        return get_product_snapshot(self.partner.id, self.sku)
+
+    def test_snapshot(self):
+        """ Verify the snapshot holds the fields of the product and its stock record. """
+        snapshot = self.get_snapshot()
+
+        self.assertEqual(snapshot.product_id, self.seat.id)
+        self.assertEqual(snapshot.partner_sku, self.sku)
+        self.assertEqual(snapshot.title, self.seat.title)
+        self.assertEqual(snapshot.product_class, SEAT_PRODUCT_CLASS_NAME)
+        self.assertEqual(snapshot.certificate_type, 'professional')
+        self.assertEqual(snapshot.course_id, self.course.id)
+        self.assertEqual(snapshot.price_excl_tax, Decimal('100.00'))
+        self.assertEqual(snapshot.mode, 'no-id-professional')
+        self.assertTrue(snapshot.is_seat_product)
+        self.assertFalse(snapshot.is_enrollment_code_product)
+
+    def test_unknown_sku(self):
+        """ Verify SKUs without a stock record have no snapshot. """
+        self.assertEqual(get_product_snapshots(self.partner.id, [self.sku, 'unknown']).keys(), {self.sku})
+        self.assertIsNone(get_product_snapshot(self.partner.id, 'unknown'))
+
+    def test_cached(self):
+        """ Verify snapshots are served from the process cache, then from the shared cache, without queries. """
+        snapshot = self.get_snapshot()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_snapshot(), snapshot)
+
+        RequestCache.clear_all_namespaces()
+        clear_local_product_snapshots()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_snapshot(), snapshot)
+
+    def test_generation_outside_request(self):
+        """ Verify the generation is memoized per request, and read from the shared cache outside of requests. """
+        self.get_snapshot()
+        title = self.seat.title
+        # Another process updates the product.
+        Product.objects.filter(id=self.seat.id).update(title='Updated')
+        clear_local_product_snapshots()
+
+        with mock.patch('ecommerce.extensions.catalogue.snapshots.crum.get_current_request', return_value=object()):
+            get_product_snapshots(self.partner.id, [self.sku])
+            cache.incr(GENERATION_CACHE_KEY)
+            self.assertEqual(self.get_snapshot().title, title)
+
+        with mock.patch('ecommerce.extensions.catalogue.snapshots.crum.get_current_request', return_value=None):
+            self.assertEqual(self.get_snapshot().title, 'Updated')
+
+    def test_invalidated_on_product_save(self):
+        self.get_snapshot()
+        self.seat.title = 'Updated'
+        self.seat.save()
+        self.assertEqual(self.get_snapshot().title, 'Updated')
+
+    def test_invalidated_on_stockrecord_save(self):
+        self.get_snapshot()
+        self.stockrecord.price_excl_tax = 50
+        self.stockrecord.save()
+        self.assertEqual(self.get_snapshot().price_excl_tax, Decimal('50.00'))
+
+    def test_invalidated_on_attribute_value_save(self):
+        self.get_snapshot()
+        value = ProductAttributeValue.objects.get(product=self.seat, attribute__code='id_verification_required')
+        value.value_boolean = True
+        value.save()
+        self.assertEqual(self.get_snapshot().mode, 'professional')
+
+    def test_line_snapshots(self):
+        """ Verify order lines whose stock record was deleted get a snapshot built from their product. """
+        basket = factories.create_basket(empty=True)
+        basket.add_product(self.seat)
+        line = factories.create_order(basket=basket).lines.get()
+        StockRecord.objects.filter(id=self.stockrecord.id).delete()
+        line.refresh_from_db()
+
+        snapshot, = get_line_snapshots([line])
+        self.assertEqual(snapshot.product_id, self.seat.id)
+        self.assertEqual(snapshot.partner_sku, self.sku)
+        self.assertIsNone(snapshot.price_excl_tax)
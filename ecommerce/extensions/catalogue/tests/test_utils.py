@@ -5,12 +5,16 @@ from hashlib import md5
 
 import ddt
 from django.db.utils import IntegrityError
+from django.utils.timezone import now, timedelta
 from oscar.core.loading import get_model
 
 from ecommerce.coupons.tests.mixins import CouponMixin
 from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.catalogue.snapshots import get_product_snapshot
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
 from ecommerce.extensions.catalogue.utils import (
+    bulk_update_seats,
+    bulk_update_stockrecords,
     create_coupon_product,
     create_subcategories,
     generate_sku,
@@ -119,6 +123,33 @@ class UtilsTests(DiscoveryTestMixin, TestCase):
         test_categories = ['Test 1', 'Test 2', 'Test 3']
         create_subcategories(Product, COUPON_CATEGORY_NAME, test_categories)
 
+    def test_bulk_update_seats(self):
+        """ Verify the seats are updated with a single query, and their history is recorded. """
+        seats = [self.seat, self.course.create_or_update_seat('honor', False, 0)]
+        expires = now() + timedelta(days=7)
+        for seat in seats:
+            seat.expires = expires
+
+        with self.assertNumQueries(2):
+            bulk_update_seats(seats, ['expires'])
+
+        for seat in seats:
+            self.assertEqual(Product.objects.get(id=seat.id).expires, expires)
+            self.assertEqual(seat.history.latest().history_type, '~')
+            self.assertEqual(seat.history.latest().expires, expires)
+
+    def test_bulk_update_stockrecords(self):
+        """ Verify the stock records are updated with their history, and the product snapshots invalidated. """
+        stockrecord = self.seat.stockrecords.get()
+        self.assertEqual(get_product_snapshot(self.partner.id, stockrecord.partner_sku).price_excl_tax, 0)
+        stockrecord.price_excl_tax = 50
+
+        bulk_update_stockrecords([stockrecord], ['price_excl_tax'])
+
+        self.assertEqual(StockRecord.objects.get(id=stockrecord.id).price_excl_tax, 50)
+        self.assertEqual(stockrecord.history.latest().price_excl_tax, 50)
+        self.assertEqual(get_product_snapshot(self.partner.id, stockrecord.partner_sku).price_excl_tax, 50)
+
 
 class CouponUtilsTests(CouponMixin, DiscoveryTestMixin, TestCase):
     def setUp(self):
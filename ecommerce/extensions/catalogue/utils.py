@@ -4,10 +4,14 @@ import logging
 from hashlib import md5
 
 from django.conf import settings
+from django.db import transaction
 from django.db.utils import IntegrityError
+from django.utils.timezone import now
 from oscar.core.loading import get_model
+from simple_history.utils import bulk_update_with_history
 
 from ecommerce.core.constants import COUPON_PRODUCT_CLASS_NAME
+from ecommerce.extensions.catalogue.snapshots import invalidate_product_snapshots
 from ecommerce.extensions.payment.models import EnterpriseContractMetadata
 from ecommerce.extensions.voucher.models import CouponVouchers
 from ecommerce.extensions.voucher.utils import create_vouchers
@@ -293,3 +297,45 @@ def create_subcategories(model, parent_category_name, categories):
 
     parent_category.numchild = parent_category.numchild + actual_created_count
     parent_category.save()
+
+
+def _bulk_update_with_history(model, objs, fields, batch_size):
+    objs = list(objs)
+    date_updated = now()
+    for obj in objs:
+        obj.date_updated = date_updated
+
+    bulk_update_with_history(objs, model, list(fields) + ['date_updated'], batch_size=batch_size)
+
+    # Bulk updates do not send the signals invalidating the product snapshots.
+    invalidate_product_snapshots()
+    transaction.on_commit(invalidate_product_snapshots)
+    return objs
+
+
+def bulk_update_seats(seats, fields, batch_size=500):
+    """
+    Update fields of many seats, and record their history, with a query per batch.
+
+    The post_save signal is not sent, so the enrollment codes of the seats are not updated to match their expiration
+    date, and the seat attributes are not saved.
+
+    Arguments:
+        seats (iterable of Product): Seats, with the new values of the fields set.
+        fields (list of str): Names of the fields to update.
+        batch_size (int): Maximum number of seats updated by each query.
+    """
+    for seat in _bulk_update_with_history(Product, seats, fields, batch_size):
+        seat.original_expires = seat.expires
+
+
+def bulk_update_stockrecords(stockrecords, fields, batch_size=500):
+    """
+    Update fields of many stock records, such as their prices, and record their history, with a query per batch.
+
+    Arguments:
+        stockrecords (iterable of StockRecord): Stock records, with the new values of the fields set.
+        fields (list of str): Names of the fields to update.
+        batch_size (int): Maximum number of stock records updated by each query.
+    """
+    _bulk_update_with_history(StockRecord, stockrecords, fields, batch_size)
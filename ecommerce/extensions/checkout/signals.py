@@ -6,8 +6,8 @@ import waffle
 from django.dispatch import receiver
 from oscar.core.loading import get_class, get_model
 
-from ecommerce.courses.utils import mode_for_product
 from ecommerce.extensions.analytics.utils import silence_exceptions, track_segment_event
+from ecommerce.extensions.catalogue.snapshots import get_line_snapshots
 from ecommerce.extensions.checkout.utils import get_credit_provider_details, get_receipt_page_url
 from ecommerce.notifications.notifications import send_notification
 from ecommerce.programs.utils import get_program
@@ -33,6 +33,8 @@ def track_completed_order(sender, order=None, **kwargs):  # pylint: disable=unus
     if order.total_excl_tax <= 0:
         return
 
+    lines = list(order.lines.all())
+    snapshots = get_line_snapshots(lines)
     properties = {
         'orderId': order.number,
         'total': float(order.total_excl_tax),
@@ -48,27 +50,27 @@ def track_completed_order(sender, order=None, **kwargs):  # pylint: disable=unus
                 # SKU. Marketing is aware that this approach will not scale once we start selling
                 # products other than courses, and will need to change in the future.
                 'id': line.partner_sku,
-                'sku': mode_for_product(line.product),
-                'name': line.product.course.id if line.product.course else line.product.title,
+                'sku': snapshot.mode,
+                'name': snapshot.course_id or snapshot.title,
                 'price': float(line.line_price_excl_tax),
                 'quantity': int(line.quantity),
-                'category': line.product.get_product_class().name,
+                'category': snapshot.product_class,
                 # TODO: DENG-797: remove the the `title` once we are no longer forwarding
                 # these events to Hubspot.
-                'title': line.product.title,
-            } for line in order.lines.all()
+                'title': snapshot.title,
+            } for line, snapshot in zip(lines, snapshots)
         ],
     }
     if order.user:
         properties['email'] = order.user.email
 
-    for line in order.lines.all():
-        if line.product.is_enrollment_code_product:
+    for snapshot in snapshots:
+        if snapshot.is_enrollment_code_product:
             # Send analytics events to track bulk enrollment code purchases.
             track_segment_event(order.site, order.user, 'Bulk Enrollment Codes Order Completed', properties)
             return
 
-        if line.product.is_coupon_product:
+        if snapshot.is_coupon_product:
             return
 
     voucher = order.basket_discounts.filter(voucher_id__isnull=False).first()
@@ -8,6 +8,7 @@ from oscar.apps.dashboard.orders.views import OrderDetailView as CoreOrderDetail
 from oscar.apps.dashboard.orders.views import OrderListView as CoreOrderListView
 from oscar.core.loading import get_model
 
+from ecommerce.core.views import ReadReplicaMixin
 from ecommerce.extensions.dashboard.views import FilterFieldsMixin
 
 Order = get_model('order', 'Order')
@@ -28,7 +29,7 @@ def queryset_orders_for_user(user):  # pylint: disable=unused-argument
     return Order._default_manager.select_related('user').prefetch_related('lines')  # pylint: disable=protected-access
 
 
-class OrderListView(FilterFieldsMixin, CoreOrderListView):
+class OrderListView(ReadReplicaMixin, FilterFieldsMixin, CoreOrderListView):
     base_queryset = None
     form = None
 
@@ -39,7 +40,9 @@ class OrderListView(FilterFieldsMixin, CoreOrderListView):
         self.base_queryset = queryset_orders_for_user(request.user).order_by('-date_placed')
 
         # Bypass the CoreOrderListView.dispatch()
-        return super(CoreOrderListView, self).dispatch(request, *args, **kwargs)  # pylint: disable=bad-super-call
+        return self.read_replica_dispatch(
+            super(CoreOrderListView, self).dispatch, request, *args, **kwargs  # pylint: disable=bad-super-call
+        )
 
     def get_queryset(self):
         queryset = super(OrderListView, self).get_queryset()
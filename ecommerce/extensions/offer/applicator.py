@@ -4,12 +4,14 @@ import logging
 from itertools import chain
 
 from oscar.apps.offer.applicator import Applicator as OscarApplicator
-from oscar.core.loading import get_model
+from oscar.core.loading import get_class, get_model
 
 from ecommerce.enterprise.api import get_enterprise_id_for_user
+from ecommerce.extensions.offer.evaluation import evaluate_offers
 
 logger = logging.getLogger(__name__)
 BUNDLE = 'bundle_identifier'
+OfferApplications = get_class('offer.results', 'OfferApplications')
 
 
 class Applicator(OscarApplicator):
@@ -37,8 +39,39 @@ class Applicator(OscarApplicator):
                 used in the case of a temporary basket which is not saved to the db, because
                 we get an error when trying to create the bundle_id BasketAttribute.
         """
-        offers = self.get_offers(basket, user, request, bundle_id)
-        self.apply_offers(basket, offers)
+        with evaluate_offers(basket):
+            offers = self.get_offers(basket, user, request, bundle_id)
+            self.apply_offers(basket, offers)
+
+    def apply_offers(self, basket, offers):
+        """
+        Apply the given offers to the basket, in two stages.
+
+        The offers failing the prechecks of `OfferEvaluation` are discarded first. The conditions
+        of the remaining offers, which may need network calls, are then evaluated as their benefits
+        are applied. The basket total used by the conditions is computed once, and again only after
+        a discount was applied.
+        """
+        with evaluate_offers(basket) as evaluation:
+            applications = OfferApplications()
+            for offer in [offer for offer in offers if evaluation.passes_prechecks(offer)]:
+                num_applications = 0
+                # Keep applying the offer until either
+                # (a) We reach the max number of applications for the offer.
+                # (b) The benefit can't be applied successfully.
+                while num_applications < offer.get_max_applications(basket.owner):
+                    result = offer.apply_benefit(basket)
+                    num_applications += 1
+                    if not result.is_successful:
+                        break
+                    evaluation.discount_applied()
+                    applications.add(offer, result)
+                    if result.is_final:
+                        break
+
+        # Store this list of discounts with the basket so it can be
+        # rendered in templates
+        basket.offer_applications = applications
 
     def get_offers(self, basket, user=None, request=None, bundle_id=None):  # pylint: disable=arguments-differ
         """
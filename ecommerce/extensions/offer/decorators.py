@@ -1,8 +1,31 @@
+from functools import partial, wraps
 
+import waffle
 
-from functools import wraps
+from ecommerce.extensions.offer.evaluation import get_basket_total_incl_tax
 
-import waffle
+
+def is_condition_applicable(offer, basket, switches=None):
+    """
+    Global logic for determining the applicability of a Condition to a Basket.
+
+    The basket total is memoized while offers are applied, see `ecommerce.extensions.offer.evaluation`.
+    """
+    if offer.partner != basket.site.siteconfiguration.partner:
+        return False
+
+    if basket.is_empty:
+        return False
+
+    if get_basket_total_incl_tax(basket) == 0:
+        return False
+
+    if switches:
+        for switch in switches:
+            if not waffle.switch_is_active(switch):
+                return False
+
+    return True
 
 
 def check_condition_applicability(switches=None):
@@ -14,6 +37,9 @@ def check_condition_applicability(switches=None):
     function to receive a Condition, ConditionalOffer, and Basket
     as parameters.
 
+    The checks are also run as prechecks by the Applicator, before
+    any condition is evaluated, see `Condition.passes_prechecks`.
+
     Arguments:
         switches (list): List of waffle switch names which should be enabled for
                          the Condition to be applicable to the Basket.
@@ -21,20 +47,10 @@ def check_condition_applicability(switches=None):
     def outer_wrapper(func):
         @wraps(func)
         def _decorated(condition, offer, basket):
-            if offer.partner != basket.site.siteconfiguration.partner:
-                return False
-
-            if basket.is_empty:
-                return False
-
-            if basket.total_incl_tax == 0:
+            if not is_condition_applicable(offer, basket, switches):
                 return False
 
-            if switches:
-                for switch in switches:
-                    if not waffle.switch_is_active(switch):
-                        return False
-
             return func(condition, offer, basket)
+        _decorated.is_applicable = partial(is_condition_applicable, switches=switches)
         return _decorated
     return outer_wrapper
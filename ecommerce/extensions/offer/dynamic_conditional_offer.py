@@ -88,6 +88,13 @@ class DynamicDiscountCondition(ConditionWithoutRangeMixin, SingleItemConsumption
     def name(self):
         return "dynamic_discount_condition"
 
+    def passes_prechecks(self, offer, evaluation):  # pylint: disable=unused-argument
+        """
+        Discards the offer unless the basket contains a single seat.
+        """
+        snapshots = evaluation.line_snapshots
+        return len(snapshots) == 1 and snapshots[0].is_seat_product
+
     def is_satisfied(self, offer, basket):  # pylint: disable=unused-argument
         """
         Check if the user and course is eligible for the discount using the jwt that was passed in through the request.
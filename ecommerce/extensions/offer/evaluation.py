@@ -0,0 +1,103 @@
+"""
+Staged evaluation of the conditions of offers, for the Applicator.
+
+Evaluating a condition can be expensive: enterprise conditions look up the catalogs of the enterprise, program
+conditions retrieve the enrollments and entitlements of the user. The Applicator first runs cheap prechecks of every
+offer against facts about the basket, which are computed at most once per apply. The conditions of the offers passing
+the prechecks are then evaluated as their benefits are applied.
+
+Conditions add prechecks by overriding `Condition.passes_prechecks`.
+"""
+from contextlib import contextmanager
+
+from django.utils.functional import cached_property
+from django.utils.timezone import now
+
+from ecommerce.enterprise.api import get_enterprise_id_for_user
+from ecommerce.extensions.catalogue.snapshots import get_line_snapshots
+
+
+class OfferEvaluation:
+    """
+    Facts about a basket used to evaluate the conditions of offers while they are applied to it.
+    """
+
+    def __init__(self, basket):
+        self.basket = basket
+        self.now = now()
+        self._total_incl_tax = None
+
+    @cached_property
+    def partner(self):
+        return self.basket.site.siteconfiguration.partner
+
+    @cached_property
+    def line_snapshots(self):
+        """ ProductSnapshot of the product of each line of the basket. """
+        return get_line_snapshots(self.basket.all_lines())
+
+    @cached_property
+    def enterprise_id(self):
+        """ UUID of the enterprise customer the basket owner is linked to, if any. """
+        if not self.basket.owner:
+            return None
+        return get_enterprise_id_for_user(self.basket.site, self.basket.owner)
+
+    @property
+    def total_incl_tax(self):
+        """ Total of the basket, including taxes and the discounts applied so far. """
+        if self._total_incl_tax is None:
+            self._total_incl_tax = self.basket.total_incl_tax
+        return self._total_incl_tax
+
+    def discount_applied(self):
+        """ Forget the totals of the basket, after a discount was applied to it. """
+        self._total_incl_tax = None
+
+    def passes_prechecks(self, offer):
+        """
+        Return False if the offer can not apply to the basket, without evaluating its condition.
+
+        Only site offers are checked for suspension and dates, like the `active` manager they are retrieved with.
+        The availability of voucher offers is checked with their vouchers, as the Oscar Applicator does.
+        """
+        if offer.offer_type == offer.SITE:
+            if offer.is_suspended:
+                return False
+            if offer.start_datetime and offer.start_datetime > self.now:
+                return False
+            if offer.end_datetime and offer.end_datetime < self.now:
+                return False
+        return offer.condition.proxy().passes_prechecks(offer, self)
+
+
+def get_offer_evaluation(basket):
+    """
+    Return the OfferEvaluation of the offers being applied to the basket, or None outside of `Applicator.apply`.
+    """
+    return getattr(basket, 'offer_evaluation', None)
+
+
+def get_basket_total_incl_tax(basket):
+    """
+    Return the total of the basket including taxes and discounts, memoized while offers are applied to it.
+    """
+    evaluation = get_offer_evaluation(basket)
+    return evaluation.total_incl_tax if evaluation else basket.total_incl_tax
+
+
+@contextmanager
+def evaluate_offers(basket):
+    """
+    Attach an OfferEvaluation to the basket while offers are applied to it, unless it already has one.
+    """
+    evaluation = get_offer_evaluation(basket)
+    if evaluation is not None:
+        yield evaluation
+        return
+
+    basket.offer_evaluation = evaluation = OfferEvaluation(basket)
+    try:
+        yield evaluation
+    finally:
+        del basket.offer_evaluation
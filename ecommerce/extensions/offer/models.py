@@ -30,7 +30,8 @@ from simple_history.models import HistoricalRecords
 from slumber.exceptions import SlumberBaseException
 from threadlocals.threadlocals import get_current_request
 
-from ecommerce.core.utils import get_cache_key, log_message_and_raise_validation_error
+from ecommerce.core.cache import CATALOGS_CACHE
+from ecommerce.core.utils import get_cache_key, log_message_and_raise_validation_error, single_flight
 from ecommerce.extensions.offer.constants import (
     EMAIL_TEMPLATE_TYPES,
     NUDGE_EMAIL_CYCLE,
@@ -122,6 +123,53 @@ class Benefit(AbstractBenefit):
 
         return uncached_course_run_ids, uncached_course_uuids, applicable_lines
 
+    def _cache_catalog_query_contains(self, offer, basket, query, partner_code, course_run_ids, course_uuids,
+                                      applicable_lines):
+        """
+        Asks the Discovery Service whether the given courses and course runs are in the catalog range specified by
+        the given query, caches the answers and removes the lines which are not in the range.
+        """
+        site = basket.site
+        # Hit Discovery Service to determine if remaining courses and runs are in the range.
+        try:
+            response = site.siteconfiguration.discovery_api_client.catalog.query_contains.get(
+                course_run_ids=','.join([metadata['id'] for metadata in course_run_ids]),
+                course_uuids=','.join([metadata['id'] for metadata in course_uuids]),
+                query=query,
+                partner=partner_code
+            )
+        except Exception as err:  # pylint: disable=bare-except
+            logger.exception(
+                '[Code Redemption Failure] Unable to apply benefit because we failed to query the '
+                'Discovery Service for catalog data. '
+                'User: %s, Offer: %s, Basket: %s, Message: %s',
+                basket.owner.username, offer.id, basket.id, err
+            )
+            raise Exception(
+                'Failed to contact Discovery Service to retrieve offer catalog_range data.'
+            ) from err
+
+        logger.info(
+            "Discovery Service results for basket: [%s], offer: [%s], query: '%s', response: %s",
+            basket.id,
+            offer.id,
+            query,
+            response,
+        )
+
+        # Cache range-state individually for each course or run identifier and remove lines not in the range.
+        for metadata in course_run_ids + course_uuids:
+            in_range = response[str(metadata['id'])]
+
+            # Convert to int, because this is what memcached will return, and the request cache should return
+            # the same value.
+            # Note: once the TieredCache is fixed to handle this case, we could remove this line.
+            in_range = int(in_range)
+            TieredCache.set_all_tiers(metadata['cache_key'], in_range, settings.COURSES_API_CACHE_TIMEOUT)
+
+            if not in_range:
+                applicable_lines.remove(metadata['line'])
+
     def get_applicable_lines(self, offer, basket, range=None):  # pylint: disable=redefined-builtin
         """
         Returns the basket lines for which the benefit is applicable.
@@ -140,45 +188,22 @@ class Benefit(AbstractBenefit):
             )
 
             if course_run_ids or course_uuids:
-                # Hit Discovery Service to determine if remaining courses and runs are in the range.
-                try:
-                    response = site.siteconfiguration.discovery_api_client.catalog.query_contains.get(
-                        course_run_ids=','.join([metadata['id'] for metadata in course_run_ids]),
-                        course_uuids=','.join([metadata['id'] for metadata in course_uuids]),
-                        query=query,
-                        partner=partner_code
-                    )
-                except Exception as err:  # pylint: disable=bare-except
-                    logger.exception(
-                        '[Code Redemption Failure] Unable to apply benefit because we failed to query the '
-                        'Discovery Service for catalog data. '
-                        'User: %s, Offer: %s, Basket: %s, Message: %s',
-                        basket.owner.username, offer.id, basket.id, err
-                    )
-                    raise Exception(
-                        'Failed to contact Discovery Service to retrieve offer catalog_range data.'
-                    ) from err
-
-                logger.info(
-                    "Discovery Service results for basket: [%s], offer: [%s], query: '%s', response: %s",
-                    basket.id,
-                    offer.id,
-                    query,
-                    response,
+                # Coalesce concurrent requests for the same set of products.
+                lookup_key = get_cache_key(
+                    site_domain=site.domain,
+                    partner_code=partner_code,
+                    resource='catalog_query.contains',
+                    cache_keys=sorted(metadata['cache_key'] for metadata in course_run_ids + course_uuids),
                 )
-
-                # Cache range-state individually for each course or run identifier and remove lines not in the range.
-                for metadata in course_run_ids + course_uuids:
-                    in_range = response[str(metadata['id'])]
-
-                    # Convert to int, because this is what memcached will return, and the request cache should return
-                    # the same value.
-                    # Note: once the TieredCache is fixed to handle this case, we could remove this line.
-                    in_range = int(in_range)
-                    TieredCache.set_all_tiers(metadata['cache_key'], in_range, settings.COURSES_API_CACHE_TIMEOUT)
-
-                    if not in_range:
-                        applicable_lines.remove(metadata['line'])
+                with single_flight(lookup_key):
+                    # The results may have been cached while we were waiting.
+                    course_run_ids, course_uuids, applicable_lines = self._identify_uncached_product_identifiers(
+                        applicable_lines, site.domain, partner_code, query
+                    )
+                    if course_run_ids or course_uuids:
+                        self._cache_catalog_query_contains(
+                            offer, basket, query, partner_code, course_run_ids, course_uuids, applicable_lines
+                        )
 
             logger.info(
                 "Basket [%s] with offer [%s] has applicable lines: %s",
@@ -470,26 +495,23 @@ class Range(AbstractRange):
         """
         request = get_current_request()
         partner_code = request.site.siteconfiguration.partner.short_code
-        cache_key = get_cache_key(
-            site_domain=request.site.domain,
-            partner_code=partner_code,
-            resource='catalogs.contains',
-            course_id=product.course_id,
-            catalog_id=self.course_catalog
-        )
-        cached_response = TieredCache.get_cached_response(cache_key)
-        if cached_response.is_found:
-            return cached_response.value
 
-        discovery_api_client = request.site.siteconfiguration.discovery_api_client
-        try:
+        def fetch():
+            discovery_api_client = request.site.siteconfiguration.discovery_api_client
             # GET: /api/v1/catalogs/{catalog_id}/contains?course_run_id={course_run_ids}
-            response = discovery_api_client.catalogs(self.course_catalog).contains.get(
+            return discovery_api_client.catalogs(self.course_catalog).contains.get(
                 course_run_id=product.course_id
             )
 
-            TieredCache.set_all_tiers(cache_key, response, settings.COURSES_API_CACHE_TIMEOUT)
-            return response
+        try:
+            return CATALOGS_CACHE.get_or_set(
+                request.site.domain,
+                fetch,
+                partner_code=partner_code,
+                resource='catalogs.contains',
+                course_id=product.course_id,
+                catalog_id=self.course_catalog
+            )
         except (ReqConnectionError, SlumberBaseException, Timeout) as exc:
             logger.exception('[Code Redemption Failure] Unable to connect to the Discovery Service '
                              'for catalog contains endpoint. '
@@ -568,6 +590,21 @@ class Condition(AbstractCondition):
             models.Index(fields=['enterprise_customer_uuid', 'program_uuid'])
         ]
 
+    def passes_prechecks(self, offer, evaluation):
+        """
+        Return False if the condition can not be satisfied, judging from cheap checks of the basket only.
+
+        The Applicator runs the prechecks of every offer before evaluating any condition, see
+        `ecommerce.extensions.offer.evaluation`. By default, the checks of `check_condition_applicability` are run,
+        if `is_satisfied` is decorated with it.
+
+        Arguments:
+            offer (ConditionalOffer): The offer of the condition.
+            evaluation (OfferEvaluation): Facts about the basket the offer is applied to.
+        """
+        is_applicable = getattr(self.is_satisfied, 'is_applicable', None)
+        return is_applicable is None or is_applicable(offer, evaluation.basket)  # pylint: disable=not-callable
+
 
 class OfferAssignment(TimeStampedModel):
     STATUS_CHOICES = (
@@ -795,10 +832,21 @@ class CodeAssignmentNudgeEmailTemplates(AbstractBaseEmailTemplate):
         """
         Return the formatted email body and subject.
         """
+        return self.get_email_content_for_voucher(
+            Voucher.objects.filter(code=code).first(),
+            user_email,
+            code,
+            base_enterprise_url=base_enterprise_url,
+        )
+
+    def get_email_content_for_voucher(self, voucher, user_email, code, base_enterprise_url=''):
+        """
+        Return the formatted email body and subject for an already loaded voucher.
+
+        Lets batch callers render many emails without a voucher query per email.
+        """
         email_body = None
-        voucher_qs = Voucher.objects.filter(code=code)
-        if voucher_qs.exists():
-            voucher = voucher_qs.first()
+        if voucher is not None:
             offer = voucher.best_offer
             max_usage_limit = offer.max_global_applications or OFFER_MAX_USES_DEFAULT
 
@@ -0,0 +1,102 @@
+"""
+Invalidate the cached basket calculations when the offers, vouchers, ranges or prices they depend on change.
+
+Cached calculations are not invalidated per user. The data of the user they depend on is part of their cache keys,
+see `BasketCalculateView`. Saves which only record the usage of an offer or voucher, e.g. by `record_usage` on every
+order, do not invalidate the calculations either, unless they exhaust a global usage limit.
+"""
+from django.contrib.sites.models import Site
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from oscar.core.loading import get_model
+
+from ecommerce.core.cache import BASKET_CALCULATE_CACHE
+
+Benefit = get_model('offer', 'Benefit')
+Condition = get_model('offer', 'Condition')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+Product = get_model('catalogue', 'Product')
+Range = get_model('offer', 'Range')
+RangeProduct = get_model('offer', 'RangeProduct')
+StockRecord = get_model('partner', 'StockRecord')
+Voucher = get_model('voucher', 'Voucher')
+
+USAGE_FIELDS = {
+    ConditionalOffer: {'num_applications', 'num_orders', 'total_discount'},
+    Voucher: {'num_basket_additions', 'num_orders', 'total_discount'},
+}
+USAGE_ONLY_ATTRIBUTE = '_basket_calculate_usage_only'
+
+
+def invalidate_basket_calculations():
+    """
+    Invalidate the cached basket calculations of every site.
+    """
+    for site_domain in Site.objects.values_list('domain', flat=True):
+        BASKET_CALCULATE_CACHE.invalidate(site_domain)
+
+
+def usage_limit_reached(instance):
+    """
+    Return True if the usage recorded on the offer or voucher makes it unavailable to every user.
+    """
+    if isinstance(instance, Voucher):
+        return instance.usage == Voucher.SINGLE_USE and instance.num_orders > 0
+    return bool(
+        (instance.max_global_applications and instance.num_applications >= instance.max_global_applications) or
+        (instance.max_discount and instance.total_discount >= instance.max_discount)
+    )
+
+
+@receiver(pre_save, sender=ConditionalOffer, dispatch_uid='basket_calculate.offer_saving')
+@receiver(pre_save, sender=Voucher, dispatch_uid='basket_calculate.voucher_saving')
+def flag_usage_only_saves(sender, instance, update_fields=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    Flag the saves of offers and vouchers which only change their usage fields.
+    """
+    usage_fields = USAGE_FIELDS[sender]
+    if update_fields is not None:
+        usage_only = set(update_fields) <= usage_fields
+    elif instance.pk is None:
+        usage_only = False
+    else:
+        fields = sender._meta.concrete_fields  # pylint: disable=protected-access
+        attnames = [field.attname for field in fields if field.name not in usage_fields]
+        saved = sender._base_manager.filter(pk=instance.pk).values(*attnames).first()  # pylint: disable=protected-access
+        usage_only = saved is not None and all(saved[attname] == getattr(instance, attname) for attname in attnames)
+    setattr(instance, USAGE_ONLY_ATTRIBUTE, usage_only)
+
+
+@receiver(post_save, sender=ConditionalOffer, dispatch_uid='basket_calculate.offer_saved')
+@receiver(post_delete, sender=ConditionalOffer, dispatch_uid='basket_calculate.offer_deleted')
+@receiver(post_save, sender=Condition, dispatch_uid='basket_calculate.condition_saved')
+@receiver(post_delete, sender=Condition, dispatch_uid='basket_calculate.condition_deleted')
+@receiver(post_save, sender=Benefit, dispatch_uid='basket_calculate.benefit_saved')
+@receiver(post_delete, sender=Benefit, dispatch_uid='basket_calculate.benefit_deleted')
+@receiver(post_save, sender=Range, dispatch_uid='basket_calculate.range_saved')
+@receiver(post_delete, sender=Range, dispatch_uid='basket_calculate.range_deleted')
+@receiver(post_save, sender=RangeProduct, dispatch_uid='basket_calculate.range_product_saved')
+@receiver(post_delete, sender=RangeProduct, dispatch_uid='basket_calculate.range_product_deleted')
+@receiver(m2m_changed, sender=Range.excluded_products.through, dispatch_uid='basket_calculate.range_excluded_changed')
+@receiver(m2m_changed, sender=Range.classes.through, dispatch_uid='basket_calculate.range_classes_changed')
+@receiver(post_save, sender=Voucher, dispatch_uid='basket_calculate.voucher_saved')
+@receiver(post_delete, sender=Voucher, dispatch_uid='basket_calculate.voucher_deleted')
+@receiver(m2m_changed, sender=Voucher.offers.through, dispatch_uid='basket_calculate.voucher_offers_changed')
+@receiver(post_save, sender=Product, dispatch_uid='basket_calculate.product_saved')
+@receiver(post_delete, sender=Product, dispatch_uid='basket_calculate.product_deleted')
+@receiver(post_save, sender=StockRecord, dispatch_uid='basket_calculate.stockrecord_saved')
+@receiver(post_delete, sender=StockRecord, dispatch_uid='basket_calculate.stockrecord_deleted')
+def invalidate_basket_calculations_on_change(sender, **kwargs):  # pylint: disable=unused-argument
+    if kwargs.get('action', 'post_').startswith('pre_'):
+        return
+
+    instance = kwargs.get('instance')
+    if kwargs['signal'] is post_save and instance.__dict__.pop(USAGE_ONLY_ATTRIBUTE, False):
+        if not usage_limit_reached(instance):
+            return
+
+    # Invalidate again once the transaction commits, so that calculations made by other processes from the data
+    # preceding the commit are not served.
+    invalidate_basket_calculations()
+    transaction.on_commit(invalidate_basket_calculations)
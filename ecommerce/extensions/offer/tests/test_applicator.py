@@ -1,18 +1,28 @@
 
 
+import datetime
 from uuid import uuid4
 
 import ddt
 import mock
+from django.utils.timezone import now
 from oscar.core.loading import get_model
 from oscar.test import factories
 
 from ecommerce.core.constants import SYSTEM_ENTERPRISE_LEARNER_ROLE
+from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.offer.applicator import Applicator
-from ecommerce.extensions.test.factories import ConditionalOfferFactory, ConditionFactory, ProgramOfferFactory
-from ecommerce.tests.factories import UserFactory
+from ecommerce.extensions.test.factories import (
+    ConditionalOfferFactory,
+    ConditionFactory,
+    EnterpriseOfferFactory,
+    ProgramOfferFactory,
+    create_basket
+)
+from ecommerce.tests.factories import PartnerFactory, UserFactory
 from ecommerce.tests.testcases import TestCase
 
+Basket = get_model('basket', 'Basket')
 BasketAttribute = get_model('basket', 'BasketAttribute')
 BasketAttributeType = get_model('basket', 'BasketAttributeType')
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
@@ -130,3 +140,65 @@ class ApplicatorTests(TestCase):
             assert not enterprise_offers
         else:
             assert enterprise_offers.count() == num_expected_offers
+
+    def test_apply_offers_prechecks(self):
+        """ Verify the conditions of the offers failing the prechecks are not evaluated. """
+        basket = create_basket()
+        partner = basket.site.siteconfiguration.partner
+        expired_offer = ProgramOfferFactory(partner=partner, end_datetime=now() - datetime.timedelta(days=1))
+        other_partner_offer = ProgramOfferFactory(partner=PartnerFactory())
+        offer = ProgramOfferFactory(partner=partner)
+
+        with mock.patch.object(ConditionalOffer, 'is_condition_satisfied', return_value=False) as mock_satisfied:
+            self.applicator.apply_offers(basket, [expired_offer, other_partner_offer, offer])
+
+        mock_satisfied.assert_called_once_with(basket)
+        self.assertFalse(hasattr(basket, 'offer_evaluation'))
+
+    def test_apply_offers_voucher_offer_dates_not_prechecked(self):
+        """ Verify the conditions of expired or suspended voucher offers are still evaluated, as Oscar does. """
+        basket = create_basket()
+        partner = basket.site.siteconfiguration.partner
+        offers = [
+            ProgramOfferFactory(
+                partner=partner, offer_type=ConditionalOffer.VOUCHER, end_datetime=now() - datetime.timedelta(days=1)
+            ),
+            ProgramOfferFactory(
+                partner=partner, offer_type=ConditionalOffer.VOUCHER, status=ConditionalOffer.SUSPENDED
+            ),
+        ]
+
+        with mock.patch.object(ConditionalOffer, 'is_condition_satisfied', return_value=False) as mock_satisfied:
+            self.applicator.apply_offers(basket, offers)
+
+        self.assertEqual(mock_satisfied.call_count, 2)
+
+    def test_apply_offers_memoizes_basket_total(self):
+        """ Verify the basket total is computed once for the conditions of every offer. """
+        basket = create_basket()
+        offers = ProgramOfferFactory.create_batch(3, partner=basket.site.siteconfiguration.partner)
+
+        with mock.patch.object(Basket, 'total_incl_tax', new_callable=mock.PropertyMock) as mock_total:
+            mock_total.return_value = 10
+            with mock.patch('ecommerce.programs.conditions.get_program', return_value=None) as mock_get_program:
+                self.applicator.apply_offers(basket, offers)
+
+        self.assertEqual(mock_get_program.call_count, 3)
+        self.assertEqual(mock_total.call_count, 1)
+
+    def test_apply_offers_enterprise_prechecks(self):
+        """ Verify the site offers of another enterprise than the one of the user are discarded. """
+        basket = create_basket(empty=True)
+        basket.add_product(CourseFactory(partner=basket.site.siteconfiguration.partner).create_or_update_seat(
+            'verified', True, 100
+        ))
+        offer, other_enterprise_offer = EnterpriseOfferFactory.create_batch(2)
+        enterprise_id = str(offer.condition.enterprise_customer_uuid)
+
+        with mock.patch('ecommerce.extensions.offer.evaluation.get_enterprise_id_for_user') as mock_enterprise_id:
+            mock_enterprise_id.return_value = enterprise_id
+            with mock.patch.object(ConditionalOffer, 'is_condition_satisfied', return_value=False) as mock_satisfied:
+                self.applicator.apply_offers(basket, [other_enterprise_offer, offer])
+
+        mock_satisfied.assert_called_once_with(basket)
+        mock_enterprise_id.assert_called_once_with(basket.site, basket.owner)
@@ -0,0 +1,56 @@
+from decimal import Decimal
+
+from oscar.core.loading import get_model
+from oscar.test.factories import ConditionalOfferFactory, VoucherFactory
+
+from ecommerce.core.cache import BASKET_CALCULATE_CACHE
+from ecommerce.extensions.test.factories import create_order
+from ecommerce.tests.testcases import TestCase
+
+Voucher = get_model('voucher', 'Voucher')
+
+
+class InvalidateBasketCalculationsTests(TestCase):
+    def setUp(self):
+        super(InvalidateBasketCalculationsTests, self).setUp()
+        self.offer = ConditionalOfferFactory()
+        self.voucher = VoucherFactory(usage=Voucher.MULTI_USE)
+
+    def assert_invalidated(self, save, invalidated=True):
+        generation = BASKET_CALCULATE_CACHE.get_generation(self.site.domain)
+        save()
+        assert_generation = self.assertNotEqual if invalidated else self.assertEqual
+        assert_generation(BASKET_CALCULATE_CACHE.get_generation(self.site.domain), generation)
+
+    def test_offer_changed(self):
+        self.offer.priority += 1
+        self.assert_invalidated(self.offer.save)
+
+    def test_offer_usage_recorded(self):
+        """ Verify recording the usage of an offer does not invalidate the calculations. """
+        self.assert_invalidated(lambda: self.offer.record_usage({'freq': 1, 'discount': Decimal('1.00')}), False)
+        self.offer.num_orders += 1
+        self.assert_invalidated(lambda: self.offer.save(update_fields=['num_orders']), False)
+
+    def test_offer_usage_limit_reached(self):
+        self.offer.max_global_applications = 1
+        self.offer.save()
+        self.assert_invalidated(lambda: self.offer.record_usage({'freq': 1, 'discount': Decimal('1.00')}))
+
+    def test_offer_usage_and_other_fields_changed(self):
+        self.offer.priority += 1
+        self.assert_invalidated(lambda: self.offer.record_usage({'freq': 1, 'discount': Decimal('1.00')}))
+
+    def test_voucher_usage_recorded(self):
+        order, user = create_order(), self.create_user()
+        self.assert_invalidated(lambda: self.voucher.record_usage(order, user), False)
+
+    def test_single_use_voucher_usage_recorded(self):
+        self.voucher.usage = Voucher.SINGLE_USE
+        self.voucher.save()
+        order, user = create_order(), self.create_user()
+        self.assert_invalidated(lambda: self.voucher.record_usage(order, user))
+
+    def test_voucher_deleted(self):
+        self.voucher.record_usage(create_order(), self.create_user())
+        self.assert_invalidated(self.voucher.delete)
@@ -19,9 +19,12 @@ from ecommerce.extensions.offer.utils import (
     format_assigned_offer_email,
     format_benefit_value,
     format_email,
+    format_emails,
     send_assigned_offer_email,
     send_assigned_offer_reminder_email,
-    send_revoked_offer_email
+    send_assigned_offer_reminder_emails,
+    send_revoked_offer_email,
+    send_revoked_offer_emails
 )
 from ecommerce.extensions.test.factories import (
     AbsoluteDiscountBenefitWithoutRangeFactory,
@@ -472,6 +475,76 @@ class UtilTests(DiscoveryTestMixin, TestCase):
             attachments=attachments,
         )
 
+    @mock.patch('ecommerce.extensions.offer.utils.group')
+    @mock.patch('ecommerce.extensions.offer.utils.send_offer_update_email')
+    def test_send_offer_revoked_emails(self, mock_email_task, mock_group):
+        """
+        Test that the revocation emails of many learners are sent by a single group of tasks.
+        """
+        learners = [('johndoe@unknown.com', 'GIL7RUEOU7VHBH7Q'), ('janedoe@unknown.com', 'ABC7RUEOU7VHBH7Q')]
+        send_revoked_offer_emails(
+            'subject', 'hi', 'bye', learners, 'sender_alias', 'edx@example.com', attachments=[]
+        )
+        mock_email_task.delay.assert_not_called()
+        mock_group.return_value.apply_async.assert_called_once_with()
+        self.assertEqual(mock_email_task.si.call_count, len(learners))
+        for (learner_email, code), call in zip(learners, mock_email_task.si.call_args_list):
+            self.assertEqual(call, mock.call(
+                learner_email, 'subject', mock.ANY, 'sender_alias', 'edx@example.com', attachments=[]
+            ))
+            self.assertIn(code, call[0][2])
+
+    @mock.patch('ecommerce.extensions.offer.utils.group')
+    @mock.patch('ecommerce.extensions.offer.utils.send_offer_update_email')
+    def test_send_assigned_offer_reminder_emails(self, mock_email_task, mock_group):
+        """
+        Test that a single reminder email is sent by its task, without a group.
+        """
+        send_assigned_offer_reminder_emails(
+            'subject',
+            'hi',
+            'bye',
+            [{
+                'learner_email': 'johndoe@unknown.com',
+                'code': 'GIL7RUEOU7VHBH7Q',
+                'redeemed_offer_count': 0,
+                'total_offer_count': 1,
+            }],
+            '2018-12-19',
+            'sender_alias',
+            'edx@example.com',
+            base_enterprise_url='https://bears.party',
+        )
+        mock_group.assert_not_called()
+        mock_email_task.delay.assert_called_once_with(
+            'johndoe@unknown.com',
+            'subject',
+            mock.ANY,
+            'sender_alias',
+            'edx@example.com',
+            attachments=[],
+            base_enterprise_url='https://bears.party',
+        )
+
+    @ddt.data(True, False)
+    def test_format_emails(self, braze_enabled):
+        """
+        Test that the emails formatted at once are the same as the emails formatted one by one.
+        """
+        Switch.objects.update_or_create(name=ENABLE_BRAZE, defaults={'active': braze_enabled})
+        placeholder_dicts = [
+            SafeDict(USER_EMAIL='johndoe@unknown.com', CODE='GIL7RUEOU7VHBH7Q'),
+            SafeDict(USER_EMAIL='janedoe@unknown.com', CODE='ABC7RUEOU7VHBH7Q'),
+        ]
+        template = settings.OFFER_REVOKE_EMAIL_TEMPLATE
+        self.assertEqual(
+            format_emails(template, placeholder_dicts, 'hi <b>', 'bye', 'https://bears.party'),
+            [
+                format_email(template, placeholder_dict, 'hi <b>', 'bye', 'https://bears.party')
+                for placeholder_dict in placeholder_dicts
+            ]
+        )
+
     @ddt.data(
         (
             settings.OFFER_ASSIGNMENT_EMAIL_TEMPLATE,
@@ -8,8 +8,9 @@ from urllib.parse import urlencode
 
 import bleach
 import waffle
+from celery import group
 from django.conf import settings
-from django.template.loader import render_to_string
+from django.template.loader import get_template
 from django.utils import timezone
 from django.utils.translation import ugettext as _
 from ecommerce_worker.email.v1.api import send_offer_assignment_email, send_offer_update_email
@@ -244,27 +245,17 @@ def send_revoked_offer_email(
         *attachments*
             Attachments to be sent with email.
     """
-    attachments = [] if attachments is None else attachments
-    email_template = settings.OFFER_REVOKE_EMAIL_TEMPLATE
-    placeholder_dict = SafeDict(
-        USER_EMAIL=learner_email,
-        CODE=code,
-    )
-    email_body = format_email(
-        email_template,
-        placeholder_dict,
+    send_revoked_offer_emails(
+        subject,
         greeting,
         closing,
-        base_enterprise_url
+        [(learner_email, code)],
+        sender_alias,
+        reply_to,
+        base_enterprise_url=base_enterprise_url,
+        attachments=attachments,
     )
 
-    if settings.DEBUG:  # pragma: no cover
-        # Avoid breaking devstack when no such service is available.
-        logger.warning("Skipping email task 'send_revoked_offer_email' because DEBUG=true.")  # pragma: no cover
-        return  # pragma: no cover
-
-    send_offer_update_email.delay(learner_email, subject, email_body, sender_alias, reply_to, attachments=attachments)
-
 
 def send_assigned_offer_reminder_email(
         subject,
@@ -306,18 +297,95 @@ def send_assigned_offer_reminder_email(
        *base_enterprise_url*
            Url for the enterprise's learner portal
     """
+    send_assigned_offer_reminder_emails(
+        subject,
+        greeting,
+        closing,
+        [{
+            'learner_email': learner_email,
+            'code': code,
+            'redeemed_offer_count': redeemed_offer_count,
+            'total_offer_count': total_offer_count,
+        }],
+        code_expiration_date,
+        sender_alias,
+        reply_to,
+        attachments=attachments,
+        base_enterprise_url=base_enterprise_url,
+    )
+
+
+def send_revoked_offer_emails(
+        subject,
+        greeting,
+        closing,
+        learners,
+        sender_alias,
+        reply_to,
+        base_enterprise_url='',
+        attachments=None,
+):
+    """
+    Send the revocation emails of many learners, see `send_revoked_offer_email`.
+
+    The emails are rendered in memory and their tasks are enqueued together, see `send_offer_update_emails`.
+
+    Arguments:
+        *learners*
+            List of (learner_email, code) pairs.
+    """
     attachments = [] if attachments is None else attachments
-    email_template = settings.OFFER_REMINDER_EMAIL_TEMPLATE
-    placeholder_dict = SafeDict(
-        REDEEMED_OFFER_COUNT=redeemed_offer_count,
-        TOTAL_OFFER_COUNT=total_offer_count,
-        USER_EMAIL=learner_email,
-        CODE=code,
-        EXPIRATION_DATE=code_expiration_date
+    email_bodies = format_emails(
+        settings.OFFER_REVOKE_EMAIL_TEMPLATE,
+        [SafeDict(USER_EMAIL=learner_email, CODE=code) for learner_email, code in learners],
+        greeting,
+        closing,
+        base_enterprise_url
     )
-    email_body = format_email(
-        template=email_template,
-        placeholder_dict=placeholder_dict,
+
+    if settings.DEBUG:  # pragma: no cover
+        # Avoid breaking devstack when no such service is available.
+        logger.warning("Skipping email task 'send_revoked_offer_emails' because DEBUG=true.")  # pragma: no cover
+        return  # pragma: no cover
+
+    send_offer_update_emails([
+        ((learner_email, subject, email_body, sender_alias, reply_to), {'attachments': attachments})
+        for (learner_email, __), email_body in zip(learners, email_bodies)
+    ])
+
+
+def send_assigned_offer_reminder_emails(
+        subject,
+        greeting,
+        closing,
+        reminders,
+        code_expiration_date,
+        sender_alias,
+        reply_to,
+        attachments=None,
+        base_enterprise_url=''):
+    """
+    Send the reminder emails of many offer assignments, see `send_assigned_offer_reminder_email`.
+
+    The emails are rendered in memory and their tasks are enqueued together, see `send_offer_update_emails`.
+
+    Arguments:
+       *reminders*
+           List of dicts with the learner_email, code, redeemed_offer_count and total_offer_count of each email.
+    """
+    attachments = [] if attachments is None else attachments
+    email_bodies = format_emails(
+        template=settings.OFFER_REMINDER_EMAIL_TEMPLATE,
+        placeholder_dicts=[
+            SafeDict(
+                REDEEMED_OFFER_COUNT=reminder['redeemed_offer_count'],
+                TOTAL_OFFER_COUNT=reminder['total_offer_count'],
+                USER_EMAIL=reminder['learner_email'],
+                CODE=reminder['code'],
+                EXPIRATION_DATE=code_expiration_date
+            )
+            for reminder in reminders
+        ],
         greeting=greeting,
         closing=closing,
         base_enterprise_url=base_enterprise_url
@@ -325,11 +393,35 @@ def send_assigned_offer_reminder_email(
     if settings.DEBUG:  # pragma: no cover
         # Avoid breaking devstack when no such service is available.
         logger.warning(
-            "Skipping email task 'send_assigned_offer_reminder_email' because DEBUG=true."
+            "Skipping email task 'send_assigned_offer_reminder_emails' because DEBUG=true."
         )  # pragma: no cover
         return  # pragma: no cover
-    send_offer_update_email.delay(learner_email, subject, email_body, sender_alias,
-                                  reply_to, attachments=attachments, base_enterprise_url=base_enterprise_url)
+    send_offer_update_emails([
+        (
+            (reminder['learner_email'], subject, email_body, sender_alias, reply_to),
+            {'attachments': attachments, 'base_enterprise_url': base_enterprise_url},
+        )
+        for reminder, email_body in zip(reminders, email_bodies)
+    ])
+
+
+def send_offer_update_emails(emails):
+    """
+    Enqueue the send_offer_update_email tasks of many emails as a celery group.
+
+    The group still publishes one broker message per email, but in a single loop over one producer connection
+    rather than acquiring a producer for each `.delay()` call.
+
+    Arguments:
+        emails (list): (args, kwargs) of the task for each email.
+    """
+    if not emails:
+        return
+    if len(emails) == 1:
+        args, kwargs = emails[0]
+        send_offer_update_email.delay(*args, **kwargs)
+        return
+    group([send_offer_update_email.si(*args, **kwargs) for args, kwargs in emails]).apply_async()
 
 
 def format_email(template, placeholder_dict, greeting, closing, base_enterprise_url=''):
@@ -347,6 +439,18 @@ def format_email(template, placeholder_dict, greeting, closing, base_enterprise_
 
     Reference: https://stackoverflow.com/questions/17215400/python-format-string-unused-named-arguments
     """
+    return format_emails(template, [placeholder_dict], greeting, closing, base_enterprise_url)[0]
+
+
+def format_emails(template, placeholder_dicts, greeting, closing, base_enterprise_url=''):
+    """
+    Apply each of many sets of placeholders to the email template, see `format_email`.
+
+    The greeting and closing are cleaned, and the HTML template loaded, once for all the emails.
+
+    Returns:
+        list: Email body for each of the placeholder_dicts.
+    """
     if greeting is None:
         greeting = ''
     if closing is None:
@@ -354,19 +458,27 @@ def format_email(template, placeholder_dict, greeting, closing, base_enterprise_
 
     greeting = bleach.clean(greeting)
     closing = bleach.clean(closing)
-    email_body = string.Formatter().vformat(template, SafeTuple(), placeholder_dict)
+    formatter = string.Formatter()
+    email_bodies = [
+        formatter.vformat(template, SafeTuple(), placeholder_dict) for placeholder_dict in placeholder_dicts
+    ]
     if waffle.switch_is_active(ENABLE_BRAZE):
         search_url = base_enterprise_url + "/search" if base_enterprise_url else "https://www.edx.org/search"
         search_url = search_url.replace('\"', '\'')
-        email_body = (greeting + email_body + closing).replace('\n', '\t\n')
         current_year = timezone.now().year
-        return render_to_string('coupons/offer_email.html', {'body': email_body, 'search_url': search_url,
-                                                             'current_year': current_year,
-                                                             })
+        email_template = get_template('coupons/offer_email.html')
+        return [
+            email_template.render({
+                'body': (greeting + email_body + closing).replace('\n', '\t\n'),
+                'search_url': search_url,
+                'current_year': current_year,
+            })
+            for email_body in email_bodies
+        ]
 
     # \n\n is being treated as single line except of two lines in HTML template,
     #  so separating them with &nbsp; tag to render them as expected.
-    return (greeting + email_body + closing).replace('\n', '<br/>')
+    return [(greeting + email_body + closing).replace('\n', '<br/>') for email_body in email_bodies]
 
 
 class SafeDict(dict):
@@ -1,6 +1,8 @@
 
 
 import logging
+import threading
+from contextlib import contextmanager
 
 import crum
 from django.urls import reverse
@@ -12,6 +14,28 @@ Condition = get_model('offer', 'Condition')
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
 logger = logging.getLogger(__name__)
 
+_manual_enrollment_order_job = threading.local()
+
+
+@contextmanager
+def manual_enrollment_order_job():
+    """
+    Let `ManualEnrollmentOrderDiscountCondition` be satisfied in the async job of the manual course enrollment
+    order endpoint, outside of its requests.
+    """
+    _manual_enrollment_order_job.active = True
+    try:
+        yield
+    finally:
+        _manual_enrollment_order_job.active = False
+
+
+def _is_manual_enrollment_order():
+    if getattr(_manual_enrollment_order_job, 'active', False):
+        return True
+    request = crum.get_current_request()
+    return request is not None and request.META['PATH_INFO'] == reverse('api:v2:manual-course-enrollment-order-list')
+
 
 class ManualEnrollmentOrderDiscountCondition(
         ConditionWithoutRangeMixin,
@@ -33,7 +57,7 @@ class ManualEnrollmentOrderDiscountCondition(
         else
             return False
         """
-        if crum.get_current_request().META['PATH_INFO'] != reverse('api:v2:manual-course-enrollment-order-list'):
+        if not _is_manual_enrollment_order():
             self.log_error_message(
                 'This condition is only applicable to manual course enrollement orders.',
                 offer,
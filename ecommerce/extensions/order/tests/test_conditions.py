@@ -6,6 +6,7 @@ from mock import patch
 from oscar.test.factories import BasketFactory
 
 from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.order.conditions import manual_enrollment_order_job
 from ecommerce.extensions.test.factories import (
     EnterpriseOfferFactory,
     ManualEnrollmentOrderDiscountConditionFactory,
@@ -105,6 +106,19 @@ class ManualEnrollmentOrderDiscountConditionTests(TestCase):
         status = self.condition.is_satisfied(offer, self.basket)
         assert status
 
+    def test_is_satisfied_in_manual_enrollment_order_job(self):
+        """
+        Test `ManualEnrollmentOrderDiscountCondition.is_satisfied` is satisfied outside of requests in the job of
+        the manual course enrollment order endpoint.
+        """
+        self.request_patcher.return_value = None
+        offer = ManualEnrollmentOrderOfferFactory()
+        self.basket.add_product(self.seat_product)
+        assert not self.condition.is_satisfied(offer, self.basket)
+
+        with manual_enrollment_order_job():
+            assert self.condition.is_satisfied(offer, self.basket)
+
     def test_is_satisfied_with_wrong_path_info(self):
         """
         Test `ManualEnrollmentOrderDiscountCondition.is_satisfied` works as expected when request path_info is wrong.
@@ -16,8 +16,10 @@ from oscar.test.factories import BasketFactory
 from requests import Timeout
 from testfixtures import LogCapture
 
+from ecommerce.core.tests import toggle_switch
 from ecommerce.core.url_utils import get_lms_entitlement_api_url
 from ecommerce.extensions.fulfillment.status import ORDER
+from ecommerce.extensions.order.constants import DISABLE_REPEAT_ORDER_CHECK_SWITCH_NAME
 from ecommerce.extensions.order.utils import UserAlreadyPlacedOrder
 from ecommerce.extensions.refund.tests.factories import RefundFactory
 from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
@@ -229,7 +231,7 @@ class UserAlreadyPlacedOrderTests(RefundTestMixin, TestCase):
         self.mock_access_token_response()
         body = {
             "user": "edx",
-            "uuid": "adfca7da-e593-428b-b12d-f728e2dd220d",
+            "uuid": self.course_entitlement_uuid,
             "course_uuid": "b084097a-7596-4fe6-b6a2-d335bffeb3f1",
             "expired_at": "2017-12-16T21:36:19.279647Z",
             "created": "2017-12-16T21:35:59.402622Z",
@@ -237,9 +239,8 @@ class UserAlreadyPlacedOrderTests(RefundTestMixin, TestCase):
             "mode": "verified",
             "order_number": "EDX-100014"
         }
-        httpretty.register_uri(httpretty.GET, get_lms_entitlement_api_url() +
-                               'entitlements/' + self.course_entitlement_uuid + '/',
-                               status=200, body=json.dumps(body), content_type='application/json')
+        httpretty.register_uri(httpretty.GET, get_lms_entitlement_api_url() + 'entitlements/',
+                               status=200, body=json.dumps({'results': [body]}), content_type='application/json')
         self.assertFalse(UserAlreadyPlacedOrder.user_already_placed_order(user=self.user,
                                                                           product=self.course_entitlement,
                                                                           site=self.site))
@@ -252,7 +253,7 @@ class UserAlreadyPlacedOrderTests(RefundTestMixin, TestCase):
         self.mock_access_token_response()
         body = {
             "user": "edx",
-            "uuid": "adfca7da-e593-428b-b12d-f728e2dd220d",
+            "uuid": self.course_entitlement_uuid,
             "course_uuid": "b084097a-7596-4fe6-b6a2-d335bffeb3f1",
             "expired_at": None,
             "created": "2017-12-16T21:35:59.402622Z",
@@ -260,9 +261,8 @@ class UserAlreadyPlacedOrderTests(RefundTestMixin, TestCase):
             "mode": "verified",
             "order_number": "EDX-100014"
         }
-        httpretty.register_uri(httpretty.GET, get_lms_entitlement_api_url() +
-                               'entitlements/' + self.course_entitlement_uuid + '/',
-                               status=200, body=json.dumps(body), content_type='application/json')
+        httpretty.register_uri(httpretty.GET, get_lms_entitlement_api_url() + 'entitlements/',
+                               status=200, body=json.dumps({'results': [body]}), content_type='application/json')
         self.assertTrue(UserAlreadyPlacedOrder.user_already_placed_order(user=self.user,
                                                                          product=self.course_entitlement,
                                                                          site=self.site))
@@ -272,8 +272,7 @@ class UserAlreadyPlacedOrderTests(RefundTestMixin, TestCase):
         """
         Test the case that we get an error trying to get the entitlement from LMS
         """
-        httpretty.register_uri(httpretty.GET, get_lms_entitlement_api_url() +
-                               'entitlements/' + self.course_entitlement_uuid + '/',
+        httpretty.register_uri(httpretty.GET, get_lms_entitlement_api_url() + 'entitlements/',
                                status=200, body={}, content_type='application/json',
                                side_effect=Timeout)
 
@@ -342,3 +341,63 @@ class UserAlreadyPlacedOrderTests(RefundTestMixin, TestCase):
 
             _ = UserAlreadyPlacedOrder.is_entitlement_expired(self.course_entitlement_uuid, site=self.site)
             self.assertEqual(mocked_set_all_tiers.call_count, 2)
+
+    def test_already_purchased(self):
+        """ Verify the purchased products are returned in the given order, with a constant number of queries. """
+        refunded_order = RefundFactory(user=self.user).order
+        refunded_product = self.get_order_product(order=refunded_order)
+        RefundLine.objects.filter(order_line__order=refunded_order).update(status='Complete')
+        other_products = [self.get_order_product(order=create_order(site=self.site, user=self.user))
+                          for __ in range(3)]
+        new_product = self.get_order_product(order=create_order(site=self.site, user=self.create_user()))
+        products = [new_product, refunded_product] + other_products + [self.product]
+
+        # One query for the switch, and one for the order lines.
+        with self.assertNumQueries(2):
+            purchased = UserAlreadyPlacedOrder.already_purchased(self.user, products, self.site)
+        self.assertEqual(purchased, other_products + [self.product])
+
+    def test_already_purchased_with_switch_active(self):
+        """ Verify no product is considered purchased if the repeat order check is disabled. """
+        self.assertEqual(UserAlreadyPlacedOrder.already_purchased(self.user, [], self.site), [])
+        toggle_switch(DISABLE_REPEAT_ORDER_CHECK_SWITCH_NAME, True)
+        self.assertEqual(UserAlreadyPlacedOrder.already_purchased(self.user, [self.product], self.site), [])
+
+    @httpretty.activate
+    def test_already_purchased_entitlement_not_returned(self):
+        """ Verify an entitlement the LMS does not return is not considered purchased. """
+        self.mock_access_token_response()
+        httpretty.register_uri(httpretty.GET, get_lms_entitlement_api_url() + 'entitlements/',
+                               status=200, body=json.dumps({'results': []}), content_type='application/json')
+        self.assertEqual(
+            UserAlreadyPlacedOrder.already_purchased(self.user, [self.course_entitlement, self.product], self.site),
+            [self.product]
+        )
+
+    @httpretty.activate
+    def test_get_active_entitlements(self):
+        """ Verify the entitlements missing from the cache are retrieved with a single request, then cached. """
+        self.mock_access_token_response()
+        httpretty.register_uri(
+            httpretty.GET,
+            get_lms_entitlement_api_url() + 'entitlements/',
+            status=200,
+            body=json.dumps({'results': [
+                {'uuid': 'expired', 'expired_at': '2017-12-16T21:36:19.279647Z'},
+                {'uuid': 'active', 'expired_at': None},
+            ]}),
+            content_type='application/json'
+        )
+
+        active = UserAlreadyPlacedOrder.get_active_entitlements(['expired', 'active', 'unknown'], self.site)
+        self.assertEqual(active, {'active'})
+        entitlement_requests = [
+            request for request in httpretty.httpretty.latest_requests if 'entitlements' in request.path
+        ]
+        self.assertEqual(len(entitlement_requests), 1)
+        self.assertEqual(entitlement_requests[0].querystring['uuid'], ['active,expired,unknown'])
+
+        httpretty.reset()
+        self.assertEqual(UserAlreadyPlacedOrder.get_active_entitlements(['expired', 'active'], self.site),
+                         {'active'})
+        self.assertTrue(UserAlreadyPlacedOrder.is_entitlement_expired('expired', self.site))
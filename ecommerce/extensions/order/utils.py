@@ -5,6 +5,8 @@ import logging
 
 import waffle
 from django.conf import settings
+from django.db.models import Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from edx_django_utils.cache import TieredCache
 from edx_rest_api_client.client import EdxRestApiClient
 from edx_rest_api_client.exceptions import HttpNotFoundError
@@ -14,6 +16,7 @@ from requests.exceptions import ConnectionError as ReqConnectionError  # pylint:
 from requests.exceptions import ConnectTimeout
 from threadlocals.threadlocals import get_current_request
 
+from ecommerce.core.constants import COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME
 from ecommerce.core.url_utils import get_lms_entitlement_api_url
 from ecommerce.extensions.order.constants import DISABLE_REPEAT_ORDER_CHECK_SWITCH_NAME
 from ecommerce.extensions.refund.status import REFUND_LINE
@@ -21,9 +24,9 @@ from ecommerce.referrals.models import Referral
 
 logger = logging.getLogger(__name__)
 
-Option = get_model('catalogue', 'Option')
 Order = get_model('order', 'Order')
 OrderLine = get_model('order', 'Line')
+OrderLineAttribute = get_model('order', 'LineAttribute')
 RefundLine = get_model('refund', 'RefundLine')
 
 
@@ -134,6 +137,10 @@ class UserAlreadyPlacedOrder:
     Provides utils methods to check if user has already placed an order
     """
 
+    @staticmethod
+    def _get_entitlement_cache_key(entitlement_uuid, site):
+        return 'course_entitlement_detail_{}{}'.format(entitlement_uuid, site.siteconfiguration.partner.short_code)
+
     @staticmethod
     def is_entitlement_expired(entitlement_uuid, site):
         """
@@ -147,15 +154,14 @@ class UserAlreadyPlacedOrder:
             bool: True if the entitlement is expired
 
         """
-        entitlement_api_client = EdxRestApiClient(get_lms_entitlement_api_url(),
-                                                  jwt=site.siteconfiguration.access_token)
-        partner_short_code = site.siteconfiguration.partner.short_code
-        key = 'course_entitlement_detail_{}{}'.format(entitlement_uuid, partner_short_code)
+        key = UserAlreadyPlacedOrder._get_entitlement_cache_key(entitlement_uuid, site)
         entitlement_cached_response = TieredCache.get_cached_response(key)
         if entitlement_cached_response.is_found:
             entitlement = entitlement_cached_response.value
         else:
             logger.debug('Trying to get entitlement {%s}', entitlement_uuid)
+            entitlement_api_client = EdxRestApiClient(get_lms_entitlement_api_url(),
+                                                      jwt=site.siteconfiguration.access_token)
             entitlement = entitlement_api_client.entitlements(entitlement_uuid).get()
             TieredCache.set_all_tiers(key, entitlement, settings.COURSES_API_CACHE_TIMEOUT)
 
@@ -164,6 +170,111 @@ class UserAlreadyPlacedOrder:
 
         return expired
 
+    @staticmethod
+    def get_active_entitlements(entitlement_uuids, site):
+        """
+        Returns the entitlements among the given ones which the LMS returned and which have not expired.
+
+        The entitlements which are not cached are retrieved with a single request to the LMS. Entitlements
+        the LMS does not return are not active.
+
+        Args:
+            entitlement_uuids: iterable of UUIDs
+            site: (Site)
+
+        Returns:
+            set: UUIDs of the active entitlements
+        """
+        entitlements = {}
+        missing_uuids = []
+        for entitlement_uuid in set(entitlement_uuids):
+            cached_response = TieredCache.get_cached_response(
+                UserAlreadyPlacedOrder._get_entitlement_cache_key(entitlement_uuid, site)
+            )
+            if cached_response.is_found:
+                entitlements[entitlement_uuid] = cached_response.value
+            else:
+                missing_uuids.append(entitlement_uuid)
+
+        if missing_uuids:
+            logger.debug('Trying to get entitlements %s', missing_uuids)
+            entitlement_api_client = EdxRestApiClient(get_lms_entitlement_api_url(),
+                                                      jwt=site.siteconfiguration.access_token)
+            response = entitlement_api_client.entitlements.get(
+                uuid=','.join(sorted(missing_uuids)), page_size=len(missing_uuids)
+            )
+            for entitlement in response.get('results', []):
+                entitlements[entitlement['uuid']] = entitlement
+                TieredCache.set_all_tiers(
+                    UserAlreadyPlacedOrder._get_entitlement_cache_key(entitlement['uuid'], site),
+                    entitlement,
+                    settings.COURSES_API_CACHE_TIMEOUT
+                )
+
+        return {
+            entitlement_uuid for entitlement_uuid in entitlement_uuids
+            if entitlement_uuid in entitlements and not entitlements[entitlement_uuid].get('expired_at')
+        }
+
+    @staticmethod
+    def already_purchased(user, products, site):
+        """
+        Returns the products the user has already purchased.
+
+        A product is considered purchased if an OrderLine exists for the product, and it has not been
+        refunded. A course entitlement is only considered purchased if the LMS returns the entitlement, and it
+        has not expired.
+
+        Args:
+            user: (User)
+            products: list of Products
+            site: (Site)
+
+        Returns:
+            list: the purchased products, in the given order.
+
+        Notes:
+            If the switch with the name `ecommerce.extensions.order.constants.DISABLE_REPEAT_ORDER_SWITCH_NAME`
+            is active this check will be disabled, and this method will always return an empty list.
+        """
+        if not products or waffle.switch_is_active(DISABLE_REPEAT_ORDER_CHECK_SWITCH_NAME):
+            return []
+
+        refunded_lines = RefundLine.objects.filter(order_line=OuterRef('pk'), status=REFUND_LINE.COMPLETE)
+        entitlement_uuids = OrderLineAttribute.objects.filter(
+            line=OuterRef('pk'), option__code='course_entitlement'
+        ).values('value')[:1]
+        order_lines = OrderLine.objects.filter(
+            product__in=products, order__user=user
+        ).annotate(
+            is_refunded=Exists(refunded_lines),
+            entitlement_uuid=Subquery(entitlement_uuids),
+            # Child products get their class from their parent.
+            product_class_name=Coalesce('product__product_class__name', 'product__parent__product_class__name'),
+        ).filter(is_refunded=False).values_list('product_id', 'product_class_name', 'entitlement_uuid')
+
+        purchased_product_ids = set()
+        entitlement_product_ids = {}
+        for product_id, product_class_name, entitlement_uuid in order_lines:
+            if product_class_name != COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME:
+                purchased_product_ids.add(product_id)
+            elif entitlement_uuid:
+                entitlement_product_ids.setdefault(entitlement_uuid, set()).add(product_id)
+
+        if entitlement_product_ids:
+            try:
+                active_uuids = UserAlreadyPlacedOrder.get_active_entitlements(entitlement_product_ids, site)
+            except (ConnectTimeout, ReqConnectionError, HttpNotFoundError):
+                logger.exception(
+                    'Unable to get entitlements info %s due to a network problem',
+                    sorted(entitlement_product_ids)
+                )
+            else:
+                for entitlement_uuid in active_uuids:
+                    purchased_product_ids.update(entitlement_product_ids[entitlement_uuid])
+
+        return [product for product in products if product.id in purchased_product_ids]
+
     @staticmethod
     def user_already_placed_order(user, product, site):
         """
@@ -183,28 +294,7 @@ class UserAlreadyPlacedOrder:
             If the switch with the name `ecommerce.extensions.order.constants.DISABLE_REPEAT_ORDER_SWITCH_NAME`
             is active this check will be disabled, and this method will already return `False`.
         """
-        if waffle.switch_is_active(DISABLE_REPEAT_ORDER_CHECK_SWITCH_NAME):
-            return False
-
-        entitlement_option = Option.objects.get(code='course_entitlement')
-
-        orders_lines = OrderLine.objects.filter(product=product, order__user=user)
-        for order_line in orders_lines:
-            if not UserAlreadyPlacedOrder.is_order_line_refunded(order_line):
-                if not order_line.product.is_course_entitlement_product:
-                    return True
-
-                entitlement_uuid = order_line.attributes.get(option=entitlement_option).value
-                try:
-                    if not UserAlreadyPlacedOrder.is_entitlement_expired(entitlement_uuid, site):
-                        return True
-                except (ConnectTimeout, ReqConnectionError, HttpNotFoundError):
-                    logger.exception(
-                        'Unable to get entitlement info [%s] due to a network problem',
-                        entitlement_uuid
-                    )
-
-        return False
+        return bool(UserAlreadyPlacedOrder.already_purchased(user, [product], site))
 
     @staticmethod
     def is_order_line_refunded(order_line):
@@ -4,9 +4,12 @@
 import base64
 import hashlib
 import hmac
+import threading
 from importlib import import_module
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 
 from ecommerce.extensions.payment import exceptions
 
@@ -31,6 +34,81 @@ def get_processor_class(path):
     return processor_class
 
 
+class PaymentProcessorRegistry:
+    """Process-wide registry of payment processor classes and instances.
+
+    The classes listed in the PAYMENT_PROCESSORS setting are imported once. Processor instances are cached
+    per site and processor class, since some processors (e.g. CybersourceREST) do a fair amount of work
+    in their constructors. An instance is only reused for the same Site object it was created with; the
+    cached Site objects are replaced whenever a SiteConfiguration is saved.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resolved = None
+        self._instances = {}
+
+    def _resolve(self):
+        resolved = self._resolved
+        if resolved is None:
+            classes = [get_processor_class(path) for path in settings.PAYMENT_PROCESSORS]
+            resolved = (classes, {processor_class.NAME: processor_class for processor_class in classes})
+            self._resolved = resolved
+        return resolved
+
+    @property
+    def classes(self):
+        """list: The payment processor classes, in the order of the PAYMENT_PROCESSORS setting."""
+        return self._resolve()[0]
+
+    def get_class(self, name):
+        """Return the payment processor class with the given name.
+
+        Raises:
+            ProcessorNotFoundError: If no payment processor with the given name exists.
+        """
+        processor_class = self._resolve()[1].get(name)
+        if processor_class is None:
+            raise exceptions.ProcessorNotFoundError(
+                exceptions.PROCESSOR_NOT_FOUND_DEVELOPER_MESSAGE.format(name=name)
+            )
+        return processor_class
+
+    def get_processor(self, site, processor_class):
+        """Return an instance of `processor_class` for `site`, reusing a cached instance when possible."""
+        key = (site.id, processor_class)
+        processor = self._instances.get(key)
+        if processor is None or processor.site is not site:
+            processor = processor_class(site)
+            with self._lock:
+                self._instances[key] = processor
+        return processor
+
+    def clear_instances(self, site_id=None):
+        """Forget the cached processor instances for the given site, or for all sites."""
+        with self._lock:
+            if site_id is None:
+                self._instances.clear()
+            else:
+                for key in [key for key in self._instances if key[0] == site_id]:
+                    del self._instances[key]
+
+    def clear(self):
+        """Forget the resolved processor classes and all cached instances."""
+        with self._lock:
+            self._resolved = None
+            self._instances.clear()
+
+
+registry = PaymentProcessorRegistry()
+
+
+@receiver(setting_changed)
+def _clear_registry(setting, **kwargs):  # pylint: disable=unused-argument
+    if setting in ('PAYMENT_PROCESSORS', 'PAYMENT_PROCESSOR_CONFIG', 'LANGUAGE_CODE'):
+        registry.clear()
+
+
 def get_default_processor_class():
     """Return the default payment processor class.
 
@@ -41,9 +119,7 @@ def get_default_processor_class():
     Raises:
         IndexError: If the PAYMENT_PROCESSORS setting is empty.
     """
-    processor_class = get_processor_class(settings.PAYMENT_PROCESSORS[0])
-
-    return processor_class
+    return registry.classes[0]
 
 
 def get_processor_class_by_name(name):
@@ -58,15 +134,29 @@ def get_processor_class_by_name(name):
     Raises:
         ProcessorNotFoundError: If no payment processor with the given name exists.
     """
-    for path in settings.PAYMENT_PROCESSORS:
-        processor_class = get_processor_class(path)
+    return registry.get_class(name)
+
+
+def get_processor(site, processor_class):
+    """Return a (possibly cached) instance of the given payment processor class for the site.
+
+    Arguments:
+        site (Site): The site the processor is used for.
+        processor_class (class): A payment processor class.
+
+    Returns:
+        BasePaymentProcessor: The payment processor instance.
+    """
+    return registry.get_processor(site, processor_class)
 
-        if name == processor_class.NAME:
-            return processor_class
 
-    raise exceptions.ProcessorNotFoundError(
-        exceptions.PROCESSOR_NOT_FOUND_DEVELOPER_MESSAGE.format(name=name)
-    )
+def get_processor_by_name(site, name):
+    """Return a (possibly cached) instance of the payment processor with the given name for the site.
+
+    Raises:
+        ProcessorNotFoundError: If no payment processor with the given name exists.
+    """
+    return registry.get_processor(site, get_processor_class_by_name(name))
 
 
 def sign(message, secret):
@@ -2,9 +2,11 @@
 
 
 import base64
-import datetime
 import json
 import logging
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass
 from decimal import Decimal
 from enum import Enum
@@ -38,11 +40,11 @@ from django.conf import settings
 from jwt.algorithms import RSAAlgorithm
 from oscar.apps.payment.exceptions import GatewayError, TransactionDeclined, UserCancelled
 from oscar.core.loading import get_class, get_model
-from pytz import UTC
 from zeep import Client
 from zeep.helpers import serialize_object
 from zeep.wsse import UsernameToken
 
+from ecommerce.core.instrumentation import record_upstream_call
 from ecommerce.extensions.payment.constants import APPLE_PAY_CYBERSOURCE_CARD_TYPE_MAP, CYBERSOURCE_CARD_TYPE_MAP
 from ecommerce.extensions.payment.exceptions import (
     AuthorizationError,
@@ -79,6 +81,72 @@ def del_none(d):  # pragma: no cover
     return d
 
 
+class CaptureContextPool:
+    """
+    A process-local pool of pre-generated Flex capture contexts for one merchant and target origin.
+
+    Capture contexts are handed out to sessions on demand, and the pool is refilled in a background thread
+    whenever it drops below its size, so that page loads do not wait on CyberSource's key generation.
+    Contexts are discarded once fewer than CYBERSOURCE_CAPTURE_CONTEXT_MIN_TTL seconds remain before their
+    `exp` claim.
+    """
+
+    def __init__(self, generate, size):
+        """
+        Arguments:
+            generate (callable): Returns a new `(capture_context, exp)` pair.
+            size (int): Number of capture contexts to keep ready.
+        """
+        self.generate = generate
+        self.size = size
+        self._contexts = deque()
+        self._lock = threading.Lock()
+        self._refilling = False
+
+    def _prune(self, now):
+        min_exp = now + settings.CYBERSOURCE_CAPTURE_CONTEXT_MIN_TTL
+        self._contexts = deque(entry for entry in self._contexts if entry[1] > min_exp)
+
+    def acquire(self):
+        """
+        Return a `(capture_context, exp)` pair, generating one synchronously only if the pool is empty.
+        """
+        with self._lock:
+            self._prune(time.time())
+            entry = self._contexts.popleft() if self._contexts else None
+        self.refill()
+        return entry or self.generate()
+
+    def refill(self):
+        """
+        Start a background thread to top the pool up, unless one is already running.
+        """
+        with self._lock:
+            if self._refilling or len(self._contexts) >= self.size:
+                return
+            self._refilling = True
+        threading.Thread(target=self._refill, daemon=True).start()
+
+    def _refill(self):
+        try:
+            while len(self._contexts) < self.size:
+                entry = self.generate()
+                with self._lock:
+                    self._contexts.append(entry)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Failed to refill the CyberSource capture context pool.')
+        finally:
+            with self._lock:
+                self._refilling = False
+
+    def __len__(self):
+        return len(self._contexts)
+
+
+_capture_context_pools = {}
+_capture_context_pools_lock = threading.Lock()
+
+
 class Decision(Enum):
     """
     An enumeration of expected CyberSource decisions that we have specific
@@ -177,7 +245,13 @@ class CybersourceREST(ApplePayMixin, BaseClientSidePaymentProcessor):
     def client_side_payment_url(self):
         return None
 
-    def get_capture_context(self, session):  # pragma: no cover
+    def _generate_capture_context(self):  # pragma: no cover
+        """
+        Request a new capture context from CyberSource.
+
+        Returns: (capture_context, exp)
+            The capture context and the expiry timestamp of its `exp` claim.
+        """
         # To delete None values in Input Request Json body
 
         requestObj = GeneratePublicKeyRequest(
@@ -188,45 +262,74 @@ class CybersourceREST(ApplePayMixin, BaseClientSidePaymentProcessor):
         requestObj = json.dumps(requestObj)
 
         api_instance = KeyGenerationApi(self.cybersource_api_config)
-        return_data, _, _ = api_instance.generate_public_key(
-            generate_public_key_request=requestObj,
-            format='JWT',
-            _request_timeout=(self.connect_timeout, self.read_timeout),
-        )
+        with record_upstream_call('cybersource', 'generate_public_key'):
+            return_data, _, _ = api_instance.generate_public_key(
+                generate_public_key_request=requestObj,
+                format='JWT',
+                _request_timeout=(self.connect_timeout, self.read_timeout),
+            )
+
+        exp = jwt.decode(return_data.key_id, verify=False)['exp']
+        return {'key_id': return_data.key_id}, exp
+
+    def _get_capture_context_pool(self):
+        """
+        Return the capture context pool for this merchant and target origin, or None if pooling is disabled.
+        """
+        size = settings.CYBERSOURCE_CAPTURE_CONTEXT_POOL_SIZE
+        if not size:
+            return None
+
+        key = (self.flex_run_environment, self.merchant_id, self.flex_target_origin)
+        pool = _capture_context_pools.get(key)
+        if pool is None:
+            with _capture_context_pools_lock:
+                pool = _capture_context_pools.setdefault(key, CaptureContextPool(self._generate_capture_context, size))
+        return pool
 
-        new_capture_context = {'key_id': return_data.key_id}
+    def get_capture_context(self, session):  # pragma: no cover
+        pool = self._get_capture_context_pool()
+        if pool:
+            new_capture_context, exp = pool.acquire()
+        else:
+            new_capture_context, exp = self._generate_capture_context()
 
+        # The expiry of each capture context is kept next to it in the session, so that it does not need to be
+        # decoded again to discard expired ones.
+        now = time.time()
         capture_contexts = [
             capture_context
-            for (capture_context, _)
-            in self._unexpired_capture_contexts(session)
+            for capture_context in session.get('capture_contexts', [])
+            if capture_context.get('exp', now) >= now
         ]
-        capture_contexts.insert(0, new_capture_context)
+        capture_contexts.insert(0, dict(new_capture_context, exp=exp))
         # Prevent session size explosion by limiting the number of recorded capture contexts
         session['capture_contexts'] = capture_contexts[:20]
         return new_capture_context
 
     def _unexpired_capture_contexts(self, session):
         """
-        Return all unexpired capture contexts in the supplied session.
+        Yield all unexpired capture contexts in the supplied session.
+
+        The expiry recorded next to each capture context when it was generated is compared against, and the
+        capture contexts are only decoded as they are yielded, so that callers stopping at the first matching
+        one do not decode the others. Capture contexts recorded without an expiry are decoded to check it.
 
         Arguments:
             session (Session): the current user session
 
-        Returns: [(capture_context, decoded_capture_context)]
-            The list of all still-valid capture contexts, both encoded and decoded
-        """
-        now = datetime.datetime.now(UTC)
-        return [
-            (capture_context, decoded_capture_context)
-            for (capture_context, decoded_capture_context)
-            in (
-                (capture_context, jwt.decode(capture_context['key_id'], verify=False))
-                for capture_context
-                in session.get('capture_contexts', [])
-            )
-            if not datetime.datetime.fromtimestamp(decoded_capture_context['exp'], tz=UTC) < now
-        ]
+        Yields: (capture_context, decoded_capture_context)
+            The still-valid capture contexts, both encoded and decoded
+        """
+        now = time.time()
+        for capture_context in session.get('capture_contexts', []):
+            exp = capture_context.get('exp')
+            if exp is not None and exp < now:
+                continue
+            decoded_capture_context = jwt.decode(capture_context['key_id'], verify=False)
+            if exp is None and decoded_capture_context['exp'] < now:
+                continue
+            yield capture_context, decoded_capture_context
 
     def get_transaction_parameters(self, basket, request=None, use_client_side_checkout=False, **kwargs):
         """
@@ -653,11 +756,12 @@ class CybersourceREST(ApplePayMixin, BaseClientSidePaymentProcessor):
         api_instance = ReversalApi(self.cybersource_api_config)
 
         try:
-            reversal_response, _, _ = api_instance.auth_reversal(
-                payment_processor_response.transaction_id,
-                json.dumps(requestObj),
-                _request_timeout=(self.connect_timeout, self.read_timeout)
-            )
+            with record_upstream_call('cybersource', 'auth_reversal'):
+                reversal_response, _, _ = api_instance.auth_reversal(
+                    payment_processor_response.transaction_id,
+                    json.dumps(requestObj),
+                    _request_timeout=(self.connect_timeout, self.read_timeout)
+                )
         except ApiException as e:
             reversal_response = e
 
@@ -776,10 +880,11 @@ class CybersourceREST(ApplePayMixin, BaseClientSidePaymentProcessor):
         self.record_processor_response(requestObj, transaction_id='[REQUEST]', basket=basket)
 
         api_instance = PaymentsApi(self.cybersource_api_config)
-        payment_processor_response, _, _ = api_instance.create_payment(
-            json.dumps(requestObj),
-            _request_timeout=(self.connect_timeout, self.read_timeout)
-        )
+        with record_upstream_call('cybersource', 'create_payment'):
+            payment_processor_response, _, _ = api_instance.create_payment(
+                json.dumps(requestObj),
+                _request_timeout=(self.connect_timeout, self.read_timeout)
+            )
 
         # Add the billing address to the response so it's available for the rest of the order completion process
         payment_processor_response.billing_address = BillingAddress(
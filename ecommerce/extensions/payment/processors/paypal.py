@@ -35,17 +35,14 @@ class Paypal(BasePaymentProcessor):
     TITLE = 'PayPal'
     DEFAULT_PROFILE_NAME = 'default'
 
-    def __init__(self, site):
+    @property
+    def retry_attempts(self):
         """
-        Constructs a new instance of the PayPal processor.
+        Number of times payment execution is retried after failure.
 
-        Raises:
-            KeyError: If a required setting is not configured for this payment processor
+        Read on every use, rather than in the constructor, because processor instances are cached across requests.
         """
-        super(Paypal, self).__init__(site)
-
-        # Number of times payment execution is retried after failure.
-        self.retry_attempts = PaypalProcessorConfiguration.get_solo().retry_attempts
+        return PaypalProcessorConfiguration.get_solo().retry_attempts
 
     @cached_property
     def paypal_api(self):
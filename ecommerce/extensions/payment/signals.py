@@ -9,6 +9,7 @@ from edx_django_utils.cache import TieredCache
 from waffle.models import Switch
 
 from ecommerce.extensions.api.v2.views.payments import PAYMENT_PROCESSOR_CACHE_KEY
+from ecommerce.extensions.payment.helpers import registry
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +18,7 @@ logger = logging.getLogger(__name__)
 def invalidate_processor_cache(*_args, **kwargs):
     """
     When Waffle switches for payment processors are toggled, the
-    payment processor list view cache must be invalidated.
+    payment processor list view cache and the cached processor instances must be invalidated.
     """
     switch = kwargs['instance']
     parts = switch.name.split(settings.PAYMENT_PROCESSOR_SWITCH_PREFIX)
@@ -25,4 +26,5 @@ def invalidate_processor_cache(*_args, **kwargs):
         processor = parts[1]
         logger.info('Switched payment processor [%s] %s.', processor, 'on' if switch.active else 'off')
         TieredCache.delete_all_tiers(PAYMENT_PROCESSOR_CACHE_KEY)
+        registry.clear_instances()
         logger.info('Invalidated payment processor cache after toggling [%s].', switch.name)
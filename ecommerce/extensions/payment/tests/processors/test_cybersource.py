@@ -3,6 +3,7 @@
 
 
 import json
+import time
 from decimal import Decimal
 from unittest import SkipTest
 
@@ -11,12 +12,15 @@ import mock
 import requests
 import responses
 from CyberSource.api_client import ApiClient
+from CyberSource.rest import ApiException
+from django.test import override_settings
 from oscar.apps.payment.exceptions import GatewayError
 from oscar.core.loading import get_model
 from oscar.test import factories
 
 from ecommerce.extensions.payment.models import PaymentProcessorResponse
 from ecommerce.extensions.payment.processors.cybersource import (
+    CaptureContextPool,
     Cybersource,
     CybersourceREST,
     Decision,
@@ -305,3 +309,77 @@ class CybersourceRESTTests(CybersourceMixin, PaymentProcessorTestCaseMixin, Cybe
 
     def test_client_side_payment_url(self):
         raise SkipTest("No client side payment url for CybersourceREST")
+
+
+@override_settings(CYBERSOURCE_CAPTURE_CONTEXT_MIN_TTL=60)
+class CaptureContextPoolTests(TestCase):
+    """ Tests for the pre-generated CyberSource capture context pool. """
+
+    def setUp(self):
+        super(CaptureContextPoolTests, self).setUp()
+        self.now = time.time()
+        self.generate = mock.Mock(side_effect=lambda: ({'key_id': 'generated'}, self.now + 900))
+        self.pool = CaptureContextPool(self.generate, 2)
+
+    def test_acquire(self):
+        """ Verify pooled capture contexts are handed out, and ones about to expire are discarded. """
+        self.pool._contexts.extend([  # pylint: disable=protected-access
+            ({'key_id': 'expiring'}, self.now + 30),
+            ({'key_id': 'pooled'}, self.now + 600),
+        ])
+        with mock.patch.object(CaptureContextPool, 'refill') as mock_refill:
+            self.assertEqual(self.pool.acquire(), ({'key_id': 'pooled'}, self.now + 600))
+            self.generate.assert_not_called()
+
+            # An empty pool falls back to generating a capture context synchronously.
+            self.assertEqual(self.pool.acquire()[0], {'key_id': 'generated'})
+            self.assertEqual(self.generate.call_count, 1)
+            self.assertEqual(mock_refill.call_count, 2)
+
+    def test_refill(self):
+        """ Verify the pool is refilled up to its size by a single background thread. """
+        with mock.patch('ecommerce.extensions.payment.processors.cybersource.threading.Thread') as mock_thread:
+            self.pool.refill()
+            self.pool.refill()
+            self.assertEqual(mock_thread.call_count, 1)
+
+        self.pool._refill()  # pylint: disable=protected-access
+        self.assertEqual(len(self.pool), 2)
+        self.assertEqual(self.generate.call_count, 2)
+        # The pool is already full, so no refill is started.
+        with mock.patch('ecommerce.extensions.payment.processors.cybersource.threading.Thread') as mock_thread:
+            self.pool.refill()
+            mock_thread.assert_not_called()
+
+    def test_refill_error(self):
+        """ Verify a failed refill is logged and a later refill can be started. """
+        self.generate.side_effect = ApiException
+        with mock.patch('ecommerce.extensions.payment.processors.cybersource.logger') as mock_logger:
+            self.pool._refilling = True  # pylint: disable=protected-access
+            self.pool._refill()  # pylint: disable=protected-access
+            self.assertTrue(mock_logger.exception.called)
+        self.assertFalse(self.pool._refilling)  # pylint: disable=protected-access
+
+    def test_unexpired_capture_contexts(self):
+        """ Verify capture contexts are checked against their recorded expiry, and only decoded when yielded. """
+        session = {'capture_contexts': [
+            {'key_id': 'expired', 'exp': self.now - 1},
+            {'key_id': 'valid', 'exp': self.now + 600},
+            {'key_id': 'legacy-expired'},
+            {'key_id': 'legacy-valid'},
+        ]}
+        processor = CybersourceREST(self.site)
+        decoded = {
+            'valid': {'exp': self.now - 1},
+            'legacy-expired': {'exp': self.now - 1},
+            'legacy-valid': {'exp': self.now + 600},
+        }
+        with mock.patch('ecommerce.extensions.payment.processors.cybersource.jwt') as mock_jwt:
+            mock_jwt.decode.side_effect = lambda key_id, verify: decoded[key_id]
+            unexpired = processor._unexpired_capture_contexts(session)  # pylint: disable=protected-access
+            first = next(unexpired)
+            mock_jwt.decode.assert_called_once_with('valid', verify=False)
+            rest = list(unexpired)
+        # The recorded expiry is trusted, decoding is only needed for contexts recorded without one.
+        self.assertEqual(first, (session['capture_contexts'][1], decoded['valid']))
+        self.assertEqual(rest, [(session['capture_contexts'][3], decoded['legacy-valid'])])
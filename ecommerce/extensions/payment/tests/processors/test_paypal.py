@@ -22,7 +22,7 @@ from testfixtures import LogCapture
 
 from ecommerce.core.tests import toggle_switch
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
-from ecommerce.extensions.payment.models import PaypalWebProfile
+from ecommerce.extensions.payment.models import PaypalProcessorConfiguration, PaypalWebProfile
 from ecommerce.extensions.payment.processors.paypal import Paypal
 from ecommerce.extensions.payment.tests.mixins import PaypalMixin
 from ecommerce.extensions.payment.tests.processors.mixins import PaymentProcessorTestCaseMixin
@@ -86,8 +86,13 @@ class PaypalTests(PaypalMixin, PaymentProcessorTestCaseMixin, TestCase):
         """DRY helper for getting receipt page URL."""
         return get_receipt_page_url(site_configuration=self.site.siteconfiguration)
 
+    def set_retry_attempts(self, retry_attempts):
+        configuration = PaypalProcessorConfiguration.get_solo()
+        configuration.retry_attempts = retry_attempts
+        configuration.save()
+
     def _assert_transaction_parameters_retry(self, api_responses, response_success, failure_log_message):
-        self.processor.retry_attempts = 2
+        self.set_retry_attempts(2)
         logger_name = 'ecommerce.extensions.payment.processors.paypal'
         toggle_switch('PAYPAL_RETRY_ATTEMPTS', True)
         url = self._create_api_url('/v1/payments/payment')
@@ -140,6 +145,13 @@ class PaypalTests(PaypalMixin, PaymentProcessorTestCaseMixin, TestCase):
         expected = urljoin(self.site.siteconfiguration.build_ecommerce_url(), reverse('paypal:execute'))
         self.assertEqual(last_request_body['redirect_urls']['return_url'], expected)
 
+    def test_retry_attempts(self):
+        """ Verify the retry attempts are read from the current configuration, not the one at construction time. """
+        self.set_retry_attempts(3)
+        self.assertEqual(self.processor.retry_attempts, 3)
+        self.set_retry_attempts(5)
+        self.assertEqual(self.processor.retry_attempts, 5)
+
     @responses.activate
     def test_get_courseid_title(self):
         for line in self.basket.all_lines():
@@ -442,7 +454,7 @@ class PaypalTests(PaypalMixin, PaymentProcessorTestCaseMixin, TestCase):
         GatewayError is raised.
         """
         toggle_switch('PAYPAL_RETRY_ATTEMPTS', True)
-        self.processor.retry_attempts = 1
+        self.set_retry_attempts(1)
         self.mock_oauth2_response()
         self.mock_payment_creation_response(self.basket, find=True)
         self.mock_payment_execution_response(self.basket)
@@ -1,6 +1,8 @@
 
 
 import ddt
+import mock
+from django.contrib.sites.models import Site
 from django.test import override_settings
 
 from ecommerce.extensions.payment import helpers
@@ -36,6 +38,35 @@ class HelperTests(TestCase):
         """
         self.assertRaises(ProcessorNotFoundError, helpers.get_processor_class_by_name, 'foo')
 
+    def test_processor_classes_are_resolved_once(self):
+        """ Verify the processor classes are only imported once per PAYMENT_PROCESSORS value. """
+        helpers.registry.clear()
+        with mock.patch.object(helpers, 'get_processor_class', wraps=helpers.get_processor_class) as mock_get:
+            helpers.get_default_processor_class()
+            helpers.get_processor_class_by_name(AnotherDummyProcessor.NAME)
+            self.assertEqual(mock_get.call_count, 2)
+
+        with override_settings(PAYMENT_PROCESSORS=['ecommerce.extensions.payment.tests.processors.DummyProcessor']):
+            self.assertRaises(ProcessorNotFoundError, helpers.get_processor_class_by_name, AnotherDummyProcessor.NAME)
+
+    def test_get_processor(self):
+        """ Verify processor instances are cached per site until the site configuration changes. """
+        processor = helpers.get_processor(self.site, DummyProcessor)
+        self.assertIsInstance(processor, DummyProcessor)
+        self.assertIs(helpers.get_processor_by_name(self.site, DummyProcessor.NAME), processor)
+        self.assertIsNot(helpers.get_processor(self.site, AnotherDummyProcessor), processor)
+
+        self.site.siteconfiguration.save()
+        self.assertIsNot(helpers.get_processor(self.site, DummyProcessor), processor)
+
+    def test_get_processor_other_site(self):
+        """ Verify a cached processor instance is not reused for a different Site object. """
+        processor = helpers.get_processor(self.site, DummyProcessor)
+        site = Site.objects.get(id=self.site.id)
+        other = helpers.get_processor(site, DummyProcessor)
+        self.assertIsNot(other, processor)
+        self.assertIs(other.site, site)
+
     def test_sign(self):
         """ Verify the function returns a valid HMAC SHA-256 signature. """
         message = "This is a super-secret message!"
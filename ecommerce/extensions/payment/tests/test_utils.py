@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 import json
+import threading
+import time
 
 import httpretty
+import mock
+from django.test import override_settings
 
-from ecommerce.extensions.payment.utils import clean_field_value, middle_truncate
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.payment.utils import clean_field_value, embargo_check, middle_truncate
+from ecommerce.tests.factories import UserFactory
 from ecommerce.tests.testcases import TestCase
 
 
@@ -61,3 +67,73 @@ class EmbargoCheckTests(TestCase):
         self.mock_embargo_response(json.dumps(embargo_response))
         response = self.site.siteconfiguration.embargo_api_client.course_access.get(**self.params)
         self.assertEqual(response, embargo_response)
+
+    def _embargo_check_args(self, lms_ip='10.1.2.3'):
+        user = UserFactory(tracking_context={'lms_ip': lms_ip})
+        course = CourseFactory(partner=self.partner)
+        product = course.create_or_update_seat('verified', False, 10)
+        return user, self.site, [product]
+
+    @httpretty.activate
+    def test_embargo_check_cached(self):
+        """ Verify embargo results are cached per user, IP address network and courses. """
+        self.mock_access_token_response()
+        self.mock_embargo_response(json.dumps({'access': False}))
+        user, site, products = self._embargo_check_args()
+
+        self.assertFalse(embargo_check(user, site, products))
+        embargo_requests = len(httpretty.httpretty.latest_requests)
+
+        # An address in the same network shares the cached result.
+        user.tracking_context = {'lms_ip': '10.1.2.200'}
+        self.assertFalse(embargo_check(user, site, products))
+        self.assertEqual(len(httpretty.httpretty.latest_requests), embargo_requests)
+
+        # An address in another network does not.
+        user.tracking_context = {'lms_ip': '10.1.3.200'}
+        self.assertFalse(embargo_check(user, site, products))
+        self.assertGreater(len(httpretty.httpretty.latest_requests), embargo_requests)
+
+    def test_embargo_check_fail_policy(self):
+        """ Verify the result of a failed embargo check follows EMBARGO_CHECK_FAIL_OPEN. """
+        user, site, products = self._embargo_check_args()
+        with mock.patch.object(type(site.siteconfiguration), 'embargo_api_client', new_callable=mock.PropertyMock) \
+                as mock_client:
+            mock_client.return_value.course_access.get.side_effect = Exception
+            self.assertTrue(embargo_check(user, site, products))
+            with override_settings(EMBARGO_CHECK_FAIL_OPEN=False):
+                self.assertFalse(embargo_check(user, site, products))
+
+    def test_embargo_check_single_flight(self):
+        """ Verify concurrent identical embargo checks share a single API call. """
+        user, site, products = self._embargo_check_args()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def course_access(**kwargs):
+            calls.append(kwargs)
+            started.set()
+            release.wait(5)
+            return {'access': True}
+
+        results = []
+        with mock.patch.object(type(site.siteconfiguration), 'embargo_api_client', new_callable=mock.PropertyMock) \
+                as mock_client:
+            mock_client.return_value.course_access.get.side_effect = course_access
+            threads = [
+                threading.Thread(target=lambda: results.append(embargo_check(user, site, products)))
+                for __ in range(3)
+            ]
+            threads[0].start()
+            started.wait(5)
+            # The other checks start while the first one is waiting for the API.
+            for thread in threads[1:]:
+                thread.start()
+            time.sleep(0.1)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(results, [True, True, True])
+        self.assertEqual(len(calls), 1)
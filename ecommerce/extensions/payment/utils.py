@@ -1,10 +1,13 @@
+import ipaddress
 import logging
 import re
 
+from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 from oscar.core.loading import get_model
 
 from ecommerce.core.constants import SEAT_PRODUCT_CLASS_NAME
+from ecommerce.core.utils import get_cache_key, get_or_set_cache
 from ecommerce.extensions.analytics.utils import parse_tracking_context
 
 logger = logging.getLogger(__name__)
@@ -98,9 +101,28 @@ def clean_field_value(value):
     return re.sub(r'[\^:"\']', '', value)
 
 
+def _get_ip_network(ip):
+    """
+    Return the network (as a string) that `ip` belongs to, used to share embargo results between nearby addresses.
+    """
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return ip
+
+    if address.version == 4:
+        prefix_length = settings.EMBARGO_CHECK_IPV4_PREFIX_LENGTH
+    else:
+        prefix_length = settings.EMBARGO_CHECK_IPV6_PREFIX_LENGTH
+    return str(ipaddress.ip_network((address, prefix_length), strict=False))
+
+
 def embargo_check(user, site, products):
     """ Checks if the user has access to purchase products by calling the LMS embargo API.
 
+    Results are cached for EMBARGO_CHECK_CACHE_TIMEOUT seconds per user, IP address network and set of
+    courses. If the API call fails, access is granted or denied according to EMBARGO_CHECK_FAIL_OPEN.
+
     Args:
         request : The current request
         products (list): A list of products to check access against
@@ -116,18 +138,33 @@ def embargo_check(user, site, products):
         if product.get_product_class().name == SEAT_PRODUCT_CLASS_NAME:
             courses.append(product.course.id)
 
-    if courses:
-        params = {
-            'user': user,
-            'ip_address': ip,
-            'course_ids': courses
-        }
-
-        try:
-            response = site.siteconfiguration.embargo_api_client.course_access.get(**params)
-            return response.get('access', True)
-        except:  # pylint: disable=bare-except
-            # We are going to allow purchase if the API is un-reachable.
-            pass
-
-    return True
+    if not courses:
+        return True
+
+    cache_key = get_cache_key(
+        site_domain=site.domain,
+        resource='embargo',
+        username=user.username,
+        ip_network=_get_ip_network(ip) if ip else ip,
+        course_ids=sorted(courses),
+    )
+    params = {
+        'user': user,
+        'ip_address': ip,
+        'course_ids': courses
+    }
+
+    def fetch():
+        response = site.siteconfiguration.embargo_api_client.course_access.get(**params)
+        return response.get('access', True)
+
+    try:
+        return get_or_set_cache(cache_key, fetch, settings.EMBARGO_CHECK_CACHE_TIMEOUT, namespace='embargo')
+    except:  # pylint: disable=bare-except
+        logger.exception(
+            'Embargo check failed for user [%s] and courses %s. Access is %s.',
+            user.username,
+            courses,
+            'allowed' if settings.EMBARGO_CHECK_FAIL_OPEN else 'denied'
+        )
+        return settings.EMBARGO_CHECK_FAIL_OPEN
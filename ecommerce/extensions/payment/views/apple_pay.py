@@ -5,6 +5,8 @@ import logging
 from django.http import HttpResponse
 from django.views import View
 
+from ecommerce.extensions.payment.helpers import get_processor
+
 logger = logging.getLogger(__name__)
 
 
@@ -12,7 +14,7 @@ class ApplePayMerchantDomainAssociationView(View):
     def get(self, request, *args, **kwargs):  # pylint: disable=unused-argument
         site_configuration = self.request.site.siteconfiguration
         payment_processor_class = site_configuration.get_client_side_payment_processor_class()
-        payment_processor = payment_processor_class(self.request.site)
+        payment_processor = get_processor(self.request.site, payment_processor_class)
         content = payment_processor.apple_pay_merchant_id_domain_association
         status_code = 200
 
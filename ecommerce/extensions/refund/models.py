@@ -14,7 +14,7 @@ from simple_history.models import HistoricalRecords
 from ecommerce.extensions.analytics.utils import audit_log
 from ecommerce.extensions.fulfillment.api import revoke_fulfillment_for_refund
 from ecommerce.extensions.order.constants import PaymentEventTypeName
-from ecommerce.extensions.payment.helpers import get_processor_class_by_name
+from ecommerce.extensions.payment.helpers import get_processor_by_name
 from ecommerce.extensions.refund.exceptions import InvalidStatus
 from ecommerce.extensions.refund.status import REFUND, REFUND_LINE
 
@@ -163,7 +163,7 @@ class Refund(StatusMixin, TimeStampedModel):
         try:
             # NOTE: Update this if we ever support multiple payment sources for a single order.
             source = self.order.sources.first()
-            processor = get_processor_class_by_name(source.source_type.name)(self.order.site)
+            processor = get_processor_by_name(self.order.site, source.source_type.name)
             amount = self.total_credit_excl_tax
 
             refund_reference_number = processor.issue_credit(self.order.number, self.order.basket, source.reference,
@@ -37,6 +37,7 @@ from ecommerce.extensions.voucher.utils import (
     generate_coupon_report,
     get_voucher_and_products_from_code,
     get_voucher_discount_info,
+    get_voucher_discount_infos,
     update_voucher_offer
 )
 from ecommerce.tests.factories import UserFactory
@@ -605,6 +606,24 @@ class UtilTests(CouponMixin, DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockM
         self.assertEqual(discount_info['discount_value'], 20.00)
         self.assertFalse(discount_info['is_discounted'])
 
+    def test_get_voucher_discount_infos(self):
+        """ Verify that get_voucher_discount_infos() returns the discount info of each price. """
+        __, benefit_percentage_half, __, benefit_value_half = self.create_benefits()
+        prices = [self.seat_price, 20.00, 0.0]
+        no_discount = {'discount_percentage': 0.00, 'discount_value': 0.00, 'is_discounted': False}
+
+        self.assertEqual(get_voucher_discount_infos(benefit_percentage_half, prices), [
+            {'discount_percentage': 50.00, 'discount_value': 50.00, 'is_discounted': True},
+            {'discount_percentage': 50.00, 'discount_value': 10.00, 'is_discounted': True},
+            no_discount,
+        ])
+        self.assertEqual(get_voucher_discount_infos(benefit_value_half, prices), [
+            {'discount_percentage': 50.00, 'discount_value': 50.00, 'is_discounted': True},
+            {'discount_percentage': 100.00, 'discount_value': 20.00, 'is_discounted': False},
+            no_discount,
+        ])
+        self.assertEqual(get_voucher_discount_infos(None, prices), [no_discount] * len(prices))
+
     def test_multiple_usage_coupon(self):
         """Test that multiple-usage coupon is created and the usage number decreased on usage."""
         # Verify that the created voucher has two possible applications.
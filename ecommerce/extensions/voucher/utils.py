@@ -862,33 +862,62 @@ def get_voucher_discount_info(benefit, price):
     Returns:
         dict
     """
+    return get_voucher_discount_infos(benefit, [price])[0]
 
-    if benefit and price > 0:
-        benefit_value = float(benefit.value)
-        price = float(price)
-        if benefit.type == Benefit.PERCENTAGE:
-            return {
+
+def get_voucher_discount_infos(benefit, prices):
+    """
+    Get the discount info of a benefit for many product prices at once.
+
+    The benefit is read once for all the prices, and the info of each price is the one
+    `get_voucher_discount_info` returns for it.
+
+    Args:
+        benefit (Benefit): Benefit provided by an applied voucher.
+        prices (iterable of Decimal): Product prices.
+
+    Returns:
+        list of dict, in the order of the prices.
+    """
+    no_discount = {
+        'discount_percentage': 0.00,
+        'discount_value': 0.00,
+        'is_discounted': False
+    }
+    if not benefit:
+        return [dict(no_discount) for __ in prices]
+
+    benefit_value = float(benefit.value)
+    if benefit.type == Benefit.PERCENTAGE:
+        is_discounted = benefit.value < 100
+        return [
+            {
                 'discount_percentage': benefit_value,
-                'discount_value': get_discount_value(discount_percentage=benefit_value, product_price=price),
-                'is_discounted': benefit.value < 100
-            }
+                'discount_value': get_discount_value(discount_percentage=benefit_value, product_price=float(price)),
+                'is_discounted': is_discounted
+            } if price > 0 else dict(no_discount)
+            for price in prices
+        ]
+
+    discount_infos = []
+    for price in prices:
+        if not price > 0:
+            discount_infos.append(dict(no_discount))
+            continue
 
+        price = float(price)
         discount_percentage = get_discount_percentage(discount_value=benefit_value, product_price=price)
         if discount_percentage > 100:
             discount_percentage = 100.00
             discount_value = price
         else:
             discount_value = benefit_value
-        return {
+        discount_infos.append({
             'discount_percentage': discount_percentage,
             'discount_value': float(discount_value),
             'is_discounted': discount_percentage < 100,
-        }
-    return {
-        'discount_percentage': 0.00,
-        'discount_value': 0.00,
-        'is_discounted': False
-    }
+        })
+    return discount_infos
 
 
 def update_voucher_with_enterprise_offer(offer, benefit_value, enterprise_customer, benefit_type=None,
@@ -0,0 +1,37 @@
+# Generated by Django 2.2.26 on 2026-10-19 10:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django_extensions.db.fields
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('basket', '0014_line_date_updated'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BasketRefundCredit',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('idempotency_key', models.CharField(max_length=255, unique=True)),
+                ('processor_name', models.CharField(max_length=255)),
+                ('transaction_id', models.CharField(blank=True, max_length=255, null=True)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('currency', models.CharField(max_length=12)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], db_index=True, default='pending', max_length=32)),
+                ('credit_transaction_id', models.CharField(blank=True, max_length=255, null=True)),
+                ('basket', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='basket.Basket')),
+            ],
+            options={
+                'get_latest_by': 'modified',
+                'abstract': False,
+            },
+        ),
+    ]
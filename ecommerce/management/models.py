@@ -0,0 +1,42 @@
+
+
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+from django_extensions.db.models import TimeStampedModel
+
+
+class BasketRefundCredit(TimeStampedModel):
+    """
+    Records a processor credit issued by `refund_basket_transactions`.
+
+    Each payment transaction is credited at most once: the idempotency key identifies the basket transaction
+    being refunded, and successful credits are skipped when a refund job is run again or resumed.
+    """
+    PENDING = 'pending'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, _('Pending')),
+        (SUCCEEDED, _('Succeeded')),
+        (FAILED, _('Failed')),
+    )
+
+    idempotency_key = models.CharField(max_length=255, unique=True)
+    basket = models.ForeignKey('basket.Basket', null=True, blank=True, on_delete=models.SET_NULL)
+    processor_name = models.CharField(max_length=255)
+    transaction_id = models.CharField(max_length=255, null=True, blank=True)
+    amount = models.DecimalField(decimal_places=2, max_digits=12)
+    currency = models.CharField(max_length=12)
+    status = models.CharField(max_length=32, choices=STATUS_CHOICES, default=PENDING, db_index=True)
+    credit_transaction_id = models.CharField(max_length=255, null=True, blank=True)
+
+    @staticmethod
+    def make_idempotency_key(basket_id, processor_name, transaction_id):
+        return '{basket_id}:{processor_name}:{transaction_id}'.format(
+            basket_id=basket_id,
+            processor_name=processor_name,
+            transaction_id=transaction_id,
+        )
+
+    def __str__(self):
+        return '{key}-{status}'.format(key=self.idempotency_key, status=self.status)
@@ -1,8 +1,12 @@
 
 
+import datetime
+
 import mock
 from django.db import transaction
 from django.test import override_settings
+from django.utils import timezone
+from oscar.apps.payment.exceptions import GatewayError
 from oscar.core.loading import get_class, get_model
 from oscar.test.factories import ProductFactory, RangeFactory, create_order
 
@@ -14,7 +18,8 @@ from ecommerce.extensions.payment.models import PaymentProcessorResponse
 from ecommerce.extensions.payment.processors.cybersource import Cybersource
 from ecommerce.extensions.payment.processors.paypal import Paypal
 from ecommerce.extensions.test.factories import create_basket, prepare_voucher
-from ecommerce.management.utils import FulfillFrozenBaskets, refund_basket_transactions
+from ecommerce.management.models import BasketRefundCredit
+from ecommerce.management.utils import REFUND_PENDING_TIMEOUT, FulfillFrozenBaskets, refund_basket_transactions
 from ecommerce.tests.factories import UserFactory
 from ecommerce.tests.testcases import TestCase
 
@@ -54,6 +59,106 @@ class RefundBasketTransactionsTests(TestCase):
         basket = create_basket(site=self.site)
         PaymentProcessorResponse.objects.create(basket=basket)
         assert refund_basket_transactions(self.site, [basket.id]) == (0, 1,)
+        assert BasketRefundCredit.objects.get(basket=basket).status == BasketRefundCredit.FAILED
+
+    def test_resume(self):
+        """ Transactions which were already credited are skipped, and failed credits are retried. """
+        order = create_order(site=self.site)
+        basket = order.basket
+        basket.site = self.site
+        basket.save()
+        PaymentProcessorResponse.objects.create(basket=basket, transaction_id='abc', processor_name='paypal')
+        PaymentProcessorResponse.objects.create(basket=basket, transaction_id='def', processor_name='paypal')
+
+        def issue_credit(order_number, basket, reference_number, amount, currency):  # pylint: disable=unused-argument
+            if reference_number == 'def':
+                raise GatewayError
+            return 'refund-' + reference_number
+
+        with mock.patch.object(Paypal, 'issue_credit', side_effect=issue_credit) as mock_issue_credit:
+            assert refund_basket_transactions(self.site, [basket.id]) == (1, 1,)
+            # The refund amount is read from the order, without re-applying offers.
+            mock_issue_credit.assert_any_call(
+                basket.order_number, basket, 'abc', order.total_excl_tax, basket.currency
+            )
+
+        credit = BasketRefundCredit.objects.get(transaction_id='abc')
+        assert credit.status == BasketRefundCredit.SUCCEEDED
+        assert credit.credit_transaction_id == 'refund-abc'
+
+        # The response recorded for the credit is not refunded, and only the failed credit is retried.
+        PaymentProcessorResponse.objects.create(basket=basket, transaction_id='refund-abc', processor_name='paypal')
+        with mock.patch.object(Paypal, 'issue_credit', return_value='refund-def') as mock_issue_credit:
+            assert refund_basket_transactions(self.site, [basket.id]) == (1, 0,)
+            mock_issue_credit.assert_called_once_with(
+                basket.order_number, basket, 'def', order.total_excl_tax, basket.currency
+            )
+        assert BasketRefundCredit.objects.get(transaction_id='def').status == BasketRefundCredit.SUCCEEDED
+
+    def test_failed_credit_retried(self):
+        """ Failed credits, which have no credit transaction, are retried. """
+        basket = create_basket(site=self.site)
+        PaymentProcessorResponse.objects.create(basket=basket, processor_name='paypal')
+        with mock.patch.object(Paypal, 'issue_credit', side_effect=GatewayError):
+            assert refund_basket_transactions(self.site, [basket.id]) == (0, 1,)
+        with mock.patch.object(Paypal, 'issue_credit', return_value='refund') as mock_issue_credit:
+            assert refund_basket_transactions(self.site, [basket.id]) == (1, 0,)
+            assert mock_issue_credit.call_count == 1
+        assert BasketRefundCredit.objects.get(basket=basket).status == BasketRefundCredit.SUCCEEDED
+
+    def test_pending_credit(self):
+        """ Credits left pending by a crashed run are retried, unless the processor recorded a response since. """
+        basket = create_basket(site=self.site)
+        PaymentProcessorResponse.objects.create(basket=basket, transaction_id='abc', processor_name='paypal')
+        credit = BasketRefundCredit.objects.create(
+            idempotency_key=BasketRefundCredit.make_idempotency_key(basket.id, 'paypal', 'abc'),
+            basket=basket,
+            processor_name='paypal',
+            transaction_id='abc',
+            amount=10,
+            currency=basket.currency,
+        )
+
+        # The credit may still be issued by a concurrent run.
+        with mock.patch.object(Paypal, 'issue_credit') as mock_issue_credit:
+            assert refund_basket_transactions(self.site, [basket.id]) == (0, 0,)
+            mock_issue_credit.assert_not_called()
+
+        stale = timezone.now() - REFUND_PENDING_TIMEOUT - datetime.timedelta(minutes=1)
+        BasketRefundCredit.objects.filter(id=credit.id).update(modified=stale)
+        unexplained = PaymentProcessorResponse.objects.create(
+            basket=basket, transaction_id='unknown', processor_name='paypal'
+        )
+        with mock.patch.object(Paypal, 'issue_credit') as mock_issue_credit:
+            # The unexplained response is most likely the record of the pending credit, neither is refunded.
+            assert refund_basket_transactions(self.site, [basket.id]) == (0, 0,)
+            mock_issue_credit.assert_not_called()
+        assert BasketRefundCredit.objects.get(id=credit.id).status == BasketRefundCredit.PENDING
+        assert not BasketRefundCredit.objects.filter(transaction_id='unknown').exists()
+
+        unexplained.delete()
+        with mock.patch.object(Paypal, 'issue_credit', return_value='refund-abc') as mock_issue_credit:
+            assert refund_basket_transactions(self.site, [basket.id]) == (1, 0,)
+            mock_issue_credit.assert_called_once_with(basket.order_number, basket, 'abc', mock.ANY, basket.currency)
+        assert BasketRefundCredit.objects.get(id=credit.id).status == BasketRefundCredit.SUCCEEDED
+
+    def test_claimed_by_another_run(self):
+        """ Transactions claimed by a concurrent run after they were read are skipped. """
+        basket = create_basket(site=self.site)
+        PaymentProcessorResponse.objects.create(basket=basket, transaction_id='abc', processor_name='paypal')
+        key = BasketRefundCredit.make_idempotency_key(basket.id, 'paypal', 'abc')
+
+        def claim_concurrently(baskets):  # pylint: disable=unused-argument
+            BasketRefundCredit.objects.create(
+                idempotency_key=key, basket=basket, processor_name='paypal', transaction_id='abc', amount=10,
+                currency=basket.currency,
+            )
+            return {basket.id: 10}
+
+        with mock.patch('ecommerce.management.utils._get_refund_amounts', side_effect=claim_concurrently):
+            with mock.patch.object(Paypal, 'issue_credit') as mock_issue_credit:
+                assert refund_basket_transactions(self.site, [basket.id]) == (0, 0,)
+                mock_issue_credit.assert_not_called()
 
 
 @override_settings(FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.FakeFulfillmentModule', ])
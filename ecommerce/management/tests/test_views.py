@@ -2,7 +2,7 @@
 
 import mock
 from django.contrib import messages
-from django.urls import reverse
+from django.urls import resolve, reverse
 
 from ecommerce.management.utils import FulfillFrozenBaskets
 from ecommerce.tests.testcases import TestCase
@@ -54,6 +54,10 @@ class ManagementViewTests(TestCase):
                    '[0] attempts failed.'
         self.assert_first_message(response, messages.INFO, expected)
 
+    def test_non_atomic_requests(self):
+        """ Verify the credits claimed and issued by the view are not rolled back with its request. """
+        assert 'default' in resolve(self.path).func._non_atomic_requests  # pylint: disable=protected-access
+
     def test_fulfill(self):
         with mock.patch.object(FulfillFrozenBaskets, 'fulfill_basket') as mock_fulfill:
             response = self.client.post(self.path, {'action': 'fulfill', 'basket_ids': '1,2,3'})
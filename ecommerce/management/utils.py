@@ -1,15 +1,20 @@
 
 
+import datetime
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from django.db import connections, transaction
 from django.db.models import Q
+from django.utils import timezone
 from oscar.apps.partner import strategy
 from oscar.core.loading import get_class, get_model
 
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.payment.constants import CYBERSOURCE_CARD_TYPE_MAP
-from ecommerce.extensions.payment.helpers import get_processor_class_by_name
+from ecommerce.extensions.payment.helpers import get_processor_by_name
 from ecommerce.extensions.payment.processors import HandledProcessorResponse
+from ecommerce.management.models import BasketRefundCredit
 
 logger = logging.getLogger(__name__)
 
@@ -22,53 +27,250 @@ OrderTotalCalculator = get_class('checkout.calculators', 'OrderTotalCalculator')
 ShippingEventType = get_model('order', 'ShippingEventType')
 
 SHIPPING_EVENT_NAME = 'Shipped'
+REFUND_MAX_WORKERS = 4
+# Credits left pending for longer than this are assumed to be abandoned by a crashed run, and are re-verified.
+REFUND_PENDING_TIMEOUT = datetime.timedelta(hours=1)
 
-_payment_processors = {}
 
+def _get_refund_amounts(baskets):
+    """
+    Return a dict mapping basket id to the amount to refund for the basket.
 
-def _get_payment_processor(site, name):
-    key = (site, name,)
-    payment_processor = _payment_processors.get(key)
-
-    if not payment_processor:
-        payment_processor = get_processor_class_by_name(name)(site)
-        _payment_processors[key] = payment_processor
-
-    return payment_processor
-
-
-def refund_basket_transactions(site, basket_ids):
-    baskets = Basket.objects.filter(site=site, id__in=basket_ids)
+    The amount is read from the order placed for the basket. Offers are only re-applied to compute the total
+    of baskets for which no order was placed.
+    """
+    amounts = dict(
+        Order.objects.filter(basket__in=baskets).values_list('basket_id', 'total_excl_tax')
+    )
+    for basket in baskets:
+        if basket.id not in amounts:
+            basket.strategy = strategy.Default()
+            Applicator().apply(basket, basket.owner, None)
+            amounts[basket.id] = basket.total_excl_tax
+    return amounts
+
+
+def _issue_credit(payment_processor, order_number, basket, credit):
+    """
+    Issue a processor credit for a claimed BasketRefundCredit. Runs on a worker thread.
+    """
+    try:
+        return payment_processor.issue_credit(
+            order_number, basket, credit.transaction_id, credit.amount, credit.currency
+        )
+    finally:
+        # Worker threads open their own database connections, which must not outlive the task.
+        connections.close_all()
+
+
+def _is_abandoned(credit, now):
+    return credit.status == BasketRefundCredit.PENDING and credit.modified <= now - REFUND_PENDING_TIMEOUT
+
+
+def _get_unexplained_responses(credit, basket, existing_credits, credit_transactions):
+    """
+    Return the responses of the processor of an abandoned credit recorded since it was claimed, which are neither
+    the transaction it refunds nor the transaction or result of another credit.
+
+    Processors record a response for every credit they attempt, so such a response is most likely the record of the
+    abandoned credit itself, and must not be refunded.
+    """
+    unexplained_responses = []
+    for response in basket.paymentprocessorresponse_set.all():
+        if response.processor_name != credit.processor_name or response.created < credit.modified:
+            continue
+        if response.transaction_id == credit.transaction_id:
+            continue
+        transaction_key = (basket.id, response.processor_name, response.transaction_id)
+        if BasketRefundCredit.make_idempotency_key(*transaction_key) in existing_credits:
+            continue
+        if transaction_key in credit_transactions:
+            continue
+        unexplained_responses.append(response)
+    return unexplained_responses
+
+
+def _get_basket_transactions(basket, existing_credits, credit_transactions, now):
+    """
+    Return the transactions of the basket to refund, and the unexplained responses of its abandoned credits.
+
+    Returns:
+        tuple: (set of (processor_name, transaction_id) tuples, dict mapping the idempotency key of each abandoned
+            credit to its unexplained responses)
+    """
+    unexplained_responses = {
+        credit.idempotency_key: _get_unexplained_responses(credit, basket, existing_credits, credit_transactions)
+        for credit in existing_credits.values()
+        if credit.basket_id == basket.id and _is_abandoned(credit, now)
+    }
+    unexplained_transactions = {
+        (response.processor_name, response.transaction_id)
+        for responses in unexplained_responses.values() for response in responses
+    }
+    transactions = {
+        (response.processor_name, response.transaction_id)
+        for response in basket.paymentprocessorresponse_set.all()
+        if (basket.id, response.processor_name, response.transaction_id) not in credit_transactions
+    }
+    return transactions - unexplained_transactions, unexplained_responses
+
+
+def _is_credit_retryable(credit, basket, unexplained_responses, now):
+    """
+    Return True if the existing BasketRefundCredit should be issued again.
+
+    Failed credits are retried. A credit left pending by a crashed run is only retried, under the same idempotency
+    key, if no unexplained response of its processor was recorded since it was claimed, see
+    `_get_unexplained_responses`. Otherwise it has to be reconciled manually.
+    """
+    if credit.status == BasketRefundCredit.FAILED:
+        return True
+    if not _is_abandoned(credit, now):
+        log = logger.info if credit.status == BasketRefundCredit.SUCCEEDED else logger.warning
+        log('Skipping [%s] transaction [%s] made against basket [%d], its credit is [%s].',
+            credit.processor_name, credit.transaction_id, basket.id, credit.status)
+        return False
+    if unexplained_responses:
+        logger.warning(
+            'Credit [%s] is pending, and responses %s were recorded since it was claimed. Neither is refunded, they '
+            'must be reconciled with the processor manually.',
+            credit.idempotency_key, [response.id for response in unexplained_responses]
+        )
+        return False
+    logger.info('Credit [%s] was left pending by an earlier run, it is retried.', credit.idempotency_key)
+    return True
+
+
+def _claim_credit(credit, key, basket, processor_name, transaction_id, amount):
+    """
+    Record a pending BasketRefundCredit for the transaction, before its credit is issued.
+
+    New credits are created, and existing credits are only claimed if they were not modified since they were read.
+    The claim is committed on its own, so that it outlives a crash of the run.
+
+    Returns:
+        BasketRefundCredit: The claimed credit, or None if another run already claimed it.
+    """
+    with transaction.atomic():
+        if credit is None:
+            credit, created = BasketRefundCredit.objects.get_or_create(
+                idempotency_key=key,
+                defaults={
+                    'basket': basket,
+                    'processor_name': processor_name,
+                    'transaction_id': transaction_id,
+                    'amount': amount,
+                    'currency': basket.currency,
+                    'status': BasketRefundCredit.PENDING,
+                },
+            )
+            if created:
+                return credit
+        elif BasketRefundCredit.objects.filter(id=credit.id, status=credit.status, modified=credit.modified).update(
+                amount=amount, currency=basket.currency, status=BasketRefundCredit.PENDING, modified=timezone.now()):
+            credit.refresh_from_db()
+            return credit
+
+    logger.warning('Skipping [%s] transaction [%s] made against basket [%d], its credit was claimed by another run.',
+                   processor_name, transaction_id, basket.id)
+    return None
+
+
+def refund_basket_transactions(site, basket_ids, max_workers=REFUND_MAX_WORKERS):
+    """
+    Issue credits for the payment transactions made against the given baskets.
+
+    Credits are recorded as BasketRefundCredit rows before being issued, so running the job again for the same
+    baskets resumes it: transactions that were already credited are skipped, failed credits are retried, and
+    credits left pending by a crashed run are re-verified, see `_is_credit_retryable`. Transactions claimed by a
+    concurrent run are skipped. At most `max_workers` credits are issued concurrently.
+
+    Each claim and each result is committed on its own, so this must not run inside a transaction, e.g. in a view
+    with ATOMIC_REQUESTS.
+
+    Returns:
+        tuple: (number of credits issued, number of failed attempts)
+    """
+    baskets = list(
+        Basket.objects.filter(site=site, id__in=basket_ids).select_related('owner').prefetch_related(
+            'paymentprocessorresponse_set'
+        )
+    )
 
     success_count = 0
     failure_count = 0
-
-    for basket in baskets:
-        basket.strategy = strategy.Default()
-        Applicator().apply(basket, basket.owner, None)
-
-        logger.info('Refunding transactions for basket [%d]...', basket.id)
-        transactions = set(
-            list(basket.paymentprocessorresponse_set.values_list('processor_name', 'transaction_id')))
-
-        for processor_name, transaction_id in transactions:
+    skipped_count = 0
+    claimed = []
+
+    if baskets:
+        existing_credits = {
+            credit.idempotency_key: credit for credit in BasketRefundCredit.objects.filter(basket__in=baskets)
+        }
+        # Responses recorded by the credits themselves must not be refunded.
+        credit_transactions = {
+            (credit.basket_id, credit.processor_name, credit.credit_transaction_id)
+            for credit in existing_credits.values()
+            if credit.credit_transaction_id is not None
+        }
+        amounts = _get_refund_amounts(baskets)
+        now = timezone.now()
+
+        for basket in baskets:
+            logger.info('Refunding transactions for basket [%d]...', basket.id)
+            transactions, unexplained_responses = _get_basket_transactions(
+                basket, existing_credits, credit_transactions, now
+            )
+            skipped_count += sum(len(responses) for responses in unexplained_responses.values())
+
+            for processor_name, transaction_id in transactions:
+                key = BasketRefundCredit.make_idempotency_key(basket.id, processor_name, transaction_id)
+                credit = existing_credits.get(key)
+                if credit and not _is_credit_retryable(credit, basket, unexplained_responses.get(key), now):
+                    skipped_count += 1
+                    continue
+
+                credit = _claim_credit(credit, key, basket, processor_name, transaction_id, amounts[basket.id])
+                if credit is None:
+                    skipped_count += 1
+                    continue
+
+                try:
+                    payment_processor = get_processor_by_name(site, processor_name)
+                except Exception:  # pylint: disable=broad-except
+                    failure_count += 1
+                    credit.status = BasketRefundCredit.FAILED
+                    with transaction.atomic():
+                        credit.save(update_fields=['status', 'modified'])
+                    logger.exception('Failed to issue credit for [%s] transaction [%s] made against basket [%d].',
+                                     processor_name, transaction_id, basket.id)
+                    continue
+                claimed.append((payment_processor, basket, credit))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_issue_credit, payment_processor, basket.order_number, basket, credit): (basket, credit)
+            for payment_processor, basket, credit in claimed
+        }
+        for future in as_completed(futures):
+            basket, credit = futures[future]
             try:
-                logger.info('Issuing credit for [%s] transaction [%s] made against basket [%d]...', processor_name,
-                            transaction_id, basket.id)
-                payment_processor = _get_payment_processor(site, processor_name)
-                payment_processor.issue_credit(basket.order_number, basket, transaction_id, basket.total_excl_tax,
-                                               basket.currency)
-                success_count += 1
-                logger.info('Successfully issued credit for [%s] transaction [%s] made against basket [%d].',
-                            processor_name, transaction_id, basket.id)
+                credit.credit_transaction_id = future.result()
             except Exception:  # pylint: disable=broad-except
                 failure_count += 1
+                credit.status = BasketRefundCredit.FAILED
                 logger.exception('Failed to issue credit for [%s] transaction [%s] made against basket [%d].',
-                                 processor_name, transaction_id, basket.id)
-        logger.info('Finished processing refunds for basket [%d].', basket.id)
+                                 credit.processor_name, credit.transaction_id, basket.id)
+            else:
+                success_count += 1
+                credit.status = BasketRefundCredit.SUCCEEDED
+                logger.info('Successfully issued credit for [%s] transaction [%s] made against basket [%d].',
+                            credit.processor_name, credit.transaction_id, basket.id)
+            with transaction.atomic():
+                credit.save(update_fields=['status', 'credit_transaction_id', 'modified'])
 
     msg = 'Finished refunding basket transactions. [{success_count}] transactions were successfully refunded. ' \
-          '[{failure_count}] attempts failed.'.format(success_count=success_count, failure_count=failure_count)
+          '[{failure_count}] attempts failed. [{skipped_count}] transactions were skipped.'.format(
+              success_count=success_count, failure_count=failure_count, skipped_count=skipped_count)
     logger.info(msg)
 
     return success_count, failure_count
@@ -161,7 +363,7 @@ class FulfillFrozenBaskets(EdxOrderPlacementMixin):
                 card_number = payment_notification.response['req_card_number']
                 card_type = CYBERSOURCE_CARD_TYPE_MAP.get(payment_notification.response['req_card_type'])
 
-            self.payment_processor = _get_payment_processor(site, payment_notification.processor_name)
+            self.payment_processor = get_processor_by_name(site, payment_notification.processor_name)
             # Create handled response
             handled_response = HandledProcessorResponse(
                 transaction_id=payment_notification.transaction_id,
@@ -4,6 +4,8 @@ import logging
 
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.db import transaction
+from django.utils.decorators import method_decorator
 from django.utils.translation import ugettext as _
 from django.views.generic import TemplateView
 
@@ -12,6 +14,9 @@ from ecommerce.management.utils import FulfillFrozenBaskets, refund_basket_trans
 logger = logging.getLogger(__name__)
 
 
+# refund_basket_transactions commits each credit it claims and issues, so that a crash of the request cannot roll back
+# the record of credits which already reached the processor.
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
 class ManagementView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
     template_name = 'management/index.html'
 
@@ -42,12 +47,13 @@ class ManagementView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
             messages.add_message(request, messages.INFO, msg)
         elif action == 'fulfill':
             basket_ids = self._parse_basket_ids(request.POST.get('basket_ids'))
-            for basket_id in basket_ids:
-                fulfilled = FulfillFrozenBaskets().fulfill_basket(basket_id=basket_id, site=request.site)
-                if fulfilled:
-                    logger.info('Fulfilled basket [%s].', basket_id)
-                else:
-                    logger.info('Unable to fulfill basket [%d]', basket_id)
+            with transaction.atomic():
+                for basket_id in basket_ids:
+                    fulfilled = FulfillFrozenBaskets().fulfill_basket(basket_id=basket_id, site=request.site)
+                    if fulfilled:
+                        logger.info('Fulfilled basket [%s].', basket_id)
+                    else:
+                        logger.info('Unable to fulfill basket [%d]', basket_id)
         else:
             messages.add_message(request, messages.ERROR,
                                  _('{action} is not a valid action.').format(action=action))
@@ -2,8 +2,7 @@
 
 import logging
 
-from django.conf import settings
-from edx_django_utils.cache import TieredCache
+from ecommerce.core.cache import PROGRAMS_CACHE
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +15,6 @@ class ProgramsApiClient:
     """
 
     def __init__(self, client, site_domain):
-        self.cache_ttl = settings.PROGRAM_CACHE_TIMEOUT
         self.client = client
         self.site_domain = site_domain
 
@@ -31,17 +29,11 @@ class ProgramsApiClient:
             dict
         """
         program_uuid = str(uuid)
-        cache_key = '{site_domain}-program-{uuid}'.format(site_domain=self.site_domain, uuid=program_uuid)
 
-        program_cached_response = TieredCache.get_cached_response(cache_key)
+        def fetch():
+            logging.info('Retrieving details of of program [%s]...', program_uuid)
+            program = self.client.programs(program_uuid).get()
+            logging.info('Program [%s] was successfully retrieved and cached.', program_uuid)
+            return program
 
-        if program_cached_response.is_found:  # pragma: no cover
-            logger.debug('Program [%s] was found in the cache.', program_uuid)
-            return program_cached_response.value
-
-        logging.info('Retrieving details of of program [%s]...', program_uuid)
-        program = self.client.programs(program_uuid).get()
-
-        TieredCache.set_all_tiers(cache_key, program, self.cache_ttl)
-        logging.info('Program [%s] was successfully retrieved and cached.', program_uuid)
-        return program
+        return PROGRAMS_CACHE.get_or_set(self.site_domain, fetch, resource='program', uuid=program_uuid)
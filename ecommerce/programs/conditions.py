@@ -4,14 +4,13 @@ import logging
 import operator
 
 from django.conf import settings
-from edx_django_utils.cache import TieredCache
 from oscar.apps.offer import utils as oscar_utils
 from oscar.core.loading import get_model
 from requests.exceptions import ConnectionError as ReqConnectionError
 from requests.exceptions import Timeout
 from slumber.exceptions import HttpNotFoundError, SlumberBaseException
 
-from ecommerce.core.utils import deprecated_traverse_pagination, get_cache_key
+from ecommerce.core.utils import get_cache_key, get_or_set_cache, traverse_pagination
 from ecommerce.extensions.offer.decorators import check_condition_applicability
 from ecommerce.extensions.offer.mixins import SingleItemConsumptionConditionMixin
 from ecommerce.programs.utils import get_program
@@ -46,33 +45,38 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
                         program_skus.add(entitlement['sku'])
         return program_skus
 
-    def _get_lms_resource_for_user(self, basket, resource_name, endpoint):
-        cache_key = get_cache_key(
+    def _get_lms_resource_cache_key(self, basket, resource_name):
+        return get_cache_key(
             site_domain=basket.site.domain,
             resource=resource_name,
             username=basket.owner.username,
         )
-        data_list_cached_response = TieredCache.get_cached_response(cache_key)
-        if data_list_cached_response.is_found:
-            return data_list_cached_response.value
 
+    def _get_lms_resource_for_user(self, basket, resource_name, endpoint):
+        cache_key = self._get_lms_resource_cache_key(basket, resource_name)
         user = basket.owner.username
         try:
-            data_list = endpoint.get(user=user) or []
-            TieredCache.set_all_tiers(cache_key, data_list, settings.LMS_API_CACHE_TIMEOUT)
+            return get_or_set_cache(
+                cache_key,
+                lambda: endpoint.get(user=user) or [],
+                settings.LMS_API_CACHE_TIMEOUT,
+                namespace=resource_name,
+            )
         except (ReqConnectionError, SlumberBaseException, Timeout) as exc:
             logger.error('Failed to retrieve %s : %s', resource_name, str(exc))
-            data_list = []
-        return data_list
+            return []
 
     def _get_lms_resource(self, basket, resource_name, endpoint):
         if not basket.owner:
             return []
         return self._get_lms_resource_for_user(basket, resource_name, endpoint)
 
-    def _get_user_ownership_data(self, basket, retrieve_entitlements=False):
+    def _get_user_ownership_data(self, basket, program, retrieve_entitlements=False):
         """
         Retrieves existing enrollments and entitlements for a user from LMS
+
+        Only the entitlements to courses of the program, in one of its applicable seat types, are returned. The
+        pages of entitlements stop being retrieved once every course of the program has one.
         """
         enrollments = []
         entitlements = []
@@ -82,16 +86,33 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
             enrollments = self._get_lms_resource(
                 basket, 'enrollments', site_configuration.enrollment_api_client.enrollment)
             if retrieve_entitlements:
-                response = self._get_lms_resource(
-                    basket, 'entitlements', site_configuration.entitlement_api_client.entitlements
-                )
+                endpoint = site_configuration.entitlement_api_client.entitlements
+                response = self._get_lms_resource(basket, 'entitlements', endpoint)
                 if isinstance(response, dict):
-                    entitlements = deprecated_traverse_pagination(
-                        response, site_configuration.entitlement_api_client.entitlements)
-                else:
-                    entitlements = response
+                    response = traverse_pagination(
+                        response,
+                        endpoint,
+                        cache_key=self._get_lms_resource_cache_key(basket, 'entitlements'),
+                        cache_timeout=settings.LMS_API_CACHE_TIMEOUT,
+                    )
+                entitlements = self._get_program_entitlements(response, program)
         return enrollments, entitlements
 
+    def _get_program_entitlements(self, entitlements, program):
+        """
+        Returns an entitlement for each course of the program the user has one for, in an applicable seat type.
+        """
+        applicable_seat_types = program['applicable_seat_types']
+        course_uuids = {course['uuid'] for course in program['courses']}
+        program_entitlements = []
+        for entitlement in entitlements:
+            if entitlement['course_uuid'] in course_uuids and entitlement['mode'] in applicable_seat_types:
+                program_entitlements.append(entitlement)
+                course_uuids.remove(entitlement['course_uuid'])
+                if not course_uuids:
+                    break
+        return program_entitlements
+
     def _has_entitlements(self, program):
         """
         Determines whether an entitlement product exists for any course in the program.
@@ -101,6 +122,29 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
                 return True
         return False
 
+    def get_ownership_fingerprint(self, basket):
+        """
+        Returns the enrollments and entitlements of the basket owner which count toward this condition.
+
+        Two users with the same fingerprint satisfy the condition for the same baskets.
+        """
+        try:
+            program = get_program(self.program_uuid, basket.site.siteconfiguration)
+        except (HttpNotFoundError, SlumberBaseException, Timeout):
+            return None
+        if not program:
+            return None
+
+        enrollments, entitlements = self._get_user_ownership_data(basket, program, self._has_entitlements(program))
+        course_run_keys = {run['key'] for course in program['courses'] for run in course['course_runs']}
+        return (
+            sorted(
+                (enrollment['course_details']['course_id'], enrollment['mode'])
+                for enrollment in enrollments if enrollment['course_details']['course_id'] in course_run_keys
+            ),
+            sorted((entitlement['course_uuid'], entitlement['mode']) for entitlement in entitlements),
+        )
+
     @check_condition_applicability()
     def is_satisfied(self, offer, basket):  # pylint: disable=unused-argument
         """
@@ -125,7 +169,7 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
             return False
 
         retrieve_entitlements = self._has_entitlements(program)
-        enrollments, entitlements = self._get_user_ownership_data(basket, retrieve_entitlements)
+        enrollments, entitlements = self._get_user_ownership_data(basket, program, retrieve_entitlements)
 
         for course in program['courses']:
             # If the user is already enrolled in a course, we do not need to check their basket for it
@@ -68,6 +68,17 @@ DATABASES = {
         'CONN_MAX_AGE': 60,
     }
 }
+
+# Reads of views using ecommerce.core.views.ReadReplicaMixin are routed to a database aliased 'read_replica',
+# when one is configured.
+DATABASE_ROUTERS = ['ecommerce.core.db_routers.ReadReplicaRouter']
+
+# Maximum replication lag, in seconds, tolerated before reads fall back to the primary database. The lag is
+# read with READ_REPLICA_LAG_QUERY, which must return the lag in seconds as the first column of a single row
+# (e.g. from a heartbeat table). The guard is disabled if either setting is None.
+READ_REPLICA_MAX_LAG = None
+READ_REPLICA_LAG_QUERY = None
+READ_REPLICA_LAG_CHECK_INTERVAL = 10  # Value is in seconds.
 # END DATABASE CONFIGURATION
 
 
@@ -218,6 +229,7 @@ MIDDLEWARE = (
     'corsheaders.middleware.CorsMiddleware',
     'edx_django_utils.monitoring.DeploymentMonitoringMiddleware',
     'edx_django_utils.cache.middleware.RequestCacheMiddleware',
+    'ecommerce.core.query_budget.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -246,6 +258,19 @@ MIDDLEWARE = (
 )
 # END MIDDLEWARE CONFIGURATION
 
+# SQL QUERY BUDGETS
+# See ecommerce.core.query_budget.QueryBudgetMiddleware. Requests exceeding the query_budget of their view are logged,
+# and raise an exception if QUERY_BUDGET_RAISE is set.
+QUERY_BUDGET_ENABLED = False
+QUERY_BUDGET_RAISE = False
+# Record the code making each query exceeding the budget, to locate the queries of over-budget requests.
+QUERY_BUDGET_CAPTURE_STACKS = True
+# Profile this fraction of the requests with cProfile, and save the profiles of the slow ones to this directory.
+QUERY_BUDGET_PROFILE_DIR = None
+QUERY_BUDGET_PROFILE_SAMPLE_RATE = 0.01
+QUERY_BUDGET_PROFILE_SLOW_REQUEST_SECONDS = 1
+# END SQL QUERY BUDGETS
+
 
 # URL CONFIGURATION
 # See: https://docs.djangoproject.com/en/dev/ref/settings/#root-urlconf
@@ -261,6 +286,26 @@ PROGRAM_CACHE_TIMEOUT = 3600  # Value is in seconds.
 # Cache catalog results from the enterprise and discovery service.
 CATALOG_RESULTS_CACHE_TIMEOUT = 86400
 
+# Entries of namespaced caches (see ecommerce.core.cache) are served for this long after they expire, while a
+# single worker refreshes them.
+CACHE_STALE_WHILE_REVALIDATE = 300  # Value is in seconds.
+# How long a worker may hold the lease to refresh a stale entry.
+CACHE_REFRESH_LEASE_TIMEOUT = 30  # Value is in seconds.
+# On a cache miss, a single worker fetches the value while holding a lease (see ecommerce.core.utils.single_flight).
+# Other workers wait for the lease to be released for up to CACHE_FILL_WAIT_TIMEOUT seconds.
+CACHE_FILL_LEASE_TIMEOUT = 30  # Value is in seconds.
+CACHE_FILL_WAIT_TIMEOUT = 5  # Value is in seconds.
+
+# Threads shared by the workers' paginated API traversals (see ecommerce.core.utils.traverse_pagination) to retrieve
+# the next page while the results of the current one are processed.
+PAGINATION_PREFETCH_THREADS = 4
+
+# Threads executing the API jobs (see ecommerce.core.jobs) when Celery tasks are executed eagerly.
+ASYNC_JOB_THREADS = 4
+# Finished API jobs, whose arguments and results may hold learner emails, are deleted after this many days by the
+# delete_finished_async_jobs management command.
+ASYNC_JOB_RETENTION_DAYS = 30
+
 # Cache timeout for enterprise customer results from the enterprise service.
 ENTERPRISE_CUSTOMER_RESULTS_CACHE_TIMEOUT = 3600  # Value is in seconds
 
@@ -268,8 +313,16 @@ ENTERPRISE_CUSTOMER_RESULTS_CACHE_TIMEOUT = 3600  # Value is in seconds
 PROVIDER_DATA_PROCESSING_TIMEOUT = 15  # Value is in seconds.
 CREDIT_PROVIDER_CACHE_TIMEOUT = 600
 
+# Product snapshots are cached in each process, up to PRODUCT_SNAPSHOT_LOCAL_CACHE_SIZE snapshots, and in the shared
+# cache for PRODUCT_SNAPSHOT_CACHE_TIMEOUT seconds. See ecommerce.extensions.catalogue.snapshots.
+PRODUCT_SNAPSHOT_CACHE_TIMEOUT = 3600  # Value is in seconds.
+PRODUCT_SNAPSHOT_LOCAL_CACHE_SIZE = 2048
+
 # Anonymous User Calculate Cache timeout
 ANONYMOUS_BASKET_CALCULATE_CACHE_TIMEOUT = 3600  # Value is in seconds.
+# Basket calculations for authenticated users are cached for BASKET_CALCULATE_CACHE_TIMEOUT seconds. Changes to
+# offers, vouchers, ranges and prices invalidate both caches, see ecommerce.extensions.offer.signals.
+BASKET_CALCULATE_CACHE_TIMEOUT = 300  # Value is in seconds.
 
 # LMS API settings used for fetching information from LMS
 LMS_API_CACHE_TIMEOUT = 30  # Value is in seconds.
@@ -282,9 +335,26 @@ EXTRA_PAYMENT_PROCESSOR_URLS = {}
 # END URL CONFIGURATION
 
 VOUCHER_CACHE_TIMEOUT = 10  # Value is in seconds.
+# Cache the offers preview of a voucher per catalog page and language.
+VOUCHER_OFFERS_CACHE_TIMEOUT = 300  # Value is in seconds.
 
 SDN_CHECK_REQUEST_TIMEOUT = 5  # Value is in seconds.
 
+# Embargo check results are cached per user, IP address network and set of courses.
+EMBARGO_CHECK_CACHE_TIMEOUT = 60  # Value is in seconds.
+EMBARGO_CHECK_IPV4_PREFIX_LENGTH = 24
+EMBARGO_CHECK_IPV6_PREFIX_LENGTH = 64
+# Time budget for the LMS embargo API call. When the call fails or exceeds the budget, purchases are
+# allowed if EMBARGO_CHECK_FAIL_OPEN is True and blocked otherwise.
+EMBARGO_CHECK_REQUEST_TIMEOUT = 2  # Value is in seconds.
+EMBARGO_CHECK_FAIL_OPEN = True
+
+# Number of CyberSource Flex capture contexts kept ready per merchant and target origin. Set to 0 to request
+# a new capture context from CyberSource for every payment page load.
+CYBERSOURCE_CAPTURE_CONTEXT_POOL_SIZE = 5
+# Pooled capture contexts are discarded once they are this close to expiring.
+CYBERSOURCE_CAPTURE_CONTEXT_MIN_TTL = 300  # Value is in seconds.
+
 # APP CONFIGURATION
 DJANGO_APPS = [
     'django.contrib.admin',
@@ -567,6 +637,7 @@ BROKER_HEARTBEAT_CHECKRATE = 2
 # See http://celery.readthedocs.io/en/latest/userguide/configuration.html#imports.
 CELERY_IMPORTS = (
     'ecommerce_worker.fulfillment.v1.tasks',
+    'ecommerce.core.tasks',
 )
 
 DEFAULT_PRIORITY_QUEUE = 'ecommerce.default'
@@ -579,6 +650,7 @@ CELERY_ROUTES = {
     'ecommerce_worker.email.v1.tasks.send_offer_usage_email': {'queue': 'ecommerce.email_marketing'},
     'ecommerce_worker.email.v1.tasks.send_code_assignment_nudge_email': {'queue': 'ecommerce.email_marketing'},
     'ecommerce_worker.fulfillment.v1.tasks.fulfill_order': {'queue': 'ecommerce.fulfillment'},
+    'ecommerce.core.tasks.run_async_job': {'queue': 'ecommerce.jobs'},
 }
 
 # Prevent Celery from removing handlers on the root logger. Allows setting custom logging handlers.
@@ -131,6 +131,8 @@ PAYMENT_PROCESSOR_CONFIG = {
     }
 }
 
+# Do not refill capture context pools in background threads during tests.
+CYBERSOURCE_CAPTURE_CONTEXT_POOL_SIZE = 0
 # END PAYMENT PROCESSING
 
 
@@ -167,3 +169,7 @@ BROKER_BACKEND = 'memory'
 
 # Awin advertiser id
 AWIN_ADVERTISER_ID = 1234
+
+# Fail tests of views making more queries than their query_budget.
+QUERY_BUDGET_ENABLED = True
+QUERY_BUDGET_RAISE = True
@@ -0,0 +1,590 @@
+"""
+Benchmarks of the basket, checkout, coupon and enterprise report flows.
+
+The benchmarks build their data with the test factories, inside a transaction which is rolled back at the end, and
+call the views with the Django test client while every upstream service (LMS, Discovery, enterprise) is stubbed
+with httpretty. Each scenario runs a number of iterations and reports the latency and number of SQL queries of an
+iteration. Results are appended to a JSON lines file, so that runs can be compared over time.
+
+See the run_benchmarks management command.
+"""
+import datetime
+import json
+import logging
+import random
+import re
+import statistics
+import subprocess
+import time
+import uuid
+from collections import OrderedDict
+from urllib.parse import urlencode, urlsplit
+
+import httpretty
+from django.conf import settings
+from django.db import transaction
+from django.test import Client, override_settings
+from django.test.client import RequestFactory
+from django.urls import reverse
+from django.utils.timezone import now
+from edx_django_utils.cache import RequestCache, TieredCache
+from edx_rest_framework_extensions.auth.jwt.cookies import jwt_cookie_name
+from edx_rest_framework_extensions.auth.jwt.tests.utils import generate_jwt_token, generate_unversioned_payload
+from oscar.core.loading import get_class, get_model
+from oscar.test import factories
+
+from ecommerce.core.constants import ALL_ACCESS_CONTEXT, SYSTEM_ENTERPRISE_OPERATOR_ROLE
+from ecommerce.core.models import BusinessClient
+from ecommerce.core.query_budget import QueryCounter
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.api import data as data_api
+from ecommerce.extensions.api.v2.views.coupons import CouponViewSet
+from ecommerce.extensions.catalogue.utils import create_coupon_product
+from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
+from ecommerce.extensions.offer.constants import VOUCHER_NOT_ASSIGNED
+from ecommerce.extensions.test.factories import ConditionalOfferFactory
+from ecommerce.tests.factories import SiteConfigurationFactory, UserFactory
+
+logger = logging.getLogger(__name__)
+
+Basket = get_model('basket', 'Basket')
+Benefit = get_model('offer', 'Benefit')
+Catalog = get_model('catalogue', 'Catalog')
+Condition = get_model('offer', 'Condition')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+Voucher = get_model('voucher', 'Voucher')
+Selector = get_class('partner.strategy', 'Selector')
+
+DOMAIN = 'benchmark.fake'
+LMS_URL_ROOT = 'http://lms.benchmark.fake'
+DISCOVERY_API_URL = 'http://discovery.benchmark.fake/api/v1/'
+SEAT_PRICE = 100
+
+# Upstream responses, as (method, path pattern, body) tuples. The first match wins, and the last entries catch every
+# other call so that no request leaves the process.
+EMPTY_PAGE = {'count': 0, 'next': None, 'previous': None, 'results': []}
+UPSTREAM_ROUTES = (
+    ('POST', r'/oauth2/access_token/?$', {'access_token': 'benchmark', 'expires_in': 3600}),
+    ('GET', r'/api/embargo/v1/course_access/$', {'access': True}),
+    ('GET', r'/enterprise/api/v1/enterprise-learner/$', EMPTY_PAGE),
+    ('GET', r'/enterprise/api/v1/enterprise-customer/[^/]+/$', {
+        'uuid': '00000000-0000-0000-0000-000000000000',
+        'name': 'Benchmark Enterprise',
+        'slug': 'benchmark-enterprise',
+        'active': True,
+        'enable_data_sharing_consent': False,
+        'enforce_data_sharing_consent': 'at_enrollment',
+        'contact_email': 'enterprise@example.com',
+    }),
+    ('GET', r'/contains/$', {'course_runs': {}, 'courses': {}}),
+    ('GET', r'/api/v1/course_runs/[^/]+/$', {'title': 'Benchmark course', 'image': None, 'start': None}),
+    ('GET', r'.*', EMPTY_PAGE),
+    (None, r'.*', {}),
+)
+
+
+def _get_configured_ports():
+    """
+    Return the (scheme, port) pairs of the URLs in the settings which use a non-default port.
+    """
+    ports = set()
+    for name in dir(settings):
+        value = getattr(settings, name, None) if name.isupper() else None
+        if isinstance(value, str) and value.startswith(('http://', 'https://')):
+            url = urlsplit(value)
+            if url.port:
+                ports.add((url.scheme, url.port))
+    return sorted(ports)
+
+
+class UpstreamStubs:
+    """
+    Context manager answering every HTTP call of the process with canned responses, after `latency` seconds.
+
+    A `failure_rate` fraction of the calls fails with a 503 response.
+    """
+
+    def __init__(self, latency=0, failure_rate=0, routes=UPSTREAM_ROUTES):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.routes = [(method, re.compile(pattern), json.dumps(body)) for method, pattern, body in routes]
+        self.calls = 0
+
+    def respond(self, request, uri, headers):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            return 503, headers, json.dumps({'error': 'Service unavailable'})
+
+        path = uri.split('?')[0]
+        for method, pattern, body in self.routes:
+            if method in (None, request.method) and pattern.search(path):
+                headers['content-type'] = 'application/json'
+                return 200, headers, body
+        return 404, headers, '{}'
+
+    def __enter__(self):
+        httpretty.reset()
+        httpretty.enable(allow_net_connect=False)
+        # httpretty only intercepts the ports of the registered URLs, which are 80 and 443 for a catch-all pattern.
+        patterns = [r'.*'] + [
+            r'{scheme}://.+:{port}/.*'.format(scheme=scheme, port=port) for scheme, port in _get_configured_ports()
+        ]
+        for method in (httpretty.GET, httpretty.POST, httpretty.PUT, httpretty.PATCH, httpretty.DELETE):
+            for pattern in patterns:
+                httpretty.register_uri(method, re.compile(pattern), body=self.respond)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        httpretty.disable()
+        httpretty.reset()
+
+
+class BenchmarkData:
+    """
+    Create the site, products, offers and coupons the scenarios use.
+
+    Arguments:
+        offers (int): Number of site offers applying to the products in baskets.
+        vouchers (int): Number of vouchers of the coupons, and of the coupons created by the coupon scenario.
+        lines (int): Number of lines of the baskets.
+    """
+
+    def __init__(self, offers, vouchers, lines):
+        self.offers = offers
+        self.vouchers = vouchers
+        self.lines = lines
+
+        self.site_configuration = SiteConfigurationFactory(
+            site__domain=DOMAIN,
+            lms_url_root=LMS_URL_ROOT,
+            discovery_api_url=DISCOVERY_API_URL,
+            oauth_settings={
+                'BACKEND_SERVICE_EDX_OAUTH2_KEY': 'key',
+                'BACKEND_SERVICE_EDX_OAUTH2_SECRET': 'secret',
+            },
+        )
+        self.site = self.site_configuration.site
+        self.partner = self.site_configuration.partner
+        self.partner.default_site = self.site
+        self.partner.save()
+        self.staff_user = UserFactory(is_staff=True)
+
+        self.seats = []
+        for __ in range(max(self.lines, 1)):
+            course = CourseFactory(partner=self.partner, site=self.site)
+            self.seats.append(course.create_or_update_seat('verified', True, SEAT_PRICE))
+        self.free_seat = CourseFactory(partner=self.partner, site=self.site).create_or_update_seat('verified', True, 0)
+        self.stock_records = [seat.stockrecords.first() for seat in self.seats]
+
+        offer_range = factories.RangeFactory(products=self.seats)
+        for __ in range(self.offers):
+            ConditionalOfferFactory(
+                offer_type=ConditionalOffer.SITE,
+                partner=self.partner,
+                benefit__range=offer_range,
+                benefit__value=random.randint(1, 50),
+                condition__range=offer_range,
+                condition__type=Condition.COUNT,
+                condition__value=1,
+            )
+
+        self.category = factories.CategoryFactory()
+        catalog = Catalog.objects.create(partner=self.partner)
+        catalog.stock_records.add(*self.stock_records)
+        self.coupon = self.create_coupon(catalog=catalog, voucher_type=Voucher.MULTI_USE)
+        self.voucher_code = self.coupon.attr.coupon_vouchers.vouchers.first().code
+
+        self.enterprise_id = str(uuid.uuid4())
+        self.enterprise_coupon = self.create_coupon(
+            enterprise_customer=self.enterprise_id,
+            enterprise_customer_catalog=str(uuid.uuid4()),
+            voucher_type=Voucher.SINGLE_USE,
+        )
+
+    def create_coupon(self, catalog=None, enterprise_customer=None, enterprise_customer_catalog=None,
+                      voucher_type=Voucher.SINGLE_USE):
+        """
+        Create a coupon, and the invoiced order the staff user bought it with.
+        """
+        coupon = create_coupon_product(
+            benefit_type=Benefit.PERCENTAGE,
+            benefit_value=50,
+            catalog=catalog,
+            catalog_query=None,
+            category=self.category,
+            code='',
+            course_catalog=None,
+            course_seat_types=None,
+            email_domains=None,
+            end_datetime=now() + datetime.timedelta(days=365),
+            enterprise_customer=enterprise_customer,
+            enterprise_customer_catalog=enterprise_customer_catalog,
+            max_uses=None,
+            note=None,
+            partner=self.partner,
+            price=SEAT_PRICE,
+            quantity=max(self.vouchers, 1),
+            start_datetime=now() - datetime.timedelta(days=1),
+            title='Benchmark coupon {}'.format(uuid.uuid4()),
+            voucher_type=voucher_type,
+            program_uuid=None,
+            site=self.site,
+            sales_force_id=None,
+        )
+
+        basket = self.fill_basket(self.staff_user, [coupon])
+        basket.strategy = Selector().strategy(user=self.staff_user)
+        view = CouponViewSet()
+        view.request = self.build_request(self.staff_user)
+        business_client, __ = BusinessClient.objects.get_or_create(name='Benchmark client')
+        view.create_order_for_invoice(basket, coupon_id=coupon.id, client=business_client)
+        return coupon
+
+    def build_request(self, user):
+        request = RequestFactory(SERVER_NAME=DOMAIN).get('/')
+        request.site = self.site
+        request.user = user
+        return request
+
+    def create_user(self):
+        return UserFactory(email='{}@example.com'.format(uuid.uuid4()))
+
+    def create_client(self, user):
+        client = Client(SERVER_NAME=DOMAIN)
+        client.force_login(user)
+        return client
+
+    def fill_basket(self, user, products):
+        """
+        Return the open basket of `user`, with `products` only.
+        """
+        basket = Basket.get_basket(user, self.site)
+        basket.flush()
+        for product in products:
+            basket.add_product(product)
+        basket.reset_offer_applications()
+        return basket
+
+
+class Scenario:
+    """
+    A flow to benchmark.
+
+    setup() is called once, and prepare() before every iteration. Only run() is measured, and must return the
+    response of the view, if any.
+    """
+    name = None
+    user = None
+    client = None
+
+    def __init__(self, data):
+        self.data = data
+
+    def setup(self):
+        self.user = self.data.create_user()
+        self.client = self.data.create_client(self.user)
+
+    def prepare(self):
+        pass
+
+    def run(self):
+        raise NotImplementedError
+
+
+class BasketAddScenario(Scenario):
+    name = 'basket_add'
+
+    def prepare(self):
+        self.data.fill_basket(self.user, [])
+
+    def run(self):
+        query = urlencode([('sku', stock_record.partner_sku) for stock_record in self.data.stock_records])
+        return self.client.get('{}?{}'.format(reverse('basket:basket-add'), query))
+
+
+class BasketSummaryScenario(Scenario):
+    name = 'basket_summary'
+
+    def setup(self):
+        super(BasketSummaryScenario, self).setup()
+        self.data.fill_basket(self.user, self.data.seats)
+
+    def run(self):
+        return self.client.get(reverse('basket:summary'))
+
+
+class BasketCalculateScenario(Scenario):
+    name = 'basket_calculate'
+
+    def run(self):
+        query = urlencode([('sku', stock_record.partner_sku) for stock_record in self.data.stock_records])
+        return self.client.get('{}?{}'.format(reverse('api:v2:baskets:calculate'), query))
+
+
+class VoucherApplyScenario(Scenario):
+    name = 'voucher_apply'
+
+    def prepare(self):
+        self.data.fill_basket(self.user, self.data.seats).vouchers.clear()
+
+    def run(self):
+        return self.client.post(reverse('basket:vouchers-add'), data={'code': self.data.voucher_code})
+
+
+class FreeCheckoutScenario(Scenario):
+    name = 'free_checkout'
+
+    def prepare(self):
+        self.data.fill_basket(self.user, [self.data.free_seat])
+
+    def run(self):
+        return self.client.get(reverse('checkout:free-checkout'))
+
+
+class OrderPlacementScenario(Scenario):
+    name = 'order_placement'
+    basket = None
+
+    def prepare(self):
+        self.basket = self.data.fill_basket(self.user, self.data.seats)
+        self.basket.strategy = Selector().strategy(user=self.user)
+        self.basket.freeze()
+
+    def run(self):
+        request = self.data.build_request(self.user)
+        order_metadata = data_api.get_order_metadata(self.basket)
+        EdxOrderPlacementMixin().handle_order_placement(
+            order_number=order_metadata['number'],
+            user=self.user,
+            basket=self.basket,
+            shipping_address=None,
+            shipping_method=order_metadata['shipping_method'],
+            shipping_charge=order_metadata['shipping_charge'],
+            billing_address=None,
+            order_total=order_metadata['total'],
+            request=request,
+        )
+
+
+class CouponCreationScenario(Scenario):
+    name = 'coupon_creation'
+
+    def setup(self):
+        self.client = self.data.create_client(self.data.staff_user)
+
+    def run(self):
+        coupon_data = {
+            'benefit_type': Benefit.PERCENTAGE,
+            'benefit_value': 50,
+            'category': {'name': self.data.category.name},
+            'client': 'Benchmark client',
+            'code': '',
+            'end_datetime': str(now() + datetime.timedelta(days=365)),
+            'price': SEAT_PRICE,
+            'quantity': max(self.data.vouchers, 1),
+            'start_datetime': str(now() - datetime.timedelta(days=1)),
+            'stock_record_ids': [stock_record.id for stock_record in self.data.stock_records],
+            'title': 'Benchmark coupon {}'.format(uuid.uuid4()),
+            'voucher_type': Voucher.SINGLE_USE,
+            'sales_force_id': '006ABCDE0123456789',
+        }
+        return self.client.post(reverse('api:v2:coupons-list'), json.dumps(coupon_data), 'application/json')
+
+
+class CouponReportScenario(Scenario):
+    name = 'coupon_report'
+
+    def setup(self):
+        self.client = self.data.create_client(self.data.staff_user)
+
+    def run(self):
+        return self.client.get(reverse('api:v2:coupons:coupon_reports', args=[self.data.coupon.id]))
+
+
+class EnterpriseCodesReportScenario(Scenario):
+    name = 'enterprise_codes_report'
+
+    def setup(self):
+        super(EnterpriseCodesReportScenario, self).setup()
+        payload = generate_unversioned_payload(self.user)
+        payload['roles'] = ['{}:{}'.format(SYSTEM_ENTERPRISE_OPERATOR_ROLE, ALL_ACCESS_CONTEXT)]
+        self.client.cookies[jwt_cookie_name()] = generate_jwt_token(payload)
+
+    def run(self):
+        path = reverse('api:v2:enterprise-coupons-codes', args=[self.data.enterprise_coupon.id])
+        return self.client.get(path, {'code_filter': VOUCHER_NOT_ASSIGNED})
+
+
+SCENARIOS = OrderedDict((scenario.name, scenario) for scenario in (
+    BasketAddScenario,
+    BasketSummaryScenario,
+    BasketCalculateScenario,
+    VoucherApplyScenario,
+    FreeCheckoutScenario,
+    OrderPlacementScenario,
+    CouponCreationScenario,
+    CouponReportScenario,
+    EnterpriseCodesReportScenario,
+))
+
+
+def summarize(durations, query_counts, errors):
+    """
+    Return the statistics of the iterations of a scenario. Durations are reported in milliseconds.
+
+    The statistics are None if no iteration succeeded.
+    """
+    durations = sorted(duration * 1000 for duration in durations)
+    if not durations:
+        return {
+            'iterations': 0, 'errors': errors, 'min_ms': None, 'median_ms': None, 'mean_ms': None, 'p95_ms': None,
+            'max_ms': None, 'queries': None,
+        }
+    return {
+        'iterations': len(durations),
+        'errors': errors,
+        'min_ms': round(durations[0], 3),
+        'median_ms': round(statistics.median(durations), 3),
+        'mean_ms': round(statistics.mean(durations), 3),
+        'p95_ms': round(durations[min(len(durations) - 1, int(len(durations) * 0.95))], 3),
+        'max_ms': round(durations[-1], 3),
+        'queries': int(statistics.median(query_counts)),
+    }
+
+
+def run_scenario(scenario, iterations, warmup=1, cold_cache=False):
+    """
+    Run a scenario and return the statistics of its measured iterations.
+
+    Failed iterations, which raised an exception or returned an error response, are counted as errors and left out
+    of the statistics.
+    """
+    scenario.setup()
+    durations = []
+    query_counts = []
+    errors = 0
+    for iteration in range(warmup + iterations):
+        scenario.prepare()
+        if cold_cache:
+            TieredCache.dangerous_clear_all_tiers()
+        RequestCache.clear_all_namespaces()
+
+        # A view raising an exception is counted as an error instead of aborting the run. The savepoint, which is
+        # not measured, keeps the benchmark transaction usable after a database error.
+        response = None
+        duration = None
+        counter = None
+        failed = False
+        try:
+            with transaction.atomic(), QueryCounter(capture_stacks=False) as counter:
+                start = time.perf_counter()
+                try:
+                    response = scenario.run()
+                finally:
+                    duration = time.perf_counter() - start
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Iteration %d of the %s scenario failed.', iteration, scenario.name)
+            failed = True
+
+        if iteration < warmup:
+            continue
+        if failed or duration is None or (response is not None and response.status_code >= 400):
+            errors += 1
+            continue
+        durations.append(duration)
+        query_counts.append(counter.count)
+
+    return summarize(durations, query_counts, errors)
+
+
+def run_benchmarks(offers, vouchers, lines, scenario_names=None, iterations=10, warmup=1, cold_cache=False,
+                   upstream_latency=0):
+    """
+    Build the benchmark data for the given sizes, run the scenarios against it and roll everything back.
+
+    Returns:
+        dict: The sizes and the statistics of each scenario.
+    """
+    scenario_names = scenario_names or list(SCENARIOS)
+    results = OrderedDict()
+
+    # The cache is replaced so that the scenarios neither read nor pollute the shared cache.
+    caches = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmarks'}}
+    with override_settings(CACHES=caches, EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'), \
+            UpstreamStubs(latency=upstream_latency), transaction.atomic():
+        try:
+            data = BenchmarkData(offers, vouchers, lines)
+            with override_settings(SITE_ID=data.site.id, ALLOWED_HOSTS=list(settings.ALLOWED_HOSTS) + [DOMAIN]):
+                for name in scenario_names:
+                    results[name] = run_scenario(SCENARIOS[name](data), iterations, warmup, cold_cache)
+        finally:
+            transaction.set_rollback(True)
+
+    return {
+        'sizes': {'offers': offers, 'vouchers': vouchers, 'lines': lines},
+        'scenarios': results,
+    }
+
+
+def get_revision():
+    """
+    Return the git commit of the code being benchmarked, or None outside of a git checkout.
+    """
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, cwd=settings.DJANGO_ROOT
+        ).decode('utf-8').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_results(path):
+    """
+    Return the runs saved to the JSON lines file at `path`, oldest first.
+    """
+    try:
+        with open(path, encoding='utf-8') as results_file:
+            return [json.loads(line) for line in results_file if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def save_results(path, run):
+    with open(path, 'a', encoding='utf-8') as results_file:
+        results_file.write(json.dumps(run, sort_keys=True) + '\n')
+
+
+def find_previous_run(runs, run):
+    """
+    Return the latest of `runs` made with the same database, sizes and options as `run`, or None.
+    """
+    def comparable(other):
+        return {key: other.get(key) for key in ('database', 'sizes', 'iterations', 'cold_cache', 'upstream_latency')}
+
+    for previous in reversed(runs):
+        if comparable(previous) == comparable(run):
+            return previous
+    return None
+
+
+def compare_runs(previous, run):
+    """
+    Return the relative change of the median duration and the change of the query count of every scenario.
+    """
+    changes = OrderedDict()
+    for name, stats in run['scenarios'].items():
+        previous_stats = previous['scenarios'].get(name)
+        if not previous_stats:
+            continue
+        if not stats['iterations'] or not previous_stats['iterations']:
+            continue
+        changes[name] = {
+            'median_ms_change': (
+                (stats['median_ms'] - previous_stats['median_ms']) / previous_stats['median_ms']
+                if previous_stats['median_ms'] else None
+            ),
+            'queries_change': stats['queries'] - previous_stats['queries'],
+        }
+    return changes
@@ -5,6 +5,7 @@
 import datetime
 import json
 import re
+from contextlib import contextmanager
 from decimal import Decimal
 
 import httpretty
@@ -27,6 +28,7 @@ from threadlocals.threadlocals import set_thread_variable
 from waffle.models import Flag
 
 from ecommerce.core.constants import ALL_ACCESS_CONTEXT, SYSTEM_ENTERPRISE_ADMIN_ROLE, SYSTEM_ENTERPRISE_OPERATOR_ROLE
+from ecommerce.core.query_budget import QueryCounter
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.models import Course
 from ecommerce.courses.utils import mode_for_product
@@ -385,6 +387,26 @@ class SiteMixin:
         return token
 
 
+class QueryBudgetMixin:
+    @contextmanager
+    def assertQueryBudget(self, max_queries, max_duplicates=None):  # pylint: disable=invalid-name
+        """
+        Fail if the block makes more than `max_queries` SQL queries, or more than `max_duplicates` queries repeating
+        an earlier query with the same parameters. The failure message groups the queries by statement.
+        """
+        with QueryCounter(capture_stacks_after=max_queries if max_duplicates is None else 0) as counter:
+            yield counter
+
+        if counter.count > max_queries:
+            self.fail('Expected at most {max_queries} queries. {report}'.format(
+                max_queries=max_queries, report=counter.report()
+            ))
+        if max_duplicates is not None and counter.duplicate_count > max_duplicates:
+            self.fail('Expected at most {max_duplicates} duplicate queries. {report}'.format(
+                max_duplicates=max_duplicates, report=counter.report()
+            ))
+
+
 class TestServerUrlMixin:
     def get_full_url(self, path, site=None):
         """ Returns a complete URL with the given path. """
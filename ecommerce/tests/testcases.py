@@ -7,7 +7,8 @@ from django.test import TransactionTestCase as DjangoTransactionTestCase
 from edx_django_utils.cache import TieredCache
 from oscar.test.factories import CategoryFactory
 
-from ecommerce.tests.mixins import SiteMixin, TestServerUrlMixin, TestWaffleFlagMixin, UserMixin
+from ecommerce.extensions.catalogue.snapshots import clear_local_product_snapshots
+from ecommerce.tests.mixins import QueryBudgetMixin, SiteMixin, TestServerUrlMixin, TestWaffleFlagMixin, UserMixin
 
 # When all unit tests are run, the catalog category table will sometimes be empty. However, if only a single test
 # is run, Category will have been populated by migrations (in particular, see
@@ -22,10 +23,12 @@ class TieredCacheMixin:
 
     def setUp(self):
         TieredCache.dangerous_clear_all_tiers()
+        clear_local_product_snapshots()
         super(TieredCacheMixin, self).setUp()
 
     def tearDown(self):
         TieredCache.dangerous_clear_all_tiers()
+        clear_local_product_snapshots()
         super(TieredCacheMixin, self).tearDown()
 
 
@@ -62,7 +65,8 @@ class ViewTestMixin(TieredCacheMixin):
         self.assert_get_response_status(200)
 
 
-class TestCase(TestServerUrlMixin, UserMixin, SiteMixin, TieredCacheMixin, DjangoTestCase, TestWaffleFlagMixin):
+class TestCase(TestServerUrlMixin, UserMixin, SiteMixin, TieredCacheMixin, QueryBudgetMixin, DjangoTestCase,
+               TestWaffleFlagMixin):
     """
     Base test case for ecommerce tests.
 
@@ -78,7 +82,8 @@ class LiveServerTestCase(TestServerUrlMixin, UserMixin, SiteMixin, TieredCacheMi
     """
 
 
-class TransactionTestCase(TestServerUrlMixin, UserMixin, SiteMixin, TieredCacheMixin, DjangoTransactionTestCase):
+class TransactionTestCase(TestServerUrlMixin, UserMixin, SiteMixin, TieredCacheMixin, QueryBudgetMixin,
+                          DjangoTransactionTestCase):
     """
     Base test case for ecommerce tests.
 
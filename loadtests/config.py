@@ -0,0 +1,30 @@
+import os
+
+
+def _get_list(name):
+    return [value.strip() for value in os.environ.get(name, '').split(',') if value.strip()]
+
+
+# The JWT settings must match the JWT_AUTH settings of the E-Commerce service under test.
+JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'lms-secret')
+JWT_ISSUER = os.environ.get('JWT_ISSUER', 'http://edx.devstack.lms:18000/oauth2')
+JWT_AUDIENCE = os.environ.get('JWT_AUDIENCE', 'lms-key')
+
+# User the marketing site uses to calculate prices for anonymous visitors.
+MARKETING_USERNAME = os.environ.get('MARKETING_USERNAME', 'marketing_site_worker')
+
+# SKUs of the seats bought by the load test users.
+SKUS = _get_list('LOADTEST_SKUS')
+
+# Codes of the coupons redeemed by the coupon redemption storms. A few codes shared by many users stress the voucher
+# usage checks.
+COUPON_CODES = _get_list('LOADTEST_COUPON_CODES')
+
+# Enterprise coupon assigned by the enterprise assignment bursts, and the enterprise customer administering it.
+ENTERPRISE_COUPON_ID = os.environ.get('LOADTEST_ENTERPRISE_COUPON_ID')
+ENTERPRISE_CUSTOMER_UUID = os.environ.get('LOADTEST_ENTERPRISE_CUSTOMER_UUID')
+ASSIGNMENT_BATCH_SIZE = int(os.environ.get('LOADTEST_ASSIGNMENT_BATCH_SIZE', 50))
+
+# URL of the CyberSource stub, which signs the payment tokens the checkout users pay with.
+CYBERSOURCE_STUB_URL = os.environ.get('CYBERSOURCE_STUB_URL', 'https://localhost:18443').strip('/')
+CYBERSOURCE_STUB_VERIFY = os.environ.get('CYBERSOURCE_STUB_VERIFY', 'False') == 'True'
@@ -0,0 +1,50 @@
+import datetime
+import uuid
+
+import jwt
+
+from loadtests.config import JWT_AUDIENCE, JWT_ISSUER, JWT_SECRET_KEY
+
+
+def generate_jwt(username, email=None, user_id=None, roles=None, administrator=False):
+    """
+    Return a JWT authenticating a user with the E-Commerce service, the way the LMS would.
+    """
+    now = datetime.datetime.utcnow()
+    payload = {
+        'iss': JWT_ISSUER,
+        'aud': JWT_AUDIENCE,
+        'iat': now,
+        'exp': now + datetime.timedelta(hours=12),
+        'username': username,
+        'email': email or '{}@example.com'.format(username),
+        'administrator': administrator,
+        'roles': roles or [],
+    }
+    if user_id is not None:
+        payload['user_id'] = user_id
+    return jwt.encode(payload, JWT_SECRET_KEY).decode('utf-8')
+
+
+def get_auth_headers(username, **kwargs):
+    return {'Authorization': 'JWT {}'.format(generate_jwt(username, **kwargs))}
+
+
+def get_learner_username():
+    """
+    Return the username of a new learner, so that every simulated user has its own baskets and orders.
+    """
+    return 'loadtest-{}'.format(uuid.uuid4().hex[:12])
+
+
+def get_billing_details():
+    return {
+        'first_name': 'Load',
+        'last_name': 'Test',
+        'address_line1': '141 Portland Ave.',
+        'address_line2': '',
+        'city': 'Cambridge',
+        'state': 'MA',
+        'postal_code': '02139',
+        'country': 'US',
+    }
@@ -0,0 +1,190 @@
+"""
+Load test scenarios for the E-Commerce service.
+
+Run all the scenarios against a local instance, pointed at the stubs of loadtests/stubs.py, with:
+
+    $ locust -f loadtests/locustfile.py --host http://localhost:8002
+
+Run a single scenario by naming its user class:
+
+    $ locust -f loadtests/locustfile.py --host http://localhost:8002 CouponRedemptionUser
+"""
+import random
+
+import requests
+from locust import HttpUser, between, task
+
+from loadtests.config import (
+    ASSIGNMENT_BATCH_SIZE,
+    COUPON_CODES,
+    CYBERSOURCE_STUB_URL,
+    CYBERSOURCE_STUB_VERIFY,
+    ENTERPRISE_COUPON_ID,
+    ENTERPRISE_CUSTOMER_UUID,
+    MARKETING_USERNAME,
+    SKUS
+)
+from loadtests.helpers import get_auth_headers, get_billing_details, get_learner_username
+
+
+def _require(setting, value):
+    if not value:
+        raise RuntimeError('{} must be set to run this scenario.'.format(setting))
+
+
+class LearnerUser(HttpUser):
+    """
+    Base class of the users acting as a learner who buys seats.
+    """
+    abstract = True
+    username = None
+
+    def on_start(self):
+        _require('LOADTEST_SKUS', SKUS)
+        self.username = get_learner_username()
+        self.client.headers.update(get_auth_headers(self.username))
+
+    def create_basket(self, skus, checkout=False):
+        """
+        Replace the contents of the basket of the learner with the products with the given SKUs.
+
+        Returns:
+            int: Id of the basket, or None if the request failed.
+        """
+        with self.client.post('/api/v2/baskets/', json={
+            'products': [{'sku': sku} for sku in skus],
+            'checkout': checkout,
+        }, catch_response=True) as response:
+            if response.status_code != 200:
+                response.failure('Failed to create a basket: {}'.format(response.status_code))
+                return None
+            return response.json()['id']
+
+    def get_payment_token(self):
+        # The stub signs the payment tokens, as the Flex Microform does in the browser. Its latency is not part of
+        # the load on the E-Commerce service, so the request is not made with the Locust client.
+        response = requests.post(
+            CYBERSOURCE_STUB_URL + '/loadtest/payment-token', json={}, verify=CYBERSOURCE_STUB_VERIFY, timeout=10
+        )
+        response.raise_for_status()
+        return response.json()['payment_token']
+
+    def pay(self, basket_id):
+        self.client.get('/bff/payment/v0/payment/')
+        self.client.get('/bff/payment/v0/capture-context/')
+
+        data = dict(get_billing_details(), basket=basket_id, payment_token=self.get_payment_token())
+        with self.client.post('/payment/cybersource/authorize/', data=data, catch_response=True) as response:
+            if response.status_code != 201:
+                response.failure('Payment failed: {}'.format(response.status_code))
+
+
+class AnonymousPriceCheckUser(HttpUser):
+    """
+    The marketing site calculating the prices of the seats shown to anonymous visitors.
+    """
+    weight = 10
+    wait_time = between(0.1, 1)
+
+    def on_start(self):
+        _require('LOADTEST_SKUS', SKUS)
+        self.client.headers.update(get_auth_headers(MARKETING_USERNAME))
+
+    @task(4)
+    def calculate(self):
+        self.client.get(
+            '/api/v2/baskets/calculate/',
+            params={'sku': random.sample(SKUS, random.randint(1, len(SKUS))), 'is_anonymous': 'true'},
+            name='/api/v2/baskets/calculate/ [anonymous]',
+        )
+
+    @task(1)
+    def calculate_with_code(self):
+        if not COUPON_CODES:
+            return
+        self.client.get(
+            '/api/v2/baskets/calculate/',
+            params={'sku': random.choice(SKUS), 'code': random.choice(COUPON_CODES), 'is_anonymous': 'true'},
+            name='/api/v2/baskets/calculate/ [anonymous, code]',
+        )
+
+
+class CheckoutUser(LearnerUser):
+    """
+    A learner buying a seat with a card.
+    """
+    weight = 3
+    wait_time = between(1, 5)
+
+    @task
+    def checkout(self):
+        basket_id = self.create_basket([random.choice(SKUS)])
+        if basket_id:
+            self.pay(basket_id)
+
+
+class CouponRedemptionUser(LearnerUser):
+    """
+    Learners redeeming the same few codes at once, as after a coupon is announced.
+    """
+    weight = 2
+    wait_time = between(0, 0.5)
+
+    def on_start(self):
+        super(CouponRedemptionUser, self).on_start()
+        _require('LOADTEST_COUPON_CODES', COUPON_CODES)
+
+    @task
+    def redeem(self):
+        if not self.create_basket([random.choice(SKUS)]):
+            return
+
+        with self.client.post('/bff/payment/v0/vouchers/', json={'code': random.choice(COUPON_CODES)},
+                              catch_response=True) as response:
+            if response.status_code != 200:
+                response.failure('Failed to apply the code: {}'.format(response.status_code))
+                return
+            basket = response.json()
+
+        if basket['is_free_basket']:
+            # Free orders are placed by a view requiring a session login, which users authenticated with a JWT do
+            # not have. Codes with partial discounts load the whole checkout.
+            return
+        self.pay(basket['basket_id'])
+
+
+class EnterpriseAssignmentUser(HttpUser):
+    """
+    Enterprise administrators assigning codes to batches of learners, then looking at the codes report.
+
+    Administrators wait between bursts, so the load comes in spikes of large assignments.
+    """
+    weight = 1
+    wait_time = between(10, 30)
+
+    def on_start(self):
+        _require('LOADTEST_ENTERPRISE_COUPON_ID', ENTERPRISE_COUPON_ID)
+        _require('LOADTEST_ENTERPRISE_CUSTOMER_UUID', ENTERPRISE_CUSTOMER_UUID)
+        self.client.headers.update(get_auth_headers(
+            get_learner_username(),
+            roles=['enterprise_admin:{}'.format(ENTERPRISE_CUSTOMER_UUID)],
+        ))
+
+    @task
+    def assign(self):
+        emails = ['{}@example.com'.format(get_learner_username()) for __ in range(ASSIGNMENT_BATCH_SIZE)]
+        self.client.post(
+            '/api/v2/enterprise/coupons/{}/assign/'.format(ENTERPRISE_COUPON_ID),
+            json={
+                'template_subject': 'Load test',
+                'template_greeting': 'Hello',
+                'template_closing': 'Bye',
+                'users': [{'email': email} for email in emails],
+            },
+            name='/api/v2/enterprise/coupons/[id]/assign/',
+        )
+        self.client.get(
+            '/api/v2/enterprise/coupons/{}/codes/'.format(ENTERPRISE_COUPON_ID),
+            params={'code_filter': 'unredeemed', 'page_size': 100},
+            name='/api/v2/enterprise/coupons/[id]/codes/',
+        )
@@ -0,0 +1,475 @@
+"""
+Stub servers for the services the E-Commerce service calls, so that it can be load tested without shared
+environments.
+
+Each stub answers the requests made by the load test scenarios with canned or echoed responses after a configurable
+latency, and fails a configurable share of the requests with a 503. Other GET requests are answered with an empty
+page of results, and other requests with an empty object.
+
+The CyberSource stub signs capture contexts and payment tokens with its own key, and authorizes every payment. The
+load test users get their payment tokens from its `/loadtest/payment-token` endpoint, in place of the Flex
+Microform.
+
+Run the stubs with:
+
+    $ python -m loadtests.stubs --latency 0.05 --jitter 0.05 --failure-rate 0.01
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import logging
+import random
+import re
+import ssl
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import jwt
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORTS = OrderedDict([
+    ('lms', 18000),
+    ('discovery', 18381),
+    ('enterprise_catalog', 18160),
+    ('cybersource', 18443),
+])
+EMPTY_PAGE = {'count': 0, 'num_pages': 1, 'next': None, 'previous': None, 'results': []}
+# Number of seconds capture contexts and payment tokens are valid for.
+TOKEN_LIFETIME = 15 * 60
+
+
+class StubRequest:
+    def __init__(self, method, path, query, body, match):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.body = body
+        self.match = match
+
+    def get_list(self, name):
+        """
+        Return the values of a query parameter, split on commas.
+        """
+        return [value for values in self.query.get(name, []) for value in values.split(',') if value]
+
+
+def get_user_id(username):
+    """
+    Return a stable id for a username, so that the stubs agree on the ids of the users they make up.
+    """
+    return int(hashlib.sha1(username.encode('utf-8')).hexdigest()[:7], 16)
+
+
+def get_user(username=None, email=None):
+    username = username or email.split('@')[0]
+    return {
+        'id': get_user_id(username),
+        'username': username,
+        'email': email or '{}@example.com'.format(username),
+        'name': username,
+        'is_active': True,
+    }
+
+
+class StubService:
+    """
+    Base class of the stubs.
+
+    Routes are (method, path pattern, handler name) tuples. Handlers take a StubRequest, and return a status code
+    and a JSON serializable body.
+    """
+    name = None
+    routes = ()
+    common_routes = (
+        ('GET', r'.*/contains_content_items/?$', 'contains_content_items'),
+        ('GET', r'.*/query_contains/?$', 'query_contains'),
+    )
+
+    def __init__(self, latency=0.0, jitter=0.0, failure_rate=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.request_count = 0
+        self.failure_count = 0
+        self._lock = threading.Lock()
+
+    def handle(self, method, path, query, body):
+        """
+        Return the status code and body of the response to a request, after the configured latency.
+        """
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        failed = random.random() < self.failure_rate
+        with self._lock:
+            self.request_count += 1
+            self.failure_count += failed
+        if failed:
+            return 503, {'error': 'Injected failure of the {} stub.'.format(self.name)}
+
+        for route_method, pattern, handler in self.routes + self.common_routes:
+            match = re.match(pattern, path)
+            if route_method == method and match:
+                return getattr(self, handler)(StubRequest(method, path, query, body, match))
+
+        return 200, EMPTY_PAGE if method == 'GET' else {}
+
+    def contains_content_items(self, request):  # pylint: disable=unused-argument
+        return 200, {'contains_content_items': True}
+
+    def query_contains(self, request):
+        return 200, {
+            content_id: True for content_id in request.get_list('course_run_ids') + request.get_list('course_uuids')
+        }
+
+
+class LmsStub(StubService):
+    """
+    Stub of the OAuth2 provider, the enrollment, embargo, user and course APIs of the LMS, and of the enterprise API
+    it hosts.
+    """
+    name = 'lms'
+    routes = (
+        ('POST', r'/oauth2/access_token/?$', 'access_token'),
+        ('GET', r'/api/embargo/v1/course_access/?$', 'course_access'),
+        ('GET', r'/api/enrollment/v1/enrollment/?$', 'enrollments'),
+        ('GET', r'/api/enrollment/v1/enrollment/(?P<key>.+)$', 'enrollment'),
+        ('POST', r'/api/enrollment/v1/enrollment/?$', 'enroll'),
+        ('POST', r'/api/user/v1/accounts/search_emails/?$', 'search_emails'),
+        ('GET', r'/api/user/v1/accounts/?$', 'accounts'),
+        ('GET', r'/api/user/v1/accounts/(?P<username>[^/]+)/?$', 'account'),
+        ('GET', r'/api/courses/v1/courses/(?P<course_id>[^/]+)/?$', 'course'),
+        ('GET', r'/enterprise/api/v1/enterprise-customer/(?P<uuid>[0-9a-f-]+)/?$', 'enterprise_customer'),
+    )
+
+    def access_token(self, request):  # pylint: disable=unused-argument
+        return 200, {'access_token': uuid.uuid4().hex, 'token_type': 'JWT', 'expires_in': 3600, 'scope': 'read'}
+
+    def course_access(self, request):  # pylint: disable=unused-argument
+        return 200, {'access': True}
+
+    def enrollments(self, request):  # pylint: disable=unused-argument
+        return 200, []
+
+    def enrollment(self, request):  # pylint: disable=unused-argument
+        return 200, {}
+
+    def enroll(self, request):
+        body = request.body or {}
+        return 200, {
+            'mode': body.get('mode'),
+            'is_active': body.get('is_active', True),
+            'user': body.get('user'),
+            'course_details': body.get('course_details', {}),
+        }
+
+    def search_emails(self, request):
+        return 200, [get_user(email=email) for email in (request.body or {}).get('emails', [])]
+
+    def accounts(self, request):
+        users = [get_user(username=username) for username in request.get_list('username')]
+        users += [get_user(email=email) for email in request.get_list('email')]
+        return 200, users
+
+    def account(self, request):
+        return 200, get_user(username=request.match.group('username'))
+
+    def course(self, request):
+        return 200, {
+            'id': request.match.group('course_id'),
+            'name': 'Load test course',
+            'start': '2020-01-01T00:00:00Z',
+            'end': None,
+        }
+
+    def enterprise_customer(self, request):
+        return 200, {
+            'uuid': request.match.group('uuid'),
+            'name': 'Load test enterprise',
+            'slug': 'load-test-enterprise',
+            'active': True,
+            'site': {'domain': 'localhost'},
+            'enable_data_sharing_consent': False,
+            'enforce_data_sharing_consent': 'at_enrollment',
+            'contact_email': 'enterprise@example.com',
+            'sender_alias': 'Load test',
+            'reply_to': 'enterprise@example.com',
+            'branding_configuration': {},
+            'enterprise_customer_catalogs': [],
+            'identity_provider': None,
+        }
+
+
+class DiscoveryStub(StubService):
+    name = 'discovery'
+    routes = (
+        ('GET', r'/api/v1/course_runs/(?P<key>[^/]+)/?$', 'course_run'),
+        ('GET', r'/api/v1/courses/(?P<key>[^/]+)/?$', 'course'),
+        ('GET', r'/api/v1/catalogs/(?P<catalog_id>\d+)/contains/?$', 'catalog_contains'),
+    )
+
+    def course_run(self, request):
+        key = request.match.group('key')
+        return 200, {
+            'key': key,
+            'title': 'Load test course',
+            'start': '2020-01-01T00:00:00Z',
+            'end': None,
+            'enrollment_end': None,
+            'pacing_type': 'self_paced',
+            'type': 'verified',
+            'seats': [],
+        }
+
+    def course(self, request):
+        key = request.match.group('key')
+        return 200, {
+            'key': key,
+            'uuid': str(uuid.uuid5(uuid.NAMESPACE_URL, key)),
+            'title': 'Load test course',
+            'course_runs': [],
+            'entitlements': [],
+        }
+
+    def catalog_contains(self, request):
+        return 200, {
+            'courses': {course_id: True for course_id in request.get_list('course_run_id')},
+        }
+
+
+class EnterpriseCatalogStub(StubService):
+    name = 'enterprise_catalog'
+
+
+class CyberSourceStub(StubService):
+    """
+    Stub of the CyberSource REST API.
+    """
+    name = 'cybersource'
+    routes = (
+        ('POST', r'/flex/v1/keys/?$', 'generate_key'),
+        ('POST', r'/pts/v2/payments/?$', 'create_payment'),
+        ('POST', r'/pts/v2/payments/(?P<payment_id>[^/]+)/reversals/?$', 'reverse_payment'),
+        ('POST', r'/loadtest/payment-token/?$', 'payment_token'),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super(CyberSourceStub, self).__init__(*args, **kwargs)
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048, backend=default_backend())
+        self.key_id = uuid.uuid4().hex
+        self.jwk = dict(json.loads(RSAAlgorithm.to_jwk(self.private_key.public_key())), kid=self.key_id)
+
+    def sign(self, payload):
+        now = datetime.datetime.utcnow()
+        payload = dict(payload, iat=now, exp=now + datetime.timedelta(seconds=TOKEN_LIFETIME), jti=uuid.uuid4().hex)
+        return jwt.encode(payload, self.private_key, algorithm='RS256', headers={'kid': self.key_id}).decode('utf-8')
+
+    def generate_key(self, request):  # pylint: disable=unused-argument
+        return 200, {'keyId': self.sign({'flx': {'jwk': self.jwk, 'origin': 'https://flex.cybersource.com'}})}
+
+    def payment_token(self, request):  # pylint: disable=unused-argument
+        token = self.sign({
+            'data': {
+                'number': '411111XXXXXX1111',
+                'type': '001',
+                'expirationMonth': '12',
+                'expirationYear': str(datetime.date.today().year + 2),
+            },
+        })
+        return 200, {'payment_token': token}
+
+    def create_payment(self, request):
+        body = request.body or {}
+        order_information = _get(body, 'order_information') or {}
+        amount_details = _get(order_information, 'amount_details') or {}
+        payment_id = str(random.randint(10 ** 21, 10 ** 22 - 1))
+        return 201, {
+            'id': payment_id,
+            'status': 'AUTHORIZED',
+            'submitTimeUtc': datetime.datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'reconciliationId': payment_id[:16],
+            'clientReferenceInformation': {
+                'code': _get(_get(body, 'client_reference_information') or {}, 'code'),
+            },
+            'orderInformation': {
+                'amountDetails': {
+                    'totalAmount': _get(amount_details, 'total_amount'),
+                    'authorizedAmount': _get(amount_details, 'total_amount'),
+                    'currency': _get(amount_details, 'currency'),
+                },
+            },
+            'paymentInformation': {
+                'tokenizedCard': {'type': '001'},
+                'card': {'type': '001'},
+            },
+            'processorInformation': {'approvalCode': '888888', 'responseCode': '100'},
+        }
+
+    def reverse_payment(self, request):
+        return 201, {
+            'id': str(random.randint(10 ** 21, 10 ** 22 - 1)),
+            'status': 'REVERSED',
+            'clientReferenceInformation': _get(request.body or {}, 'client_reference_information') or {},
+            'reversalAmountDetails': {'reversedAmount': None},
+        }
+
+
+def _get(data, key):
+    """
+    Return the value of a key of a request body, whether it is camel cased, snake cased or private.
+    """
+    normalized = key.replace('_', '').lower()
+    for name, value in data.items():
+        if name.replace('_', '').lower() == normalized:
+            return value
+    return None
+
+
+SERVICES = OrderedDict((service.name, service) for service in (
+    LmsStub, DiscoveryStub, EnterpriseCatalogStub, CyberSourceStub
+))
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.respond()
+
+    do_DELETE = do_PATCH = do_POST = do_PUT = do_GET
+
+    def respond(self):
+        url = urlsplit(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        raw_body = self.rfile.read(length) if length else b''
+        if 'json' in (self.headers.get('Content-Type') or ''):
+            try:
+                body = json.loads(raw_body.decode('utf-8') or 'null')
+            except ValueError:
+                body = None
+        else:
+            body = {name: values[-1] for name, values in parse_qs(raw_body.decode('utf-8')).items()}
+
+        status, payload = self.server.service.handle(self.command, url.path, parse_qs(url.query), body)
+
+        content = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('v-c-correlation-id', uuid.uuid4().hex)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        logger.debug('[%s] %s', self.server.service.name, format % args)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, service, host='127.0.0.1', port=0, certfile=None, keyfile=None):
+        super(StubServer, self).__init__((host, port), StubRequestHandler)
+        self.service = service
+        self.scheme = 'http'
+        if certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            self.socket = context.wrap_socket(self.socket, server_side=True)
+            self.scheme = 'https'
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return '{scheme}://{host}:{port}'.format(scheme=self.scheme, host=host, port=port)
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, name='{}-stub'.format(self.service.name), daemon=True)
+        thread.start()
+        return thread
+
+
+def _parse_overrides(values, parse):
+    overrides = {}
+    for value in values or []:
+        name, _, setting = value.partition('=')
+        if name not in SERVICES:
+            raise argparse.ArgumentTypeError('Unknown service [{}].'.format(name))
+        overrides[name] = parse(setting)
+    return overrides
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description='Run stubs of the services the E-Commerce service calls.')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface the stubs listen on.')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Number of seconds the stubs take to respond.')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='Maximum number of seconds randomly added to the latency.')
+    parser.add_argument('--failure-rate', type=float, default=0.0,
+                        help='Share of the requests failing with a 503, between 0 and 1.')
+    parser.add_argument('--service-latency', action='append', metavar='SERVICE=SECONDS',
+                        help='Latency of one service. May be repeated.')
+    parser.add_argument('--service-failure-rate', action='append', metavar='SERVICE=RATE',
+                        help='Failure rate of one service. May be repeated.')
+    parser.add_argument('--port', action='append', metavar='SERVICE=PORT',
+                        help='Port of one service. May be repeated. Defaults to {}.'.format(
+                            ', '.join('{}={}'.format(name, port) for name, port in DEFAULT_PORTS.items())))
+    parser.add_argument('--service', dest='services', action='append', choices=list(SERVICES),
+                        help='Service to stub. May be repeated. Defaults to all services.')
+    parser.add_argument('--certfile', help='Certificate the CyberSource stub serves HTTPS with.')
+    parser.add_argument('--keyfile', help='Private key of the certificate.')
+    options = parser.parse_args(args)
+
+    try:
+        options.service_latency = _parse_overrides(options.service_latency, float)
+        options.service_failure_rate = _parse_overrides(options.service_failure_rate, float)
+        options.port = _parse_overrides(options.port, int)
+    except (argparse.ArgumentTypeError, ValueError) as error:
+        parser.error(str(error))
+    return options
+
+
+def create_servers(options):
+    servers = []
+    for name in options.services or SERVICES:
+        service = SERVICES[name](
+            latency=options.service_latency.get(name, options.latency),
+            jitter=options.jitter,
+            failure_rate=options.service_failure_rate.get(name, options.failure_rate),
+        )
+        tls = {'certfile': options.certfile, 'keyfile': options.keyfile} if name == 'cybersource' else {}
+        servers.append(StubServer(service, options.host, options.port.get(name, DEFAULT_PORTS[name]), **tls))
+    return servers
+
+
+def main(args=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    servers = create_servers(parse_args(args))
+    for server in servers:
+        server.start()
+        logger.info('Stubbing [%s] at [%s].', server.service.name, server.url)
+
+    try:
+        while True:
+            time.sleep(60)
+            for server in servers:
+                logger.info('[%s] served %d requests, %d failed.', server.service.name,
+                            server.service.request_count, server.service.failure_count)
+    except KeyboardInterrupt:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    main()